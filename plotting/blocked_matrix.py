@@ -0,0 +1,104 @@
+"""Where cache blocking pays off in the matrix multiplications.
+
+Prints the fastest L1/L2 tile pair of every blocked fixture at every size with its
+speedup over the unblocked OptimizedMul of the same layout, and plots that speedup
+against the matrix size next to the tile sweep at the largest size.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from results import group_reduce, load_results, select
+
+
+def blocked_fixtures(data):
+    return [f for f in np.unique(data['fixture']) if 'Blocked' in f]
+
+
+def best_tiles(data, fixture):
+    """(threads, size) groups with the fastest (l1, l2) and its median ns"""
+    groups, ns = group_reduce(data[select(data, fixture=fixture, kernel='BlockedMul')],
+                              ['threads', 'size', 'l1', 'l2'], 'ns')
+    best = {}
+    for group, value in zip(groups, ns):
+        key = (group['threads'], group['size'])
+        if key not in best or value < best[key][2]:
+            best[key] = (group['l1'], group['l2'], value)
+    return best
+
+
+def speedups(data, fixture):
+    """{threads: [(size, l1, l2, speedup over OptimizedMul)]} sorted by size"""
+    # CMatrixSharedBlockedInt is the blocked twin of CMatrixSharedInt
+    baseline = data[select(data, fixture=fixture.replace('Blocked', ''), kernel='OptimizedMul')]
+    groups, reference = group_reduce(baseline, ['threads', 'size'], 'ns')
+    reference = {(g['threads'], g['size']): value for g, value in zip(groups, reference)}
+
+    by_threads = {}
+    for (threads, size), (l1, l2, ns) in sorted(best_tiles(data, fixture).items()):
+        gain = reference[(threads, size)] / ns if (threads, size) in reference else np.nan
+        by_threads.setdefault(threads, []).append((size, l1, l2, gain))
+    return by_threads
+
+
+def print_best(data):
+    for fixture in blocked_fixtures(data):
+        print(f"\n{fixture}: fastest tiles (speedup over OptimizedMul)")
+        for threads, points in speedups(data, fixture).items():
+            for size, l1, l2, gain in points:
+                print(f"  {threads:>2}t  {size:>5}  l1 {l1:>3}  l2 {l2:>4}  x{gain:.2f}")
+
+
+def plot_speedups(data):
+    fixtures = blocked_fixtures(data)
+    if not fixtures:
+        return
+
+    fig, (gains, sweep) = plt.subplots(1, 2, figsize=(16, 6))
+    fig.suptitle('Cache-blocked matrix multiplication', fontsize=16, fontweight='bold')
+
+    for fixture in fixtures:
+        for threads, points in speedups(data, fixture).items():
+            sizes = [p[0] for p in points]
+            gains.plot(sizes, [p[3] for p in points], marker='o',
+                       label=fixture if threads == 1 else f'{fixture} {threads}t')
+    gains.axhline(1, color='black', linewidth=0.8)
+    gains.set_xscale('log', base=2)
+    gains.set_xlabel('Matrix size')
+    gains.set_ylabel('Speedup over OptimizedMul (best tiles)')
+    gains.grid(True, alpha=0.3)
+    gains.legend(fontsize=7)
+
+    # tile sweep of the first single-threaded fixture at its largest size
+    subset = data[select(data, fixture=fixtures[0], kernel='BlockedMul')]
+    subset = subset[(subset['threads'] == subset['threads'].min()) & (subset['size'] == subset['size'].max())]
+    groups, ns = group_reduce(subset, ['l1', 'l2'], 'ns')
+    l1s, l2s = np.unique(groups['l1']), np.unique(groups['l2'])
+    rows = {l1: i for i, l1 in enumerate(l1s)}
+    cols = {l2: j for j, l2 in enumerate(l2s)}
+    grid = np.full((len(l1s), len(l2s)), np.nan)
+    for group, value in zip(groups, ns):
+        grid[rows[group['l1']], cols[group['l2']]] = value / 1e6
+    image = sweep.imshow(grid, cmap='viridis_r')
+    sweep.set_xticks(range(len(l2s)))
+    sweep.set_xticklabels(l2s)
+    sweep.set_yticks(range(len(l1s)))
+    sweep.set_yticklabels(l1s)
+    sweep.set_xlabel('L2 tile')
+    sweep.set_ylabel('L1 tile')
+    sweep.set_title(f'{fixtures[0]}, size {subset["size"].max() if len(subset) else 0}', fontweight='bold')
+    fig.colorbar(image, ax=sweep, label='ms')
+
+    plt.tight_layout()
+    plt.savefig('blocked_matrix.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    results = load_results(*sys.argv[1:])
+    print_best(results)
+    plot_speedups(results)
@@ -0,0 +1,73 @@
+"""Serial against parallel first-touch initialization of the multithreaded fixtures.
+
+Run the suites once per mode into the same results file, e.g.
+    for m in serial parallel; do BENCH_INIT=$m ./benchmarks; done
+and pass the file(s) on the command line. Prints for every point the first-touch
+time and the kernel time of both modes, and plots the kernel speedup of parallel
+initialization against the thread count, one line per fixture, kernel and size.
+On a single-node machine the kernel times should match, only first touch differs.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+
+from results import NS_PER_MS, load_records
+
+MODES = ['serial', 'parallel']
+
+
+def init_points(records):
+    """{(fixture, kernel, size, threads): {mode: (first touch ns, median ns)}}"""
+    points = {}
+    for record in records:
+        if 'init' not in record:
+            continue
+        key = (record['fixture'], record.get('kernel', ''), record['size'], record.get('threads', 1))
+        points.setdefault(key, {})[record['init']] = (record['first_touch_ns'], record.get('median_ns', record['ns']))
+    return dict(sorted(points.items()))
+
+
+def print_points(points):
+    for (fixture, kernel, size, threads), by_mode in points.items():
+        cells = '  '.join(f"{mode} touch {touch / NS_PER_MS:9.3f} ms run {ns / NS_PER_MS:9.3f} ms"
+                          for mode, (touch, ns) in sorted(by_mode.items(), key=lambda item: MODES.index(item[0])))
+        print(f"{fixture} {kernel} {size:>9} {threads:>2}t  {cells}")
+
+
+def speedups(points):
+    """{(fixture, kernel, size): [(threads, serial ns / parallel ns)]} sorted by threads"""
+    curves = {}
+    for (fixture, kernel, size, threads), by_mode in points.items():
+        if all(mode in by_mode for mode in MODES):
+            curves.setdefault((fixture, kernel, size), []).append((threads, by_mode['serial'][1] / by_mode['parallel'][1]))
+    return {key: sorted(values) for key, values in curves.items()}
+
+
+def plot_speedups(curves):
+    if not curves:
+        return
+
+    fig, ax = plt.subplots(figsize=(12, 7))
+    fig.suptitle('Parallel first touch against serial', fontsize=16, fontweight='bold')
+
+    for (fixture, kernel, size), curve in curves.items():
+        ax.plot([p[0] for p in curve], [p[1] for p in curve], marker='o', label=f'{fixture} {kernel} {size}')
+    ax.axhline(1, color='black', linewidth=0.8)
+    ax.set_xscale('log', base=2)
+    ax.set_xlabel('Threads')
+    ax.set_ylabel('kernel time after serial init / after parallel init')
+    ax.grid(True, alpha=0.3)
+    ax.legend(fontsize=6)
+
+    plt.tight_layout()
+    plt.savefig('first_touch.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    points = init_points(load_records(*sys.argv[1:]))
+    print_points(points)
+    plot_speedups(speedups(points))
@@ -0,0 +1,59 @@
+"""Fraction of the theoretical peak reached by the packed GEMM micro-kernel.
+
+Prints GFLOP/s and peak fraction of every GemmMul point and plots the fraction of
+peak against the matrix size, one line per fixture and thread count.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from results import load_records
+
+
+def gemm_points(records):
+    """{(fixture, threads): [(size, gflops, peak fraction)]} sorted by size"""
+    points = {}
+    for record in records:
+        if record.get('kernel') != 'GemmMul' or 'peak_fraction' not in record:
+            continue
+        key = (record['fixture'], record.get('threads', 1))
+        points.setdefault(key, []).append((record['size'], record['gflops'], record['peak_fraction']))
+    return {key: sorted(values) for key, values in sorted(points.items())}
+
+
+def print_points(points):
+    for (fixture, threads), values in points.items():
+        print(f"\n{fixture}, {threads} threads")
+        for size, gflops, fraction in values:
+            print(f"  {size:>5}  {gflops:8.2f} GFLOP/s  {fraction:6.1%} of peak")
+
+
+def plot_peak(points):
+    if not points:
+        return
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for (fixture, threads), values in points.items():
+        sizes, _, fractions = np.array(values).T
+        ax.plot(sizes, fractions * 100, marker='o', label=f'{fixture} {threads}t')
+    ax.axhline(100, color='black', linewidth=0.8)
+    ax.set_xscale('log', base=2)
+    ax.set_xlabel('Matrix size')
+    ax.set_ylabel('% of theoretical peak')
+    ax.set_title('Packed GEMM micro-kernel', fontsize=16, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    ax.legend(fontsize=8)
+
+    plt.tight_layout()
+    plt.savefig('gemm_peak.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    gemm = gemm_points(load_records(*sys.argv[1:]))
+    print_points(gemm)
+    plot_peak(gemm)
@@ -1,3 +1,5 @@
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.ticker import FuncFormatter
@@ -5,6 +7,8 @@ import seaborn as sns
 from matplotlib.patches import Rectangle
 import matplotlib.patches as mpatches
 
+from results import from_nested, load_results, series
+
 # Set publication-quality style
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
@@ -30,7 +34,7 @@ raw_data = {
             (10, 0), (100, 2), (1000, 16), (10000, 131),
             (100000, 1382), (1000000, 13782), (2000000, 31189)
         ],
-        "Random": [  # Renamed from "Jump" for clarity
+        "Stride": [
             (10, 2), (100, 6), (1000, 51), (10000, 945),
             (100000, 11832), (1000000, 158561), (2000000, 327873)
         ],
@@ -40,7 +44,7 @@ raw_data = {
             (10, 0), (100, 2), (1000, 28), (10000, 266),
             (100000, 2815), (1000000, 28604), (2000000, 146210)
         ],
-        "Random": [
+        "Stride": [
             (10, 1), (100, 5), (1000, 51), (10000, 1038),
             (100000, 15165), (1000000, 166890), (2000000, 1076490)
         ],
@@ -50,7 +54,7 @@ raw_data = {
             (10, 0), (100, 1), (1000, 12), (10000, 127),
             (100000, 1302), (1000000, 13352), (2000000, 27942)
         ],
-        "Random": [
+        "Stride": [
             (10, 2), (100, 6), (1000, 53), (10000, 999),
             (100000, 11159), (1000000, 148445), (2000000, 329537)
         ],
@@ -60,26 +64,71 @@ raw_data = {
             (10, 0), (100, 2), (1000, 27), (10000, 257),
             (100000, 2656), (1000000, 29799), (2000000, 165417)
         ],
-        "Random": [
+        "Stride": [
             (10, 1), (100, 5), (1000, 53), (10000, 1047),
             (100000, 15545), (1000000, 187580), (2000000, 2253729)
         ],
     }
 }
 
+# The hand-copied timings were taken with the fixed LOOP_COUNT_200K outer loop
+LEGACY_LOOP_COUNT = 200_000
+
+# JumpIterate walks the array in cache-line strides the prefetcher follows, only
+# RandomIterate (shuffled index) and PointerChase (dependent loads) miss for real
+PATTERNS = {
+    "Sequential": "SequentialIterate",
+    "Stride": "JumpIterate",
+    "Random": "RandomIterate",
+    "Chase": "PointerChase",
+}
+
+PATTERN_LABELS = {
+    "Sequential": "Sequential Access",
+    "Stride": "Cache-line Stride Access",
+    "Random": "Random Access",
+    "Chase": "Pointer Chasing",
+}
+
+if len(sys.argv) > 1:
+    results = load_results(*sys.argv[1:])
+else:
+    results = from_nested({dtype: {PATTERNS[mode]: points for mode, points in modes.items()}
+                           for dtype, modes in raw_data.items()},
+                          'scalar_singlecore_caching', 'CArray', loops=LEGACY_LOOP_COUNT)
+
+# the hand-copied timings only have the stride walk to set against sequential access
+RANDOM = "Random" if (results['kernel'] == PATTERNS["Random"]).any() else "Stride"
+
+
+def pattern_series(dtype, mode):
+    """Sizes and median ns per element of one access pattern.
+
+    Sizes whose run finished under the clock resolution carry no information and are
+    dropped; run with BENCH_CALIBRATE=1 to get them measured instead.
+    """
+    sizes, ns = series(results, value='ns_per_element', suite='scalar_singlecore_caching',
+                       dtype=dtype, kernel=PATTERNS[mode])
+    measured = ns > 0
+    return sizes[measured], ns[measured]
+
+
+def dtypes_in_results():
+    """Data types present in the results, in first-seen order"""
+    _, first = np.unique(results['dtype'], return_index=True)
+    return [str(dtype) for dtype in results['dtype'][np.sort(first)]]
+
 
 def smart_format_time(x, pos):
-    """Format time values with appropriate units and precision"""
+    """Format per-element time values with appropriate units and precision"""
     if x == 0:
         return '0'
     elif x < 1:
-        return f'{x * 1000:.0f}μs'
+        return f'{x * 1000:.0f}ps'
     elif x < 1000:
-        return f'{x:.0f}ms'
-    elif x < 60000:
-        return f'{x / 1000:.1f}s'
+        return f'{x:.3g}ns'
     else:
-        return f'{x / 60000:.1f}min'
+        return f'{x / 1000:.3g}μs'
 
 
 def smart_format_size(x, pos):
@@ -92,32 +141,19 @@ def smart_format_size(x, pos):
         return f'{x / 1000000:.1f}M'
 
 
-def calculate_complexity_line(sizes, base_time, complexity='linear'):
-    """Calculate theoretical complexity lines for comparison"""
-    if complexity == 'linear':
-        return [base_time * (size / sizes[0]) for size in sizes]
-    elif complexity == 'quadratic':
-        return [base_time * (size / sizes[0]) ** 2 for size in sizes]
-    elif complexity == 'nlogn':
-        return [base_time * (size / sizes[0]) * np.log2(size / sizes[0]) for size in sizes]
-
-
-def add_performance_annotations(ax, sizes, seq_times, rand_times):
+def add_performance_annotations(ax, seq_sizes, seq_times, rand_sizes, rand_times):
     """Add performance ratio annotations and highlight significant differences"""
 
-    # Calculate performance ratios
-    ratios = []
-    for i, (seq, rand) in enumerate(zip(seq_times, rand_times)):
-        if seq > 0:
-            ratio = rand / seq
-            ratios.append((sizes[i], ratio))
+    # Calculate performance ratios at the sizes both patterns measured
+    sizes, seq_idx, rand_idx = np.intersect1d(seq_sizes, rand_sizes, return_indices=True)
+    ratios = rand_times[rand_idx] / seq_times[seq_idx]
 
     # Add ratio annotations for largest sizes
     if len(ratios) >= 2:
-        size, ratio = ratios[-1]  # Last (largest) size
+        size, ratio = sizes[-1], ratios[-1]  # Last (largest) size
         if ratio > 2:  # Only annotate significant differences
             ax.annotate(f'{ratio:.1f}× slower',
-                        xy=(size, rand_times[-1]),
+                        xy=(size, rand_times[rand_idx[-1]]),
                         xytext=(20, 20), textcoords='offset points',
                         bbox=dict(boxstyle='round,pad=0.3',
                                   facecolor='orange', alpha=0.7),
@@ -125,45 +161,42 @@ def add_performance_annotations(ax, sizes, seq_times, rand_times):
                         fontsize=9, fontweight='bold')
 
 
-def plot_individual_benchmarks(data):
+def plot_individual_benchmarks():
     """Plot individual benchmark comparisons for each data type with CS standards"""
 
     fig, axes = plt.subplots(2, 2, figsize=(15, 12))
-    fig.suptitle('Memory Access Pattern Performance Analysis\nSequential vs Random Access',
+    fig.suptitle(f'Memory Access Pattern Performance Analysis\nSequential vs {PATTERN_LABELS[RANDOM]}',
                  fontsize=16, fontweight='bold', y=0.98)
 
     axes = axes.flatten()
     colors = ['#1f77b4', '#ff7f0e']  # Blue for sequential, orange for random
 
-    for idx, (dtype, modes) in enumerate(data.items()):
+    for idx, dtype in enumerate(dtypes_in_results()[:len(axes)]):
         ax = axes[idx]
 
         # Extract data
-        seq_sizes = [x[0] for x in modes['Sequential']]
-        seq_times = [max(x[1], 0.1) for x in modes['Sequential']]  # Avoid log(0)
-        rand_sizes = [x[0] for x in modes['Random']]
-        rand_times = [max(x[1], 0.1) for x in modes['Random']]
+        seq_sizes, seq_times = pattern_series(dtype, 'Sequential')
+        rand_sizes, rand_times = pattern_series(dtype, RANDOM)
 
         # Plot lines with better styling
         ax.plot(seq_sizes, seq_times, 'o-', color=colors[0],
                 label='Sequential Access', linewidth=2.5, markersize=7,
                 markerfacecolor='white', markeredgewidth=2)
         ax.plot(rand_sizes, rand_times, 's-', color=colors[1],
-                label='Random Access', linewidth=2.5, markersize=7,
+                label=PATTERN_LABELS[RANDOM], linewidth=2.5, markersize=7,
                 markerfacecolor='white', markeredgewidth=2)
 
-        # Add theoretical complexity reference (linear for sequential)
-        if seq_times[1] > 0:
-            theoretical = calculate_complexity_line(seq_sizes, seq_times[1])
-            ax.plot(seq_sizes, theoretical, '--', color='gray', alpha=0.6,
-                    label='O(n) Reference', linewidth=1.5)
+        # Add theoretical complexity reference: O(n) total time is a flat per-element cost
+        if len(seq_times) > 0:
+            ax.axhline(y=seq_times[0], linestyle='--', color='gray', alpha=0.6,
+                       label='O(n) Reference', linewidth=1.5)
 
         # Formatting
         ax.set_title(
             f'{dtype.upper()} Data Type\n({8 if dtype == "double" else 4 if dtype == "float" else 8 if dtype == "long" else 4} bytes per element)',
             fontweight='bold', pad=15)
         ax.set_xlabel('Array Size (elements)')
-        ax.set_ylabel('Execution Time (ms)')
+        ax.set_ylabel('Time per Element (ns)')
         ax.set_xscale('log')
         ax.set_yscale('log')
 
@@ -172,7 +205,7 @@ def plot_individual_benchmarks(data):
         ax.yaxis.set_major_formatter(FuncFormatter(smart_format_time))
 
         # Add performance annotations
-        add_performance_annotations(ax, seq_sizes, seq_times, rand_times)
+        add_performance_annotations(ax, seq_sizes, seq_times, rand_sizes, rand_times)
 
         # Enhanced grid
         ax.grid(True, which="major", linestyle='-', alpha=0.4)
@@ -188,7 +221,7 @@ def plot_individual_benchmarks(data):
     plt.show()
 
 
-def plot_combined_analysis(data):
+def plot_combined_analysis():
     """Create a comprehensive analysis with multiple subplots"""
 
     fig = plt.figure(figsize=(16, 10))
@@ -202,52 +235,50 @@ def plot_combined_analysis(data):
     fig.suptitle('Comprehensive Memory Access Performance Analysis',
                  fontsize=16, fontweight='bold')
 
-    colors = plt.cm.Set1(np.linspace(0, 1, len(data)))
+    dtypes = dtypes_in_results()
+    colors = plt.cm.Set1(np.linspace(0, 1, len(dtypes)))
 
     # Sequential access patterns
-    for i, (dtype, modes) in enumerate(data.items()):
-        sizes = [x[0] for x in modes['Sequential']]
-        times = [max(x[1], 0.1) for x in modes['Sequential']]
+    for i, dtype in enumerate(dtypes):
+        sizes, times = pattern_series(dtype, 'Sequential')
 
         ax1.plot(sizes, times, 'o-', color=colors[i], label=f'{dtype}',
                  linewidth=2, markersize=6)
 
     ax1.set_title('Sequential Access Performance', fontweight='bold')
     ax1.set_xlabel('Array Size')
-    ax1.set_ylabel('Time (ms)')
+    ax1.set_ylabel('Time per Element (ns)')
     ax1.set_xscale('log')
     ax1.set_yscale('log')
     ax1.legend()
     ax1.grid(True, alpha=0.3)
 
     # Random access patterns
-    for i, (dtype, modes) in enumerate(data.items()):
-        sizes = [x[0] for x in modes['Random']]
-        times = [max(x[1], 0.1) for x in modes['Random']]
+    for i, dtype in enumerate(dtypes):
+        sizes, times = pattern_series(dtype, RANDOM)
 
         ax2.plot(sizes, times, 's-', color=colors[i], label=f'{dtype}',
                  linewidth=2, markersize=6)
 
-    ax2.set_title('Random Access Performance', fontweight='bold')
+    ax2.set_title(f'{PATTERN_LABELS[RANDOM]} Performance', fontweight='bold')
     ax2.set_xlabel('Array Size')
-    ax2.set_ylabel('Time (ms)')
+    ax2.set_ylabel('Time per Element (ns)')
     ax2.set_xscale('log')
     ax2.set_yscale('log')
     ax2.legend()
     ax2.grid(True, alpha=0.3)
 
     # Performance ratio analysis
-    sizes_for_ratio = [x[0] for x in data['int']['Sequential']]
-
-    for i, (dtype, modes) in enumerate(data.items()):
-        seq_times = [max(x[1], 0.1) for x in modes['Sequential']]
-        rand_times = [max(x[1], 0.1) for x in modes['Random']]
-        ratios = [r / s if s > 0 else 1 for s, r in zip(seq_times, rand_times)]
+    for i, dtype in enumerate(dtypes):
+        seq_sizes, seq_times = pattern_series(dtype, 'Sequential')
+        rand_sizes, rand_times = pattern_series(dtype, RANDOM)
+        sizes_for_ratio, seq_idx, rand_idx = np.intersect1d(seq_sizes, rand_sizes, return_indices=True)
+        ratios = rand_times[rand_idx] / seq_times[seq_idx]
 
         ax3.plot(sizes_for_ratio, ratios, 'o-', color=colors[i],
                  label=f'{dtype}', linewidth=2, markersize=6)
 
-    ax3.set_title('Performance Ratio\n(Random/Sequential)', fontweight='bold')
+    ax3.set_title(f'Performance Ratio\n({RANDOM}/Sequential)', fontweight='bold')
     ax3.set_xlabel('Array Size')
     ax3.set_ylabel('Performance Ratio')
     ax3.set_xscale('log')
@@ -266,8 +297,8 @@ if __name__ == "__main__":
     print("=" * 60)
 
     # Generate all visualizations
-    plot_individual_benchmarks(raw_data)
-    plot_combined_analysis(raw_data)
+    plot_individual_benchmarks()
+    plot_combined_analysis()
 
     print("\nVisualization complete!")
     print("Generated files:")
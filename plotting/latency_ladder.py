@@ -0,0 +1,129 @@
+"""Load latency against working set size from the CLatencyLadder pointer chases.
+
+Prints ns per load against the ring size for every chaser count and plots them on
+a log-log scale. The latency plateaus of the single-chaser curve are detected
+automatically and annotated with their latency and the largest ring that still
+fits them, the effective capacity of that cache level. At the largest ring the
+single-chaser latency over the ns per load of N chasers is the number of misses
+the core overlapped, printed as the memory-level parallelism.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from results import load_records
+
+# neighbouring points within this ratio of the running plateau median belong to it
+PLATEAU_TOLERANCE = 1.15
+MIN_PLATEAU_POINTS = 3
+# distinct levels of the hierarchy are at least this far apart
+LEVEL_RATIO = 1.5
+LEVEL_NAMES = ['L1', 'L2', 'L3', 'L4']
+
+
+def format_bytes(size):
+    for unit, scale in (('GiB', 1 << 30), ('MiB', 1 << 20), ('KiB', 1 << 10)):
+        if size >= scale:
+            return f'{size / scale:g} {unit}'
+    return f'{size} B'
+
+
+def ladder_curves(records):
+    """{chasers: (ring sizes in bytes, ns per load)} sorted by size"""
+    points = {}
+    for record in records:
+        if record.get('fixture') != 'CLatencyLadder':
+            continue
+        points.setdefault(record['chasers'], []).append((record['size'], record['ns_per_load']))
+    return {chasers: tuple(np.array(values) for values in zip(*sorted(curve)))
+            for chasers, curve in sorted(points.items())}
+
+
+def ratio(a, b):
+    return max(a, b) / min(a, b)
+
+
+def find_plateaus(sizes, latencies):
+    """[(first size, last size, median ns)] of the runs of at least MIN_PLATEAU_POINTS
+    neighbouring points that stay within PLATEAU_TOLERANCE of their running median.
+    Runs closer than LEVEL_RATIO to the previous one are the same level, only drifting
+    with the TLB reach or the replacement policy, and are merged into it."""
+    runs = []
+    start = 0
+    for i in range(1, len(latencies) + 1):
+        level = np.median(latencies[start:i])
+        if i < len(latencies) and ratio(latencies[i], level) <= PLATEAU_TOLERANCE:
+            continue
+        if i - start >= MIN_PLATEAU_POINTS:
+            if runs and ratio(level, np.median(latencies[slice(*runs[-1])])) <= LEVEL_RATIO:
+                runs[-1] = (runs[-1][0], i)
+            else:
+                runs.append((start, i))
+        start = i
+    return [(sizes[first], sizes[end - 1], float(np.median(latencies[first:end]))) for first, end in runs]
+
+
+def level_names(plateaus):
+    """Cache level names in order, the last plateau is main memory"""
+    if len(plateaus) < 2:
+        return ['?'] * len(plateaus)
+    return [LEVEL_NAMES[i] if i < len(LEVEL_NAMES) else f'level {i + 1}' for i in range(len(plateaus) - 1)] + ['DRAM']
+
+
+def print_ladder(curves, plateaus):
+    for chasers, (sizes, latencies) in curves.items():
+        print(f"\n{chasers} chaser(s)")
+        for size, ns in zip(sizes, latencies):
+            print(f"  {format_bytes(size):>10}  {ns:8.2f} ns/load")
+
+    print("\nLatency plateaus (1 chaser)")
+    for name, (first, last, ns) in zip(level_names(plateaus), plateaus):
+        print(f"  {name:>5}  {ns:8.2f} ns  {format_bytes(first)} - {format_bytes(last)}")
+
+    if 1 in curves:
+        print("\nMemory-level parallelism at the largest ring measured with every chaser count")
+        single = dict(zip(*curves[1]))
+        for chasers, (sizes, latencies) in curves.items():
+            common = [(size, ns) for size, ns in zip(sizes, latencies) if size in single]
+            if common:
+                size, ns = common[-1]
+                print(f"  {chasers:>3} chasers  {format_bytes(size):>10}  {ns:8.2f} ns/load  x{single[size] / ns:5.2f}")
+
+
+def plot_ladder(curves, plateaus):
+    if not curves:
+        return
+
+    fig, ax = plt.subplots(figsize=(14, 8))
+    fig.suptitle('Pointer-chasing latency ladder', fontsize=16, fontweight='bold')
+
+    for chasers, (sizes, latencies) in curves.items():
+        ax.plot(sizes, latencies, marker='o', markersize=3, label=f'{chasers} chaser(s)')
+
+    for name, (first, last, ns) in zip(level_names(plateaus), plateaus):
+        ax.hlines(ns, first, last, colors='black', linewidth=3, alpha=0.4)
+        ax.axvline(last, color='gray', linestyle=':', alpha=0.6)
+        ax.annotate(f'{name} {ns:.1f} ns\nup to {format_bytes(last)}', xy=(np.sqrt(first * last), ns),
+                    xytext=(0, 12), textcoords='offset points', ha='center', fontsize=9, fontweight='bold')
+
+    ax.set_xscale('log', base=2)
+    ax.set_yscale('log')
+    ax.set_xlabel('Ring size (bytes)')
+    ax.set_ylabel('ns per load')
+    ax.grid(True, which='both', alpha=0.3)
+    ax.legend()
+
+    plt.tight_layout()
+    plt.savefig('latency_ladder.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    curves = ladder_curves(load_records(*sys.argv[1:]))
+    plateaus = find_plateaus(*curves[1]) if 1 in curves else []
+    print_ladder(curves, plateaus)
+    plot_ladder(curves, plateaus)
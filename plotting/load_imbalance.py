@@ -0,0 +1,158 @@
+"""Per-thread timelines and load imbalance of the multithreaded Mandelbrot suites.
+
+The threaded fixtures record when each pool task started and finished in the last
+measured run (worker_start_ns / worker_end_ns) and, for Mandelbrot, the iterations
+each row block needed (worker_work). The speedup over the single-core run is split into
+    achieved     T1 / Tmax
+    stragglers   T1 / Tmean - T1 / Tmax   lost waiting for the slowest thread
+    contention   threads - T1 / Tmean     lost by each thread running slower than alone
+where Tmax and Tmean are the longest and mean task durations.
+"""
+import sys
+from collections import defaultdict
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from results import load_records
+
+# threaded suite -> single-core suite and fixture computing the same pictures
+BASELINES = {
+    'scalar_multithreaded_compute': ('scalar_singlecore_compute', 'CArrayMandelbrot'),
+    'simd_multithreaded_compute': ('simd_singlecore_compute', 'AlignedArrayMandelbrot'),
+}
+
+
+def analyse(records):
+    """One dict per threaded record with its spans, imbalance and speedup breakdown"""
+    baseline = {(r['suite'], r['fixture'], r.get('preset'), r.get('size')): r.get('median_ns', r['ns'])
+                for r in records if r.get('suite') not in BASELINES}
+
+    rows = []
+    for record in records:
+        if record.get('suite') not in BASELINES or 'worker_start_ns' not in record:
+            continue
+        starts = np.array(record['worker_start_ns'])
+        ends = np.array(record['worker_end_ns'])
+        durations = ends - starts
+        threads = len(durations)
+
+        single = baseline.get(BASELINES[record['suite']] + (record.get('preset'), record.get('size')), np.nan)
+        achieved = single / durations.max()
+        balanced = single / durations.mean()
+
+        rows.append({
+            'suite': record['suite'],
+            'preset': record.get('preset', ''),
+            'schedule': record.get('schedule', 'static'),
+            'size': record.get('size', 0),
+            'picture': f"{record.get('width', '?')}x{record.get('height', '?')}",
+            'threads': threads,
+            'starts': starts,
+            'ends': ends,
+            'work': np.array(record.get('worker_work', [np.nan] * threads)),
+            'imbalance': durations.max() / durations.mean(),
+            'achieved': achieved,
+            'stragglers': balanced - achieved,
+            'contention': threads - balanced,
+        })
+    return rows
+
+
+def largest_pictures(rows):
+    """Only the rows of the largest picture each suite rendered"""
+    largest = defaultdict(int)
+    for row in rows:
+        largest[row['suite']] = max(largest[row['suite']], row['size'])
+    return [r for r in rows if r['size'] == largest[r['suite']]]
+
+
+def plot_gantt(rows, suite, schedule):
+    """Timeline of every task at the highest thread count, one panel per preset"""
+    rows = [r for r in largest_pictures(rows) if r['suite'] == suite and r['schedule'] == schedule]
+    if not rows:
+        return
+    most_threads = max(r['threads'] for r in rows)
+    rows = [r for r in rows if r['threads'] == most_threads]
+
+    fig, axes = plt.subplots(len(rows), 1, figsize=(12, 2 + 1.2 * len(rows)), squeeze=False)
+    fig.suptitle(f"{suite}: per-thread timeline, {rows[0]['picture']}, {most_threads} threads, {schedule} rows",
+                 fontsize=14, fontweight='bold')
+
+    for ax, row in zip(axes[:, 0], rows):
+        share = row['work'] / np.nansum(row['work']) if np.isfinite(row['work']).all() else np.zeros(row['threads'])
+        colors = plt.cm.viridis(share / share.max() if share.max() > 0 else share)
+        ax.barh(np.arange(row['threads']), (row['ends'] - row['starts']) / 1e6, left=row['starts'] / 1e6,
+                color=colors, edgecolor='black', linewidth=0.5)
+        ax.set_title(f"{row['preset']} (imbalance {row['imbalance']:.2f})", fontsize=10)
+        ax.set_ylabel('Thread')
+        ax.invert_yaxis()
+        ax.grid(True, axis='x', alpha=0.3)
+    axes[-1, 0].set_xlabel('Time since first task started (ms), colour = share of iterations')
+
+    plt.tight_layout()
+    plt.savefig(f'gantt_{suite}_{schedule}.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+def plot_imbalance(rows, schedule):
+    """Imbalance factor against thread count and where the missing speedup went"""
+    rows = [r for r in largest_pictures(rows) if r['schedule'] == schedule]
+    fig, (ax_imb, ax_loss) = plt.subplots(1, 2, figsize=(16, 6))
+    fig.suptitle(f'Mandelbrot load imbalance, {schedule} rows', fontsize=16, fontweight='bold')
+
+    curves = defaultdict(list)
+    for row in rows:
+        curves[(row['suite'], row['preset'])].append((row['threads'], row['imbalance']))
+    for (suite, preset), points in sorted(curves.items()):
+        threads, imbalance = zip(*sorted(points))
+        ax_imb.plot(threads, imbalance, marker='o', linestyle='-' if suite.startswith('scalar') else '--',
+                    label=f'{preset} ({suite.split("_")[0]})')
+    ax_imb.axhline(1, color='gray', linestyle=':')
+    ax_imb.set_xlabel('Threads')
+    ax_imb.set_ylabel('Imbalance (max / mean task time)')
+    ax_imb.grid(True, alpha=0.3)
+    ax_imb.legend(fontsize=8)
+
+    # breakdown at the highest thread count of every suite/preset
+    top = {}
+    for row in rows:
+        key = (row['suite'], row['preset'])
+        if key not in top or row['threads'] > top[key]['threads']:
+            top[key] = row
+    labels = [f"{preset}\n{suite.split('_')[0]} {top[(suite, preset)]['threads']}t" for suite, preset in sorted(top)]
+    parts = [np.array([top[key][part] for key in sorted(top)]) for part in ('achieved', 'stragglers', 'contention')]
+    x = np.arange(len(labels))
+    bottom = np.zeros(len(labels))
+    for values, name, color in zip(parts, ('achieved', 'lost to stragglers', 'lost to contention'),
+                                   ('#2E8B57', '#FF6B35', '#8E44AD')):
+        ax_loss.bar(x, np.nan_to_num(values), bottom=bottom, label=name, color=color)
+        bottom += np.nan_to_num(values)
+    ax_loss.set_xticks(x)
+    ax_loss.set_xticklabels(labels, fontsize=8)
+    ax_loss.set_ylabel('Speedup over one core')
+    ax_loss.legend()
+    ax_loss.grid(True, axis='y', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(f'load_imbalance_{schedule}.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    rows = analyse(load_records(*sys.argv[1:]))
+    if not rows:
+        sys.exit('no multithreaded Mandelbrot records with worker timings found')
+
+    print(f"{'suite':<30} {'picture':<10} {'preset':<12} {'schedule':<8} {'threads':>7} {'imbalance':>9} {'speedup':>8} {'stragglers':>10} {'contention':>10}")
+    for row in sorted(rows, key=lambda r: (r['suite'], r['size'], r['preset'], r['schedule'], r['threads'])):
+        print(f"{row['suite']:<30} {row['picture']:<10} {row['preset']:<12} {row['schedule']:<8} {row['threads']:>7} {row['imbalance']:>9.2f} "
+              f"{row['achieved']:>8.2f} {row['stragglers']:>10.2f} {row['contention']:>10.2f}")
+
+    for schedule in sorted({row['schedule'] for row in rows}):
+        for suite in BASELINES:
+            plot_gantt(rows, suite, schedule)
+        plot_imbalance(rows, schedule)
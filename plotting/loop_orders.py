@@ -0,0 +1,77 @@
+"""Matrix multiplication time of all six loop orders on both matrix layouts.
+
+Prints the ranking of the orders at every size with the strides of A, B and C in
+their innermost loop, and plots time against size for each layout and dtype.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from results import load_records, load_results, select, series
+
+LAYOUTS = {'CMatrixLoopOrder': 'pointer of rows', 'CMatrixArrayLoopOrder': 'contiguous'}
+DTYPES = ['int', 'long', 'double']
+ORDERS = ['ijk', 'ikj', 'jik', 'jki', 'kij', 'kji']
+
+
+def stride_tags(records):
+    """{order: 'A unit, B row, C invariant'} from the strides the fixtures record"""
+    tags = {}
+    for record in records:
+        if 'stride_A' in record:
+            tags[record['order']] = ', '.join(f"{m} {record['stride_' + m]}" for m in 'ABC')
+    return tags
+
+
+def print_ranking(data, tags):
+    for fixture, layout in LAYOUTS.items():
+        for dtype in DTYPES:
+            subset = data[select(data, fixture=fixture + dtype.capitalize())]
+            for size in np.unique(subset['size']):
+                ranking = []
+                for order in ORDERS:
+                    _, ns = series(subset, value='ns', order=order, size=size)
+                    if len(ns):
+                        ranking.append((ns[0], order))
+                print(f"\n{layout}, {dtype}, {size}x{size}")
+                for ns, order in sorted(ranking):
+                    print(f"  {order}  {ns / 1e6:10.1f} ms  ({tags.get(order, '')})")
+
+
+def plot_orders(data, tags):
+    fig, axes = plt.subplots(len(LAYOUTS), len(DTYPES), figsize=(18, 10), squeeze=False)
+    fig.suptitle('Matrix multiplication by loop order', fontsize=16, fontweight='bold')
+
+    for row, (fixture, layout) in enumerate(LAYOUTS.items()):
+        for col, dtype in enumerate(DTYPES):
+            ax = axes[row][col]
+            subset = data[select(data, fixture=fixture + dtype.capitalize())]
+            if len(subset) == 0:
+                ax.set_visible(False)
+                continue
+            for order in ORDERS:
+                sizes, ns = series(subset, value='ns', order=order)
+                if len(sizes):
+                    ax.plot(sizes, ns / 1e6, marker='o', label=f"{order} ({tags.get(order, '')})")
+            ax.set_title(f'{layout}, {dtype}', fontweight='bold')
+            ax.set_xscale('log', base=2)
+            ax.set_yscale('log')
+            ax.set_xlabel('Matrix size')
+            ax.set_ylabel('ms')
+            ax.grid(True, alpha=0.3)
+            ax.legend(fontsize=7)
+
+    plt.tight_layout()
+    plt.savefig('loop_orders.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    strides = stride_tags(load_records(*sys.argv[1:]))
+    results = load_results(*sys.argv[1:])
+    print_ranking(results, strides)
+    plot_orders(results, strides)
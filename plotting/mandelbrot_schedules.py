@@ -0,0 +1,78 @@
+"""Pixels per second of the threaded Mandelbrot renderers by row schedule.
+
+Prints the fastest schedule for every suite, preset and thread count and plots the
+throughput of each schedule at the largest picture.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from results import group_reduce, load_results, select
+
+SUITES = ['scalar_multithreaded_compute', 'simd_multithreaded_compute']
+SCHEDULES = ['static', 'cyclic', 'dynamic', 'guided', 'stealing']
+
+
+def throughput(data, suite):
+    """(preset, threads, schedule) groups and their median Mpixels/s at the largest picture"""
+    subset = data[select(data, suite=suite)]
+    if len(subset) == 0:
+        return None, None
+    subset = subset[subset['size'] == subset['size'].max()]
+    groups, ns = group_reduce(subset, ['preset', 'threads', 'schedule'], 'ns')
+    return groups, subset['size'][0] / ns * 1e3
+
+
+def print_best(data):
+    for suite in SUITES:
+        groups, mpixels = throughput(data, suite)
+        if groups is None:
+            continue
+        print(f"\n{suite}: fastest schedule (Mpixels/s, speedup over static)")
+        for preset in np.unique(groups['preset']):
+            for threads in np.unique(groups['threads']):
+                mask = (groups['preset'] == preset) & (groups['threads'] == threads)
+                best = np.argmax(np.where(mask, mpixels, -np.inf))
+                static = mpixels[mask & (groups['schedule'] == 'static')]
+                gain = mpixels[best] / static[0] if len(static) else np.nan
+                print(f"  {preset:<12} {threads:>2}t  {groups['schedule'][best]:<8} {mpixels[best]:8.2f}  x{gain:.2f}")
+
+
+def plot_schedules(data):
+    fig, axes = plt.subplots(1, len(SUITES), figsize=(16, 6), squeeze=False)
+    fig.suptitle('Mandelbrot throughput by row schedule', fontsize=16, fontweight='bold')
+
+    for ax, suite in zip(axes[0], SUITES):
+        groups, mpixels = throughput(data, suite)
+        if groups is None:
+            ax.set_visible(False)
+            continue
+        presets = np.unique(groups['preset'])
+        most_threads = groups['threads'].max()
+        width = 0.8 / len(SCHEDULES)
+        for i, schedule in enumerate(SCHEDULES):
+            values = [mpixels[(groups['preset'] == p) & (groups['threads'] == most_threads) &
+                              (groups['schedule'] == schedule)] for p in presets]
+            ax.bar(np.arange(len(presets)) + i * width, [v[0] if len(v) else 0 for v in values], width,
+                   label=schedule)
+        ax.set_xticks(np.arange(len(presets)) + width * (len(SCHEDULES) - 1) / 2)
+        ax.set_xticklabels(presets)
+        ax.set_title(f'{suite}, {most_threads} threads', fontweight='bold')
+        ax.set_ylabel('Mpixels/s')
+        ax.set_yscale('log')
+        ax.grid(True, axis='y', alpha=0.3)
+        ax.legend()
+
+    plt.tight_layout()
+    plt.savefig('mandelbrot_schedules.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    results = load_results(*sys.argv[1:])
+    print_best(results)
+    plot_schedules(results)
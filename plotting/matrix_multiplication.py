@@ -1,7 +1,11 @@
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.ticker import FixedLocator, FuncFormatter, NullLocator
 
+from results import NS_PER_MS, from_nested, load_results, series
+
 # Data extracted from the GTest logs (BlockMul removed)
 raw_data = {
     "int": {
@@ -30,6 +34,19 @@ raw_data = {
     }
 }
 
+KERNELS = ["NaiveMul", "OptimizedMul"]
+
+
+def matrix_times(results):
+    """{dtype: {kernel: [(size, median ms)]}} of the singlecore CMatrix fixtures"""
+    data = {}
+    for dtype in ["int", "long", "double"]:
+        for kernel in KERNELS:
+            sizes, times = series(results, fixture='CMatrix' + dtype.capitalize(), kernel=kernel)
+            if len(sizes):
+                data.setdefault(dtype, {})[kernel] = list(zip(sizes.tolist(), (times / NS_PER_MS).tolist()))
+    return data
+
 def smart_format(x, pos):
     if x == 0:
         return '0'
@@ -124,7 +141,7 @@ def plot_benchmarks(data):
             line = plt.plot(sizes, times, marker='o', label=algorithm, linewidth=2, markersize=6)
             for size, time in values:
                 if time > 0:
-                    annotations.append({'x': size, 'y': time, 'text': f'{time}',
+                    annotations.append({'x': size, 'y': time, 'text': f'{time:.0f}',
                                         'color': line[0].get_color(), 'algorithm': algorithm})
         add_smart_annotations(ax, annotations)
         plt.title(f"Matrix Multiplication - {dtype.upper()}", fontsize=14, fontweight='bold')
@@ -155,7 +172,7 @@ def plot_combined(data, algorithm):
             line = plt.plot(sizes, times, marker='o', label=dtype, linewidth=2, markersize=6, color=colors[i])
             for size, time in algorithms[algorithm]:
                 if time > 0:
-                    annotations.append({'x': size, 'y': time, 'text': f'{time}', 'color': colors[i], 'dtype': dtype})
+                    annotations.append({'x': size, 'y': time, 'text': f'{time:.0f}', 'color': colors[i], 'dtype': dtype})
     add_smart_annotations(ax, annotations)
     plt.title(f"{algorithm} - All Data Types", fontsize=14, fontweight='bold')
     plt.xlabel("Matrix Size (NxN)", fontsize=12)
@@ -178,7 +195,7 @@ def plot_speedup_comparison(data):
     colors = plt.cm.tab10(np.linspace(0, 1, len(data)))
     annotations = []
     for i, (dtype, algorithms) in enumerate(data.items()):
-        naive_times = dict(algorithms["NaiveMul"])
+        naive_times = dict(algorithms.get("NaiveMul", []))
         alg_name = "OptimizedMul"
         if alg_name in algorithms:
             sizes = []
@@ -209,7 +226,12 @@ def plot_speedup_comparison(data):
     plt.show()
 
 if __name__ == "__main__":
-    plot_combined(raw_data, "NaiveMul")
-    plot_combined(raw_data, "OptimizedMul")
-    plot_benchmarks(raw_data)
-    plot_speedup_comparison(raw_data)
+    if len(sys.argv) > 1:
+        data = matrix_times(load_results(*sys.argv[1:]))
+    else:
+        data = matrix_times(from_nested(raw_data, 'scalar_singlecore_caching', 'CMatrix'))
+
+    plot_combined(data, "NaiveMul")
+    plot_combined(data, "OptimizedMul")
+    plot_benchmarks(data)
+    plot_speedup_comparison(data)
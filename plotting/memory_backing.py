@@ -0,0 +1,79 @@
+"""Effect of the BENCH_MEMORY backend on the large arrays and matrices.
+
+Run the suites once per backend into the same results file, e.g.
+    for m in malloc aligned thp hugetlb; do BENCH_MEMORY=$m ./benchmarks; done
+and pass the file(s) on the command line. Prints the speedup of every backend over
+malloc next to the share of the memory smaps reported as huge-page backed, and plots
+the speedups against the size, one panel per backend.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+
+from results import load_records
+
+BACKENDS = ['malloc', 'aligned', 'thp', 'hugetlb']
+
+
+def backend_points(records):
+    """{(fixture, kernel, size): {backend: (median ns, huge fraction)}} for points with large allocations"""
+    points = {}
+    for record in records:
+        if 'huge_fraction' not in record:
+            continue
+        key = (record['fixture'], record.get('kernel', ''), record['size'])
+        points.setdefault(key, {})[record.get('memory', 'malloc')] = (record.get('median_ns', record['ns']), record['huge_fraction'])
+    return dict(sorted(points.items()))
+
+
+def speedups(points):
+    """{backend: {(fixture, kernel): [(size, malloc ns / backend ns, huge fraction)]}}"""
+    curves = {}
+    for (fixture, kernel, size), by_backend in points.items():
+        if 'malloc' not in by_backend:
+            continue
+        baseline = by_backend['malloc'][0]
+        for backend, (ns, fraction) in by_backend.items():
+            curves.setdefault(backend, {}).setdefault((fixture, kernel), []).append((size, baseline / ns, fraction))
+    return curves
+
+
+def print_speedups(curves):
+    for backend in BACKENDS:
+        for (fixture, kernel), curve in sorted(curves.get(backend, {}).items()):
+            print(f"\n{backend}: {fixture} {kernel}")
+            for size, speedup, fraction in curve:
+                print(f"  {size:>9}  x{speedup:5.2f} of malloc, {fraction:6.1%} huge pages")
+
+
+def plot_speedups(curves):
+    backends = [backend for backend in BACKENDS if backend in curves and backend != 'malloc']
+    if not backends:
+        return
+
+    fig, axes = plt.subplots(1, len(backends), figsize=(6 * len(backends), 6), squeeze=False)
+    fig.suptitle('Memory backends against malloc', fontsize=16, fontweight='bold')
+
+    for ax, backend in zip(axes[0], backends):
+        for (fixture, kernel), curve in sorted(curves[backend].items()):
+            ax.plot([p[0] for p in curve], [p[1] for p in curve], marker='o', label=f'{fixture} {kernel}')
+        ax.axhline(1, color='black', linewidth=0.8)
+        ax.set_title(backend, fontweight='bold')
+        ax.set_xscale('log', base=2)
+        ax.set_xlabel('Size')
+        ax.set_ylabel('malloc time / backend time')
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=6)
+
+    plt.tight_layout()
+    plt.savefig('memory_backing.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    curves = speedups(backend_points(load_records(*sys.argv[1:])))
+    print_speedups(curves)
+    plot_speedups(curves)
@@ -1,7 +1,11 @@
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 
+from results import NS_PER_MS, from_nested, load_results, select, series
+
 # Set up the plotting style
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
@@ -104,12 +108,35 @@ raw_data = {
 }
 
 
+if len(sys.argv) > 1:
+    results = load_results(*sys.argv[1:])
+else:
+    results = from_nested(raw_data, 'scalar_multithreaded_caching', 'CArrayShared')
+
+# thread counts and sizes come from the data, the fixtures run ARRAY_SIZES x NUM_THREADS
+THREAD_COUNTS = [int(threads) for threads in np.unique(results['threads'][select(results, suite='scalar_multithreaded_caching')])]
+BASELINE_THREADS = THREAD_COUNTS[0]
+ARRAY_SIZES = [int(size) for size in np.unique(results['size'][select(results, suite='scalar_multithreaded_caching')])]
+
+
+def measured(data_type, threads):
+    """Whether any CArrayShared kernel of the dtype ran with `threads`"""
+    return bool(select(results, fixture='CArrayShared' + data_type, threads=threads).any())
+
+
+def points(data_type, threads, algorithm):
+    """(size, median ms) pairs of one CArrayShared kernel, empty when it was not measured"""
+    sizes, times = series(results, fixture='CArrayShared' + data_type, kernel=algorithm, threads=threads)
+    return list(zip(sizes.tolist(), (times / NS_PER_MS).tolist()))
+
+
 def calculate_speedup(base_times, comparison_times):
-    """Calculate speedup ratio between two timing datasets"""
+    """Calculate speedup ratio between two timing datasets, at the sizes both measured"""
+    base = dict(base_times)
     speedups = []
-    for (size_b, time_b), (size_c, time_c) in zip(base_times, comparison_times):
-        if size_b == size_c and time_c > 0:
-            speedups.append((size_b, time_b / time_c))
+    for size, time_c in comparison_times:
+        if size in base and time_c > 0:
+            speedups.append((size, base[size] / time_c))
     return speedups
 
 
@@ -135,9 +162,9 @@ def plot_scalability_analysis():
         for j, data_type in enumerate(['Int', 'Double']):
             ax = axes[i][j]
 
-            for threads in [2, 4, 8, 14]:
-                if data_type in raw_data and threads in raw_data[data_type]:
-                    data = raw_data[data_type][threads][algorithm]
+            for threads in THREAD_COUNTS:
+                if measured(data_type, threads):
+                    data = points(data_type, threads, algorithm)
                     sizes, times = zip(*data)
                     ax.loglog(sizes, times, marker='o', linewidth=2,
                               label=f'{threads} threads', markersize=6)
@@ -163,13 +190,13 @@ def plot_speedup_analysis():
         for j, algorithm in enumerate(['SequentialIterate', 'JumpIterate']):
             ax = axes[i][j]
 
-            # Use 2-thread performance as baseline
-            if data_type in raw_data and 2 in raw_data[data_type]:
-                baseline_data = raw_data[data_type][2][algorithm]
+            # Use the fewest threads as baseline
+            if measured(data_type, BASELINE_THREADS):
+                baseline_data = points(data_type, BASELINE_THREADS, algorithm)
 
-                for threads in [4, 8, 14]:
-                    if threads in raw_data[data_type]:
-                        comparison_data = raw_data[data_type][threads][algorithm]
+                for threads in THREAD_COUNTS[1:]:
+                    if measured(data_type, threads):
+                        comparison_data = points(data_type, threads, algorithm)
                         speedup_data = calculate_speedup(baseline_data, comparison_data)
 
                         if speedup_data:
@@ -178,9 +205,9 @@ def plot_speedup_analysis():
                                         label=f'{threads} threads', markersize=6)
 
             # Add ideal speedup lines
-            sizes = [10, 100, 1000, 10000, 100000, 1000000, 2000000]
-            for threads in [4, 8, 14]:
-                ideal_speedup = [threads / 2] * len(sizes)  # threads/2 because baseline is 2 threads
+            sizes = ARRAY_SIZES
+            for threads in THREAD_COUNTS[1:]:
+                ideal_speedup = [threads / BASELINE_THREADS] * len(sizes)
                 ax.semilogx(sizes, ideal_speedup, '--', alpha=0.5,
                             label=f'Ideal {threads}t' if j == 0 else "")
 
@@ -203,14 +230,14 @@ def plot_efficiency_analysis():
         ax = axes[i]
 
         algorithm = 'SequentialIterate'  # Focus on sequential for efficiency
-        if data_type in raw_data and 2 in raw_data[data_type]:
-            baseline_data = raw_data[data_type][2][algorithm]
+        if measured(data_type, BASELINE_THREADS):
+            baseline_data = points(data_type, BASELINE_THREADS, algorithm)
 
-            for threads in [4, 8, 14]:
-                if threads in raw_data[data_type]:
-                    comparison_data = raw_data[data_type][threads][algorithm]
+            for threads in THREAD_COUNTS[1:]:
+                if measured(data_type, threads):
+                    comparison_data = points(data_type, threads, algorithm)
                     speedup_data = calculate_speedup(baseline_data, comparison_data)
-                    efficiency_data = calculate_efficiency(speedup_data, threads / 2)
+                    efficiency_data = calculate_efficiency(speedup_data, threads / BASELINE_THREADS)
 
                     if efficiency_data:
                         sizes, efficiencies = zip(*efficiency_data)
@@ -244,15 +271,15 @@ def plot_memory_access_comparison():
             ax = axes[i][j]
 
             threads = 8  # Focus on 8 threads for this comparison
-            if data_type in raw_data and threads in raw_data[data_type]:
+            if measured(data_type, threads):
                 # Forward pattern
-                data1 = raw_data[data_type][threads][pattern1]
+                data1 = points(data_type, threads, pattern1)
                 sizes1, times1 = zip(*data1)
                 ax.loglog(sizes1, times1, marker='o', linewidth=2,
                           label=pattern1, markersize=6)
 
                 # Reverse pattern
-                data2 = raw_data[data_type][threads][pattern2]
+                data2 = points(data_type, threads, pattern2)
                 sizes2, times2 = zip(*data2)
                 ax.loglog(sizes2, times2, marker='s', linewidth=2,
                           label=pattern2, markersize=6)
@@ -279,8 +306,8 @@ def plot_data_type_comparison():
 
         threads = 8
         for data_type in ['Int', 'Long', 'Double']:
-            if data_type in raw_data and threads in raw_data[data_type]:
-                data = raw_data[data_type][threads][algorithm]
+            if measured(data_type, threads):
+                data = points(data_type, threads, algorithm)
                 sizes, times = zip(*data)
                 ax.loglog(sizes, times, marker='o', linewidth=2,
                           label=data_type, markersize=6)
@@ -304,9 +331,9 @@ def plot_throughput_analysis():
         ax = axes[i]
 
         data_type = 'Int'  # Focus on Int for throughput
-        for threads in [2, 4, 8, 14]:
-            if data_type in raw_data and threads in raw_data[data_type]:
-                data = raw_data[data_type][threads][algorithm]
+        for threads in THREAD_COUNTS:
+            if measured(data_type, threads):
+                data = points(data_type, threads, algorithm)
                 throughput_data = calculate_throughput(data)
                 sizes, throughputs = zip(*throughput_data)
                 ax.loglog(sizes, throughputs, marker='o', linewidth=2,
@@ -328,16 +355,16 @@ def plot_performance_heatmap():
     fig.suptitle('Performance Heatmap: Execution Time by Thread Count and Array Size', fontsize=16, fontweight='bold')
 
     algorithm = 'SequentialIterate'
-    array_sizes = [10, 100, 1000, 10000, 100000, 1000000, 2000000]
-    thread_counts = [2, 4, 8, 14]
+    array_sizes = ARRAY_SIZES
+    thread_counts = THREAD_COUNTS
 
     for i, data_type in enumerate(['Int', 'Long', 'Double']):
         # Create matrix for heatmap
         performance_matrix = np.zeros((len(thread_counts), len(array_sizes)))
 
         for j, threads in enumerate(thread_counts):
-            if data_type in raw_data and threads in raw_data[data_type]:
-                data = raw_data[data_type][threads][algorithm]
+            if measured(data_type, threads):
+                data = points(data_type, threads, algorithm)
                 for size, time in data:
                     if size in array_sizes:
                         k = array_sizes.index(size)
@@ -1,9 +1,13 @@
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.colors import LinearSegmentedColormap
 import seaborn as sns
 from mpl_toolkits.mplot3d import Axes3D
 
+from results import NS_PER_MS, from_nested, load_results, series
+
 # Set up the plotting style
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
@@ -149,16 +153,26 @@ def calculate_optimization_factor(naive_data, optimized_data):
             factors.append((size_n, time_n / time_o))
     return factors
 
+SOURCE_FIXTURES = {
+    'matrix': 'CMatrixShared',
+    'array': 'CMatrixArrayShared',
+}
+
+if len(sys.argv) > 1:
+    results = load_results(*sys.argv[1:])
+else:
+    results = np.concatenate([
+        from_nested(matrix_data, 'scalar_multithreaded_caching', SOURCE_FIXTURES['matrix']),
+        from_nested(matrix_as_array_data, 'scalar_multithreaded_caching', SOURCE_FIXTURES['array']),
+    ])
+
 def get_data_from_source(source, data_type, threads, algorithm):
-    """Helper function to get data from either matrix_data or matrix_as_array_data"""
-    datasets = {
-        'matrix': matrix_data,
-        'array': matrix_as_array_data
-    }
-    
-    if source in datasets and data_type in datasets[source] and threads in datasets[source][data_type]:
-        return datasets[source][data_type][threads].get(algorithm, [])
-    return []
+    """Median time in ms per matrix size for one implementation, as (size, time) pairs"""
+    if source not in SOURCE_FIXTURES:
+        return []
+    sizes, times = series(results, fixture=SOURCE_FIXTURES[source] + data_type,
+                          threads=threads, kernel=algorithm)
+    return list(zip(sizes.tolist(), (times / NS_PER_MS).tolist()))
 
 # 1. Implementation Comparison: Matrix vs Array vs Algorithms
 def plot_implementation_comparison():
@@ -349,9 +363,9 @@ def plot_comprehensive_scalability():
     fig, axes = plt.subplots(3, 2, figsize=(16, 18))
     fig.suptitle('Comprehensive Scalability Analysis: All Implementations', fontsize=16, fontweight='bold')
 
-    data_sources = [('matrix', matrix_data), ('array', matrix_as_array_data)]
+    data_sources = ['matrix', 'array']
     
-    for col, (source_name, source_data) in enumerate(data_sources):
+    for col, source_name in enumerate(data_sources):
         # Plot 1: Thread scaling for naive algorithms
         ax = axes[0][col]
         algorithm = 'NaiveMul'
@@ -438,11 +452,11 @@ def plot_implementation_heatmaps():
     matrix_sizes = [512, 1024, 2048, 4096, 8192]
     thread_counts = [2, 4, 8, 12]
     
-    data_sources = [('Matrix', matrix_data), ('Array', matrix_as_array_data)]
+    data_sources = ['Matrix', 'Array']
     algorithms = ['NaiveMul', 'OptimizedMul']
     
     for row, algorithm in enumerate(algorithms):
-        for col, (source_name, source_data) in enumerate(data_sources):
+        for col, source_name in enumerate(data_sources):
             for data_type_idx, data_type in enumerate(['Int', 'Double']):
                 ax_col = col * 2 + data_type_idx
                 if ax_col >= 4:
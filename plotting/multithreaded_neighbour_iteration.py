@@ -1,6 +1,10 @@
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+from results import NS_PER_MS, from_nested, load_results, select, series, value_at
+
 # Cleaned data focusing on key patterns
 raw_data = {
     "Int": {
@@ -39,6 +43,30 @@ raw_data = {
     },
 }
 
+if len(sys.argv) > 1:
+    results = load_results(*sys.argv[1:])
+else:
+    results = from_nested(raw_data, 'scalar_multithreaded_caching', 'CArrayShared')
+
+PATTERNS = ['SequentialIterate', 'JumpIterate', 'NeighbourSequentialIterate']
+
+# thread counts and sizes come from the data, the fixtures run ARRAY_SIZES x NUM_THREADS
+_int_rows = results[select(results, dtype='int', kernel=PATTERNS)]
+THREAD_COUNTS = [int(threads) for threads in np.unique(_int_rows['threads'])]
+LARGEST_SIZE = int(_int_rows['size'].max())
+
+
+def time_ms(pattern, threads, size):
+    """Median Int time in ms of one pattern at a given thread count and array size"""
+    return value_at(results, dtype='int', kernel=pattern, threads=threads, size=size) / NS_PER_MS
+
+
+def common_sizes(threads):
+    """Sizes measured for both SequentialIterate and NeighbourSequentialIterate at `threads`"""
+    seq_sizes, _ = series(results, dtype='int', kernel='SequentialIterate', threads=threads)
+    neighbor_sizes, _ = series(results, dtype='int', kernel='NeighbourSequentialIterate', threads=threads)
+    return np.intersect1d(seq_sizes, neighbor_sizes)
+
 
 def create_focused_analysis():
     """Create focused visualizations highlighting cache behavior impacts"""
@@ -54,8 +82,8 @@ def create_focused_analysis():
         'NeighbourSequentialIterate': '#8E44AD'  # Purple
     }
 
-    thread_counts = [2, 4, 8, 14]
-    patterns = ['SequentialIterate', 'JumpIterate', 'NeighbourSequentialIterate']
+    thread_counts = THREAD_COUNTS
+    patterns = PATTERNS
 
     # 1. Scaling Performance by Array Size
     # 1. Scaling Performance by Array Size (Updated)
@@ -67,17 +95,16 @@ def create_focused_analysis():
     ax1.set_yscale('log')
     ax1.grid(True, alpha=0.3)
 
-    markers = {2: 'o', 4: 's', 8: '^', 14: 'D'}
+    markers = dict(zip(thread_counts, ['o', 's', '^', 'D', 'v', 'P', 'X']))
 
     for pattern in patterns:
         for threads in thread_counts:
-            data = raw_data["Int"][threads][pattern]
-            sizes = [x[0] for x in data]
-            times = [x[1] for x in data]
+            sizes, times = series(results, dtype='int', kernel=pattern, threads=threads)
+            times = times / NS_PER_MS
 
             ax1.plot(sizes, times,
                      color=colors[pattern],
-                     marker=markers[threads],
+                     marker=markers.get(threads, 'o'),
                      markersize=6,
                      linewidth=2,
                      linestyle='-' if pattern != 'NeighbourSequentialIterate' else '--',
@@ -88,20 +115,11 @@ def create_focused_analysis():
     # 2. Cache Invalidation Impact (Key Insight)
     ax2 = axes[0, 1]
 
-    array_sizes = [100, 1000, 10000, 100000, 1000000, 2000000]
-
     for threads in thread_counts:
-        cache_impact = []
-        for size in array_sizes:
-            # Compare NeighbourSequentialIterate vs SequentialIterate
-            seq_data = raw_data["Int"][threads]["SequentialIterate"]
-            neighbor_data = raw_data["Int"][threads]["NeighbourSequentialIterate"]
-
-            seq_time = next(x[1] for x in seq_data if x[0] == size)
-            neighbor_time = next(x[1] for x in neighbor_data if x[0] == size)
-
-            impact = neighbor_time / seq_time
-            cache_impact.append(impact)
+        # Compare NeighbourSequentialIterate vs SequentialIterate, only where both were measured
+        array_sizes = common_sizes(threads)
+        cache_impact = [time_ms('NeighbourSequentialIterate', threads, size) / time_ms('SequentialIterate', threads, size)
+                        for size in array_sizes]
 
         ax2.semilogx(array_sizes, cache_impact,
                      marker='o',
@@ -119,21 +137,18 @@ def create_focused_analysis():
     # 3. Threading Efficiency Analysis
     ax3 = axes[1, 0]
 
-    # Focus on large array (2M elements) where threading effects are clearest
-    large_array_size = 2000000
+    # Focus on the largest array where threading effects are clearest
+    large_array_size = LARGEST_SIZE
 
     for pattern in patterns:
-        times_by_threads = []
-        for threads in thread_counts:
-            data = raw_data["Int"][threads][pattern]
-            time = next(x[1] for x in data if x[0] == large_array_size)
-            times_by_threads.append(time)
+        threads_axis, times_by_threads = series(results, x='threads', dtype='int', kernel=pattern,
+                                                size=large_array_size, threads=thread_counts)
 
-        # Calculate speedup relative to 2 threads
-        baseline_time = times_by_threads[0]  # 2 threads
-        speedups = [baseline_time / time for time in times_by_threads]
+        # Calculate speedup relative to the fewest threads
+        baseline_time = times_by_threads[0]
+        speedups = baseline_time / times_by_threads
 
-        ax3.plot(thread_counts, speedups,
+        ax3.plot(threads_axis, speedups,
                  color=colors[pattern],
                  marker='s',
                  linewidth=3,
@@ -141,13 +156,13 @@ def create_focused_analysis():
                  label=pattern)
 
     # Add ideal speedup line
-    ideal_speedup = [threads / 2 for threads in thread_counts]
+    ideal_speedup = [threads / thread_counts[0] for threads in thread_counts]
     ax3.plot(thread_counts, ideal_speedup, 'k--',
              linewidth=2, alpha=0.7, label='Ideal Linear Speedup')
 
     ax3.set_xlabel('Number of Threads', fontweight='bold')
-    ax3.set_ylabel('Speedup (vs 2 threads)', fontweight='bold')
-    ax3.set_title('Threading Efficiency (2M Elements)', fontweight='bold')
+    ax3.set_ylabel(f'Speedup (vs {thread_counts[0]} threads)', fontweight='bold')
+    ax3.set_title(f'Threading Efficiency ({large_array_size:,} Elements)', fontweight='bold')
     ax3.legend()
     ax3.grid(True, alpha=0.3)
     ax3.set_xticks(thread_counts)
@@ -159,23 +174,10 @@ def create_focused_analysis():
     x_pos = np.arange(len(thread_counts))
     width = 0.25
 
-    # Get times for 2M elements for each pattern
-    seq_times = []
-    jump_times = []
-    neighbor_times = []
-
-    for threads in thread_counts:
-        seq_data = raw_data["Int"][threads]["SequentialIterate"]
-        jump_data = raw_data["Int"][threads]["JumpIterate"]
-        neighbor_data = raw_data["Int"][threads]["NeighbourSequentialIterate"]
-
-        seq_time = next(x[1] for x in seq_data if x[0] == 2000000)
-        jump_time = next(x[1] for x in jump_data if x[0] == 2000000)
-        neighbor_time = next(x[1] for x in neighbor_data if x[0] == 2000000)
-
-        seq_times.append(seq_time)
-        jump_times.append(jump_time)
-        neighbor_times.append(neighbor_time)
+    # Get times for the largest array for each pattern
+    seq_times = [time_ms('SequentialIterate', threads, large_array_size) for threads in thread_counts]
+    jump_times = [time_ms('JumpIterate', threads, large_array_size) for threads in thread_counts]
+    neighbor_times = [time_ms('NeighbourSequentialIterate', threads, large_array_size) for threads in thread_counts]
 
     bars1 = ax4.bar(x_pos - width, seq_times, width,
                     color=colors['SequentialIterate'], alpha=0.8,
@@ -189,7 +191,7 @@ def create_focused_analysis():
 
     ax4.set_xlabel('Number of Threads', fontweight='bold')
     ax4.set_ylabel('Execution Time (ms)', fontweight='bold')
-    ax4.set_title('Memory Access Pattern Impact (2M Elements)', fontweight='bold')
+    ax4.set_title(f'Memory Access Pattern Impact ({large_array_size:,} Elements)', fontweight='bold')
     ax4.set_xticks(x_pos)
     ax4.set_xticklabels(thread_counts)
     ax4.legend()
@@ -220,47 +222,40 @@ def print_key_insights():
     print("=== KEY CACHE PERFORMANCE INSIGHTS ===\n")
 
     # Cache invalidation impact analysis
-    print("1. CACHE INVALIDATION IMPACT (2M elements):")
-    print("   Pattern                    | 2T     | 4T     | 8T     | 14T")
-    print("   " + "-" * 55)
+    print(f"1. CACHE INVALIDATION IMPACT ({LARGEST_SIZE:,} elements):")
+    print("   Pattern                    | " + " | ".join(f"{f'{threads}T':<6}" for threads in THREAD_COUNTS).rstrip())
+    print("   " + "-" * (28 + 9 * len(THREAD_COUNTS)))
 
-    for pattern in ['SequentialIterate', 'JumpIterate', 'NeighbourSequentialIterate']:
+    for pattern in PATTERNS:
         times_str = []
-        for threads in [2, 4, 8, 14]:
-            data = raw_data["Int"][threads][pattern]
-            time = next(x[1] for x in data if x[0] == 2000000)
+        for threads in THREAD_COUNTS:
+            time = time_ms(pattern, threads, LARGEST_SIZE)
             times_str.append(f"{time / 1000:5.1f}s")
 
         pattern_name = pattern.replace('Iterate', '').ljust(25)
         print(f"   {pattern_name} | {' | '.join(times_str)}")
 
     print("\n2. CACHE PENALTY FACTORS (vs Sequential):")
-    for threads in [2, 4, 8, 14]:
-        seq_data = raw_data["Int"][threads]["SequentialIterate"]
-        jump_data = raw_data["Int"][threads]["JumpIterate"]
-        neighbor_data = raw_data["Int"][threads]["NeighbourSequentialIterate"]
-
-        seq_time = next(x[1] for x in seq_data if x[0] == 2000000)
-        jump_time = next(x[1] for x in jump_data if x[0] == 2000000)
-        neighbor_time = next(x[1] for x in neighbor_data if x[0] == 2000000)
+    for threads in THREAD_COUNTS:
+        seq_time = time_ms('SequentialIterate', threads, LARGEST_SIZE)
+        jump_time = time_ms('JumpIterate', threads, LARGEST_SIZE)
+        neighbor_time = time_ms('NeighbourSequentialIterate', threads, LARGEST_SIZE)
 
         jump_penalty = jump_time / seq_time
         neighbor_penalty = neighbor_time / seq_time
 
         print(f"   {threads:2d} threads: Jump={jump_penalty:4.1f}x, Neighbour={neighbor_penalty:4.1f}x")
 
-    print("\n3. SCALING EFFICIENCY (2M elements, vs 2 threads):")
-    for pattern in ['SequentialIterate', 'JumpIterate', 'NeighbourSequentialIterate']:
+    print(f"\n3. SCALING EFFICIENCY ({LARGEST_SIZE:,} elements, vs {THREAD_COUNTS[0]} threads):")
+    for pattern in PATTERNS:
         print(f"   {pattern.replace('Iterate', '')}:")
 
-        baseline_data = raw_data["Int"][2][pattern]
-        baseline_time = next(x[1] for x in baseline_data if x[0] == 2000000)
+        baseline_time = time_ms(pattern, THREAD_COUNTS[0], LARGEST_SIZE)
 
-        for threads in [4, 8, 14]:
-            data = raw_data["Int"][threads][pattern]
-            time = next(x[1] for x in data if x[0] == 2000000)
+        for threads in THREAD_COUNTS[1:]:
+            time = time_ms(pattern, threads, LARGEST_SIZE)
             speedup = baseline_time / time
-            efficiency = speedup / (threads / 2)
+            efficiency = speedup / (threads / THREAD_COUNTS[0])
             print(f"     {threads:2d} threads: {speedup:4.1f}x speedup ({efficiency:4.1f} efficiency)")
         print()
 
@@ -1,6 +1,10 @@
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+from results import NS_PER_MS, from_nested, load_results, select, value_at
+
 simd_data = {
     "int": {
         192: {2: 1, 4: 0, 8: 0, 12: 0},
@@ -55,9 +59,38 @@ regular_data = {
     }
 }
 
+FIXTURES = {'simd': 'AlignedArrayShared', 'regular': 'CArrayShared'}
+
+
+def to_nested(by_size):
+    """{dtype: {size: {threads: ms}}} as the {dtype: {threads: {kernel: [(size, ms)]}}} from_nested takes"""
+    nested = {}
+    for dtype, by_threads_of_size in by_size.items():
+        for size, by_threads in by_threads_of_size.items():
+            for thread, ms in by_threads.items():
+                nested.setdefault(dtype, {}).setdefault(thread, {}).setdefault('SequentialIterate', []).append((size, ms))
+    return nested
+
+
+if len(sys.argv) > 1:
+    results = load_results(*sys.argv[1:])
+else:
+    results = np.concatenate([
+        from_nested(to_nested(simd_data), 'simd_multithreaded_caching', FIXTURES['simd']),
+        from_nested(to_nested(regular_data), 'scalar_multithreaded_caching', FIXTURES['regular']),
+    ])
+
+
+def time_ms(source, dtype, size, thread):
+    """Median SequentialIterate time in ms, NaN when it was not measured"""
+    return value_at(results, fixture=FIXTURES[source] + dtype.capitalize(), kernel='SequentialIterate',
+                    size=size, threads=thread) / NS_PER_MS
+
+
 # Extract array sizes and thread counts
-sizes = sorted(list(simd_data["int"].keys()))
-threads = sorted(list(simd_data["int"][sizes[0]].keys()))
+_simd_rows = results[select(results, kernel='SequentialIterate', fixture=[FIXTURES['simd'] + t for t in ('Int', 'Long', 'Double')])]
+sizes = [int(size) for size in np.unique(_simd_rows['size'])]
+threads = [int(thread) for thread in np.unique(_simd_rows['threads'])]
 data_types = ["int", "long", "double"]
 
 
@@ -78,8 +111,8 @@ for idx, dtype in enumerate(data_types):
     ax = axes1[idx]
 
     for thread in threads:
-        simd_times = [simd_data[dtype][size][thread] for size in sizes]
-        regular_times = [regular_data[dtype][size][thread] for size in sizes]
+        simd_times = [time_ms('simd', dtype, size, thread) for size in sizes]
+        regular_times = [time_ms('regular', dtype, size, thread) for size in sizes]
 
         ax.plot(range(len(sizes)), simd_times, marker='o', linewidth=2.5,
                 markersize=8, label=f'{thread}T SIMD', linestyle='-')
@@ -111,8 +144,8 @@ for idx, thread in enumerate(threads):
     for i, dtype in enumerate(data_types):
         speedups = []
         for size in sizes:
-            regular_time = regular_data[dtype][size][thread]
-            simd_time = simd_data[dtype][size][thread]
+            regular_time = time_ms('regular', dtype, size, thread)
+            simd_time = time_ms('simd', dtype, size, thread)
             # Handle zero values
             if simd_time == 0:
                 speedups.append(0)
@@ -142,7 +175,7 @@ for idx, dtype in enumerate(data_types):
     # SIMD scaling
     ax_simd = axes3[0, idx]
     for size in sizes:
-        times = [simd_data[dtype][size][t] for t in threads]
+        times = [time_ms('simd', dtype, size, t) for t in threads]
         ax_simd.plot(threads, times, marker='o', linewidth=2.5,
                      markersize=8, label=format_size(size))
 
@@ -156,7 +189,7 @@ for idx, dtype in enumerate(data_types):
     # Regular scaling
     ax_regular = axes3[1, idx]
     for size in sizes:
-        times = [regular_data[dtype][size][t] for t in threads]
+        times = [time_ms('regular', dtype, size, t) for t in threads]
         ax_regular.plot(threads, times, marker='s', linewidth=2.5,
                         markersize=8, label=format_size(size))
 
@@ -183,8 +216,8 @@ for idx, dtype in enumerate(data_types):
         regular_throughput = []
 
         for size in sizes:
-            simd_time = simd_data[dtype][size][thread]
-            regular_time = regular_data[dtype][size][thread]
+            simd_time = time_ms('simd', dtype, size, thread)
+            regular_time = time_ms('regular', dtype, size, thread)
 
             # Calculate throughput (elements per ms)
             simd_tp = size / simd_time if simd_time > 0 else 0
@@ -222,8 +255,8 @@ for idx, dtype in enumerate(data_types):
 
     for i, size in enumerate(sizes):
         for j, thread in enumerate(threads):
-            regular_time = regular_data[dtype][size][thread]
-            simd_time = simd_data[dtype][size][thread]
+            regular_time = time_ms('regular', dtype, size, thread)
+            simd_time = time_ms('simd', dtype, size, thread)
             if simd_time > 0:
                 speedup_matrix[i, j] = regular_time / simd_time
 
@@ -252,8 +285,8 @@ for idx, dtype in enumerate(data_types):
     labels = []
 
     for thread in threads:
-        simd_times = [simd_data[dtype][size][thread] for size in sizes]
-        regular_times = [regular_data[dtype][size][thread] for size in sizes]
+        simd_times = [time_ms('simd', dtype, size, thread) for size in sizes]
+        regular_times = [time_ms('regular', dtype, size, thread) for size in sizes]
         time_data.append(simd_times)
         time_data.append(regular_times)
         labels.append(f'{thread}T SIMD')
@@ -287,8 +320,8 @@ for dtype in data_types:
     for thread in threads:
         speedups = []
         for size in sizes:
-            regular_time = regular_data[dtype][size][thread]
-            simd_time = simd_data[dtype][size][thread]
+            regular_time = time_ms('regular', dtype, size, thread)
+            simd_time = time_ms('simd', dtype, size, thread)
             if simd_time > 0:
                 speedups.append(regular_time / simd_time)
 
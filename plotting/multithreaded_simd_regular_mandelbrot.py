@@ -1,7 +1,11 @@
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 
+from results import NS_PER_MS, from_presets, load_results, value_at
+
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
@@ -79,6 +83,29 @@ res_pixels = {
     "8K": 7680 * 4320
 }
 
+if len(sys.argv) > 1:
+    results = load_results(*sys.argv[1:])
+else:
+    results = np.concatenate([
+        from_presets(simd_data, res_pixels, 'simd_multithreaded_compute', 'AlignedArraySharedMandelbrot'),
+        from_presets(regular_data, res_pixels, 'scalar_multithreaded_compute', 'CArrayShared'),
+    ])
+
+
+def time_ms(fixture, res, frac, thread):
+    """Median time in ms of one picture with the static row split, NaN when it was not measured"""
+    # the hand-copied numbers predate the schedules and have none
+    return value_at(results, fixture=fixture, kernel='MandelbrotQuadratic', preset=frac,
+                    size=res_pixels[res], threads=thread, schedule=['', 'static']) / NS_PER_MS
+
+
+def simd_ms(res, frac, thread):
+    return time_ms('AlignedArraySharedMandelbrot', res, frac, thread)
+
+
+def regular_ms(res, frac, thread):
+    return time_ms('CArrayShared', res, frac, thread)
+
 # Plot 1: Fractal Complexity Comparison (Performance Profile)
 fig1, axes1 = plt.subplots(2, 2, figsize=(16, 12))
 fig1.suptitle('Rendering Performance by Fractal Type and Resolution', fontsize=16, fontweight='bold')
@@ -89,8 +116,8 @@ for idx, thread in enumerate(threads):
     width = 0.18
 
     for i, res in enumerate(resolutions):
-        simd_times = [simd_data[res][frac][thread] for frac in fractals]
-        regular_times = [regular_data[res][frac][thread] for frac in fractals]
+        simd_times = [simd_ms(res, frac, thread) for frac in fractals]
+        regular_times = [regular_ms(res, frac, thread) for frac in fractals]
 
         offset = (i - 1.5) * width
         ax.bar(x + offset - width / 2, simd_times, width * 0.9,
@@ -124,7 +151,7 @@ for idx, res in enumerate(resolutions):
     for thread in threads:
         speedups = []
         for frac in fractals:
-            speedup = regular_data[res][frac][thread] / simd_data[res][frac][thread]
+            speedup = regular_ms(res, frac, thread) / simd_ms(res, frac, thread)
             speedups.append(speedup)
         speedups += speedups[:1]  # Complete the circle
 
@@ -134,7 +161,7 @@ for idx, res in enumerate(resolutions):
 
     ax.set_xticks(angles[:-1])
     ax.set_xticklabels(fractals, fontsize=10)
-    ax.set_ylim(0, max([regular_data[res][frac][t] / simd_data[res][frac][t]
+    ax.set_ylim(0, max([regular_ms(res, frac, t) / simd_ms(res, frac, t)
                         for frac in fractals for t in threads]) * 1.1)
     ax.set_title(f'{res} Resolution', fontweight='bold', fontsize=12, pad=20)
     ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), fontsize=9)
@@ -157,8 +184,8 @@ for idx, frac in enumerate(fractals):
     ax = axes3[0, idx] if idx < 3 else axes3[1, idx - 3]
 
     for thread in threads:
-        simd_times = [simd_data[res][frac][thread] for res in resolutions]
-        regular_times = [regular_data[res][frac][thread] for res in resolutions]
+        simd_times = [simd_ms(res, frac, thread) for res in resolutions]
+        regular_times = [regular_ms(res, frac, thread) for res in resolutions]
 
         ax.plot(resolutions, simd_times, marker='o', linewidth=2.5,
                 markersize=9, label=f'{thread}T SIMD')
@@ -192,7 +219,7 @@ width = 0.15
 for i, thread in enumerate(threads):
     throughputs = []
     for res in resolutions:
-        avg_time = np.mean([simd_data[res][frac][thread] for frac in fractals])
+        avg_time = np.mean([simd_ms(res, frac, thread) for frac in fractals])
         megapixels = res_pixels[res] / 1_000_000
         throughput = megapixels / (avg_time / 1000)  # MP/s
         throughputs.append(throughput)
@@ -213,7 +240,7 @@ ax_regular = axes4[1]
 for i, thread in enumerate(threads):
     throughputs = []
     for res in resolutions:
-        avg_time = np.mean([regular_data[res][frac][thread] for frac in fractals])
+        avg_time = np.mean([regular_ms(res, frac, thread) for frac in fractals])
         megapixels = res_pixels[res] / 1_000_000
         throughput = megapixels / (avg_time / 1000)  # MP/s
         throughputs.append(throughput)
@@ -244,7 +271,7 @@ for idx, res in enumerate(resolutions):
 
     for i, frac in enumerate(fractals):
         for j, thread in enumerate(threads):
-            speedup = regular_data[res][frac][thread] / simd_data[res][frac][thread]
+            speedup = regular_ms(res, frac, thread) / simd_ms(res, frac, thread)
             speedup_matrix[i, j] = speedup
 
     im1 = ax_speedup.imshow(speedup_matrix, cmap='RdYlGn', aspect='auto',
@@ -274,7 +301,7 @@ for idx, res in enumerate(resolutions):
 
     for i, frac in enumerate(fractals):
         for j, thread in enumerate(threads):
-            time_matrix[i, j] = simd_data[res][frac][thread]
+            time_matrix[i, j] = simd_ms(res, frac, thread)
 
     im2 = ax_time.imshow(time_matrix, cmap='plasma', aspect='auto',
                          norm=plt.matplotlib.colors.LogNorm())
@@ -306,7 +333,7 @@ for frac in fractals:
     for res in resolutions:
         for thread in threads:
             # Normalize by pixel count
-            time_per_mpixel = simd_data[res][frac][thread] / (res_pixels[res] / 1_000_000)
+            time_per_mpixel = simd_ms(res, frac, thread) / (res_pixels[res] / 1_000_000)
             total_time += time_per_mpixel
             count += 1
     complexity_scores[frac] = total_time / count
@@ -320,7 +347,7 @@ width = 0.2
 for i, res in enumerate(resolutions):
     simd_times = []
     for frac, _ in sorted_fractals:
-        avg_time = np.mean([simd_data[res][frac][t] for t in threads])
+        avg_time = np.mean([simd_ms(res, frac, t) for t in threads])
         simd_times.append(avg_time)
 
     ax6.bar(x + (i - 1.5) * width, simd_times, width,
@@ -355,8 +382,8 @@ for res in resolutions:
     for frac in fractals:
         print(f"\n  {frac.upper()}:")
         for thread in threads:
-            simd_time = simd_data[res][frac][thread]
-            regular_time = regular_data[res][frac][thread]
+            simd_time = simd_ms(res, frac, thread)
+            regular_time = regular_ms(res, frac, thread)
             speedup = regular_time / simd_time
             fps_simd = 1000 / simd_time if simd_time > 0 else 0
             fps_regular = 1000 / regular_time if regular_time > 0 else 0
@@ -373,7 +400,7 @@ for thread in threads:
     count = 0
     for res in resolutions:
         for frac in fractals:
-            speedup = regular_data[res][frac][thread] / simd_data[res][frac][thread]
+            speedup = regular_ms(res, frac, thread) / simd_ms(res, frac, thread)
             total_speedup += speedup
             count += 1
     avg_speedup = total_speedup / count
@@ -1,6 +1,10 @@
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+from results import NS_PER_MS, from_nested, load_results, select, value_at
+
 simd_data = {
     "int": {
         (512, 512): {2: 8, 4: 5, 8: 3, 12: 3},
@@ -49,9 +53,39 @@ scalar_data = {
     }
 }
 
+# OptimizedMul of the SIMD fixture against the contiguous scalar layout it mirrors
+FIXTURES = {'simd': 'AlignedMatrixShared', 'scalar': 'CMatrixArrayShared'}
+
+
+def to_nested(by_size):
+    """{dtype: {(n, n): {threads: ms}}} as the {dtype: {threads: {kernel: [(n, ms)]}}} from_nested takes"""
+    nested = {}
+    for dtype, by_matrix in by_size.items():
+        for (n, _), by_threads in by_matrix.items():
+            for thread, ms in by_threads.items():
+                nested.setdefault(dtype, {}).setdefault(thread, {}).setdefault('OptimizedMul', []).append((n, ms))
+    return nested
+
+
+if len(sys.argv) > 1:
+    results = load_results(*sys.argv[1:])
+else:
+    results = np.concatenate([
+        from_nested(to_nested(simd_data), 'simd_multithreaded_caching', FIXTURES['simd']),
+        from_nested(to_nested(scalar_data), 'scalar_multithreaded_caching', FIXTURES['scalar']),
+    ])
+
+
+def time_ms(source, dtype, size, thread):
+    """Median OptimizedMul time in ms, NaN when it was not measured"""
+    return value_at(results, fixture=FIXTURES[source] + dtype.capitalize(), kernel='OptimizedMul',
+                    size=size[0], threads=thread) / NS_PER_MS
+
+
 # Extract matrix sizes and thread counts
-sizes = sorted(list(simd_data["int"].keys()))
-threads = sorted(list(simd_data["int"][sizes[0]].keys()))
+_simd_rows = results[select(results, kernel='OptimizedMul', fixture=[FIXTURES['simd'] + t for t in ('Int', 'Long', 'Double')])]
+sizes = [(int(n), int(n)) for n in np.unique(_simd_rows['size'])]
+threads = [int(t) for t in np.unique(_simd_rows['threads'])]
 data_types = ["int", "long", "double"]
 
 # Plot 1: Performance comparison across data types (one plot per thread count)
@@ -64,8 +98,8 @@ for idx, thread in enumerate(threads):
     width = 0.12
 
     for i, dtype in enumerate(data_types):
-        simd_times = [simd_data[dtype][size][thread] for size in sizes]
-        scalar_times = [scalar_data[dtype][size][thread] for size in sizes]
+        simd_times = [time_ms('simd', dtype, size, thread) for size in sizes]
+        scalar_times = [time_ms('scalar', dtype, size, thread) for size in sizes]
 
         ax.bar(x + (i * 2 - 2) * width, simd_times, width, label=f'{dtype} SIMD', alpha=0.8)
         ax.bar(x + (i * 2 - 1) * width, scalar_times, width, label=f'{dtype} Scalar', alpha=0.8)
@@ -93,8 +127,8 @@ for idx, dtype in enumerate(data_types):
     for thread in threads:
         speedups = []
         for size in sizes:
-            scalar_time = scalar_data[dtype][size][thread]
-            simd_time = simd_data[dtype][size][thread]
+            scalar_time = time_ms('scalar', dtype, size, thread)
+            simd_time = time_ms('simd', dtype, size, thread)
             speedups.append(scalar_time / simd_time)
 
         ax.plot([f'{s[0]}' for s in sizes], speedups, marker='o', linewidth=2,
@@ -119,8 +153,8 @@ for idx, dtype in enumerate(data_types):
     ax = axes3[idx]
 
     for size in sizes:
-        simd_times = [simd_data[dtype][size][t] for t in threads]
-        scalar_times = [scalar_data[dtype][size][t] for t in threads]
+        simd_times = [time_ms('simd', dtype, size, t) for t in threads]
+        scalar_times = [time_ms('scalar', dtype, size, t) for t in threads]
 
         ax.plot(threads, simd_times, marker='o', linewidth=2, markersize=8,
                 label=f'{size[0]} SIMD', linestyle='-')
@@ -148,8 +182,8 @@ for idx, dtype in enumerate(data_types):
 
     for i, size in enumerate(sizes):
         for j, thread in enumerate(threads):
-            scalar_time = scalar_data[dtype][size][thread]
-            simd_time = simd_data[dtype][size][thread]
+            scalar_time = time_ms('scalar', dtype, size, thread)
+            simd_time = time_ms('simd', dtype, size, thread)
             speedup_matrix[i, j] = scalar_time / simd_time
 
     im = ax.imshow(speedup_matrix, cmap='YlGn', aspect='auto')
@@ -183,7 +217,7 @@ width = 0.25
 for i, dtype in enumerate(data_types):
     avg_speedups = []
     for thread in threads:
-        speedups = [scalar_data[dtype][size][thread] / simd_data[dtype][size][thread]
+        speedups = [time_ms('scalar', dtype, size, thread) / time_ms('simd', dtype, size, thread)
                     for size in sizes]
         avg_speedups.append(np.mean(speedups))
 
@@ -208,7 +242,7 @@ print("=" * 60)
 for dtype in data_types:
     print(f"\n{dtype.upper()} Data Type:")
     for thread in threads:
-        speedups = [scalar_data[dtype][size][thread] / simd_data[dtype][size][thread]
+        speedups = [time_ms('scalar', dtype, size, thread) / time_ms('simd', dtype, size, thread)
                     for size in sizes]
         print(f"  {thread:2d} threads - Avg Speedup: {np.mean(speedups):.2f}x, "
               f"Max: {np.max(speedups):.2f}x, Min: {np.min(speedups):.2f}x")
@@ -0,0 +1,74 @@
+"""Cost of power-of-two row strides and how much row padding recovers.
+
+Normalizes every Padded fixture point to ns per multiply-add, prints for each power
+of two how much slower it is than the mean of its pow2 - 1 and pow2 + 1 neighbours
+at every padding, and plots ns per multiply-add against the size, one line per padding.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+
+from results import load_records
+
+
+def padded_points(records):
+    """{(fixture, kernel): {pad: {size: ns per multiply-add}}}"""
+    points = {}
+    for record in records:
+        if 'Padded' not in record.get('fixture', '') or 'pad' not in record:
+            continue
+        size = record['size']
+        ns = record.get('median_ns', record['ns'])
+        by_pad = points.setdefault((record['fixture'], record['kernel']), {})
+        by_pad.setdefault(record['pad'], {})[size] = ns / size ** 3
+    return dict(sorted(points.items()))
+
+
+def pow2_penalty(by_size):
+    """{pow2: time per multiply-add / mean of the pow2 - 1 and pow2 + 1 neighbours}"""
+    penalty = {}
+    for size, ns in by_size.items():
+        below, above = by_size.get(size - 1), by_size.get(size + 1)
+        if size & (size - 1) == 0 and below and above:
+            penalty[size] = ns / ((below + above) / 2)
+    return dict(sorted(penalty.items()))
+
+
+def print_penalties(points):
+    for (fixture, kernel), by_pad in points.items():
+        print(f"\n{fixture} {kernel}")
+        for pad, by_size in sorted(by_pad.items()):
+            cells = '  '.join(f"{size}: x{ratio:4.2f}" for size, ratio in pow2_penalty(by_size).items())
+            print(f"  pad {pad:>3} B  {cells}")
+
+
+def plot_padding(points):
+    if not points:
+        return
+
+    fig, axes = plt.subplots(len(points), 1, figsize=(12, 4 * len(points)), squeeze=False)
+    fig.suptitle('Row stride and padding', fontsize=16, fontweight='bold')
+
+    for ax, ((fixture, kernel), by_pad) in zip(axes[:, 0], points.items()):
+        for pad, by_size in sorted(by_pad.items()):
+            sizes = sorted(by_size)
+            ax.plot(sizes, [by_size[size] for size in sizes], marker='o', label=f'pad {pad} B')
+        ax.set_title(f'{fixture} {kernel}', fontweight='bold')
+        ax.set_xscale('log', base=2)
+        ax.set_xlabel('Matrix size')
+        ax.set_ylabel('ns per multiply-add')
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=8)
+
+    plt.tight_layout()
+    plt.savefig('padded_matrix.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    padded = padded_points(load_records(*sys.argv[1:]))
+    print_penalties(padded)
+    plot_padding(padded)
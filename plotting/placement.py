@@ -0,0 +1,75 @@
+"""Effect of the BENCH_PLACEMENT thread pinning policy on the threaded suites.
+
+Run the multithreaded suites once per policy into the same results file, e.g.
+    for p in none compact scatter physical smt; do BENCH_PLACEMENT=$p ./benchmarks; done
+and pass the file(s) on the command line.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from results import group_reduce, load_results, select
+
+PLACEMENTS = ['none', 'compact', 'scatter', 'physical', 'smt']
+ITERATE_PATTERNS = ['NeighbourSequentialIterate', 'SequentialIterate']
+MATRIX_FIXTURES = ['CMatrixSharedDouble', 'CMatrixArraySharedDouble']
+
+
+def by_placement(data, value, **criteria):
+    """{placement: (threads, reduced value)} at the largest size matching `criteria`"""
+    subset = data[select(data, **criteria)]
+    if len(subset) == 0:
+        return {}
+    subset = subset[subset['size'] == subset['size'].max()]
+
+    curves = {}
+    for placement in PLACEMENTS:
+        groups, reduced = group_reduce(subset[subset['placement'] == placement], ['threads'], value)
+        if len(groups):
+            curves[placement] = (groups['threads'], reduced)
+    return curves
+
+
+def plot_placement(data):
+    fig, (ax_iter, ax_mat) = plt.subplots(1, 2, figsize=(16, 6))
+    fig.suptitle('Thread placement policies', fontsize=16, fontweight='bold')
+    colors = dict(zip(PLACEMENTS, plt.cm.tab10.colors))
+
+    for pattern, style in zip(ITERATE_PATTERNS, ['-', '--']):
+        curves = by_placement(data, 'ns_per_element', suite='scalar_multithreaded_caching', dtype='int',
+                              kernel=pattern)
+        for placement, (threads, ns) in curves.items():
+            ax_iter.plot(threads, ns, style, marker='o', color=colors[placement],
+                         label=f'{pattern} ({placement})')
+    ax_iter.set_title('Iteration, largest array (false sharing vs. placement)', fontweight='bold')
+    ax_iter.set_xlabel('Threads')
+    ax_iter.set_ylabel('ns per element')
+    ax_iter.grid(True, alpha=0.3)
+    ax_iter.legend(fontsize=8)
+
+    for fixture, style in zip(MATRIX_FIXTURES, ['-', '--']):
+        curves = by_placement(data, 'ns', fixture=fixture, kernel='OptimizedMul')
+        size = data['size'][select(data, fixture=fixture, kernel='OptimizedMul')].max(initial=0)
+        for placement, (threads, ns) in curves.items():
+            gflops = 2.0 * size ** 3 / ns
+            ax_mat.plot(threads, gflops, style, marker='s', color=colors[placement],
+                        label=f'{fixture} ({placement})')
+    ax_mat.set_title('OptimizedMul, largest matrix', fontweight='bold')
+    ax_mat.set_xlabel('Threads')
+    ax_mat.set_ylabel('GFLOPS')
+    ax_mat.grid(True, alpha=0.3)
+    ax_mat.legend(fontsize=8)
+
+    plt.tight_layout()
+    plt.savefig('thread_placement.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    results = load_results(*sys.argv[1:])
+    print('Placements found:', ', '.join(np.unique(results['placement'])))
+    plot_placement(results)
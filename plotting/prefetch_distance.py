@@ -0,0 +1,82 @@
+"""Best software prefetch distance of the strided and shuffled-index walks.
+
+For every kernel, dtype and size prints the distance and locality hint with the
+lowest ns per element and its speedup over distance 0, which issues no prefetch.
+Plots that speedup against the distance at the largest (DRAM resident) size, one
+panel per kernel, one line per dtype and hint.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+
+from results import load_records
+
+
+def prefetch_points(records):
+    """{(kernel, dtype, size): {(distance, hint): ns per element}}"""
+    points = {}
+    for record in records:
+        if 'distance' not in record or 'hint' not in record:
+            continue
+        key = (record['kernel'], record.get('dtype', ''), record['size'])
+        points.setdefault(key, {})[(record['distance'], record['hint'])] = record['ns_per_element']
+    return dict(sorted(points.items()))
+
+
+def best_distances(points):
+    """{(kernel, dtype, size): (distance, hint, speedup over no prefetch)}"""
+    best = {}
+    for key, by_setting in points.items():
+        baselines = [ns for (distance, _), ns in by_setting.items() if distance == 0]
+        if not baselines:
+            continue
+        (distance, hint), ns = min(by_setting.items(), key=lambda item: item[1])
+        best[key] = (distance, hint, min(baselines) / ns)
+    return best
+
+
+def print_best(best):
+    for (kernel, dtype, size), (distance, hint, speedup) in best.items():
+        print(f"{kernel:>26} {dtype:>6} {size:>9}  distance {distance:>3} {hint:>3}  x{speedup:5.2f} of no prefetch")
+
+
+def plot_speedups(points):
+    if not points:
+        return
+
+    kernels = sorted({kernel for kernel, _, _ in points})
+    fig, axes = plt.subplots(1, len(kernels), figsize=(7 * len(kernels), 6), squeeze=False)
+    fig.suptitle('Software prefetch distance at the largest size', fontsize=16, fontweight='bold')
+
+    for ax, kernel in zip(axes[0], kernels):
+        largest = max(size for other, _, size in points if other == kernel)
+        for (other, dtype, size), by_setting in points.items():
+            if other != kernel or size != largest:
+                continue
+            baseline = min((ns for (distance, _), ns in by_setting.items() if distance == 0), default=None)
+            if baseline is None:
+                continue
+            for hint in sorted({hint for _, hint in by_setting}):
+                curve = sorted((distance, baseline / ns) for (distance, other_hint), ns in by_setting.items()
+                               if other_hint == hint and distance > 0)
+                ax.plot([p[0] for p in curve], [p[1] for p in curve], marker='o', label=f'{dtype} {hint}')
+        ax.axhline(1, color='black', linewidth=0.8)
+        ax.set_title(f'{kernel}, {largest} elements', fontweight='bold')
+        ax.set_xscale('log', base=2)
+        ax.set_xlabel('Prefetch distance (iterations)')
+        ax.set_ylabel('no prefetch time / prefetch time')
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=7)
+
+    plt.tight_layout()
+    plt.savefig('prefetch_distance.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    points = prefetch_points(load_records(*sys.argv[1:]))
+    print_best(best_distances(points))
+    plot_speedups(points)
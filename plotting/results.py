@@ -0,0 +1,162 @@
+"""Columnar access to the JSONL records written by the benchmark binaries.
+
+Every record becomes one row of a NumPy structured array, so the plotting
+scripts filter with boolean masks and aggregate with vectorized group-bys
+instead of walking nested dicts.
+"""
+import json
+
+import numpy as np
+
+RESULT_DTYPE = np.dtype([
+    ('suite', 'U40'),
+    ('fixture', 'U40'),
+    ('kernel', 'U40'),
+    ('dtype', 'U8'),
+    ('size', 'i8'),
+    ('threads', 'i4'),
+    ('placement', 'U10'),
+    ('memory', 'U8'),
+    ('init', 'U8'),
+    ('schedule', 'U8'),
+    ('preset', 'U12'),
+    ('l1', 'i4'),
+    ('l2', 'i4'),
+    ('order', 'U3'),
+    ('repetition', 'i4'),
+    ('ns', 'f8'),
+    ('ns_per_element', 'f8'),
+])
+
+NS_PER_MS = 1e6
+
+
+def _row(record, repetition, ns):
+    # looping kernels report how many passes over how many elements one sample covers
+    work = record.get('loops', 0) * record.get('elements', 0)
+    return (record.get('suite', ''), record.get('fixture', ''), record.get('kernel', ''),
+            record.get('dtype', ''), record.get('size', 0), record.get('threads', 1),
+            record.get('placement', 'none'), record.get('memory', 'malloc'), record.get('init', 'serial'),
+            record.get('schedule', ''), record.get('preset', ''),
+            record.get('l1', 0), record.get('l2', 0), record.get('order', ''), repetition, ns, ns / work if work else np.nan)
+
+
+def load_records(*paths):
+    """The passed records of one or more JSONL result files as dicts, series fields included"""
+    records = []
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if record.get('status', 'passed') == 'passed':
+                    records.append(record)
+    return records
+
+
+def load_results(*paths):
+    """Load one or more JSONL result files into a single structured array"""
+    rows = []
+    for record in load_records(*paths):
+        # one row per kept repetition, outliers rejected by the harness are left out
+        samples = record.get('samples_ns')
+        if samples:
+            rows.extend(_row(record, i, ns) for i, ns in enumerate(samples))
+        else:
+            rows.append(_row(record, 0, record['ns']))
+    return np.array(rows, dtype=RESULT_DTYPE)
+
+
+def from_nested(nested, suite='', fixture='', unit=NS_PER_MS, loops=0):
+    """Convert the hand-copied {dtype: {threads: {kernel: [(size, time)]}}} dicts.
+
+    The threads level is optional, `unit` converts the stored times to ns and
+    `fixture` gets the dtype suffix appended like the CMatrixSharedInt aliases.
+    `loops` is the fixed outer loop count of iterate kernels, it fills ns_per_element.
+    """
+    rows = []
+    for dtype, level in nested.items():
+        by_threads = level if all(isinstance(k, int) for k in level) else {1: level}
+        for threads, kernels in by_threads.items():
+            for kernel, points in kernels.items():
+                for size, time in points:
+                    ns = time * unit
+                    rows.append((suite, fixture + dtype.capitalize(), kernel, dtype.lower(),
+                                 size, threads, 'none', 'malloc', 'serial', '', '', 0, 0, '', 0, ns, ns / (loops * size) if loops else np.nan))
+    return np.array(rows, dtype=RESULT_DTYPE)
+
+
+def from_presets(nested, pixels, suite='', fixture='', kernel='MandelbrotQuadratic', unit=NS_PER_MS):
+    """Convert the hand-copied {resolution: {preset: time or {threads: time}}} Mandelbrot dicts.
+
+    `pixels` maps the resolution labels to width * height, the size the binaries record
+    for a picture with a preset.
+    """
+    rows = []
+    for resolution, presets in nested.items():
+        for preset, level in presets.items():
+            by_threads = level if isinstance(level, dict) else {1: level}
+            for threads, time in by_threads.items():
+                rows.append((suite, fixture, kernel, '', pixels[resolution], threads, 'none', 'malloc', 'serial',
+                             '', preset, 0, 0, '', 0, time * unit, np.nan))
+    return np.array(rows, dtype=RESULT_DTYPE)
+
+
+def select(data, **criteria):
+    """Boolean mask of the rows matching every column=value (or column=[values]) pair"""
+    mask = np.ones(len(data), dtype=bool)
+    for column, value in criteria.items():
+        if isinstance(value, (list, tuple, set, np.ndarray)):
+            mask &= np.isin(data[column], list(value))
+        else:
+            mask &= data[column] == value
+    return mask
+
+
+def group_reduce(data, keys, value='ns', reduce='median'):
+    """Aggregate `value` over the unique combinations of `keys`.
+
+    Returns the unique key rows and the reduced values, both sorted by key.
+    """
+    if len(data) == 0:
+        return data[list(keys)], np.empty(0)
+
+    groups, inverse = np.unique(data[list(keys)], return_inverse=True)
+    inverse = inverse.ravel()
+    values = data[value].astype(float)
+
+    order = np.lexsort((values, inverse))
+    sorted_values = values[order]
+    counts = np.bincount(inverse, minlength=len(groups))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    if reduce == 'median':
+        low = sorted_values[starts + (counts - 1) // 2]
+        high = sorted_values[starts + counts // 2]
+        reduced = (low + high) / 2
+    elif reduce == 'min':
+        reduced = sorted_values[starts]
+    elif reduce == 'max':
+        reduced = sorted_values[starts + counts - 1]
+    elif reduce == 'mean':
+        reduced = np.add.reduceat(sorted_values, starts) / counts
+    else:
+        raise ValueError(f'unknown reduction {reduce}')
+
+    return groups, reduced
+
+
+def series(data, x='size', value='ns', reduce='median', **criteria):
+    """(x values, reduced values) of the rows matching `criteria`, sorted by x"""
+    groups, reduced = group_reduce(data[select(data, **criteria)], [x], value, reduce)
+    return groups[x], reduced
+
+
+def value_at(data, value='ns', reduce='median', **criteria):
+    """Single reduced value of the rows matching `criteria`, NaN when nothing matches"""
+    values = data[value][select(data, **criteria)].astype(float)
+    if len(values) == 0:
+        return np.nan
+    return float({'median': np.median, 'min': np.min, 'max': np.max, 'mean': np.mean}[reduce](values))
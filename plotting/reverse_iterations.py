@@ -1,3 +1,5 @@
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.ticker import FuncFormatter
@@ -5,6 +7,8 @@ import seaborn as sns
 from matplotlib.patches import Rectangle
 import matplotlib.patches as mpatches
 
+from results import NS_PER_MS, from_nested, load_results, series
+
 # Set publication-quality style
 plt.style.use('seaborn-v0_8-whitegrid')
 sns.set_palette("husl")
@@ -81,6 +85,26 @@ raw_data = {
     }
 }
 
+# the access pattern labels and the singlecore CArray kernels behind them
+MODES = {
+    "Sequential": "SequentialIterate",
+    "Reverse Sequential": "ReverseSequentialIterate",
+    "Random": "JumpIterate",
+    "Reverse Random": "ReverseJumpIterate",
+}
+
+
+def iteration_times(results):
+    """{dtype: {mode: [(size, median ms)]}} of the singlecore CArray fixtures"""
+    data = {}
+    for dtype in ["int", "long", "double"]:
+        for mode, kernel in MODES.items():
+            sizes, times = series(results, fixture='CArray' + dtype.capitalize(), kernel=kernel)
+            if len(sizes):
+                data.setdefault(dtype, {})[mode] = list(zip(sizes.tolist(), (times / NS_PER_MS).tolist()))
+    return data
+
+
 def smart_format_time(x, pos):
     """Format time values with appropriate units and precision"""
     if x == 0:
@@ -304,9 +328,16 @@ if __name__ == "__main__":
     print("Generating comprehensive benchmark visualizations...")
     print("=" * 60)
     
+    if len(sys.argv) > 1:
+        results = load_results(*sys.argv[1:])
+    else:
+        renamed = {dtype: {MODES[mode]: values for mode, values in modes.items()} for dtype, modes in raw_data.items()}
+        results = from_nested(renamed, 'scalar_singlecore_caching', 'CArray')
+    data = iteration_times(results)
+
     # Generate all visualizations
-    plot_individual_benchmarks(raw_data)
-    plot_combined_analysis(raw_data)
+    plot_individual_benchmarks(data)
+    plot_combined_analysis(data)
     
     print("\nVisualization complete!")
     print("Generated files:")
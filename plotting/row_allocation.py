@@ -0,0 +1,64 @@
+"""Allocation, first touch and multiply time of the row allocation strategies.
+
+Prints the three phases of every CMatrixAllocation point side by side and plots
+each phase against the matrix size, one line per fixture and allocation.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+
+from results import NS_PER_MS, load_records
+
+PHASES = {'allocate_ns': 'Allocation', 'first_touch_ns': 'First touch', 'median_ns': 'Multiply'}
+
+
+def allocation_points(records, kernel):
+    """{(fixture, allocation): [(size, {phase: ns})]} sorted by size"""
+    points = {}
+    for record in records:
+        if record.get('kernel') != kernel or 'alloc' not in record:
+            continue
+        phases = {phase: record.get(phase, record['ns']) for phase in PHASES}
+        points.setdefault((record['fixture'], record['alloc']), []).append((record['size'], phases))
+    return {key: sorted(values, key=lambda point: point[0]) for key, values in sorted(points.items())}
+
+
+def print_phases(points):
+    for (fixture, allocation), values in points.items():
+        print(f"\n{fixture} {allocation}")
+        for size, phases in values:
+            cells = '  '.join(f"{label} {phases[phase] / NS_PER_MS:10.3f} ms" for phase, label in PHASES.items())
+            print(f"  {size:>5}  {cells}")
+
+
+def plot_phases(points, kernel):
+    if not points:
+        return
+
+    fig, axes = plt.subplots(1, len(PHASES), figsize=(18, 6))
+    fig.suptitle(f'Row allocation strategies, {kernel}', fontsize=16, fontweight='bold')
+
+    for ax, (phase, label) in zip(axes, PHASES.items()):
+        for (fixture, allocation), values in points.items():
+            sizes = [size for size, _ in values]
+            ax.plot(sizes, [phases[phase] / NS_PER_MS for _, phases in values], marker='o', label=f'{fixture} {allocation}')
+        ax.set_title(label, fontweight='bold')
+        ax.set_xscale('log', base=2)
+        ax.set_yscale('log')
+        ax.set_xlabel('Matrix size')
+        ax.set_ylabel('ms')
+        ax.grid(True, alpha=0.3)
+    axes[-1].legend(fontsize=7)
+
+    plt.tight_layout()
+    plt.savefig('row_allocation.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    points = allocation_points(load_records(*sys.argv[1:]), 'OptimizedMul')
+    print_phases(points)
+    plot_phases(points, 'OptimizedMul')
@@ -1,4 +1,9 @@
+import sys
+
 import matplotlib.pyplot as plt
+import numpy as np
+
+from results import NS_PER_MS, from_nested, load_results, series
 
 # Given data
 simd_data = {
@@ -24,31 +29,39 @@ simd_data = {
 
 regular_data = {
     "int": {
-        "Sequential": [
+        "SequentialIterate": [
             (12, 0), (100, 3), (1000, 30), (10000, 299),
             (100000, 2960), (1000000, 29528), (2000000, 59818), (3000000, 94396)
         ]
     },
     "long": {
-        "Sequential": [
+        "SequentialIterate": [
             (12, 0), (100, 3), (1000, 30), (10000, 314),
             (100000, 3228), (1000000, 32278), (2000000, 112508), (3000000, 314590)
         ]
     },
     "double": {
-        "Sequential": [
+        "SequentialIterate": [
             (12, 1), (100, 7), (1000, 78), (10000, 765),
             (100000, 7681), (1000000, 76370), (2000000, 171045), (3000000, 339641)
         ]
     }
 }
 
-# Mapping between SIMD and regular dataset keys
-mapping = {
-    "Int": "int",
-    "Long": "long",
-    "Double": "double"
-}
+if len(sys.argv) > 1:
+    results = load_results(*sys.argv[1:])
+else:
+    results = np.concatenate([
+        from_nested(simd_data, 'simd_singlecore_caching', 'AlignedArray'),
+        from_nested(regular_data, 'scalar_singlecore_caching', 'CArray'),
+    ])
+
+
+def sequential_ms(fixture, dtype):
+    """(sizes, median SequentialIterate time in ms) of one fixture and dtype"""
+    sizes, times = series(results, fixture=fixture + dtype, kernel='SequentialIterate')
+    return sizes, times / NS_PER_MS
+
 
 # Create subplots
 fig, axes = plt.subplots(1, 3, figsize=(18, 5))
@@ -61,12 +74,8 @@ for idx, dtype in enumerate(["Int", "Long", "Double"]):
     ax = axes[idx]
 
     # Extract SIMD and regular data
-    simd = simd_data[dtype]["SequentialIterate"]
-    regular = regular_data[mapping[dtype]]["Sequential"]
-
-    # Unpack data into X and Y
-    simd_x, simd_y = zip(*simd)
-    reg_x, reg_y = zip(*regular)
+    simd_x, simd_y = sequential_ms('AlignedArray', dtype)
+    reg_x, reg_y = sequential_ms('CArray', dtype)
 
     # Plot data
     ax.plot(simd_x, simd_y, marker="o", color=colors[0], label="SIMD")
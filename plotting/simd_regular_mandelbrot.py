@@ -1,7 +1,11 @@
+import sys
+
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
+from results import NS_PER_MS, from_presets, load_results, value_at
+
 simd_data = {
     "1K": {  # 1920x1080
         "mandelbrot": 455,
@@ -64,9 +68,31 @@ regular_data = {
     },
 }
 
-# Extract all zoom names and resolutions
-zooms = list(next(iter(simd_data.values())).keys())  # ["mandelbrot", "shells", ...]
-resolutions = list(simd_data.keys())  # ["1K", "4K", "6K", "8K"]
+RESOLUTION_PIXELS = {
+    "1K": 1920 * 1080,
+    "4K": 3840 * 2160,
+    "6K": 5760 * 3240,
+    "8K": 7680 * 4320,
+}
+
+if len(sys.argv) > 1:
+    results = load_results(*sys.argv[1:])
+else:
+    results = np.concatenate([
+        from_presets(simd_data, RESOLUTION_PIXELS, 'simd_singlecore_compute', 'AlignedArrayMandelbrot'),
+        from_presets(regular_data, RESOLUTION_PIXELS, 'scalar_singlecore_compute', 'CArrayMandelbrot'),
+    ])
+
+
+def time_ms(fixture, resolution, zoom):
+    """Median MandelbrotQuadratic time in ms of one fixture, NaN when it was not measured"""
+    return value_at(results, fixture=fixture, kernel='MandelbrotQuadratic', preset=zoom,
+                    size=RESOLUTION_PIXELS[resolution]) / NS_PER_MS
+
+
+# Extract all zoom names and resolutions present in the data
+zooms = [zoom for zoom in ["mandelbrot", "shells", "seastar", "stuff", "galaxy"] if zoom in results['preset']]
+resolutions = [res for res, pixels in RESOLUTION_PIXELS.items() if pixels in results['size']]
 
 # Define plot style
 sns.set_style("whitegrid")
@@ -80,8 +106,8 @@ for idx, zoom in enumerate(zooms):
     ax = axes[idx]
 
     # Get data for this zoom
-    simd_times = [simd_data[res][zoom] for res in resolutions]
-    reg_times = [regular_data[res][zoom] for res in resolutions]
+    simd_times = [time_ms('AlignedArrayMandelbrot', res, zoom) for res in resolutions]
+    reg_times = [time_ms('CArrayMandelbrot', res, zoom) for res in resolutions]
 
     # Set bar positions
     x = np.arange(len(resolutions))
@@ -0,0 +1,80 @@
+"""Strassen-Winograd against the classical ikj multiply of the contiguous matrices.
+
+For every dtype, thread count and cutoff prints the speedup of StrassenMul over
+CMatrixArrayShared OptimizedMul per size, and for double the max relative error
+against the classical result. Plots both against the matrix size.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+
+from results import load_records
+
+
+def medians(records):
+    """{(kernel, dtype, threads, cutoff, size): (median ns, max relative error)}"""
+    points = {}
+    for record in records:
+        kernel = record.get('kernel')
+        if kernel == 'StrassenMul' or (kernel == 'OptimizedMul' and record['fixture'].startswith('CMatrixArrayShared')):
+            key = (kernel, record.get('dtype', ''), record.get('threads', 1), record.get('cutoff', 0), record['size'])
+            points[key] = (record.get('median_ns', record['ns']), record.get('max_rel_error'))
+    return points
+
+
+def speedups(points):
+    """{(dtype, threads, cutoff): [(size, ikj / strassen, max relative error)]} sorted by size"""
+    curves = {}
+    for (kernel, dtype, threads, cutoff, size), (ns, error) in points.items():
+        baseline = points.get(('OptimizedMul', dtype, threads, 0, size))
+        if kernel != 'StrassenMul' or baseline is None:
+            continue
+        curves.setdefault((dtype, threads, cutoff), []).append((size, baseline[0] / ns, error))
+    return {key: sorted(values) for key, values in sorted(curves.items())}
+
+
+def print_speedups(curves):
+    for (dtype, threads, cutoff), curve in curves.items():
+        print(f"\n{dtype}, {threads} threads, cutoff {cutoff}")
+        for size, speedup, error in curve:
+            suffix = f", max relative error {error:.2e}" if error is not None else ''
+            print(f"  {size:>5}  x{speedup:5.2f} of ikj{suffix}")
+
+
+def plot_speedups(curves):
+    if not curves:
+        return
+
+    fig, (time_ax, error_ax) = plt.subplots(1, 2, figsize=(16, 6))
+    fig.suptitle('Strassen-Winograd against ikj', fontsize=16, fontweight='bold')
+
+    for (dtype, threads, cutoff), curve in curves.items():
+        sizes = [p[0] for p in curve]
+        time_ax.plot(sizes, [p[1] for p in curve], marker='o', label=f'{dtype} {threads}t cutoff {cutoff}')
+        errors = [(size, error) for size, _, error in curve if error is not None]
+        if errors:
+            error_ax.plot(*zip(*errors), marker='o', label=f'{threads}t cutoff {cutoff}')
+
+    time_ax.axhline(1, color='black', linewidth=0.8)
+    time_ax.set_ylabel('OptimizedMul time / StrassenMul time')
+    error_ax.set_yscale('log')
+    error_ax.set_ylabel('max |C - AB| / max |AB| (double)')
+    for ax in (time_ax, error_ax):
+        ax.set_xscale('log', base=2)
+        ax.set_xlabel('Matrix size')
+        ax.grid(True, alpha=0.3)
+        if ax.get_legend_handles_labels()[0]:
+            ax.legend(fontsize=7)
+
+    plt.tight_layout()
+    plt.savefig('strassen_matrix.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    curves = speedups(medians(load_records(*sys.argv[1:])))
+    print_speedups(curves)
+    plot_speedups(curves)
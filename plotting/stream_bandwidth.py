@@ -0,0 +1,64 @@
+"""STREAM copy, scale, add and triad bandwidth of the scalar, SIMD and threaded builds.
+
+Prints the GB/s of every kernel per fixture, size and thread count, and plots the
+bandwidth against the thread count at the largest size, the memory ceiling the
+iterate and matrix results can be normalized against. The single-threaded fixtures
+are drawn at one thread.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+
+from results import load_records
+
+KERNELS = ['Copy', 'Scale', 'Add', 'Triad']
+
+
+def bandwidth_points(records):
+    """{(fixture, kernel, size): [(threads, GB/s)]} sorted by threads"""
+    points = {}
+    for record in records:
+        if record.get('kernel') not in KERNELS or 'gb_per_s' not in record:
+            continue
+        key = (record['fixture'], record['kernel'], record['size'])
+        points.setdefault(key, []).append((record.get('threads', 1), record['gb_per_s']))
+    return {key: sorted(values) for key, values in sorted(points.items())}
+
+
+def print_bandwidth(points):
+    for (fixture, kernel, size), curve in points.items():
+        cells = '  '.join(f"{threads:>2}t {gb:7.2f}" for threads, gb in curve)
+        print(f"{fixture:>26} {kernel:>5} {size:>9}  {cells} GB/s")
+
+
+def plot_bandwidth(points):
+    if not points:
+        return
+
+    largest = max(size for _, _, size in points)
+    fig, axes = plt.subplots(1, len(KERNELS), figsize=(20, 5), sharey=True)
+    fig.suptitle(f'STREAM bandwidth, {largest} elements per array', fontsize=16, fontweight='bold')
+
+    for ax, kernel in zip(axes, KERNELS):
+        for (fixture, other, size), curve in points.items():
+            if other == kernel and size == largest:
+                ax.plot([p[0] for p in curve], [p[1] for p in curve], marker='o', label=fixture)
+        ax.set_title(kernel, fontweight='bold')
+        ax.set_xscale('log', base=2)
+        ax.set_xlabel('Threads')
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=8)
+    axes[0].set_ylabel('GB/s')
+
+    plt.tight_layout()
+    plt.savefig('stream_bandwidth.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    points = bandwidth_points(load_records(*sys.argv[1:]))
+    print_bandwidth(points)
+    plot_bandwidth(points)
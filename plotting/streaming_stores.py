@@ -0,0 +1,81 @@
+"""Non-temporal against regular stores in the SIMD iterate kernels.
+
+Pairs every streaming kernel with its regular-store counterpart, StreamingWrite with
+SequentialWrite and StreamingIterate with SequentialIterate, prints per fixture and
+thread count the speedup of the streaming version and both bandwidths against the
+size, and plots the speedups. Streaming only pays off once the array no longer fits
+in the last level cache, below that it sends every pass to memory.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+
+from results import load_records
+
+PAIRS = {'StreamingWrite': 'SequentialWrite', 'StreamingIterate': 'SequentialIterate'}
+
+
+def store_points(records):
+    """{(fixture, threads, kernel, size): (ns per element and pass, gb_per_s)} for the SIMD iterate kernels"""
+    points = {}
+    for record in records:
+        kernel = record.get('kernel')
+        if kernel not in PAIRS and kernel not in PAIRS.values() or 'gb_per_s' not in record:
+            continue
+        key = (record['fixture'], record.get('threads', 1), kernel, record['size'])
+        # per element and pass, BENCH_CALIBRATE may pick different loops for the two kernels
+        points[key] = (record['ns_per_element'], record['gb_per_s'])
+    return points
+
+
+def speedups(points):
+    """{streaming kernel: {(fixture, threads): [(size, regular ns / streaming ns, regular GB/s, streaming GB/s)]}}"""
+    curves = {}
+    for (fixture, threads, kernel, size), (ns, bandwidth) in points.items():
+        regular = points.get((fixture, threads, PAIRS.get(kernel), size))
+        if regular is None:
+            continue
+        curve = curves.setdefault(kernel, {}).setdefault((fixture, threads), [])
+        curve.append((size, regular[0] / ns, regular[1], bandwidth))
+    return {kernel: {key: sorted(curve) for key, curve in sorted(by_fixture.items())} for kernel, by_fixture in curves.items()}
+
+
+def print_speedups(curves):
+    for kernel, by_fixture in curves.items():
+        for (fixture, threads), curve in by_fixture.items():
+            print(f"\n{kernel} against {PAIRS[kernel]}: {fixture}, {threads} threads")
+            for size, speedup, regular, streaming in curve:
+                print(f"  {size:>9}  x{speedup:5.2f}  {regular:7.2f} -> {streaming:7.2f} GB/s")
+
+
+def plot_speedups(curves):
+    if not curves:
+        return
+
+    fig, axes = plt.subplots(1, len(curves), figsize=(8 * len(curves), 6), squeeze=False)
+    fig.suptitle('Non-temporal stores against regular stores', fontsize=16, fontweight='bold')
+
+    for ax, (kernel, by_fixture) in zip(axes[0], sorted(curves.items())):
+        for (fixture, threads), curve in by_fixture.items():
+            ax.plot([p[0] for p in curve], [p[1] for p in curve], marker='o', label=f'{fixture} {threads}t')
+        ax.axhline(1, color='black', linewidth=0.8)
+        ax.set_title(f'{kernel} / {PAIRS[kernel]}', fontweight='bold')
+        ax.set_xscale('log', base=2)
+        ax.set_yscale('log', base=2)
+        ax.set_xlabel('Array size')
+        ax.set_ylabel('regular time / streaming time')
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=6)
+
+    plt.tight_layout()
+    plt.savefig('streaming_stores.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    curves = speedups(store_points(load_records(*sys.argv[1:])))
+    print_speedups(curves)
+    plot_speedups(curves)
@@ -0,0 +1,90 @@
+"""Break-even of transposing or packing B once against the plain ikj multiply.
+
+For every fixture, dtype and thread count prints the time of TransposedMul and
+PackedBMul split into the one-time preparation of B and the multiply, relative to
+OptimizedMul, and the smallest size from which they stay ahead. Plots the ratios.
+"""
+import sys
+
+import matplotlib.pyplot as plt
+
+from results import load_records
+
+KERNELS = {'TransposedMul': 'transpose_ns', 'PackedBMul': 'pack_ns'}
+
+
+def medians(records):
+    """{(fixture, threads, kernel, size): (median ns, preparation ns)}"""
+    points = {}
+    for record in records:
+        kernel = record.get('kernel')
+        if kernel != 'OptimizedMul' and kernel not in KERNELS:
+            continue
+        key = (record['fixture'], record.get('threads', 1), kernel, record['size'])
+        points[key] = (record.get('median_ns', record['ns']), record.get(KERNELS.get(kernel), 0.0))
+    return points
+
+
+def ratios(points):
+    """{(fixture, threads, kernel): [(size, total / ikj, preparation / ikj)]} sorted by size"""
+    curves = {}
+    for (fixture, threads, kernel, size), (ns, prepare) in points.items():
+        baseline = points.get((fixture, threads, 'OptimizedMul', size))
+        if kernel == 'OptimizedMul' or baseline is None:
+            continue
+        curves.setdefault((fixture, threads, kernel), []).append((size, ns / baseline[0], prepare / baseline[0]))
+    return {key: sorted(values) for key, values in sorted(curves.items())}
+
+
+def break_even(curve):
+    """Smallest size from which the kernel beats ikj at every larger size, None if it never does"""
+    size = None
+    for point_size, ratio, _ in reversed(curve):
+        if ratio >= 1:
+            break
+        size = point_size
+    return size
+
+
+def print_break_even(curves):
+    for (fixture, threads, kernel), curve in curves.items():
+        print(f"\n{fixture} {kernel}, {threads} threads: break-even at {break_even(curve)}")
+        for size, ratio, prepare in curve:
+            print(f"  {size:>5}  x{ratio:5.2f} of ikj, preparation x{prepare:6.4f}")
+
+
+def plot_ratios(curves):
+    if not curves:
+        return
+
+    fig, axes = plt.subplots(1, len(KERNELS), figsize=(16, 6), squeeze=False)
+    fig.suptitle('Transposed and packed B against ikj', fontsize=16, fontweight='bold')
+
+    for ax, kernel in zip(axes[0], KERNELS):
+        for (fixture, threads, curve_kernel), curve in curves.items():
+            if curve_kernel != kernel:
+                continue
+            sizes = [p[0] for p in curve]
+            line, = ax.plot(sizes, [p[1] for p in curve], marker='o', label=f'{fixture} {threads}t')
+            ax.plot(sizes, [p[2] for p in curve], linestyle=':', color=line.get_color())
+        ax.axhline(1, color='black', linewidth=0.8)
+        ax.set_title(f'{kernel} (dotted: preparation of B)', fontweight='bold')
+        ax.set_xscale('log', base=2)
+        ax.set_yscale('log')
+        ax.set_xlabel('Matrix size')
+        ax.set_ylabel('time / OptimizedMul')
+        ax.grid(True, alpha=0.3)
+        ax.legend(fontsize=7)
+
+    plt.tight_layout()
+    plt.savefig('transposed_matrix.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(f'usage: {sys.argv[0]} results.jsonl [results.jsonl ...]')
+
+    curves = ratios(medians(load_records(*sys.argv[1:])))
+    print_break_even(curves)
+    plot_ratios(curves)
@@ -1,8 +1,8 @@
 #pragma once
 
-#include <gtest/gtest.h>
+#include "utils/thread_pool.hpp"
 
-#include <thread>
+#include <gtest/gtest.h>
 
 template <typename T>
 class CArrayShared;
@@ -18,7 +18,9 @@ protected:
     void TearDown() override;
 public:
     T* array;
-    std::vector<std::thread> threads;
+    // outer passes over the array, fixed unless BENCH_CALIBRATE is set
+    size_t loops;
+    std::vector<task_function> tasks;
 
     void runTest(iterate_function<T> iterate);
 
@@ -45,3 +47,20 @@ static void jump_iterate(size_t start, size_t end, const CArrayShared<T>* test);
 
 template <typename T>
 static void reverse_jump_iterate(size_t start, size_t end, const CArrayShared<T>* test);
+
+// CArrayShared plus, inside every worker's slice, a shuffled index and a random cycle
+// over the slice's elements, walked by the random-access kernels
+template <typename T>
+class CArraySharedRandom : public CArrayShared<T> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    // every element of a slice once, in shuffled order, at the slice's own positions
+    size_t* index;
+    // next[j] is the element visited after j, one cycle per slice
+    size_t* next;
+
+    void runRandomTest(std::function<void(size_t, size_t, const CArraySharedRandom<T>*)> iterate);
+};
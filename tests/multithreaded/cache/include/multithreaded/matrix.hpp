@@ -1,6 +1,8 @@
 #pragma once
 
-#include <thread>
+#include "utils/thread_pool.hpp"
+#include "utils/tile_executor.hpp"
+
 #include <gtest/gtest.h>
 
 template <typename T>
@@ -9,6 +11,9 @@ class CMatrixShared;
 template <typename T>
 using mul_function = std::function<void(size_t, size_t, size_t, size_t, CMatrixShared<T>*)>;
 
+template <typename T>
+using prepare_function = std::function<void(size_t, size_t, CMatrixShared<T>*)>;
+
 template <typename T>
 class CMatrixShared : public testing::TestWithParam<std::tuple<size_t, size_t>> {
 protected:
@@ -20,9 +25,22 @@ public:
     T** matrix_B;
     T** matrix_C;
 
-    std::vector<std::thread> threads;
+    std::vector<task_function> tasks;
+    TileExecutor executor;
     
+    // one C block per thread on a grid_shape() grid
     void runTest(mul_function<T> mul);
+
+    // tile_size() C tiles on the work-stealing executor
+    void runTiledTest(mul_function<T> mul);
+
+    // B^T or B in column panels, allocated on first use with room for the packed layout
+    T* prepared_B = nullptr;
+    std::vector<double> prepare_ns;
+
+    // prepares B by row bands on the pool and times that on its own, then runs mul with
+    // whole C rows per thread, so every row meets whole B panels
+    void runPreparedTest(prepare_function<T> prepare, mul_function<T> mul);
     
     static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t>>& info) {
         size_t totalSize, numThreads;
@@ -36,3 +54,45 @@ static void naive_mul(size_t startRow, size_t endRow, size_t startCol, size_t en
 
 template <typename T>
 static void optimized_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const CMatrixShared<T>* test);
+
+// rows [startRow, endRow) of B into prepared_B, transposed
+template <typename T>
+static void transpose_b(size_t startRow, size_t endRow, const CMatrixShared<T>* test);
+
+// rows [startRow, endRow) of B into the PACKED_B_WIDTH column panels of prepared_B
+template <typename T>
+static void pack_b(size_t startRow, size_t endRow, const CMatrixShared<T>* test);
+
+template <typename T>
+static void transposed_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const CMatrixShared<T>* test);
+
+template <typename T>
+static void packed_b_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const CMatrixShared<T>* test);
+
+// (size, threads, l1 tile, l2 tile)
+template <typename T>
+class CMatrixSharedBlocked : public testing::TestWithParam<std::tuple<size_t, size_t, size_t, size_t>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T** matrix_A;
+    T** matrix_B;
+    T** matrix_C;
+
+    std::vector<task_function> tasks;
+
+    // ikj over the C block in l1 x l1 blocks of l2 x l2 panels of B, see for_each_block()
+    void blocked_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol);
+
+    // one C block per thread on a grid_shape() grid
+    void runTest();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t, size_t, size_t>>& info) {
+        size_t totalSize, numThreads, l1, l2;
+        std::tie(totalSize, numThreads, l1, l2) = info.param;
+        return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize) + "_threads_" + std::to_string(numThreads) +
+               "_l1_" + std::to_string(l1) + "_l2_" + std::to_string(l2);
+    }
+};
@@ -1,6 +1,8 @@
 #pragma once
 
-#include <thread>
+#include "utils/thread_pool.hpp"
+#include "utils/tile_executor.hpp"
+
 #include <gtest/gtest.h>
 
 template <typename T>
@@ -9,6 +11,9 @@ class CMatrixArrayShared;
 template <typename T>
 using mul_function = std::function<void(size_t, size_t, size_t, size_t, CMatrixArrayShared<T>*)>;
 
+template <typename T>
+using prepare_function = std::function<void(size_t, size_t, CMatrixArrayShared<T>*)>;
+
 template <typename T>
 class CMatrixArrayShared : public testing::TestWithParam<std::tuple<size_t, size_t>> {
 protected:
@@ -20,9 +25,26 @@ public:
     T* matrix_B;
     T* matrix_C;
 
-    std::vector<std::thread> threads;
+    std::vector<task_function> tasks;
+    TileExecutor executor;
     
+    // one C block per thread on a grid_shape() grid
     void runTest(mul_function<T> mul);
+
+    // tile_size() C tiles on the work-stealing executor
+    void runTiledTest(mul_function<T> mul);
+
+    // B^T or B in column panels, allocated on first use with room for the packed layout
+    T* prepared_B = nullptr;
+    std::vector<double> prepare_ns;
+
+    // prepares B by row bands on the pool and times that on its own, then runs mul with
+    // whole C rows per thread, so every row meets whole B panels
+    void runPreparedTest(prepare_function<T> prepare, mul_function<T> mul);
+
+    // C cut by split_tiles() into a few tiles per thread on the work-stealing executor,
+    // mul recurses inside each of them
+    void runRecursiveTest(mul_function<T> mul);
     
     static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t>>& info) {
         size_t totalSize, numThreads;
@@ -36,3 +58,92 @@ static void naive_mul(size_t startRow, size_t endRow, size_t startCol, size_t en
 
 template <typename T>
 static void optimized_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const CMatrixArrayShared<T>* test);
+
+// rows [startRow, endRow) of B into prepared_B, transposed
+template <typename T>
+static void transpose_b(size_t startRow, size_t endRow, const CMatrixArrayShared<T>* test);
+
+// rows [startRow, endRow) of B into the PACKED_B_WIDTH column panels of prepared_B
+template <typename T>
+static void pack_b(size_t startRow, size_t endRow, const CMatrixArrayShared<T>* test);
+
+template <typename T>
+static void transposed_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const CMatrixArrayShared<T>* test);
+
+// ikj on the blocks of a cache-oblivious recursion over the C block, see for_each_recursive_block()
+template <typename T>
+static void recursive_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const CMatrixArrayShared<T>* test);
+
+template <typename T>
+static void packed_b_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const CMatrixArrayShared<T>* test);
+
+// (size, threads, l1 tile, l2 tile)
+template <typename T>
+class CMatrixArraySharedBlocked : public testing::TestWithParam<std::tuple<size_t, size_t, size_t, size_t>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* matrix_A;
+    T* matrix_B;
+    T* matrix_C;
+
+    std::vector<task_function> tasks;
+
+    // ikj over the C block in l1 x l1 blocks of l2 x l2 panels of B, see for_each_block()
+    void blocked_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol);
+
+    // one C block per thread on a grid_shape() grid
+    void runTest();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t, size_t, size_t>>& info) {
+        size_t totalSize, numThreads, l1, l2;
+        std::tie(totalSize, numThreads, l1, l2) = info.param;
+        return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize) + "_threads_" + std::to_string(numThreads) +
+               "_l1_" + std::to_string(l1) + "_l2_" + std::to_string(l2);
+    }
+};
+
+// (size, threads, Strassen-Winograd cutoff)
+template <typename T>
+class CMatrixArrayStrassen : public testing::TestWithParam<std::tuple<size_t, size_t, size_t>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* matrix_A;
+    T* matrix_B;
+    T* matrix_C;
+
+    std::vector<task_function> tasks;
+
+    // S1..S4 and T1..T4, the products M5..M7 and one recursion workspace per thread,
+    // allocated on first use. M1..M4 are kept in the quadrants of C.
+    T* scratch = nullptr;
+
+    // the sums of quadrants the products take, for the rows [startRow, endRow) of a quadrant
+    void operand_sums(size_t startRow, size_t endRow);
+
+    // M1..M7 from `first` in steps of `step`, each by strassen_mul() in its own workspace
+    void products(size_t first, size_t step, T* workspace);
+
+    // the quadrants of C from M1..M7, for the rows [startRow, endRow) of a quadrant
+    void combine(size_t startRow, size_t endRow);
+
+    // C = A * B by one Strassen-Winograd level on the pool: the operand sums and the
+    // combination by row bands, the seven products spread over the threads, so no more
+    // than seven threads are busy in between. Below it, every product recurses serially.
+    void runTest();
+
+    // max |C - A * B| / max |A * B| over STRASSEN_CHECK_ROWS rows of C recomputed by the classical kernel
+    void record_error();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t, size_t>>& info) {
+        size_t totalSize, numThreads, cutoff;
+        std::tie(totalSize, numThreads, cutoff) = info.param;
+        return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize) + "_threads_" + std::to_string(numThreads) +
+               "_cutoff_" + std::to_string(cutoff);
+    }
+};
@@ -0,0 +1,29 @@
+#pragma once
+
+#include "utils/thread_pool.hpp"
+#include "utils/stream.hpp"
+
+#include <gtest/gtest.h>
+
+// The three STREAM arrays of `size` elements each, a = 1, b = 2, c = 0 after SetUp,
+// every worker owning the same contiguous slice of all three
+template <typename T>
+class CStreamShared : public testing::TestWithParam<std::tuple<size_t, size_t>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* a;
+    T* b;
+    T* c;
+    std::vector<task_function> tasks;
+
+    void runTest(StreamKernel kernel);
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t>>& info) {
+        size_t totalSize, numThreads;
+        std::tie(totalSize, numThreads) = info.param;
+        return "size_" + std::to_string(totalSize) + "_threads_" + std::to_string(numThreads);
+    }
+};
@@ -1,28 +1,39 @@
 #include "multithreaded/iterate.hpp"
 #include "utils/utils.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
+#include "utils/first_touch.hpp"
+#include "utils/permutation.hpp"
 
 template <typename T>
 void CArrayShared<T>::SetUp() {
-    size_t size;
-    std::tie(size, std::ignore) = this->GetParam();
+    size_t size, numThreads;
+    std::tie(size, numThreads) = this->GetParam();
     size_t totalSize = size * sizeof *array;
 
     array = (T*) safe_malloc(totalSize);
     ASSERT_NE(array, nullptr) << "Unable to alloc array of size " << size;
 
-    memset(array, 1, totalSize);
+    std::vector<Tile> slices = grid_tiles(size, 1, numThreads, 1);
+    first_touch(slices.size(), [&](size_t i) { fill_tile(array, 1, slices[i], 1); });
+
+    loops = LOOP_COUNT_200K;
+
+    record_thread_setup(numThreads);
 }
 
 template <typename T>
 void CArrayShared<T>::TearDown() {
-    free(array);
-    threads.clear();
+    record_worker_timings();
+
+    safe_free(array);
+    tasks.clear();
 }
 
 template <typename T>
 void sequential_iterate(size_t start, size_t end, const CArrayShared<T>* test) {
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
         for (size_t j = start; j < end; j++) {
             test->array[j]++;
         }
@@ -31,7 +42,8 @@ void sequential_iterate(size_t start, size_t end, const CArrayShared<T>* test) {
 
 template <typename T>
 void reverse_sequential_iterate(size_t start, size_t end, const CArrayShared<T>* test) {
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
         for (int j = (int)end - 1; j >= (int)start; j--) {
             test->array[j]++;
         }
@@ -40,7 +52,8 @@ void reverse_sequential_iterate(size_t start, size_t end, const CArrayShared<T>*
 
 template <typename T>
 void neighbour_sequential_iterate(size_t size, size_t start, size_t increment, const CArrayShared<T>* test) {
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
         for (size_t j = start; j + start < size - 1; j += increment) {
             test->array[j]++;
         }
@@ -52,7 +65,8 @@ void jump_iterate(size_t start, size_t end, const CArrayShared<T>* test) {
     constexpr size_t element_size = sizeof(T),
                      jump_size    = CACHE_LINE / element_size;
     
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
         for (size_t k = start; k < jump_size; k++) {
             size_t j = k;
             while (j < end) {
@@ -69,7 +83,8 @@ void reverse_jump_iterate(size_t start, size_t end, const CArrayShared<T>* test)
     constexpr size_t element_size = sizeof(T),
                      jump_size    = CACHE_LINE / element_size;
 
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
         for (size_t k = 0; k < jump_size; k++) {
             size_t remainder = (end - 1 - start - k) % jump_size;
             int j = (int)(end - 1 - remainder);
@@ -87,21 +102,13 @@ void CArrayShared<T>::runTest(iterate_function<T> iterate) {
     size_t totalSize, numThreads;
     std::tie(totalSize, numThreads) = this->GetParam();
 
-    size_t sliceSize = totalSize / numThreads, 
-           remainder = totalSize % numThreads,
-           start     = 0;
-    
-    for (size_t i = 0; i < numThreads; i++) {
-        size_t currentSliceSize = sliceSize + (i < remainder ? 1 : 0);
-        size_t end = start + currentSliceSize;
-        
-        threads.emplace_back(iterate, start, end, this);
-        start = end;
+    // the slices SetUp first touched
+    for (const Tile& slice : grid_tiles(totalSize, 1, numThreads, 1)) {
+        tasks.emplace_back(std::bind(iterate, slice.row_begin, slice.row_end, this));
     }
 
-    for (auto& thread : threads) {
-        thread.join();
-    }
+    thread_pool().run(tasks);
+    tasks.clear();
 }
 
 template <typename T>
@@ -110,12 +117,11 @@ void CArrayShared<T>::runNeighbourTest() {
     std::tie(totalSize, numThreads) = this->GetParam();
     
     for (size_t i = 0; i < numThreads; i++) {
-        threads.emplace_back(neighbour_sequential_iterate<T>, totalSize, i, numThreads, this);
+        tasks.emplace_back(std::bind(neighbour_sequential_iterate<T>, totalSize, i, numThreads, this));
     }
 
-    for (auto& thread : threads) {
-        thread.join();
-    }
+    thread_pool().run(tasks);
+    tasks.clear();
 }
 
 using CArraySharedInt = CArrayShared<int>;
@@ -123,63 +129,63 @@ using CArraySharedLong = CArrayShared<long>;
 using CArraySharedDouble = CArrayShared<double>;
 
 TEST_P(CArraySharedInt, SequentialIterate) {
-    this->runTest(sequential_iterate<int>);
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runTest(sequential_iterate<int>); });
 }
 
 TEST_P(CArraySharedLong, SequentialIterate) {
-    this->runTest(sequential_iterate<long>);
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runTest(sequential_iterate<long>); });
 }
 
 TEST_P(CArraySharedDouble, SequentialIterate) {
-    this->runTest(sequential_iterate<double>);
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runTest(sequential_iterate<double>); });
 }
 
 TEST_P(CArraySharedInt, DISABLED_ReverseSequentialIterate) {
-    this->runTest(reverse_sequential_iterate<int>);
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runTest(reverse_sequential_iterate<int>); });
 }
 
 TEST_P(CArraySharedLong, DISABLED_ReverseSequentialIterate) {
-    this->runTest(reverse_sequential_iterate<long>);
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runTest(reverse_sequential_iterate<long>); });
 }
 
 TEST_P(CArraySharedDouble, DISABLED_ReverseSequentialIterate) {
-    this->runTest(reverse_sequential_iterate<double>);
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runTest(reverse_sequential_iterate<double>); });
 }
 
 TEST_P(CArraySharedInt, DISABLED_NeighbourSequentialIterate) {
-    this->runNeighbourTest();
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runNeighbourTest(); });
 }
 
 TEST_P(CArraySharedLong, DISABLED_NeighbourSequentialIterate) {
-    this->runNeighbourTest();
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runNeighbourTest(); });
 }
 
 TEST_P(CArraySharedDouble, DISABLED_NeighbourSequentialIterate) {
-    this->runNeighbourTest();
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runNeighbourTest(); });
 }
 
 TEST_P(CArraySharedInt, DISABLED_JumpIterate) {
-    this->runTest(jump_iterate<int>);
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runTest(jump_iterate<int>); });
 }
 
 TEST_P(CArraySharedLong, DISABLED_JumpIterate) {
-    this->runTest(jump_iterate<long>);
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runTest(jump_iterate<long>); });
 }
 
 TEST_P(CArraySharedDouble, DISABLED_JumpIterate) {
-    this->runTest(jump_iterate<double>);
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runTest(jump_iterate<double>); });
 }
 
 TEST_P(CArraySharedInt, DISABLED_ReverseJumpIterate) {
-    this->runTest(reverse_jump_iterate<int>);
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runTest(reverse_jump_iterate<int>); });
 }
 
 TEST_P(CArraySharedLong, DISABLED_ReverseJumpIterate) {
-    this->runTest(reverse_jump_iterate<long>);
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runTest(reverse_jump_iterate<long>); });
 }
 
 TEST_P(CArraySharedDouble, DISABLED_ReverseJumpIterate) {
-    this->runTest(reverse_jump_iterate<double>);
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runTest(reverse_jump_iterate<double>); });
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -212,3 +218,124 @@ INSTANTIATE_TEST_SUITE_P(
     ),
     CArraySharedDouble::getTestCaseName
 );
+
+template <typename T>
+void random_iterate(size_t start, size_t end, const CArraySharedRandom<T>* test) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
+        for (size_t j = start; j < end; j++) {
+            test->array[test->index[j]]++;
+        }
+    }
+}
+
+// every address depends on the previous load, so the misses of one worker cannot overlap
+template <typename T>
+void pointer_chase(size_t start, size_t end, const CArraySharedRandom<T>* test) {
+    size_t j = start;
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
+        for (size_t k = start; k < end; k++) {
+            j = test->next[j];
+            test->array[j]++;
+        }
+    }
+}
+
+template <typename T>
+void CArraySharedRandom<T>::SetUp() {
+    CArrayShared<T>::SetUp();
+    size_t size, numThreads;
+    std::tie(size, numThreads) = this->GetParam();
+
+    ASSERT_NO_THROW(index = (size_t*) safe_malloc(size * sizeof(size_t)));
+    ASSERT_NO_THROW(next = (size_t*) safe_malloc(size * sizeof(size_t)));
+
+    // the permutations stay inside the runTest slices, each worker still only touches its own
+    std::vector<Tile> slices = grid_tiles(size, 1, numThreads, 1);
+    for (size_t i = 0; i < slices.size(); i++) {
+        shuffled_indices(index, slices[i].row_begin, slices[i].row_end, PERMUTATION_SEED + static_cast<unsigned>(i));
+        random_cycle(next, slices[i].row_begin, slices[i].row_end, PERMUTATION_SEED + static_cast<unsigned>(i));
+    }
+
+    // a miss per element costs far more than a sequential pass, the small sizes need BENCH_CALIBRATE
+    this->loops = LOOP_COUNT_18;
+}
+
+template <typename T>
+void CArraySharedRandom<T>::TearDown() {
+    safe_free(index);
+    safe_free(next);
+    CArrayShared<T>::TearDown();
+}
+
+template <typename T>
+void CArraySharedRandom<T>::runRandomTest(std::function<void(size_t, size_t, const CArraySharedRandom<T>*)> iterate) {
+    size_t totalSize, numThreads;
+    std::tie(totalSize, numThreads) = this->GetParam();
+
+    for (const Tile& slice : grid_tiles(totalSize, 1, numThreads, 1)) {
+        this->tasks.emplace_back(std::bind(iterate, slice.row_begin, slice.row_end, this));
+    }
+
+    thread_pool().run(this->tasks);
+    this->tasks.clear();
+}
+
+using CArraySharedRandomInt = CArraySharedRandom<int>;
+using CArraySharedRandomLong = CArraySharedRandom<long>;
+using CArraySharedRandomDouble = CArraySharedRandom<double>;
+
+TEST_P(CArraySharedRandomInt, RandomIterate) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runRandomTest(random_iterate<int>); });
+}
+
+TEST_P(CArraySharedRandomLong, RandomIterate) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runRandomTest(random_iterate<long>); });
+}
+
+TEST_P(CArraySharedRandomDouble, RandomIterate) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runRandomTest(random_iterate<double>); });
+}
+
+TEST_P(CArraySharedRandomInt, PointerChase) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runRandomTest(pointer_chase<int>); });
+}
+
+TEST_P(CArraySharedRandomLong, PointerChase) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runRandomTest(pointer_chase<long>); });
+}
+
+TEST_P(CArraySharedRandomDouble, PointerChase) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] { this->runRandomTest(pointer_chase<double>); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CArraySharedRandomInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(ARRAY_SIZES),
+        ::testing::ValuesIn(NUM_THREADS)
+    ),
+    CArraySharedRandomInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CArraySharedRandomLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(ARRAY_SIZES),
+        ::testing::ValuesIn(NUM_THREADS)
+    ),
+    CArraySharedRandomLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CArraySharedRandomDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(ARRAY_SIZES),
+        ::testing::ValuesIn(NUM_THREADS)
+    ),
+    CArraySharedRandomDouble::getTestCaseName
+);
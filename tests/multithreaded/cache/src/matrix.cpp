@@ -1,8 +1,9 @@
 #include "multithreaded/matrix.hpp"
 #include "utils/utils.hpp"
 #include "utils/constants.hpp"
-
-#include <cmath>
+#include "utils/harness.hpp"
+#include "utils/blocking.hpp"
+#include "utils/transpose.hpp"
 
 template <typename T>
 void CMatrixShared<T>::SetUp() {
@@ -12,16 +13,26 @@ void CMatrixShared<T>::SetUp() {
     ASSERT_NO_THROW(create_matrix(matrix_A, size));
     ASSERT_NO_THROW(create_matrix(matrix_B, size));
     ASSERT_NO_THROW(create_matrix(matrix_C, size));
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+
+    record_thread_setup(numThreads);
 }
 
 template <typename T>
 void CMatrixShared<T>::TearDown() {
+    record_worker_timings();
+    executor.record();
+
     size_t size, numThreads;
     std::tie(size, numThreads) = this->GetParam();
 
     free_matrix(reinterpret_cast<void**&>(matrix_A), size);
     free_matrix(reinterpret_cast<void**&>(matrix_B), size);
     free_matrix(reinterpret_cast<void**&>(matrix_C), size);
+    safe_free(prepared_B);
+    prepared_B = nullptr;
 }
 
 template <typename T>
@@ -29,6 +40,7 @@ void naive_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, c
     size_t matrixSize, numThreads;
     std::tie(matrixSize, numThreads) = test->GetParam();
     
+    RegionTimer region;
     for (size_t i = startRow; i < endRow; i++) {
         for (size_t j = startCol; j < endCol; j++) {
             for (size_t k = 0; k < matrixSize; k++) {
@@ -43,6 +55,7 @@ void optimized_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCo
     size_t matrixSize, numThreads;
     std::tie(matrixSize, numThreads) = test->GetParam();
     
+    RegionTimer region;
     for (size_t i = startRow; i < endRow; i++) {
         for (size_t k = 0; k < matrixSize; k++) {
             for (size_t j = startCol; j < endCol; j++) {
@@ -52,46 +65,94 @@ void optimized_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCo
     }
 }
 
+template <typename T>
+void transpose_b(size_t startRow, size_t endRow, const CMatrixShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    transpose(test->matrix_B, test->prepared_B, matrixSize, startRow, endRow);
+}
+
+template <typename T>
+void pack_b(size_t startRow, size_t endRow, const CMatrixShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    pack_columns(test->matrix_B, test->prepared_B, matrixSize, startRow, endRow);
+}
+
+template <typename T>
+void transposed_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const CMatrixShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    RegionTimer region;
+    for (size_t i = startRow; i < endRow; i++) {
+        for (size_t j = startCol; j < endCol; j++) {
+            test->matrix_C[i][j] += dot(test->matrix_A[i], &test->prepared_B[j * matrixSize], matrixSize);
+        }
+    }
+}
+
+template <typename T>
+void packed_b_mul(size_t startRow, size_t endRow, size_t, size_t, const CMatrixShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    RegionTimer region;
+    for (size_t i = startRow; i < endRow; i++) {
+        packed_row_mul(test->matrix_A[i], test->prepared_B, test->matrix_C[i], matrixSize);
+    }
+}
+
 template <typename T>
 void CMatrixShared<T>::runTest(mul_function<T> mul) {
     size_t matrixSize, numThreads;
     std::tie(matrixSize, numThreads) = this->GetParam();
 
-    size_t gridSize = static_cast<size_t>(std::sqrt(numThreads));
-    if (gridSize * gridSize != numThreads) {
-        size_t rowsPerThread = matrixSize / numThreads;
-        size_t remainder = matrixSize % numThreads;
-        size_t startRow = 0;
-        
-        for (size_t i = 0; i < numThreads; i++) {
-            size_t currentRows = rowsPerThread + (i < remainder ? 1 : 0);
-            size_t endRow = startRow + currentRows;
-            
-            threads.emplace_back(mul, startRow, endRow, 0, matrixSize, this);
-            startRow = endRow;
-        }
-    } else {
-        size_t blockRows = matrixSize / gridSize;
-        size_t blockCols = matrixSize / gridSize;
-        size_t rowRemainder = matrixSize % gridSize;
-        size_t colRemainder = matrixSize % gridSize;
-        
-        for (size_t i = 0; i < gridSize; i++) {
-            for (size_t j = 0; j < gridSize; j++) {
-                size_t startRow = i * blockRows + std::min(i, rowRemainder);
-                size_t endRow = startRow + blockRows + (i < rowRemainder ? 1 : 0);
-                
-                size_t startCol = j * blockCols + std::min(j, colRemainder);
-                size_t endCol = startCol + blockCols + (j < colRemainder ? 1 : 0);
-                
-                threads.emplace_back(mul, startRow, endRow, startCol, endCol, this);
-            }
-        }
+    size_t gridRows, gridCols;
+    std::tie(gridRows, gridCols) = grid_shape(numThreads);
+
+    for (const Tile& block : grid_tiles(matrixSize, matrixSize, gridRows, gridCols)) {
+        tasks.emplace_back(std::bind(mul, block.row_begin, block.row_end, block.col_begin, block.col_end, this));
+    }
+
+    thread_pool().run(tasks);
+    tasks.clear();
+}
+
+template <typename T>
+void CMatrixShared<T>::runTiledTest(mul_function<T> mul) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = this->GetParam();
+
+    std::vector<Tile> tiles = make_tiles(matrixSize, matrixSize, tile_size(), tile_size());
+    executor.run(tiles, numThreads, [this, &mul](const Tile& tile) {
+        mul(tile.row_begin, tile.row_end, tile.col_begin, tile.col_end, this);
+    });
+}
+
+template <typename T>
+void CMatrixShared<T>::runPreparedTest(prepare_function<T> prepare, mul_function<T> mul) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = this->GetParam();
+
+    if (prepared_B == nullptr) {
+        prepared_B = (T*) safe_malloc(packed_panels(matrixSize) * PACKED_B_WIDTH * matrixSize * sizeof(T));
+    }
+
+    std::vector<Tile> bands = grid_tiles(matrixSize, matrixSize, numThreads, 1);
+    for (const Tile& band : bands) {
+        tasks.emplace_back(std::bind(prepare, band.row_begin, band.row_end, this));
     }
+    prepare_ns.push_back(time_once([&] { thread_pool().run(tasks); }));
+    tasks.clear();
 
-    for (auto& thread : threads) {
-        thread.join();
+    for (const Tile& band : bands) {
+        tasks.emplace_back(std::bind(mul, band.row_begin, band.row_end, band.col_begin, band.col_end, this));
     }
+    thread_pool().run(tasks);
+    tasks.clear();
 }
 
 using CMatrixSharedInt = CMatrixShared<int>;
@@ -99,27 +160,69 @@ using CMatrixSharedLong = CMatrixShared<long>;
 using CMatrixSharedDouble = CMatrixShared<double>;
 
 TEST_P(CMatrixSharedInt, DISABLED_NaiveMul) {
-    this->runTest(::naive_mul<int>);
+    measure([&] { this->runTest(::naive_mul<int>); });
 }
 
 TEST_P(CMatrixSharedLong, DISABLED_NaiveMul) {
-    this->runTest(::naive_mul<long>);
+    measure([&] { this->runTest(::naive_mul<long>); });
 }
 
 TEST_P(CMatrixSharedDouble, DISABLED_NaiveMul) {
-    this->runTest(::naive_mul<double>);
+    measure([&] { this->runTest(::naive_mul<double>); });
 }
 
 TEST_P(CMatrixSharedInt, OptimizedMul) {
-    this->runTest(::optimized_mul<int>);
+    measure([&] { this->runTest(::optimized_mul<int>); });
 }
 
 TEST_P(CMatrixSharedLong, OptimizedMul) {
-    this->runTest(::optimized_mul<long>);
+    measure([&] { this->runTest(::optimized_mul<long>); });
 }
 
 TEST_P(CMatrixSharedDouble, OptimizedMul) {
-    this->runTest(::optimized_mul<double>);
+    measure([&] { this->runTest(::optimized_mul<double>); });
+}
+
+TEST_P(CMatrixSharedInt, OptimizedMulTiled) {
+    measure([&] { this->runTiledTest(::optimized_mul<int>); });
+}
+
+TEST_P(CMatrixSharedLong, OptimizedMulTiled) {
+    measure([&] { this->runTiledTest(::optimized_mul<long>); });
+}
+
+TEST_P(CMatrixSharedDouble, OptimizedMulTiled) {
+    measure([&] { this->runTiledTest(::optimized_mul<double>); });
+}
+
+TEST_P(CMatrixSharedInt, TransposedMul) {
+    SampleStats stats = measure([&] { this->runPreparedTest(::transpose_b<int>, ::transposed_mul<int>); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(CMatrixSharedLong, TransposedMul) {
+    SampleStats stats = measure([&] { this->runPreparedTest(::transpose_b<long>, ::transposed_mul<long>); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(CMatrixSharedDouble, TransposedMul) {
+    SampleStats stats = measure([&] { this->runPreparedTest(::transpose_b<double>, ::transposed_mul<double>); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(CMatrixSharedInt, PackedBMul) {
+    SampleStats stats = measure([&] { this->runPreparedTest(::pack_b<int>, ::packed_b_mul<int>); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(CMatrixSharedLong, PackedBMul) {
+    SampleStats stats = measure([&] { this->runPreparedTest(::pack_b<long>, ::packed_b_mul<long>); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(CMatrixSharedDouble, PackedBMul) {
+    SampleStats stats = measure([&] { this->runPreparedTest(::pack_b<double>, ::packed_b_mul<double>); });
+    record_phase("pack", prepare_ns, stats);
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -151,3 +254,116 @@ INSTANTIATE_TEST_SUITE_P(
     ),
     CMatrixSharedDouble::getTestCaseName
 );
+
+template <typename T>
+void CMatrixSharedBlocked<T>::SetUp() {
+    size_t size, numThreads, l1, l2;
+    std::tie(size, numThreads, l1, l2) = this->GetParam();
+
+    ASSERT_NO_THROW(create_matrix(matrix_A, size));
+    ASSERT_NO_THROW(create_matrix(matrix_B, size));
+    ASSERT_NO_THROW(create_matrix(matrix_C, size));
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+
+    record_thread_setup(numThreads);
+}
+
+template <typename T>
+void CMatrixSharedBlocked<T>::TearDown() {
+    record_worker_timings();
+
+    size_t size, numThreads, l1, l2;
+    std::tie(size, numThreads, l1, l2) = this->GetParam();
+
+    free_matrix(reinterpret_cast<void**&>(matrix_A), size);
+    free_matrix(reinterpret_cast<void**&>(matrix_B), size);
+    free_matrix(reinterpret_cast<void**&>(matrix_C), size);
+}
+
+template <typename T>
+void CMatrixSharedBlocked<T>::blocked_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol) {
+    size_t matrixSize, numThreads, l1, l2;
+    std::tie(matrixSize, numThreads, l1, l2) = this->GetParam();
+
+    RegionTimer region;
+    for_each_block(startRow, endRow, startCol, endCol, matrixSize, l1, l2,
+                   [this](size_t blockStartRow, size_t blockEndRow, size_t startK, size_t endK, size_t blockStartCol, size_t blockEndCol) {
+        for (size_t i = blockStartRow; i < blockEndRow; i++) {
+            for (size_t k = startK; k < endK; k++) {
+                for (size_t j = blockStartCol; j < blockEndCol; j++) {
+                    matrix_C[i][j] += matrix_A[i][k] * matrix_B[k][j];
+                }
+            }
+        }
+    });
+}
+
+template <typename T>
+void CMatrixSharedBlocked<T>::runTest() {
+    size_t matrixSize, numThreads, l1, l2;
+    std::tie(matrixSize, numThreads, l1, l2) = this->GetParam();
+
+    size_t gridRows, gridCols;
+    std::tie(gridRows, gridCols) = grid_shape(numThreads);
+
+    for (const Tile& block : grid_tiles(matrixSize, matrixSize, gridRows, gridCols)) {
+        tasks.emplace_back(std::bind(&CMatrixSharedBlocked<T>::blocked_mul, this, block.row_begin, block.row_end, block.col_begin, block.col_end));
+    }
+
+    thread_pool().run(tasks);
+    tasks.clear();
+}
+
+using CMatrixSharedBlockedInt = CMatrixSharedBlocked<int>;
+using CMatrixSharedBlockedLong = CMatrixSharedBlocked<long>;
+using CMatrixSharedBlockedDouble = CMatrixSharedBlocked<double>;
+
+TEST_P(CMatrixSharedBlockedInt, BlockedMul) {
+    measure([&] { this->runTest(); });
+}
+
+TEST_P(CMatrixSharedBlockedLong, BlockedMul) {
+    measure([&] { this->runTest(); });
+}
+
+TEST_P(CMatrixSharedBlockedDouble, BlockedMul) {
+    measure([&] { this->runTest(); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CMatrixSharedBlockedInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    CMatrixSharedBlockedInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CMatrixSharedBlockedLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    CMatrixSharedBlockedLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CMatrixSharedBlockedDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    CMatrixSharedBlockedDouble::getTestCaseName
+);
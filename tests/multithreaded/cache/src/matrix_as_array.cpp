@@ -1,7 +1,13 @@
 #include "multithreaded/matrix_as_array.hpp"
 #include "utils/utils.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
+#include "utils/blocking.hpp"
+#include "utils/transpose.hpp"
+#include "utils/strassen.hpp"
+#include "utils/first_touch.hpp"
 
+#include <algorithm>
 #include <cmath>
 
 template <typename T>
@@ -13,18 +19,34 @@ void CMatrixArrayShared<T>::SetUp() {
     ASSERT_NO_THROW(matrix_B = (T*) safe_malloc(size * size * sizeof(T)));
     ASSERT_NO_THROW(matrix_C = (T*) safe_malloc(size * size * sizeof(T)));
 
-    memset(matrix_A, 3, size);
-    memset(matrix_B, 3, size);
-    memset(matrix_C, 0, size);
+    // every worker touches the block of A, B and C at its runTest block of C
+    size_t gridRows, gridCols;
+    std::tie(gridRows, gridCols) = grid_shape(numThreads);
+    std::vector<Tile> blocks = grid_tiles(size, size, gridRows, gridCols);
+    first_touch(blocks.size(), [&](size_t i) {
+        fill_tile(matrix_A, size, blocks[i], 3);
+        fill_tile(matrix_B, size, blocks[i], 3);
+        fill_tile(matrix_C, size, blocks[i], 0);
+    });
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+
+    record_thread_setup(numThreads);
 }
 
 template <typename T>
 void CMatrixArrayShared<T>::TearDown() {
-    free(matrix_A);
-    free(matrix_B);
-    free(matrix_C);
+    record_worker_timings();
+    executor.record();
 
-    threads.clear();
+    safe_free(matrix_A);
+    safe_free(matrix_B);
+    safe_free(matrix_C);
+    safe_free(prepared_B);
+    prepared_B = nullptr;
+
+    tasks.clear();
 }
 
 template <typename T>
@@ -32,6 +54,7 @@ void naive_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, c
     size_t matrixSize, numThreads;
     std::tie(matrixSize, numThreads) = test->GetParam();
     
+    RegionTimer region;
     for (size_t i = startRow; i < endRow; i++) {
         for (size_t j = startCol; j < endCol; j++) {
             for (size_t k = 0; k < matrixSize; k++) {
@@ -46,6 +69,7 @@ void optimized_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCo
     size_t matrixSize, numThreads;
     std::tie(matrixSize, numThreads) = test->GetParam();
     
+    RegionTimer region;
     for (size_t i = startRow; i < endRow; i++) {
         for (size_t k = 0; k < matrixSize; k++) {
             T a_ik = test->matrix_A[i * matrixSize + k];
@@ -57,45 +81,124 @@ void optimized_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCo
 }
 
 template <typename T>
-void CMatrixArrayShared<T>::runTest(mul_function<T> mul) {
+void transpose_b(size_t startRow, size_t endRow, const CMatrixArrayShared<T>* test) {
     size_t matrixSize, numThreads;
-    std::tie(matrixSize, numThreads) = this->GetParam();
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    transpose(test->matrix_B, test->prepared_B, matrixSize, startRow, endRow);
+}
+
+template <typename T>
+void pack_b(size_t startRow, size_t endRow, const CMatrixArrayShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    pack_columns(test->matrix_B, test->prepared_B, matrixSize, startRow, endRow);
+}
+
+template <typename T>
+void transposed_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const CMatrixArrayShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
 
-    size_t gridSize = static_cast<size_t>(std::sqrt(numThreads));
-    if (gridSize * gridSize != numThreads) {
-        size_t rowsPerThread = matrixSize / numThreads;
-        size_t remainder = matrixSize % numThreads;
-        size_t startRow = 0;
-        
-        for (size_t i = 0; i < numThreads; i++) {
-            size_t currentRows = rowsPerThread + (i < remainder ? 1 : 0);
-            size_t endRow = startRow + currentRows;
-            
-            threads.emplace_back(mul, startRow, endRow, 0, matrixSize, this);
-            startRow = endRow;
+    RegionTimer region;
+    for (size_t i = startRow; i < endRow; i++) {
+        for (size_t j = startCol; j < endCol; j++) {
+            test->matrix_C[i * matrixSize + j] += dot(&test->matrix_A[i * matrixSize], &test->prepared_B[j * matrixSize], matrixSize);
         }
-    } else {
-        size_t blockRows = matrixSize / gridSize;
-        size_t blockCols = matrixSize / gridSize;
-        size_t rowRemainder = matrixSize % gridSize;
-        size_t colRemainder = matrixSize % gridSize;
-        
-        for (size_t i = 0; i < gridSize; i++) {
-            for (size_t j = 0; j < gridSize; j++) {
-                size_t startRow = i * blockRows + std::min(i, rowRemainder);
-                size_t endRow = startRow + blockRows + (i < rowRemainder ? 1 : 0);
-                
-                size_t startCol = j * blockCols + std::min(j, colRemainder);
-                size_t endCol = startCol + blockCols + (j < colRemainder ? 1 : 0);
-                
-                threads.emplace_back(mul, startRow, endRow, startCol, endCol, this);
+    }
+}
+
+template <typename T>
+void packed_b_mul(size_t startRow, size_t endRow, size_t, size_t, const CMatrixArrayShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    RegionTimer region;
+    for (size_t i = startRow; i < endRow; i++) {
+        packed_row_mul(&test->matrix_A[i * matrixSize], test->prepared_B, &test->matrix_C[i * matrixSize], matrixSize);
+    }
+}
+
+template <typename T>
+void recursive_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const CMatrixArrayShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    RegionTimer region;
+    for_each_recursive_block(startRow, endRow, 0, matrixSize, startCol, endCol, RECURSION_BASE, 1,
+                             [test, matrixSize](size_t blockStartRow, size_t blockEndRow, size_t startK, size_t endK, size_t blockStartCol, size_t blockEndCol) {
+        for (size_t i = blockStartRow; i < blockEndRow; i++) {
+            for (size_t k = startK; k < endK; k++) {
+                T a_ik = test->matrix_A[i * matrixSize + k];
+                for (size_t j = blockStartCol; j < blockEndCol; j++) {
+                    test->matrix_C[i * matrixSize + j] += a_ik * test->matrix_B[k * matrixSize + j];
+                }
             }
         }
+    });
+}
+
+template <typename T>
+void CMatrixArrayShared<T>::runTest(mul_function<T> mul) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = this->GetParam();
+
+    size_t gridRows, gridCols;
+    std::tie(gridRows, gridCols) = grid_shape(numThreads);
+
+    for (const Tile& block : grid_tiles(matrixSize, matrixSize, gridRows, gridCols)) {
+        tasks.emplace_back(std::bind(mul, block.row_begin, block.row_end, block.col_begin, block.col_end, this));
     }
 
-    for (auto& thread : threads) {
-        thread.join();
+    thread_pool().run(tasks);
+    tasks.clear();
+}
+
+template <typename T>
+void CMatrixArrayShared<T>::runTiledTest(mul_function<T> mul) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = this->GetParam();
+
+    std::vector<Tile> tiles = make_tiles(matrixSize, matrixSize, tile_size(), tile_size());
+    executor.run(tiles, numThreads, [this, &mul](const Tile& tile) {
+        mul(tile.row_begin, tile.row_end, tile.col_begin, tile.col_end, this);
+    });
+}
+
+template <typename T>
+void CMatrixArrayShared<T>::runRecursiveTest(mul_function<T> mul) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = this->GetParam();
+
+    // a few tiles per thread leave the executor something to steal
+    std::vector<Tile> tiles = split_tiles({0, matrixSize, 0, matrixSize}, 4 * numThreads, 1);
+    executor.run(tiles, numThreads, [this, &mul](const Tile& tile) {
+        mul(tile.row_begin, tile.row_end, tile.col_begin, tile.col_end, this);
+    });
+}
+
+template <typename T>
+void CMatrixArrayShared<T>::runPreparedTest(prepare_function<T> prepare, mul_function<T> mul) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = this->GetParam();
+
+    if (prepared_B == nullptr) {
+        prepared_B = (T*) safe_malloc(packed_panels(matrixSize) * PACKED_B_WIDTH * matrixSize * sizeof(T));
+    }
+
+    std::vector<Tile> bands = grid_tiles(matrixSize, matrixSize, numThreads, 1);
+    for (const Tile& band : bands) {
+        tasks.emplace_back(std::bind(prepare, band.row_begin, band.row_end, this));
     }
+    prepare_ns.push_back(time_once([&] { thread_pool().run(tasks); }));
+    tasks.clear();
+
+    for (const Tile& band : bands) {
+        tasks.emplace_back(std::bind(mul, band.row_begin, band.row_end, band.col_begin, band.col_end, this));
+    }
+    thread_pool().run(tasks);
+    tasks.clear();
 }
 
 using CMatrixArraySharedInt = CMatrixArrayShared<int>;
@@ -103,27 +206,81 @@ using CMatrixArraySharedLong = CMatrixArrayShared<long>;
 using CMatrixArraySharedDouble = CMatrixArrayShared<double>;
 
 TEST_P(CMatrixArraySharedInt, DISABLED_NaiveMul) {
-    this->runTest(::naive_mul<int>);
+    measure([&] { this->runTest(::naive_mul<int>); });
 }
 
 TEST_P(CMatrixArraySharedLong, DISABLED_NaiveMul) {
-    this->runTest(::naive_mul<long>);
+    measure([&] { this->runTest(::naive_mul<long>); });
 }
 
 TEST_P(CMatrixArraySharedDouble, DISABLED_NaiveMul) {
-    this->runTest(::naive_mul<double>);
+    measure([&] { this->runTest(::naive_mul<double>); });
 }
 
 TEST_P(CMatrixArraySharedInt, OptimizedMul) {
-    this->runTest(::optimized_mul<int>);
+    measure([&] { this->runTest(::optimized_mul<int>); });
 }
 
 TEST_P(CMatrixArraySharedLong, OptimizedMul) {
-    this->runTest(::optimized_mul<long>);
+    measure([&] { this->runTest(::optimized_mul<long>); });
 }
 
 TEST_P(CMatrixArraySharedDouble, OptimizedMul) {
-    this->runTest(::optimized_mul<double>);
+    measure([&] { this->runTest(::optimized_mul<double>); });
+}
+
+TEST_P(CMatrixArraySharedInt, OptimizedMulTiled) {
+    measure([&] { this->runTiledTest(::optimized_mul<int>); });
+}
+
+TEST_P(CMatrixArraySharedLong, OptimizedMulTiled) {
+    measure([&] { this->runTiledTest(::optimized_mul<long>); });
+}
+
+TEST_P(CMatrixArraySharedDouble, OptimizedMulTiled) {
+    measure([&] { this->runTiledTest(::optimized_mul<double>); });
+}
+
+TEST_P(CMatrixArraySharedInt, TransposedMul) {
+    SampleStats stats = measure([&] { this->runPreparedTest(::transpose_b<int>, ::transposed_mul<int>); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(CMatrixArraySharedLong, TransposedMul) {
+    SampleStats stats = measure([&] { this->runPreparedTest(::transpose_b<long>, ::transposed_mul<long>); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(CMatrixArraySharedDouble, TransposedMul) {
+    SampleStats stats = measure([&] { this->runPreparedTest(::transpose_b<double>, ::transposed_mul<double>); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(CMatrixArraySharedInt, PackedBMul) {
+    SampleStats stats = measure([&] { this->runPreparedTest(::pack_b<int>, ::packed_b_mul<int>); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(CMatrixArraySharedLong, PackedBMul) {
+    SampleStats stats = measure([&] { this->runPreparedTest(::pack_b<long>, ::packed_b_mul<long>); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(CMatrixArraySharedDouble, PackedBMul) {
+    SampleStats stats = measure([&] { this->runPreparedTest(::pack_b<double>, ::packed_b_mul<double>); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(CMatrixArraySharedInt, RecursiveMul) {
+    measure([&] { this->runRecursiveTest(::recursive_mul<int>); });
+}
+
+TEST_P(CMatrixArraySharedLong, RecursiveMul) {
+    measure([&] { this->runRecursiveTest(::recursive_mul<long>); });
+}
+
+TEST_P(CMatrixArraySharedDouble, RecursiveMul) {
+    measure([&] { this->runRecursiveTest(::recursive_mul<double>); });
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -155,3 +312,355 @@ INSTANTIATE_TEST_SUITE_P(
     ),
     CMatrixArraySharedDouble::getTestCaseName
 );
+
+template <typename T>
+void CMatrixArraySharedBlocked<T>::SetUp() {
+    size_t size, numThreads, l1, l2;
+    std::tie(size, numThreads, l1, l2) = this->GetParam();
+
+    ASSERT_NO_THROW(matrix_A = (T*) safe_malloc(size * size * sizeof(T)));
+    ASSERT_NO_THROW(matrix_B = (T*) safe_malloc(size * size * sizeof(T)));
+    ASSERT_NO_THROW(matrix_C = (T*) safe_malloc(size * size * sizeof(T)));
+
+    // same blocks as runTest, see CMatrixArrayShared::SetUp
+    size_t gridRows, gridCols;
+    std::tie(gridRows, gridCols) = grid_shape(numThreads);
+    std::vector<Tile> blocks = grid_tiles(size, size, gridRows, gridCols);
+    first_touch(blocks.size(), [&](size_t i) {
+        fill_tile(matrix_A, size, blocks[i], 3);
+        fill_tile(matrix_B, size, blocks[i], 3);
+        fill_tile(matrix_C, size, blocks[i], 0);
+    });
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+
+    record_thread_setup(numThreads);
+}
+
+template <typename T>
+void CMatrixArraySharedBlocked<T>::TearDown() {
+    record_worker_timings();
+
+    safe_free(matrix_A);
+    safe_free(matrix_B);
+    safe_free(matrix_C);
+
+    tasks.clear();
+}
+
+template <typename T>
+void CMatrixArraySharedBlocked<T>::blocked_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol) {
+    size_t matrixSize, numThreads, l1, l2;
+    std::tie(matrixSize, numThreads, l1, l2) = this->GetParam();
+
+    RegionTimer region;
+    for_each_block(startRow, endRow, startCol, endCol, matrixSize, l1, l2,
+                   [this, matrixSize](size_t blockStartRow, size_t blockEndRow, size_t startK, size_t endK, size_t blockStartCol, size_t blockEndCol) {
+        for (size_t i = blockStartRow; i < blockEndRow; i++) {
+            for (size_t k = startK; k < endK; k++) {
+                T a_ik = matrix_A[i * matrixSize + k];
+                for (size_t j = blockStartCol; j < blockEndCol; j++) {
+                    matrix_C[i * matrixSize + j] += a_ik * matrix_B[k * matrixSize + j];
+                }
+            }
+        }
+    });
+}
+
+template <typename T>
+void CMatrixArraySharedBlocked<T>::runTest() {
+    size_t matrixSize, numThreads, l1, l2;
+    std::tie(matrixSize, numThreads, l1, l2) = this->GetParam();
+
+    size_t gridRows, gridCols;
+    std::tie(gridRows, gridCols) = grid_shape(numThreads);
+
+    for (const Tile& block : grid_tiles(matrixSize, matrixSize, gridRows, gridCols)) {
+        tasks.emplace_back(std::bind(&CMatrixArraySharedBlocked<T>::blocked_mul, this, block.row_begin, block.row_end, block.col_begin, block.col_end));
+    }
+
+    thread_pool().run(tasks);
+    tasks.clear();
+}
+
+using CMatrixArraySharedBlockedInt = CMatrixArraySharedBlocked<int>;
+using CMatrixArraySharedBlockedLong = CMatrixArraySharedBlocked<long>;
+using CMatrixArraySharedBlockedDouble = CMatrixArraySharedBlocked<double>;
+
+TEST_P(CMatrixArraySharedBlockedInt, BlockedMul) {
+    measure([&] { this->runTest(); });
+}
+
+TEST_P(CMatrixArraySharedBlockedLong, BlockedMul) {
+    measure([&] { this->runTest(); });
+}
+
+TEST_P(CMatrixArraySharedBlockedDouble, BlockedMul) {
+    measure([&] { this->runTest(); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CMatrixArraySharedBlockedInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    CMatrixArraySharedBlockedInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CMatrixArraySharedBlockedLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    CMatrixArraySharedBlockedLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CMatrixArraySharedBlockedDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    CMatrixArraySharedBlockedDouble::getTestCaseName
+);
+
+template <typename T>
+void CMatrixArrayStrassen<T>::SetUp() {
+    size_t size, numThreads, cutoff;
+    std::tie(size, numThreads, cutoff) = this->GetParam();
+
+    ASSERT_NO_THROW(matrix_A = (T*) safe_malloc(size * size * sizeof(T)));
+    ASSERT_NO_THROW(matrix_B = (T*) safe_malloc(size * size * sizeof(T)));
+    ASSERT_NO_THROW(matrix_C = (T*) safe_malloc(size * size * sizeof(T)));
+
+    fill_operand(matrix_A, size * size, 1);
+    fill_operand(matrix_B, size * size, 2);
+    memset(matrix_C, 0, size * size * sizeof(T));
+
+    // the classical flop count, so GFLOP/s compare with the other multiplications
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+
+    record_thread_setup(numThreads);
+}
+
+template <typename T>
+void CMatrixArrayStrassen<T>::TearDown() {
+    record_worker_timings();
+
+    safe_free(matrix_A);
+    safe_free(matrix_B);
+    safe_free(matrix_C);
+    safe_free(scratch);
+    scratch = nullptr;
+
+    tasks.clear();
+}
+
+template <typename T>
+void CMatrixArrayStrassen<T>::operand_sums(size_t startRow, size_t endRow) {
+    size_t matrixSize, numThreads, cutoff;
+    std::tie(matrixSize, numThreads, cutoff) = this->GetParam();
+
+    size_t h = matrixSize / 2, quadrant = h * h;
+    T *S = scratch, *Tsum = scratch + 4 * quadrant;
+
+    RegionTimer region;
+    for (size_t i = startRow; i < endRow; i++) {
+        const T *a1 = &matrix_A[i * matrixSize], *a2 = &matrix_A[(i + h) * matrixSize];
+        const T *b1 = &matrix_B[i * matrixSize], *b2 = &matrix_B[(i + h) * matrixSize];
+        for (size_t j = 0; j < h; j++) {
+            size_t at = i * h + j;
+            T s1 = a2[j] + a2[h + j], t1 = b1[h + j] - b1[j];
+            T s2 = s1 - a1[j], t2 = b2[h + j] - t1;
+            S[at] = s1;
+            S[quadrant + at] = s2;
+            S[2 * quadrant + at] = a1[j] - a2[j];
+            S[3 * quadrant + at] = a1[h + j] - s2;
+            Tsum[at] = t1;
+            Tsum[quadrant + at] = t2;
+            Tsum[2 * quadrant + at] = b2[h + j] - b1[h + j];
+            Tsum[3 * quadrant + at] = t2 - b2[j];
+        }
+    }
+}
+
+template <typename T>
+void CMatrixArrayStrassen<T>::products(size_t first, size_t step, T* workspace) {
+    size_t matrixSize, numThreads, cutoff;
+    std::tie(matrixSize, numThreads, cutoff) = this->GetParam();
+
+    size_t n = matrixSize, h = n / 2, quadrant = h * h;
+    const T *S = scratch, *Tsum = scratch + 4 * quadrant;
+    T* M = scratch + 8 * quadrant;
+
+    struct Product {
+        const T* a;
+        size_t lda;
+        const T* b;
+        size_t ldb;
+        T* c;
+        size_t ldc;
+    };
+    const Product all[7] = {
+        {matrix_A, n, matrix_B, n, matrix_C, n},                                                 // M1 = A11 * B11
+        {matrix_A + h, n, matrix_B + h * n, n, matrix_C + h, n},                                 // M2 = A12 * B21
+        {S + 3 * quadrant, h, matrix_B + h * n + h, n, matrix_C + h * n, n},                     // M3 = S4 * B22
+        {matrix_A + h * n + h, n, Tsum + 3 * quadrant, h, matrix_C + h * n + h, n},              // M4 = A22 * T4
+        {S, h, Tsum, h, M, h},                                                                   // M5 = S1 * T1
+        {S + quadrant, h, Tsum + quadrant, h, M + quadrant, h},                                  // M6 = S2 * T2
+        {S + 2 * quadrant, h, Tsum + 2 * quadrant, h, M + 2 * quadrant, h},                      // M7 = S3 * T3
+    };
+
+    RegionTimer region;
+    for (size_t p = first; p < 7; p += step) {
+        strassen_mul(all[p].a, all[p].lda, all[p].b, all[p].ldb, all[p].c, all[p].ldc, h, cutoff, workspace);
+    }
+}
+
+template <typename T>
+void CMatrixArrayStrassen<T>::combine(size_t startRow, size_t endRow) {
+    size_t matrixSize, numThreads, cutoff;
+    std::tie(matrixSize, numThreads, cutoff) = this->GetParam();
+
+    size_t h = matrixSize / 2, quadrant = h * h;
+    const T* M = scratch + 8 * quadrant;
+
+    RegionTimer region;
+    for (size_t i = startRow; i < endRow; i++) {
+        T *c1 = &matrix_C[i * matrixSize], *c2 = &matrix_C[(i + h) * matrixSize];
+        for (size_t j = 0; j < h; j++) {
+            size_t at = i * h + j;
+            T m1 = c1[j], m2 = c1[h + j], m3 = c2[j], m4 = c2[h + j];
+            T m5 = M[at], u2 = m1 + M[quadrant + at];
+            T u3 = u2 + M[2 * quadrant + at];
+            c1[j] = m1 + m2;
+            c1[h + j] = u2 + m5 + m3;
+            c2[j] = u3 - m4;
+            c2[h + j] = u3 + m5;
+        }
+    }
+}
+
+template <typename T>
+void CMatrixArrayStrassen<T>::runTest() {
+    size_t matrixSize, numThreads, cutoff;
+    std::tie(matrixSize, numThreads, cutoff) = this->GetParam();
+
+    if (!strassen_splits(matrixSize, cutoff)) {
+        classical_mul(matrix_A, matrixSize, matrix_B, matrixSize, matrix_C, matrixSize, matrixSize);
+        return;
+    }
+
+    size_t h = matrixSize / 2, workers = std::min<size_t>(numThreads, 7);
+    size_t workspace = strassen_workspace(h, cutoff);
+    if (scratch == nullptr) {
+        scratch = (T*) safe_malloc((11 * h * h + workers * workspace) * sizeof(T));
+    }
+
+    std::vector<Tile> bands = grid_tiles(h, h, numThreads, 1);
+    for (const Tile& band : bands) {
+        tasks.emplace_back(std::bind(&CMatrixArrayStrassen<T>::operand_sums, this, band.row_begin, band.row_end));
+    }
+    thread_pool().run(tasks);
+    tasks.clear();
+
+    for (size_t w = 0; w < workers; w++) {
+        tasks.emplace_back(std::bind(&CMatrixArrayStrassen<T>::products, this, w, workers, scratch + 11 * h * h + w * workspace));
+    }
+    thread_pool().run(tasks);
+    tasks.clear();
+
+    for (const Tile& band : bands) {
+        tasks.emplace_back(std::bind(&CMatrixArrayStrassen<T>::combine, this, band.row_begin, band.row_end));
+    }
+    thread_pool().run(tasks);
+    tasks.clear();
+}
+
+template <typename T>
+void CMatrixArrayStrassen<T>::record_error() {
+    size_t matrixSize, numThreads, cutoff;
+    std::tie(matrixSize, numThreads, cutoff) = this->GetParam();
+
+    std::vector<T> reference(matrixSize);
+    double maxError = 0, maxValue = 0;
+    for (size_t r = 0; r < STRASSEN_CHECK_ROWS; r++) {
+        size_t i = (2 * r + 1) * matrixSize / (2 * STRASSEN_CHECK_ROWS);
+        std::fill(reference.begin(), reference.end(), T(0));
+        for (size_t k = 0; k < matrixSize; k++) {
+            T a_ik = matrix_A[i * matrixSize + k];
+            for (size_t j = 0; j < matrixSize; j++) {
+                reference[j] += a_ik * matrix_B[k * matrixSize + j];
+            }
+        }
+        for (size_t j = 0; j < matrixSize; j++) {
+            double expected = static_cast<double>(reference[j]);
+            maxError = std::max(maxError, std::abs(static_cast<double>(matrix_C[i * matrixSize + j]) - expected));
+            maxValue = std::max(maxValue, std::abs(expected));
+        }
+    }
+    record_metric("max_rel_error", maxValue > 0 ? maxError / maxValue : maxError);
+}
+
+using CMatrixArrayStrassenInt = CMatrixArrayStrassen<int>;
+using CMatrixArrayStrassenLong = CMatrixArrayStrassen<long>;
+using CMatrixArrayStrassenDouble = CMatrixArrayStrassen<double>;
+
+TEST_P(CMatrixArrayStrassenInt, StrassenMul) {
+    measure([&] { this->runTest(); });
+}
+
+TEST_P(CMatrixArrayStrassenLong, StrassenMul) {
+    measure([&] { this->runTest(); });
+}
+
+TEST_P(CMatrixArrayStrassenDouble, StrassenMul) {
+    measure([&] { this->runTest(); });
+    record_error();
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CMatrixArrayStrassenInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(STRASSEN_CUTOFFS)
+    ),
+    CMatrixArrayStrassenInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CMatrixArrayStrassenLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(STRASSEN_CUTOFFS)
+    ),
+    CMatrixArrayStrassenLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CMatrixArrayStrassenDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(STRASSEN_CUTOFFS)
+    ),
+    CMatrixArrayStrassenDouble::getTestCaseName
+);
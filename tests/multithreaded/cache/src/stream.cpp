@@ -0,0 +1,87 @@
+#include "multithreaded/stream.hpp"
+#include "utils/utils.hpp"
+#include "utils/constants.hpp"
+#include "utils/harness.hpp"
+#include "utils/first_touch.hpp"
+
+#include <algorithm>
+
+template <typename T>
+void CStreamShared<T>::SetUp() {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = this->GetParam();
+
+    ASSERT_NO_THROW(a = (T*) safe_malloc(size * sizeof(T)));
+    ASSERT_NO_THROW(b = (T*) safe_malloc(size * sizeof(T)));
+    ASSERT_NO_THROW(c = (T*) safe_malloc(size * sizeof(T)));
+
+    std::vector<Tile> slices = grid_tiles(size, 1, numThreads, 1);
+    first_touch(slices.size(), [&](size_t i) {
+        std::fill(a + slices[i].row_begin, a + slices[i].row_end, T(1));
+        std::fill(b + slices[i].row_begin, b + slices[i].row_end, T(2));
+        std::fill(c + slices[i].row_begin, c + slices[i].row_end, T(0));
+    });
+
+    set_work(static_cast<double>(size));
+
+    record_thread_setup(numThreads);
+}
+
+template <typename T>
+void CStreamShared<T>::TearDown() {
+    record_worker_timings();
+
+    safe_free(a);
+    safe_free(b);
+    safe_free(c);
+
+    tasks.clear();
+}
+
+template <typename T>
+void CStreamShared<T>::runTest(StreamKernel kernel) {
+    size_t totalSize, numThreads;
+    std::tie(totalSize, numThreads) = this->GetParam();
+
+    // the slices SetUp first touched
+    for (const Tile& slice : grid_tiles(totalSize, 1, numThreads, 1)) {
+        tasks.emplace_back([this, kernel, slice] {
+            stream_kernel(kernel, a, b, c, T(STREAM_SCALAR), slice.row_begin, slice.row_end);
+        });
+    }
+
+    thread_pool().run(tasks);
+    tasks.clear();
+}
+
+using CStreamSharedDouble = CStreamShared<double>;
+
+TEST_P(CStreamSharedDouble, Copy) {
+    SampleStats stats = measure([&] { this->runTest(StreamKernel::copy); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::copy, std::get<0>(GetParam())));
+}
+
+TEST_P(CStreamSharedDouble, Scale) {
+    SampleStats stats = measure([&] { this->runTest(StreamKernel::scale); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::scale, std::get<0>(GetParam())));
+}
+
+TEST_P(CStreamSharedDouble, Add) {
+    SampleStats stats = measure([&] { this->runTest(StreamKernel::add); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::add, std::get<0>(GetParam())));
+}
+
+TEST_P(CStreamSharedDouble, Triad) {
+    SampleStats stats = measure([&] { this->runTest(StreamKernel::triad); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::triad, std::get<0>(GetParam())));
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_multithreaded_caching,
+    CStreamSharedDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(STREAM_SIZES),
+        ::testing::ValuesIn(NUM_THREADS)
+    ),
+    CStreamSharedDouble::getTestCaseName
+);
@@ -1,14 +1,17 @@
 #pragma once
 
+#include "utils/schedule.hpp"
+#include "utils/thread_pool.hpp"
+#include "utils/tile_executor.hpp"
 #include "utils/utils.hpp"
 
 #include <gtest/gtest.h>
-#include <thread>
 
 using testParams = std::tuple<
     std::tuple<size_t, size_t>,
     std::tuple<double, double, double>,
-    size_t>;
+    size_t,
+    Schedule>;
 
 class CArrayShared : public testing::TestWithParam<testParams> {
 protected:
@@ -18,7 +21,11 @@ protected:
 public:
     int* array;
     
-    std::vector<std::thread> threads;
+    std::vector<task_function> tasks;
+    RowScheduler scheduler;
+    TileExecutor executor;
+    // iterations each worker ran in the last run
+    std::vector<double> work;
 
     size_t width;
     size_t height;
@@ -31,18 +38,21 @@ public:
         std::tuple<size_t, size_t> dimensions;
         std::tuple<double, double, double> mandelbrot_args;
         size_t numThreads;
-        std::tie(dimensions, mandelbrot_args, numThreads) = info.param;
+        Schedule schedule;
+        std::tie(dimensions, mandelbrot_args, numThreads, schedule) = info.param;
 
         size_t width, height;
         double center_coord_real, center_coord_im, radius;
         std::tie(width, height) = dimensions;
         std::tie(center_coord_real, center_coord_im, radius) = mandelbrot_args;
 
-        return "size_" + std::to_string(width) + "x" + std::to_string(height) + "_" + get_mandelbrot_name(radius) + "_threads_" + std::to_string(numThreads);
+        return "size_" + std::to_string(width) + "x" + std::to_string(height) + "_" + get_mandelbrot_name(radius) + "_threads_" + std::to_string(numThreads) + "_schedule_" + schedule_name(schedule);
     }
 
 };
 
-static void mandelbrot(size_t start_row, size_t end_row, const CArrayShared* test);
+static double mandelbrot(size_t start_row, size_t end_row, size_t start_col, size_t end_col, const CArrayShared* test);
+
+static void render(size_t worker, CArrayShared* test);
 
 static void runTest(CArrayShared* test);
@@ -1,12 +1,13 @@
 #include "multithreaded/mandelbrot.hpp"
 #include "utils/utils.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
 
 void CArrayShared::SetUp() {
     std::tuple<size_t, size_t> dimensions;
     std::tuple<double, double, double> mandelbrot_args;
     size_t numThreads;
-    std::tie(dimensions, mandelbrot_args, numThreads) = GetParam();
+    std::tie(dimensions, mandelbrot_args, numThreads, std::ignore) = GetParam();
 
     double center_coord_real, center_coord_im, radius;
     std::tie(width, height) = dimensions;
@@ -22,56 +23,77 @@ void CArrayShared::SetUp() {
     this->pixel_width         = radius * 2 / ((width < height) ? static_cast<double>(width) : static_cast<double>(height));
     this->top_left_coord_real = center_coord_real - static_cast<double>(width) / 2 * this->pixel_width;
     this->top_left_coord_im   = center_coord_im + static_cast<double>(height) / 2 * this->pixel_width;
+
+    set_work(static_cast<double>(width * height));
+
+    record_thread_setup(numThreads);
+    record_metric("chunk", static_cast<double>(schedule_chunk()));
 }
 
 void CArrayShared::TearDown() {
-    free(array);
+    record_worker_timings(work);
+    executor.record();
+
+    safe_free(array);
 }
 
-void mandelbrot(size_t start_row, size_t end_row, const CArrayShared* test) {
+double mandelbrot(size_t start_row, size_t end_row, size_t start_col, size_t end_col, const CArrayShared* test) {
+    double iterations = 0;
     double im_part = test->top_left_coord_im - (static_cast<double>(start_row) * test->pixel_width);
     
     for (size_t i = start_row; i < end_row; i++) {
-        double real_part = test->top_left_coord_real;
-        for (size_t j = 0; j < test->width; j++) {
+        double real_part = test->top_left_coord_real + static_cast<double>(start_col) * test->pixel_width;
+        for (size_t j = start_col; j < end_col; j++) {
             int iter_count = scalar_diverge(real_part, im_part, ITER_1500);
             
             test->array[test->width * i + j] = iter_count;
+            // scalar_diverge stores 0 for the pixels that ran all the iterations
+            iterations += iter_count != 0 ? iter_count : ITER_1500 + 1;
 
             real_part += test->pixel_width;
         }
         im_part -= test->pixel_width;
     }
+    return iterations;
+}
+
+void render(size_t worker, CArrayShared* test) {
+    size_t start_row, end_row;
+    double iterations = 0;
+
+    RegionTimer region;
+    while (test->scheduler.next(worker, start_row, end_row)) {
+        iterations += mandelbrot(start_row, end_row, 0, test->width, test);
+    }
+    test->work[worker] = iterations;
 }
 
 void runTest(CArrayShared* test) {
-    std::tuple<size_t, size_t> dimensions;
-    std::tuple<double, double, double> mandelbrot_args;
     size_t numThreads;
-    std::tie(dimensions, mandelbrot_args, numThreads) = test->GetParam();
+    Schedule schedule;
+    std::tie(std::ignore, std::ignore, numThreads, schedule) = test->GetParam();
 
-    size_t width, height;
-    std::tie(width, height) = dimensions;
-    
-    size_t rowsPerThread = height / numThreads;
-    size_t remainderRows = height % numThreads;
-    size_t currentRow = 0;
-    
-    for (size_t i = 0; i < numThreads; i++) {
-        size_t startRow = currentRow;
-        size_t endRow = startRow + rowsPerThread + (i < remainderRows ? 1 : 0);
-        
-        test->threads.emplace_back(mandelbrot, startRow, endRow, test);
-        currentRow = endRow;
+    if (schedule == Schedule::stealing) {
+        std::vector<Tile> tiles = make_tiles(test->height, test->width, tile_size(), tile_size());
+        test->work.assign(numThreads, 0);
+        test->executor.run(tiles, numThreads, [test](size_t worker, const Tile& tile) {
+            test->work[worker] += mandelbrot(tile.row_begin, tile.row_end, tile.col_begin, tile.col_end, test);
+        });
+        return;
     }
 
-    for (auto& thread : test->threads) {
-        thread.join();
+    test->scheduler.reset(schedule, test->height, numThreads, schedule_chunk());
+    test->work.assign(numThreads, 0);
+    for (size_t i = 0; i < numThreads; i++) {
+        test->tasks.emplace_back(std::bind(render, i, test));
     }
+
+    thread_pool().run(test->tasks);
+    test->tasks.clear();
 }
 
 TEST_P(CArrayShared, MandelbrotQuadratic) {
-    ::runTest(this);
+    measure([&] { ::runTest(this); });
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -80,6 +102,7 @@ INSTANTIATE_TEST_SUITE_P(
     ::testing::Combine(
         ::testing::ValuesIn(picture_dimensions),
         ::testing::ValuesIn(MANDELBROT_ARGS),
-        ::testing::ValuesIn(NUM_THREADS)),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(SCHEDULES)),
     CArrayShared::getTestCaseName
 );
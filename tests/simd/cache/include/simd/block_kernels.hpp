@@ -0,0 +1,247 @@
+#pragma once
+
+#include "utils/constants.hpp"
+#include "utils/transpose.hpp"
+
+#include <algorithm>
+#include <immintrin.h>
+
+// The first `count` 32-bit lanes set, for _mm256_maskload/maskstore of the end of a row
+inline __m256i tail_mask_epi32(size_t count) {
+    return _mm256_cmpgt_epi32(_mm256_set1_epi32(static_cast<int>(count)), _mm256_setr_epi32(0, 1, 2, 3, 4, 5, 6, 7));
+}
+
+// The first `count` 64-bit lanes set
+inline __m256i tail_mask_epi64(size_t count) {
+    return _mm256_cmpgt_epi64(_mm256_set1_epi64x(static_cast<long long>(count)), _mm256_setr_epi64x(0, 1, 2, 3));
+}
+
+// Lane-wise 64-bit a * b, low 64 bits of the product. AVX2 only multiplies the low 32
+// bits of each lane into 64 (_mm256_mul_epu32), so the product is put together from
+// lo(a) * lo(b) and the two cross products shifted into the high half; hi(a) * hi(b)
+// falls entirely outside the low 64 bits.
+inline __m256i mullo_epi64(__m256i a, __m256i b) {
+    __m256i low = _mm256_mul_epu32(a, b);
+    __m256i cross = _mm256_add_epi64(_mm256_mul_epu32(_mm256_srli_epi64(a, 32), b),
+                                     _mm256_mul_epu32(a, _mm256_srli_epi64(b, 32)));
+    return _mm256_add_epi64(low, _mm256_slli_epi64(cross, 32));
+}
+
+// C[startRow, endRow) x [startCol, endCol) += A[., startK..endK) * B[startK..endK, .) on
+// row-major size x size matrices, ikj with a broadcast of A[i][k]. The column range
+// has to start on and span a multiple of the SIMD width, like the L1 tiles do.
+template <typename T>
+inline void simd_block_mul(const T* A, const T* B, T* C, size_t size, size_t startRow, size_t endRow,
+                           size_t startK, size_t endK, size_t startCol, size_t endCol);
+
+template <>
+inline void simd_block_mul<int>(const int* A, const int* B, int* C, size_t size, size_t startRow, size_t endRow,
+                                size_t startK, size_t endK, size_t startCol, size_t endCol) {
+    for (size_t i = startRow; i < endRow; i++) {
+        for (size_t k = startK; k < endK; k++) {
+            __m256i a = _mm256_set1_epi32(A[i * size + k]);
+            for (size_t j = startCol; j + SIMD_INT_WIDTH <= endCol; j += SIMD_INT_WIDTH) {
+                __m256i c = _mm256_load_si256(reinterpret_cast<__m256i*>(&C[i * size + j]));
+
+                __m256i b = _mm256_load_si256(reinterpret_cast<const __m256i*>(&B[k * size + j]));
+
+                c = _mm256_add_epi32(c, _mm256_mullo_epi32(a, b));
+
+                _mm256_store_si256(reinterpret_cast<__m256i*>(&C[i * size + j]), c);
+            }
+        }
+    }
+}
+
+template <>
+inline void simd_block_mul<long>(const long* A, const long* B, long* C, size_t size, size_t startRow, size_t endRow,
+                                 size_t startK, size_t endK, size_t startCol, size_t endCol) {
+    for (size_t i = startRow; i < endRow; i++) {
+        for (size_t k = startK; k < endK; k++) {
+            __m256i a = _mm256_set1_epi64x(A[i * size + k]);
+            for (size_t j = startCol; j + SIMD_LONG_WIDTH <= endCol; j += SIMD_LONG_WIDTH) {
+                __m256i c = _mm256_load_si256(reinterpret_cast<__m256i*>(&C[i * size + j]));
+
+                __m256i b = _mm256_load_si256(reinterpret_cast<const __m256i*>(&B[k * size + j]));
+
+                c = _mm256_add_epi64(c, mullo_epi64(a, b));
+
+                _mm256_store_si256(reinterpret_cast<__m256i*>(&C[i * size + j]), c);
+            }
+        }
+    }
+}
+
+template <>
+inline void simd_block_mul<double>(const double* A, const double* B, double* C, size_t size, size_t startRow, size_t endRow,
+                                   size_t startK, size_t endK, size_t startCol, size_t endCol) {
+    for (size_t i = startRow; i < endRow; i++) {
+        for (size_t k = startK; k < endK; k++) {
+            __m256d a = _mm256_set1_pd(A[i * size + k]);
+            for (size_t j = startCol; j + SIMD_DOUBLE_WIDTH <= endCol; j += SIMD_DOUBLE_WIDTH) {
+                __m256d c = _mm256_load_pd(&C[i * size + j]);
+
+                __m256d b = _mm256_load_pd(&B[k * size + j]);
+
+                c = _mm256_fmadd_pd(a, b, c);
+
+                _mm256_store_pd(&C[i * size + j], c);
+            }
+        }
+    }
+}
+
+// Dot product of two aligned rows of `size` elements
+template <typename T>
+inline T simd_dot(const T* a, const T* b, size_t size);
+
+template <>
+inline int simd_dot<int>(const int* a, const int* b, size_t size) {
+    __m256i sum = _mm256_setzero_si256();
+    size_t k = 0;
+    for (; k + SIMD_INT_WIDTH <= size; k += SIMD_INT_WIDTH) {
+        __m256i a_k = _mm256_load_si256(reinterpret_cast<const __m256i*>(&a[k]));
+        __m256i b_k = _mm256_load_si256(reinterpret_cast<const __m256i*>(&b[k]));
+        sum = _mm256_add_epi32(sum, _mm256_mullo_epi32(a_k, b_k));
+    }
+
+    __m128i half = _mm_add_epi32(_mm256_castsi256_si128(sum), _mm256_extracti128_si256(sum, 1));
+    half = _mm_hadd_epi32(half, half);
+    half = _mm_hadd_epi32(half, half);
+    int result = _mm_cvtsi128_si32(half);
+    for (; k < size; k++) {
+        result += a[k] * b[k];
+    }
+    return result;
+}
+
+template <>
+inline long simd_dot<long>(const long* a, const long* b, size_t size) {
+    __m256i sum = _mm256_setzero_si256();
+    size_t k = 0;
+    for (; k + SIMD_LONG_WIDTH <= size; k += SIMD_LONG_WIDTH) {
+        __m256i a_k = _mm256_load_si256(reinterpret_cast<const __m256i*>(&a[k]));
+        __m256i b_k = _mm256_load_si256(reinterpret_cast<const __m256i*>(&b[k]));
+        sum = _mm256_add_epi64(sum, mullo_epi64(a_k, b_k));
+    }
+
+    __m128i half = _mm_add_epi64(_mm256_castsi256_si128(sum), _mm256_extracti128_si256(sum, 1));
+    half = _mm_add_epi64(half, _mm_unpackhi_epi64(half, half));
+    long result = _mm_cvtsi128_si64(half);
+    for (; k < size; k++) {
+        result += a[k] * b[k];
+    }
+    return result;
+}
+
+template <>
+inline double simd_dot<double>(const double* a, const double* b, size_t size) {
+    // four chains hide the FMA latency, one chain would wait on every add
+    __m256d sums[4] = {_mm256_setzero_pd(), _mm256_setzero_pd(), _mm256_setzero_pd(), _mm256_setzero_pd()};
+    size_t k = 0;
+    for (; k + 4 * SIMD_DOUBLE_WIDTH <= size; k += 4 * SIMD_DOUBLE_WIDTH) {
+        for (size_t v = 0; v < 4; v++) {
+            sums[v] = _mm256_fmadd_pd(_mm256_load_pd(&a[k + v * SIMD_DOUBLE_WIDTH]),
+                                      _mm256_load_pd(&b[k + v * SIMD_DOUBLE_WIDTH]), sums[v]);
+        }
+    }
+
+    __m256d sum = _mm256_add_pd(_mm256_add_pd(sums[0], sums[1]), _mm256_add_pd(sums[2], sums[3]));
+    __m128d half = _mm_add_pd(_mm256_castpd256_pd128(sum), _mm256_extractf128_pd(sum, 1));
+    double result = _mm_cvtsd_f64(_mm_add_sd(half, _mm_unpackhi_pd(half, half)));
+    for (; k < size; k++) {
+        result += a[k] * b[k];
+    }
+    return result;
+}
+
+// c_row += a_row * B with B in packed panels, see packed_row_mul(). The PACKED_B_WIDTH
+// strip of the C row stays in registers for the whole panel.
+template <typename T>
+inline void simd_packed_row_mul(const T* a_row, const T* packed, T* c_row, size_t size);
+
+template <>
+inline void simd_packed_row_mul<int>(const int* a_row, const int* packed, int* c_row, size_t size) {
+    constexpr size_t VECTORS = PACKED_B_WIDTH / SIMD_INT_WIDTH;
+    alignas(ALIGNMENT_32) int strip[PACKED_B_WIDTH];
+
+    for (size_t p = 0; p < packed_panels(size); p++) {
+        const int* panel = &packed[p * size * PACKED_B_WIDTH];
+        __m256i sums[VECTORS];
+        for (size_t v = 0; v < VECTORS; v++) {
+            sums[v] = _mm256_setzero_si256();
+        }
+        for (size_t k = 0; k < size; k++) {
+            __m256i a = _mm256_set1_epi32(a_row[k]);
+            for (size_t v = 0; v < VECTORS; v++) {
+                __m256i b = _mm256_load_si256(reinterpret_cast<const __m256i*>(&panel[k * PACKED_B_WIDTH + v * SIMD_INT_WIDTH]));
+                sums[v] = _mm256_add_epi32(sums[v], _mm256_mullo_epi32(a, b));
+            }
+        }
+
+        for (size_t v = 0; v < VECTORS; v++) {
+            _mm256_store_si256(reinterpret_cast<__m256i*>(&strip[v * SIMD_INT_WIDTH]), sums[v]);
+        }
+        size_t cols = std::min(PACKED_B_WIDTH, size - p * PACKED_B_WIDTH);
+        for (size_t c = 0; c < cols; c++) {
+            c_row[p * PACKED_B_WIDTH + c] += strip[c];
+        }
+    }
+}
+
+template <>
+inline void simd_packed_row_mul<long>(const long* a_row, const long* packed, long* c_row, size_t size) {
+    constexpr size_t VECTORS = PACKED_B_WIDTH / SIMD_LONG_WIDTH;
+    alignas(ALIGNMENT_32) long strip[PACKED_B_WIDTH];
+
+    for (size_t p = 0; p < packed_panels(size); p++) {
+        const long* panel = &packed[p * size * PACKED_B_WIDTH];
+        __m256i sums[VECTORS];
+        for (size_t v = 0; v < VECTORS; v++) {
+            sums[v] = _mm256_setzero_si256();
+        }
+        for (size_t k = 0; k < size; k++) {
+            __m256i a = _mm256_set1_epi64x(a_row[k]);
+            for (size_t v = 0; v < VECTORS; v++) {
+                __m256i b = _mm256_load_si256(reinterpret_cast<const __m256i*>(&panel[k * PACKED_B_WIDTH + v * SIMD_LONG_WIDTH]));
+                sums[v] = _mm256_add_epi64(sums[v], mullo_epi64(a, b));
+            }
+        }
+
+        for (size_t v = 0; v < VECTORS; v++) {
+            _mm256_store_si256(reinterpret_cast<__m256i*>(&strip[v * SIMD_LONG_WIDTH]), sums[v]);
+        }
+        size_t cols = std::min(PACKED_B_WIDTH, size - p * PACKED_B_WIDTH);
+        for (size_t c = 0; c < cols; c++) {
+            c_row[p * PACKED_B_WIDTH + c] += strip[c];
+        }
+    }
+}
+
+template <>
+inline void simd_packed_row_mul<double>(const double* a_row, const double* packed, double* c_row, size_t size) {
+    constexpr size_t VECTORS = PACKED_B_WIDTH / SIMD_DOUBLE_WIDTH;
+    alignas(ALIGNMENT_32) double strip[PACKED_B_WIDTH];
+
+    for (size_t p = 0; p < packed_panels(size); p++) {
+        const double* panel = &packed[p * size * PACKED_B_WIDTH];
+        __m256d sums[VECTORS];
+        for (size_t v = 0; v < VECTORS; v++) {
+            sums[v] = _mm256_setzero_pd();
+        }
+        for (size_t k = 0; k < size; k++) {
+            __m256d a = _mm256_set1_pd(a_row[k]);
+            for (size_t v = 0; v < VECTORS; v++) {
+                sums[v] = _mm256_fmadd_pd(a, _mm256_load_pd(&panel[k * PACKED_B_WIDTH + v * SIMD_DOUBLE_WIDTH]), sums[v]);
+            }
+        }
+
+        for (size_t v = 0; v < VECTORS; v++) {
+            _mm256_store_pd(&strip[v * SIMD_DOUBLE_WIDTH], sums[v]);
+        }
+        size_t cols = std::min(PACKED_B_WIDTH, size - p * PACKED_B_WIDTH);
+        for (size_t c = 0; c < cols; c++) {
+            c_row[p * PACKED_B_WIDTH + c] += strip[c];
+        }
+    }
+}
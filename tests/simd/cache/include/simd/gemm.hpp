@@ -0,0 +1,48 @@
+#pragma once
+
+#include <cstddef>
+
+// Blocking of the packed GEMM. Every micro-kernel call keeps an MR x NR block of C in
+// ymm accumulators over a whole KC-deep panel. MC x KC panels of A (sized for L2) and
+// KC x NC panels of B (sized for L3) are packed into aligned MR-row and NR-column slivers,
+// so the micro-kernel reads both operands with unit stride.
+template <typename T>
+struct GemmShape;
+
+template <>
+struct GemmShape<double> {
+    // 12 accumulators, 2 B vectors and 1 broadcast of A out of 16 ymm registers
+    static constexpr size_t MR = 6;
+    static constexpr size_t NR = 8;
+    static constexpr size_t MC = 96;
+    static constexpr size_t KC = 256;
+    static constexpr size_t NC = 2048;
+
+    // 4 lanes of one FMA (multiply + add) per vector unit and cycle
+    static constexpr size_t OPS_PER_CYCLE = 8;
+};
+
+template <>
+struct GemmShape<int> {
+    static constexpr size_t MR = 6;
+    static constexpr size_t NR = 16;
+    static constexpr size_t MC = 96;
+    static constexpr size_t KC = 256;
+    static constexpr size_t NC = 2048;
+
+    // no integer FMA: the mullo and the add of 8 lanes take a vector unit cycle each
+    static constexpr size_t OPS_PER_CYCLE = 8;
+};
+
+// C[startRow, endRow) x [startCol, endCol) += A * B on row-major size x size matrices.
+// The packing buffers are per thread, so threads may update disjoint C blocks concurrently.
+// Defined for double and int.
+template <typename T>
+void gemm(const T* A, const T* B, T* C, size_t size, size_t startRow, size_t endRow, size_t startCol, size_t endCol);
+
+// BENCH_VECTOR_UNITS, SIMD multiply/FMA units per core (default 2)
+size_t vector_units();
+
+// Theoretical GFLOP/s of `cores` cores at the nominal TSC frequency, turbo can beat it
+template <typename T>
+double peak_gflops(size_t cores);
@@ -17,7 +17,70 @@ public:
 
     void optimized_mul();
 
+    // register-blocked micro-kernel over packed panels, see gemm()
+    void gemm_mul();
+
+    // B^T or B in column panels, allocated on first use with room for the packed layout
+    T* prepared_B = nullptr;
+    std::vector<double> prepare_ns;
+
+    // row i of A dotted with row j of B^T, B is transposed at the start of every run
+    void transposed_mul();
+
+    // C rows against PACKED_B_WIDTH column panels of B, packed at the start of every run
+    void packed_b_mul();
+
+    // simd_block_mul() on the blocks of a cache-oblivious recursion, see for_each_recursive_block()
+    void recursive_mul();
+
     static std::string getTestCaseName(const ::testing::TestParamInfo<size_t>& info) {
         return "size_" + std::to_string(info.param) + "x" + std::to_string(info.param);
     }
 };
+
+// (size, l1 tile, l2 tile)
+template <typename T>
+class AlignedMatrixBlocked : public testing::TestWithParam<std::tuple<size_t, size_t, size_t>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* matrix_A;
+    T* matrix_B;
+    T* matrix_C;
+
+    // simd_block_mul() over l1 x l1 blocks of l2 x l2 panels of B, see for_each_block()
+    void blocked_mul();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t, size_t>>& info) {
+        size_t totalSize, l1, l2;
+        std::tie(totalSize, l1, l2) = info.param;
+        return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize) +
+               "_l1_" + std::to_string(l1) + "_l2_" + std::to_string(l2);
+    }
+};
+
+// (size, row padding in bytes), rows are leading_dimension() elements apart and rounded
+// up to ALIGNMENT_32, so every row starts aligned whatever the size and the last partial
+// vector is masked. Without padding, pow2 - 1 rows have the same stride as pow2 rows.
+template <typename T>
+class AlignedMatrixPadded : public testing::TestWithParam<std::tuple<size_t, size_t>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* matrix_A;
+    T* matrix_B;
+    T* matrix_C;
+    size_t ld;
+
+    void optimized_mul();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t>>& info) {
+        size_t totalSize, pad;
+        std::tie(totalSize, pad) = info.param;
+        return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize) + "_pad_" + std::to_string(pad);
+    }
+};
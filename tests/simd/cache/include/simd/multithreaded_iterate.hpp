@@ -1,8 +1,8 @@
 #pragma once
 
-#include <gtest/gtest.h>
+#include "utils/thread_pool.hpp"
 
-#include <thread>
+#include <gtest/gtest.h>
 
 template <typename T>
 class AlignedArrayShared;
@@ -18,7 +18,9 @@ protected:
     void TearDown() override;
 public:
     T* array;
-    std::vector<std::thread> threads;
+    // outer passes over the array, fixed unless BENCH_CALIBRATE is set
+    size_t loops;
+    std::vector<task_function> tasks;
 
     void runTest(iterate_function<T> iterate);
 
@@ -32,3 +34,12 @@ public:
 template <typename T>
 static void sequential_iterate(size_t start, size_t end, const AlignedArrayShared<T>* test);
 
+// sequential_iterate with write-only or non-temporal stores, see store_iterate
+template <typename T>
+static void sequential_write(size_t start, size_t end, const AlignedArrayShared<T>* test);
+
+template <typename T>
+static void streaming_write(size_t start, size_t end, const AlignedArrayShared<T>* test);
+
+template <typename T>
+static void streaming_iterate(size_t start, size_t end, const AlignedArrayShared<T>* test);
@@ -1,7 +1,9 @@
 #pragma once
 
+#include "utils/thread_pool.hpp"
+#include "utils/tile_executor.hpp"
+
 #include <gtest/gtest.h>
-#include <thread>
 
 template <typename T>
 class AlignedMatrixShared;
@@ -9,6 +11,9 @@ class AlignedMatrixShared;
 template <typename T>
 using mul_function = void(*)(size_t, size_t, size_t, size_t, const AlignedMatrixShared<T>*);
 
+template <typename T>
+using prepare_function = void(*)(size_t, size_t, const AlignedMatrixShared<T>*);
+
 template <typename T>
 class AlignedMatrixShared : public testing::TestWithParam<std::tuple<size_t, size_t>> {
 protected:
@@ -19,7 +24,8 @@ public:
     T* matrix_A;
     T* matrix_B;
     T* matrix_C;
-    std::vector<std::thread> threads;
+    std::vector<task_function> tasks;
+    TileExecutor executor;
 
     void naive_mul();
 
@@ -27,6 +33,17 @@ public:
 
     void runTest(mul_function<T> mul);
 
+    // B^T or B in column panels, allocated on first use with room for the packed layout
+    T* prepared_B = nullptr;
+    std::vector<double> prepare_ns;
+
+    // prepares B by row bands on the pool and times that on its own, then runs mul
+    void runPreparedTest(prepare_function<T> prepare, mul_function<T> mul);
+
+    // C cut by split_tiles() into a few tiles per thread on the work-stealing executor,
+    // mul recurses inside each of them
+    void runRecursiveTest(mul_function<T> mul);
+
     static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t>>& info) {
         size_t totalSize, numThreads;
         std::tie(totalSize, numThreads) = info.param;
@@ -36,3 +53,52 @@ public:
 
 template <typename T>
 void optimized_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const AlignedMatrixShared<T>* test);
+
+// register-blocked micro-kernel over packed panels, see gemm()
+template <typename T>
+void gemm_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const AlignedMatrixShared<T>* test);
+
+// rows [startRow, endRow) of B into prepared_B, transposed
+template <typename T>
+void transpose_b(size_t startRow, size_t endRow, const AlignedMatrixShared<T>* test);
+
+// rows [startRow, endRow) of B into the PACKED_B_WIDTH column panels of prepared_B
+template <typename T>
+void pack_b(size_t startRow, size_t endRow, const AlignedMatrixShared<T>* test);
+
+template <typename T>
+void transposed_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const AlignedMatrixShared<T>* test);
+
+// simd_block_mul() on the blocks of a cache-oblivious recursion over the C block, see for_each_recursive_block()
+template <typename T>
+void recursive_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const AlignedMatrixShared<T>* test);
+
+template <typename T>
+void packed_b_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const AlignedMatrixShared<T>* test);
+
+// (size, threads, l1 tile, l2 tile)
+template <typename T>
+class AlignedMatrixSharedBlocked : public testing::TestWithParam<std::tuple<size_t, size_t, size_t, size_t>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* matrix_A;
+    T* matrix_B;
+    T* matrix_C;
+    std::vector<task_function> tasks;
+
+    // simd_block_mul() over l1 x l1 blocks of l2 x l2 panels of B, see for_each_block()
+    void blocked_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol);
+
+    // one band of whole rows per thread, so every block starts on a SIMD-aligned column
+    void runTest();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t, size_t, size_t>>& info) {
+        size_t totalSize, numThreads, l1, l2;
+        std::tie(totalSize, numThreads, l1, l2) = info.param;
+        return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize) + "_threads_" + std::to_string(numThreads) +
+               "_l1_" + std::to_string(l1) + "_l2_" + std::to_string(l2);
+    }
+};
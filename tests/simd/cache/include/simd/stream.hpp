@@ -0,0 +1,49 @@
+#pragma once
+
+#include "utils/thread_pool.hpp"
+#include "utils/stream.hpp"
+
+#include <gtest/gtest.h>
+
+// One STREAM kernel over the elements [begin, end) with 4-wide AVX loads and stores,
+// the elements past the last full vector one at a time
+void simd_stream_kernel(StreamKernel kernel, double* a, double* b, double* c, double q, size_t begin, size_t end);
+
+// The three STREAM arrays of `size` elements each, 32-byte aligned, a = 1, b = 2, c = 0 after SetUp
+template <typename T>
+class AlignedStream : public testing::TestWithParam<size_t> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* a;
+    T* b;
+    T* c;
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<size_t>& info) {
+        return "size_" + std::to_string(info.param);
+    }
+};
+
+// AlignedStream split into one contiguous slice of all three arrays per worker
+template <typename T>
+class AlignedStreamShared : public testing::TestWithParam<std::tuple<size_t, size_t>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* a;
+    T* b;
+    T* c;
+    std::vector<task_function> tasks;
+
+    void runTest(StreamKernel kernel);
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t>>& info) {
+        size_t totalSize, numThreads;
+        std::tie(totalSize, numThreads) = info.param;
+        return "size_" + std::to_string(totalSize) + "_threads_" + std::to_string(numThreads);
+    }
+};
@@ -0,0 +1,110 @@
+#pragma once
+
+#include "utils/constants.hpp"
+#include "utils/harness.hpp"
+
+#include <immintrin.h>
+
+// The AVX load, add, set and the two store forms of one element type. `stream` is the
+// non-temporal store: it goes through the write-combining buffers instead of the
+// caches, so the destination line is not read for ownership before it is overwritten.
+template <typename T>
+struct StoreLanes;
+
+template <>
+struct StoreLanes<int> {
+    using vector = __m256i;
+    static constexpr size_t width = SIMD_INT_WIDTH;
+
+    static vector load(const int* p) { return _mm256_load_si256(reinterpret_cast<const __m256i*>(p)); }
+    static vector set(int value) { return _mm256_set1_epi32(value); }
+    static vector add(vector a, vector b) { return _mm256_add_epi32(a, b); }
+    static void store(int* p, vector v) { _mm256_store_si256(reinterpret_cast<__m256i*>(p), v); }
+    static void stream(int* p, vector v) { _mm256_stream_si256(reinterpret_cast<__m256i*>(p), v); }
+};
+
+template <>
+struct StoreLanes<long> {
+    using vector = __m256i;
+    static constexpr size_t width = SIMD_LONG_WIDTH;
+
+    static vector load(const long* p) { return _mm256_load_si256(reinterpret_cast<const __m256i*>(p)); }
+    static vector set(long value) { return _mm256_set1_epi64x(value); }
+    static vector add(vector a, vector b) { return _mm256_add_epi64(a, b); }
+    static void store(long* p, vector v) { _mm256_store_si256(reinterpret_cast<__m256i*>(p), v); }
+    static void stream(long* p, vector v) { _mm256_stream_si256(reinterpret_cast<__m256i*>(p), v); }
+};
+
+template <>
+struct StoreLanes<double> {
+    using vector = __m256d;
+    static constexpr size_t width = SIMD_DOUBLE_WIDTH;
+
+    static vector load(const double* p) { return _mm256_load_pd(p); }
+    static vector set(double value) { return _mm256_set1_pd(value); }
+    static vector add(vector a, vector b) { return _mm256_add_pd(a, b); }
+    static void store(double* p, vector v) { _mm256_store_pd(p, v); }
+    static void stream(double* p, vector v) { _mm256_stream_pd(p, v); }
+};
+
+// `loops` passes over [start, end) four vectors at a time like sequential_iterate, the
+// elements past the last full group of four are left alone. ReadModifyWrite adds 1 to
+// every element, otherwise every element is overwritten with the pass number without
+// being read. Streaming stores are weakly ordered, so the sfence after the last pass
+// drains them before the worker reports back. `array + start` has to be 32-byte aligned.
+template <typename T, bool ReadModifyWrite, bool Streaming>
+void store_iterate(T* array, size_t start, size_t end, size_t loops) {
+    using Lanes = StoreLanes<T>;
+    const size_t numElems = Lanes::width * 4;
+    const size_t unroll_end = start + ((end - start) / numElems) * numElems;
+    const typename Lanes::vector one_vec = Lanes::set(T(1));
+
+    RegionTimer region;
+    for (size_t i = 0; i < loops; i++) {
+        typename Lanes::vector fill = Lanes::set(static_cast<T>(i));
+        for (size_t j = start; j < unroll_end; j += numElems) {
+            typename Lanes::vector vec0 = fill, vec1 = fill, vec2 = fill, vec3 = fill;
+            if constexpr (ReadModifyWrite) {
+                vec0 = Lanes::add(Lanes::load(array + j), one_vec);
+                vec1 = Lanes::add(Lanes::load(array + j + Lanes::width), one_vec);
+                vec2 = Lanes::add(Lanes::load(array + j + Lanes::width * 2), one_vec);
+                vec3 = Lanes::add(Lanes::load(array + j + Lanes::width * 3), one_vec);
+            }
+
+            if constexpr (Streaming) {
+                Lanes::stream(array + j, vec0);
+                Lanes::stream(array + j + Lanes::width, vec1);
+                Lanes::stream(array + j + Lanes::width * 2, vec2);
+                Lanes::stream(array + j + Lanes::width * 3, vec3);
+            } else {
+                Lanes::store(array + j, vec0);
+                Lanes::store(array + j + Lanes::width, vec1);
+                Lanes::store(array + j + Lanes::width * 2, vec2);
+                Lanes::store(array + j + Lanes::width * 3, vec3);
+            }
+        }
+        // nothing reads a write-only pass before the next one overwrites it, keep the
+        // compiler from dropping all but the last
+        asm volatile("" ::: "memory");
+    }
+    if constexpr (Streaming) {
+        _mm_sfence();
+    }
+}
+
+// Elements a pass over [start, end) touches, whole groups of four vectors like
+// store_iterate and sequential_iterate
+template <typename T>
+size_t store_iterate_elements(size_t start, size_t end) {
+    const size_t numElems = StoreLanes<T>::width * 4;
+    return (end - start) / numElems * numElems;
+}
+
+// The bytes the program itself moves in `loops` passes over `elements` touched ones: one
+// read and one write per element for ReadModifyWrite, one write otherwise. The read for
+// ownership a regular store adds on a miss is not counted, so what streaming saves
+// shows up as a higher gb_per_s for the same bytes.
+template <typename T>
+double store_iterate_bytes(bool readModifyWrite, size_t loops, size_t elements) {
+    return static_cast<double>(loops) * static_cast<double>(elements) * sizeof(T) * (readModifyWrite ? 2 : 1);
+}
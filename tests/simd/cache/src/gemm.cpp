@@ -0,0 +1,170 @@
+#include "simd/gemm.hpp"
+#include "utils/constants.hpp"
+#include "utils/harness.hpp"
+#include "utils/utils.hpp"
+
+#include <algorithm>
+#include <cstdlib>
+#include <immintrin.h>
+
+namespace {
+
+template <typename T>
+struct PackBuffers {
+    T* a = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, GemmShape<T>::MC * GemmShape<T>::KC * sizeof(T)));
+    T* b = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, GemmShape<T>::KC * GemmShape<T>::NC * sizeof(T)));
+
+    ~PackBuffers() {
+        safe_free(a);
+        safe_free(b);
+    }
+};
+
+template <typename T>
+PackBuffers<T>& pack_buffers() {
+    static thread_local PackBuffers<T> buffers;
+    return buffers;
+}
+
+// rows x depth block of A at (row, k) as MR-row slivers, k-major inside a sliver.
+// Rows past the block are zero, so edge slivers run through the full micro-kernel.
+template <typename T>
+void pack_a(const T* A, size_t size, size_t row, size_t rows, size_t k, size_t depth, T* packed) {
+    constexpr size_t MR = GemmShape<T>::MR;
+    for (size_t ir = 0; ir < rows; ir += MR) {
+        for (size_t p = 0; p < depth; p++) {
+            for (size_t r = 0; r < MR; r++) {
+                *packed++ = ir + r < rows ? A[(row + ir + r) * size + k + p] : T(0);
+            }
+        }
+    }
+}
+
+// depth x cols block of B at (k, col) as NR-column slivers, one NR-wide row per k
+template <typename T>
+void pack_b(const T* B, size_t size, size_t k, size_t depth, size_t col, size_t cols, T* packed) {
+    constexpr size_t NR = GemmShape<T>::NR;
+    for (size_t jr = 0; jr < cols; jr += NR) {
+        for (size_t p = 0; p < depth; p++) {
+            const T* source = &B[(k + p) * size + col + jr];
+            for (size_t c = 0; c < NR; c++) {
+                *packed++ = jr + c < cols ? source[c] : T(0);
+            }
+        }
+    }
+}
+
+// 6x8 block of C (row stride ldc) += packed A sliver * packed B sliver
+void micro_kernel(size_t depth, const double* a, const double* b, double* c, size_t ldc) {
+    __m256d acc[6][2];
+    for (size_t r = 0; r < 6; r++) {
+        acc[r][0] = _mm256_setzero_pd();
+        acc[r][1] = _mm256_setzero_pd();
+    }
+
+    for (size_t p = 0; p < depth; p++) {
+        __m256d b0 = _mm256_load_pd(b);
+        __m256d b1 = _mm256_load_pd(b + 4);
+        for (size_t r = 0; r < 6; r++) {
+            __m256d a_r = _mm256_broadcast_sd(a + r);
+            acc[r][0] = _mm256_fmadd_pd(a_r, b0, acc[r][0]);
+            acc[r][1] = _mm256_fmadd_pd(a_r, b1, acc[r][1]);
+        }
+        a += 6;
+        b += 8;
+    }
+
+    for (size_t r = 0; r < 6; r++) {
+        double* row = c + r * ldc;
+        _mm256_storeu_pd(row, _mm256_add_pd(_mm256_loadu_pd(row), acc[r][0]));
+        _mm256_storeu_pd(row + 4, _mm256_add_pd(_mm256_loadu_pd(row + 4), acc[r][1]));
+    }
+}
+
+// 6x16 block of C (row stride ldc) += packed A sliver * packed B sliver
+void micro_kernel(size_t depth, const int* a, const int* b, int* c, size_t ldc) {
+    __m256i acc[6][2];
+    for (size_t r = 0; r < 6; r++) {
+        acc[r][0] = _mm256_setzero_si256();
+        acc[r][1] = _mm256_setzero_si256();
+    }
+
+    for (size_t p = 0; p < depth; p++) {
+        __m256i b0 = _mm256_load_si256(reinterpret_cast<const __m256i*>(b));
+        __m256i b1 = _mm256_load_si256(reinterpret_cast<const __m256i*>(b + 8));
+        for (size_t r = 0; r < 6; r++) {
+            __m256i a_r = _mm256_set1_epi32(a[r]);
+            acc[r][0] = _mm256_add_epi32(acc[r][0], _mm256_mullo_epi32(a_r, b0));
+            acc[r][1] = _mm256_add_epi32(acc[r][1], _mm256_mullo_epi32(a_r, b1));
+        }
+        a += 6;
+        b += 16;
+    }
+
+    for (size_t r = 0; r < 6; r++) {
+        __m256i* row = reinterpret_cast<__m256i*>(c + r * ldc);
+        _mm256_storeu_si256(row, _mm256_add_epi32(_mm256_loadu_si256(row), acc[r][0]));
+        _mm256_storeu_si256(row + 1, _mm256_add_epi32(_mm256_loadu_si256(row + 1), acc[r][1]));
+    }
+}
+
+}
+
+template <typename T>
+void gemm(const T* A, const T* B, T* C, size_t size, size_t startRow, size_t endRow, size_t startCol, size_t endCol) {
+    constexpr size_t MR = GemmShape<T>::MR, NR = GemmShape<T>::NR;
+    constexpr size_t MC = GemmShape<T>::MC, KC = GemmShape<T>::KC, NC = GemmShape<T>::NC;
+
+    PackBuffers<T>& buffers = pack_buffers<T>();
+    alignas(ALIGNMENT_32) T edge[MR * NR];
+
+    for (size_t jc = startCol; jc < endCol; jc += NC) {
+        size_t nc = std::min(NC, endCol - jc);
+        for (size_t pc = 0; pc < size; pc += KC) {
+            size_t kc = std::min(KC, size - pc);
+            pack_b(B, size, pc, kc, jc, nc, buffers.b);
+
+            for (size_t ic = startRow; ic < endRow; ic += MC) {
+                size_t mc = std::min(MC, endRow - ic);
+                pack_a(A, size, ic, mc, pc, kc, buffers.a);
+
+                for (size_t jr = 0; jr < nc; jr += NR) {
+                    size_t nr = std::min(NR, nc - jr);
+                    for (size_t ir = 0; ir < mc; ir += MR) {
+                        size_t mr = std::min(MR, mc - ir);
+                        T* c = &C[(ic + ir) * size + jc + jr];
+                        if (mr == MR && nr == NR) {
+                            micro_kernel(kc, buffers.a + ir * kc, buffers.b + jr * kc, c, size);
+                            continue;
+                        }
+
+                        // partial block at the bottom or right edge, computed whole and added back clipped
+                        std::fill(edge, edge + MR * NR, T(0));
+                        micro_kernel(kc, buffers.a + ir * kc, buffers.b + jr * kc, edge, NR);
+                        for (size_t i = 0; i < mr; i++) {
+                            for (size_t j = 0; j < nr; j++) {
+                                c[i * size + j] += edge[i * NR + j];
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+template void gemm<double>(const double*, const double*, double*, size_t, size_t, size_t, size_t, size_t);
+template void gemm<int>(const int*, const int*, int*, size_t, size_t, size_t, size_t, size_t);
+
+size_t vector_units() {
+    static const size_t units = std::max<size_t>(env_size("BENCH_VECTOR_UNITS", 2), 1);
+    return units;
+}
+
+template <typename T>
+double peak_gflops(size_t cores) {
+    return static_cast<double>(cores * vector_units() * GemmShape<T>::OPS_PER_CYCLE) * tsc_ghz();
+}
+
+template double peak_gflops<double>(size_t);
+template double peak_gflops<int>(size_t);
@@ -1,5 +1,8 @@
 #include "simd/iterate.hpp"
+#include "simd/streaming_stores.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
+#include "utils/utils.hpp"
 
 #include <immintrin.h>
 #include <cstdlib>
@@ -11,16 +14,18 @@ void AlignedArray<T>::SetUp() {
     if (totalSize % ALIGNMENT_32 != 0) {
         totalSize += ALIGNMENT_32 - (totalSize % ALIGNMENT_32);
     }
-    array = static_cast<T*>(std::aligned_alloc(ALIGNMENT_32, totalSize));
+    array = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
 
     ASSERT_NE(array, nullptr) << "Unable to alloc array of size " << size;
 
     memset(array, 0, totalSize);
+
+    loops = LOOP_COUNT_200K;
 }
 
 template <typename T>
 void AlignedArray<T>::TearDown() {
-    std::free(array);
+    safe_free(array);
 }
 
 using AlignedArrayInt = AlignedArray<int>;
@@ -32,24 +37,28 @@ TEST_P(AlignedArrayInt, SequentialIterate) {
     size_t numElems = SIMD_INT_WIDTH * 4;
     const __m256i increment = _mm256_set1_epi32(1);
 
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
-        for (size_t j = 0; j + numElems <= size; j += numElems) {
-            __m256i vec0 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j));
-            __m256i vec1 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j + SIMD_INT_WIDTH));
-            __m256i vec2 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j + SIMD_INT_WIDTH * 2));
-            __m256i vec3 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j + SIMD_INT_WIDTH * 3));
-            
-            vec0 = _mm256_add_epi32(vec0, increment);
-            vec1 = _mm256_add_epi32(vec1, increment);
-            vec2 = _mm256_add_epi32(vec2, increment);
-            vec3 = _mm256_add_epi32(vec3, increment);
-            
-            _mm256_store_si256(reinterpret_cast<__m256i*>(array + j), vec0);
-            _mm256_store_si256(reinterpret_cast<__m256i*>(array + j + SIMD_INT_WIDTH), vec1);
-            _mm256_store_si256(reinterpret_cast<__m256i*>(array + j + SIMD_INT_WIDTH * 2), vec2);
-            _mm256_store_si256(reinterpret_cast<__m256i*>(array + j + SIMD_INT_WIDTH * 3), vec3);
+    SampleStats stats = measure_loops(loops, size, [&] {
+        RegionTimer region;
+        for (size_t i = 0; i < loops; i++) {
+            for (size_t j = 0; j + numElems <= size; j += numElems) {
+                __m256i vec0 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j));
+                __m256i vec1 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j + SIMD_INT_WIDTH));
+                __m256i vec2 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j + SIMD_INT_WIDTH * 2));
+                __m256i vec3 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j + SIMD_INT_WIDTH * 3));
+                
+                vec0 = _mm256_add_epi32(vec0, increment);
+                vec1 = _mm256_add_epi32(vec1, increment);
+                vec2 = _mm256_add_epi32(vec2, increment);
+                vec3 = _mm256_add_epi32(vec3, increment);
+                
+                _mm256_store_si256(reinterpret_cast<__m256i*>(array + j), vec0);
+                _mm256_store_si256(reinterpret_cast<__m256i*>(array + j + SIMD_INT_WIDTH), vec1);
+                _mm256_store_si256(reinterpret_cast<__m256i*>(array + j + SIMD_INT_WIDTH * 2), vec2);
+                _mm256_store_si256(reinterpret_cast<__m256i*>(array + j + SIMD_INT_WIDTH * 3), vec3);
+            }
         }
-    }
+    });
+    record_bandwidth(stats, store_iterate_bytes<int>(true, loops, store_iterate_elements<int>(0, size)));
 }
 
 TEST_P(AlignedArrayLong, SequentialIterate) {
@@ -57,24 +66,28 @@ TEST_P(AlignedArrayLong, SequentialIterate) {
     size_t numElems = SIMD_LONG_WIDTH * 4;
     const __m256i increment = _mm256_set1_epi64x(1);
 
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
-        for (size_t j = 0; j + numElems <= size; j += numElems) {
-            __m256i vec0 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j));
-            __m256i vec1 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j + SIMD_LONG_WIDTH));
-            __m256i vec2 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j + SIMD_LONG_WIDTH * 2));
-            __m256i vec3 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j + SIMD_LONG_WIDTH * 3));
-
-            vec0 = _mm256_add_epi64(vec0, increment);
-            vec1 = _mm256_add_epi64(vec1, increment);
-            vec2 = _mm256_add_epi64(vec2, increment);
-            vec3 = _mm256_add_epi64(vec3, increment);
-
-            _mm256_store_si256(reinterpret_cast<__m256i*>(array + j), vec0);
-            _mm256_store_si256(reinterpret_cast<__m256i*>(array + j + SIMD_LONG_WIDTH), vec1);
-            _mm256_store_si256(reinterpret_cast<__m256i*>(array + j + SIMD_LONG_WIDTH * 2), vec2);
-            _mm256_store_si256(reinterpret_cast<__m256i*>(array + j + SIMD_LONG_WIDTH * 3), vec3);
+    SampleStats stats = measure_loops(loops, size, [&] {
+        RegionTimer region;
+        for (size_t i = 0; i < loops; i++) {
+            for (size_t j = 0; j + numElems <= size; j += numElems) {
+                __m256i vec0 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j));
+                __m256i vec1 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j + SIMD_LONG_WIDTH));
+                __m256i vec2 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j + SIMD_LONG_WIDTH * 2));
+                __m256i vec3 = _mm256_load_si256(reinterpret_cast<const __m256i*>(array + j + SIMD_LONG_WIDTH * 3));
+
+                vec0 = _mm256_add_epi64(vec0, increment);
+                vec1 = _mm256_add_epi64(vec1, increment);
+                vec2 = _mm256_add_epi64(vec2, increment);
+                vec3 = _mm256_add_epi64(vec3, increment);
+
+                _mm256_store_si256(reinterpret_cast<__m256i*>(array + j), vec0);
+                _mm256_store_si256(reinterpret_cast<__m256i*>(array + j + SIMD_LONG_WIDTH), vec1);
+                _mm256_store_si256(reinterpret_cast<__m256i*>(array + j + SIMD_LONG_WIDTH * 2), vec2);
+                _mm256_store_si256(reinterpret_cast<__m256i*>(array + j + SIMD_LONG_WIDTH * 3), vec3);
+            }
         }
-    }
+    });
+    record_bandwidth(stats, store_iterate_bytes<long>(true, loops, store_iterate_elements<long>(0, size)));
 }
 
 TEST_P(AlignedArrayDouble, SequentialIterate) {
@@ -82,24 +95,82 @@ TEST_P(AlignedArrayDouble, SequentialIterate) {
     size_t numElems = SIMD_DOUBLE_WIDTH * 4;
     const __m256d increment = _mm256_set1_pd(1);
 
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
-        for (size_t j = 0; j + numElems <= size; j += numElems) {
-            __m256d vec0 = _mm256_load_pd(array + j);
-            __m256d vec1 = _mm256_load_pd(array + j + SIMD_DOUBLE_WIDTH);
-            __m256d vec2 = _mm256_load_pd(array + j + SIMD_DOUBLE_WIDTH * 2);
-            __m256d vec3 = _mm256_load_pd(array + j + SIMD_DOUBLE_WIDTH * 3);
-
-            vec0 = _mm256_add_pd(vec0, increment);
-            vec1 = _mm256_add_pd(vec1, increment);
-            vec2 = _mm256_add_pd(vec2, increment);
-            vec3 = _mm256_add_pd(vec3, increment);
-
-            _mm256_store_pd(array + j, vec0);
-            _mm256_store_pd(array + j + SIMD_DOUBLE_WIDTH, vec1);
-            _mm256_store_pd(array + j + SIMD_DOUBLE_WIDTH * 2, vec2);
-            _mm256_store_pd(array + j + SIMD_DOUBLE_WIDTH * 3, vec3);
+    SampleStats stats = measure_loops(loops, size, [&] {
+        RegionTimer region;
+        for (size_t i = 0; i < loops; i++) {
+            for (size_t j = 0; j + numElems <= size; j += numElems) {
+                __m256d vec0 = _mm256_load_pd(array + j);
+                __m256d vec1 = _mm256_load_pd(array + j + SIMD_DOUBLE_WIDTH);
+                __m256d vec2 = _mm256_load_pd(array + j + SIMD_DOUBLE_WIDTH * 2);
+                __m256d vec3 = _mm256_load_pd(array + j + SIMD_DOUBLE_WIDTH * 3);
+
+                vec0 = _mm256_add_pd(vec0, increment);
+                vec1 = _mm256_add_pd(vec1, increment);
+                vec2 = _mm256_add_pd(vec2, increment);
+                vec3 = _mm256_add_pd(vec3, increment);
+
+                _mm256_store_pd(array + j, vec0);
+                _mm256_store_pd(array + j + SIMD_DOUBLE_WIDTH, vec1);
+                _mm256_store_pd(array + j + SIMD_DOUBLE_WIDTH * 2, vec2);
+                _mm256_store_pd(array + j + SIMD_DOUBLE_WIDTH * 3, vec3);
+            }
         }
-    }
+    });
+    record_bandwidth(stats, store_iterate_bytes<double>(true, loops, store_iterate_elements<double>(0, size)));
+}
+
+TEST_P(AlignedArrayInt, SequentialWrite) {
+    size_t size = this->GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { store_iterate<int, false, false>(array, 0, size, loops); });
+    record_bandwidth(stats, store_iterate_bytes<int>(false, loops, store_iterate_elements<int>(0, size)));
+}
+
+TEST_P(AlignedArrayInt, StreamingWrite) {
+    size_t size = this->GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { store_iterate<int, false, true>(array, 0, size, loops); });
+    record_bandwidth(stats, store_iterate_bytes<int>(false, loops, store_iterate_elements<int>(0, size)));
+}
+
+TEST_P(AlignedArrayInt, StreamingIterate) {
+    size_t size = this->GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { store_iterate<int, true, true>(array, 0, size, loops); });
+    record_bandwidth(stats, store_iterate_bytes<int>(true, loops, store_iterate_elements<int>(0, size)));
+}
+
+TEST_P(AlignedArrayLong, SequentialWrite) {
+    size_t size = this->GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { store_iterate<long, false, false>(array, 0, size, loops); });
+    record_bandwidth(stats, store_iterate_bytes<long>(false, loops, store_iterate_elements<long>(0, size)));
+}
+
+TEST_P(AlignedArrayLong, StreamingWrite) {
+    size_t size = this->GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { store_iterate<long, false, true>(array, 0, size, loops); });
+    record_bandwidth(stats, store_iterate_bytes<long>(false, loops, store_iterate_elements<long>(0, size)));
+}
+
+TEST_P(AlignedArrayLong, StreamingIterate) {
+    size_t size = this->GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { store_iterate<long, true, true>(array, 0, size, loops); });
+    record_bandwidth(stats, store_iterate_bytes<long>(true, loops, store_iterate_elements<long>(0, size)));
+}
+
+TEST_P(AlignedArrayDouble, SequentialWrite) {
+    size_t size = this->GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { store_iterate<double, false, false>(array, 0, size, loops); });
+    record_bandwidth(stats, store_iterate_bytes<double>(false, loops, store_iterate_elements<double>(0, size)));
+}
+
+TEST_P(AlignedArrayDouble, StreamingWrite) {
+    size_t size = this->GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { store_iterate<double, false, true>(array, 0, size, loops); });
+    record_bandwidth(stats, store_iterate_bytes<double>(false, loops, store_iterate_elements<double>(0, size)));
+}
+
+TEST_P(AlignedArrayDouble, StreamingIterate) {
+    size_t size = this->GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { store_iterate<double, true, true>(array, 0, size, loops); });
+    record_bandwidth(stats, store_iterate_bytes<double>(true, loops, store_iterate_elements<double>(0, size)));
 }
 
 // TODO: move values to a vector
@@ -1,5 +1,10 @@
 #include "simd/matrix.hpp"
+#include "simd/block_kernels.hpp"
+#include "simd/gemm.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
+#include "utils/blocking.hpp"
+#include "utils/utils.hpp"
 
 #include <immintrin.h>
 
@@ -10,25 +15,31 @@ void AlignedMatrix<T>::SetUp() {
     if (totalSize % ALIGNMENT_32 != 0) {
         totalSize += ALIGNMENT_32 - (totalSize % ALIGNMENT_32);
     }
-    matrix_A = static_cast<T*>(std::aligned_alloc(ALIGNMENT_32, totalSize));
-    matrix_B = static_cast<T*>(std::aligned_alloc(ALIGNMENT_32, totalSize));
-    matrix_C = static_cast<T*>(std::aligned_alloc(ALIGNMENT_32, totalSize));
+    matrix_A = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+    matrix_B = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+    matrix_C = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
 
     memset(matrix_A, 3, totalSize);
     memset(matrix_B, 3, totalSize);
     memset(matrix_C, 0, totalSize);
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
 }
 
 template <typename T>
 void AlignedMatrix<T>::TearDown() {
-    free(matrix_A);
-    free(matrix_B);
-    free(matrix_C);
+    safe_free(matrix_A);
+    safe_free(matrix_B);
+    safe_free(matrix_C);
+    safe_free(prepared_B);
+    prepared_B = nullptr;
 }
 
 template <>
 void AlignedMatrix<int>::naive_mul() {
     size_t size = this->GetParam();
+    RegionTimer region;
     for (size_t i = 0; i < size; i++) {
         for (size_t j = 0; j + SIMD_INT_WIDTH <= size; j += SIMD_INT_WIDTH) {
             __m256i sum = _mm256_setzero_si256();
@@ -47,6 +58,7 @@ void AlignedMatrix<int>::naive_mul() {
 template <>
 void AlignedMatrix<int>::optimized_mul() {
     size_t size = this->GetParam();
+    RegionTimer region;
     for (size_t i = 0; i < size; i++) {
         for (size_t k = 0; k < size; k++) {
             __m256i a = _mm256_set1_epi32(matrix_A[i * size + k]);
@@ -66,6 +78,7 @@ void AlignedMatrix<int>::optimized_mul() {
 template <>
 void AlignedMatrix<long>::optimized_mul() {
     size_t size = this->GetParam();
+    RegionTimer region;
     for (size_t i = 0; i < size; i++) {
         for (size_t k = 0; k < size; k++) {
             __m256i a = _mm256_set1_epi64x(matrix_A[i * size + k]);
@@ -86,6 +99,7 @@ void AlignedMatrix<long>::optimized_mul() {
 template <>
 void AlignedMatrix<double>::optimized_mul() {
     size_t size = this->GetParam();
+    RegionTimer region;
     for (size_t i = 0; i < size; i++) {
         for (size_t k = 0; k < size; k++) {
             __m256d a = _mm256_set1_pd(matrix_A[i * size + k]);
@@ -102,24 +116,126 @@ void AlignedMatrix<double>::optimized_mul() {
     }
 }
 
+template <typename T>
+void AlignedMatrix<T>::gemm_mul() {
+    size_t size = this->GetParam();
+    RegionTimer region;
+    gemm(matrix_A, matrix_B, matrix_C, size, 0, size, 0, size);
+}
+
+template <typename T>
+void AlignedMatrix<T>::transposed_mul() {
+    size_t size = this->GetParam();
+    if (prepared_B == nullptr) {
+        prepared_B = alloc_prepared<T>(size);
+    }
+    prepare_ns.push_back(time_once([&] { transpose(matrix_B, prepared_B, size, 0, size); }));
+
+    RegionTimer region;
+    for (size_t i = 0; i < size; i++) {
+        for (size_t j = 0; j < size; j++) {
+            matrix_C[i * size + j] += simd_dot(&matrix_A[i * size], &prepared_B[j * size], size);
+        }
+    }
+}
+
+template <typename T>
+void AlignedMatrix<T>::packed_b_mul() {
+    size_t size = this->GetParam();
+    if (prepared_B == nullptr) {
+        prepared_B = alloc_prepared<T>(size);
+    }
+    prepare_ns.push_back(time_once([&] { pack_columns(matrix_B, prepared_B, size, 0, size); }));
+
+    RegionTimer region;
+    for (size_t i = 0; i < size; i++) {
+        simd_packed_row_mul(&matrix_A[i * size], prepared_B, &matrix_C[i * size], size);
+    }
+}
+
+template <typename T>
+void AlignedMatrix<T>::recursive_mul() {
+    size_t size = this->GetParam();
+
+    RegionTimer region;
+    for_each_recursive_block(0, size, 0, size, 0, size, RECURSION_BASE, ALIGNMENT_32 / sizeof(T),
+                             [this, size](size_t startRow, size_t endRow, size_t startK, size_t endK, size_t startCol, size_t endCol) {
+        simd_block_mul(matrix_A, matrix_B, matrix_C, size, startRow, endRow, startK, endK, startCol, endCol);
+    });
+}
+
 using AlignedMatrixInt = AlignedMatrix<int>;
 using AlignedMatrixLong = AlignedMatrix<long>;
 using AlignedMatrixDouble = AlignedMatrix<double>;
 
 TEST_P(AlignedMatrixInt, DISABLED_NaiveMul) {
-    naive_mul();
+    measure([&] { naive_mul(); });
 }
 
 TEST_P(AlignedMatrixInt, OptimizedMul) {
-    optimized_mul();
+    measure([&] { optimized_mul(); });
 }
 
 TEST_P(AlignedMatrixLong, OptimizedMul) {
-    optimized_mul();
+    measure([&] { optimized_mul(); });
 }
 
 TEST_P(AlignedMatrixDouble, OptimizedMul) {
-    optimized_mul();
+    measure([&] { optimized_mul(); });
+}
+
+TEST_P(AlignedMatrixInt, GemmMul) {
+    double n = static_cast<double>(GetParam());
+    SampleStats stats = measure([&] { gemm_mul(); });
+    record_flops(stats, 2 * n * n * n, peak_gflops<int>(1));
+}
+
+TEST_P(AlignedMatrixDouble, GemmMul) {
+    double n = static_cast<double>(GetParam());
+    SampleStats stats = measure([&] { gemm_mul(); });
+    record_flops(stats, 2 * n * n * n, peak_gflops<double>(1));
+}
+
+TEST_P(AlignedMatrixInt, TransposedMul) {
+    SampleStats stats = measure([&] { transposed_mul(); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(AlignedMatrixLong, TransposedMul) {
+    SampleStats stats = measure([&] { transposed_mul(); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(AlignedMatrixDouble, TransposedMul) {
+    SampleStats stats = measure([&] { transposed_mul(); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(AlignedMatrixInt, PackedBMul) {
+    SampleStats stats = measure([&] { packed_b_mul(); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(AlignedMatrixLong, PackedBMul) {
+    SampleStats stats = measure([&] { packed_b_mul(); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(AlignedMatrixDouble, PackedBMul) {
+    SampleStats stats = measure([&] { packed_b_mul(); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(AlignedMatrixInt, RecursiveMul) {
+    measure([&] { recursive_mul(); });
+}
+
+TEST_P(AlignedMatrixLong, RecursiveMul) {
+    measure([&] { recursive_mul(); });
+}
+
+TEST_P(AlignedMatrixDouble, RecursiveMul) {
+    measure([&] { recursive_mul(); });
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -142,3 +258,253 @@ INSTANTIATE_TEST_SUITE_P(
     ::testing::ValuesIn(MATRIX_SIZES_POW2),
     AlignedMatrixDouble::getTestCaseName
 );
+
+template <typename T>
+void AlignedMatrixBlocked<T>::SetUp() {
+    size_t size, l1, l2;
+    std::tie(size, l1, l2) = this->GetParam();
+    size_t totalSize = size * size * sizeof(T);
+    if (totalSize % ALIGNMENT_32 != 0) {
+        totalSize += ALIGNMENT_32 - (totalSize % ALIGNMENT_32);
+    }
+    matrix_A = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+    matrix_B = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+    matrix_C = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+
+    memset(matrix_A, 3, totalSize);
+    memset(matrix_B, 3, totalSize);
+    memset(matrix_C, 0, totalSize);
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+}
+
+template <typename T>
+void AlignedMatrixBlocked<T>::TearDown() {
+    safe_free(matrix_A);
+    safe_free(matrix_B);
+    safe_free(matrix_C);
+}
+
+template <typename T>
+void AlignedMatrixBlocked<T>::blocked_mul() {
+    size_t size, l1, l2;
+    std::tie(size, l1, l2) = this->GetParam();
+
+    RegionTimer region;
+    for_each_block(0, size, 0, size, size, l1, l2,
+                   [this, size](size_t startRow, size_t endRow, size_t startK, size_t endK, size_t startCol, size_t endCol) {
+        simd_block_mul(matrix_A, matrix_B, matrix_C, size, startRow, endRow, startK, endK, startCol, endCol);
+    });
+}
+
+using AlignedMatrixBlockedInt = AlignedMatrixBlocked<int>;
+using AlignedMatrixBlockedLong = AlignedMatrixBlocked<long>;
+using AlignedMatrixBlockedDouble = AlignedMatrixBlocked<double>;
+
+TEST_P(AlignedMatrixBlockedInt, BlockedMul) {
+    measure([&] { blocked_mul(); });
+}
+
+TEST_P(AlignedMatrixBlockedLong, BlockedMul) {
+    measure([&] { blocked_mul(); });
+}
+
+TEST_P(AlignedMatrixBlockedDouble, BlockedMul) {
+    measure([&] { blocked_mul(); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    simd_singlecore_caching,
+    AlignedMatrixBlockedInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    AlignedMatrixBlockedInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    simd_singlecore_caching,
+    AlignedMatrixBlockedLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    AlignedMatrixBlockedLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    simd_singlecore_caching,
+    AlignedMatrixBlockedDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    AlignedMatrixBlockedDouble::getTestCaseName
+);
+
+template <typename T>
+void AlignedMatrixPadded<T>::SetUp() {
+    size_t size, pad;
+    std::tie(size, pad) = this->GetParam();
+    ld = leading_dimension<T>(size, pad, ALIGNMENT_32);
+
+    // ld is a multiple of the SIMD width, so the total already is of ALIGNMENT_32
+    size_t totalSize = size * ld * sizeof(T);
+    matrix_A = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+    matrix_B = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+    matrix_C = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+
+    memset(matrix_A, 3, totalSize);
+    memset(matrix_B, 3, totalSize);
+    memset(matrix_C, 0, totalSize);
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+    record_metric("ld", static_cast<double>(ld));
+}
+
+template <typename T>
+void AlignedMatrixPadded<T>::TearDown() {
+    safe_free(matrix_A);
+    safe_free(matrix_B);
+    safe_free(matrix_C);
+}
+
+template <>
+void AlignedMatrixPadded<int>::optimized_mul() {
+    size_t size, pad;
+    std::tie(size, pad) = this->GetParam();
+    size_t body = size / SIMD_INT_WIDTH * SIMD_INT_WIDTH;
+    __m256i tail = tail_mask_epi32(size - body);
+
+    RegionTimer region;
+    for (size_t i = 0; i < size; i++) {
+        for (size_t k = 0; k < size; k++) {
+            __m256i a = _mm256_set1_epi32(matrix_A[i * ld + k]);
+            for (size_t j = 0; j < body; j += SIMD_INT_WIDTH) {
+                __m256i c = _mm256_load_si256(reinterpret_cast<__m256i*>(&matrix_C[i * ld + j]));
+
+                __m256i b = _mm256_load_si256(reinterpret_cast<const __m256i*>(&matrix_B[k * ld + j]));
+
+                c = _mm256_add_epi32(c, _mm256_mullo_epi32(a, b));
+
+                _mm256_store_si256(reinterpret_cast<__m256i*>(&matrix_C[i * ld + j]), c);
+            }
+            if (body < size) {
+                __m256i c = _mm256_maskload_epi32(&matrix_C[i * ld + body], tail);
+                __m256i b = _mm256_maskload_epi32(&matrix_B[k * ld + body], tail);
+                _mm256_maskstore_epi32(&matrix_C[i * ld + body], tail, _mm256_add_epi32(c, _mm256_mullo_epi32(a, b)));
+            }
+        }
+    }
+}
+
+template <>
+void AlignedMatrixPadded<long>::optimized_mul() {
+    size_t size, pad;
+    std::tie(size, pad) = this->GetParam();
+    size_t body = size / SIMD_LONG_WIDTH * SIMD_LONG_WIDTH;
+    __m256i tail = tail_mask_epi64(size - body);
+
+    RegionTimer region;
+    for (size_t i = 0; i < size; i++) {
+        for (size_t k = 0; k < size; k++) {
+            __m256i a = _mm256_set1_epi64x(matrix_A[i * ld + k]);
+            for (size_t j = 0; j < body; j += SIMD_LONG_WIDTH) {
+                __m256i c = _mm256_load_si256(reinterpret_cast<__m256i*>(&matrix_C[i * ld + j]));
+
+                __m256i b = _mm256_load_si256(reinterpret_cast<const __m256i*>(&matrix_B[k * ld + j]));
+
+                c = _mm256_add_epi64(c, mullo_epi64(a, b));
+
+                _mm256_store_si256(reinterpret_cast<__m256i*>(&matrix_C[i * ld + j]), c);
+            }
+            if (body < size) {
+                long long* c_tail = reinterpret_cast<long long*>(&matrix_C[i * ld + body]);
+                __m256i c = _mm256_maskload_epi64(c_tail, tail);
+                __m256i b = _mm256_maskload_epi64(reinterpret_cast<const long long*>(&matrix_B[k * ld + body]), tail);
+                _mm256_maskstore_epi64(c_tail, tail, _mm256_add_epi64(c, mullo_epi64(a, b)));
+            }
+        }
+    }
+}
+
+template <>
+void AlignedMatrixPadded<double>::optimized_mul() {
+    size_t size, pad;
+    std::tie(size, pad) = this->GetParam();
+    size_t body = size / SIMD_DOUBLE_WIDTH * SIMD_DOUBLE_WIDTH;
+    __m256i tail = tail_mask_epi64(size - body);
+
+    RegionTimer region;
+    for (size_t i = 0; i < size; i++) {
+        for (size_t k = 0; k < size; k++) {
+            __m256d a = _mm256_set1_pd(matrix_A[i * ld + k]);
+            for (size_t j = 0; j < body; j += SIMD_DOUBLE_WIDTH) {
+                __m256d c = _mm256_load_pd(&matrix_C[i * ld + j]);
+
+                __m256d b = _mm256_load_pd(&matrix_B[k * ld + j]);
+
+                c = _mm256_fmadd_pd(a, b, c);
+
+                _mm256_store_pd(&matrix_C[i * ld + j], c);
+            }
+            if (body < size) {
+                __m256d c = _mm256_maskload_pd(&matrix_C[i * ld + body], tail);
+                __m256d b = _mm256_maskload_pd(&matrix_B[k * ld + body], tail);
+                _mm256_maskstore_pd(&matrix_C[i * ld + body], tail, _mm256_fmadd_pd(a, b, c));
+            }
+        }
+    }
+}
+
+using AlignedMatrixPaddedInt = AlignedMatrixPadded<int>;
+using AlignedMatrixPaddedLong = AlignedMatrixPadded<long>;
+using AlignedMatrixPaddedDouble = AlignedMatrixPadded<double>;
+
+TEST_P(AlignedMatrixPaddedInt, OptimizedMul) {
+    measure([&] { optimized_mul(); });
+}
+
+TEST_P(AlignedMatrixPaddedLong, OptimizedMul) {
+    measure([&] { optimized_mul(); });
+}
+
+TEST_P(AlignedMatrixPaddedDouble, OptimizedMul) {
+    measure([&] { optimized_mul(); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    simd_singlecore_caching,
+    AlignedMatrixPaddedInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_AROUND_POW2),
+        ::testing::ValuesIn(ROW_PADDINGS)
+    ),
+    AlignedMatrixPaddedInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    simd_singlecore_caching,
+    AlignedMatrixPaddedLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_AROUND_POW2),
+        ::testing::ValuesIn(ROW_PADDINGS)
+    ),
+    AlignedMatrixPaddedLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    simd_singlecore_caching,
+    AlignedMatrixPaddedDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_AROUND_POW2),
+        ::testing::ValuesIn(ROW_PADDINGS)
+    ),
+    AlignedMatrixPaddedDouble::getTestCaseName
+);
@@ -1,5 +1,9 @@
 #include "simd/multithreaded_iterate.hpp"
+#include "simd/streaming_stores.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
+#include "utils/utils.hpp"
+#include "utils/first_touch.hpp"
 
 #include <immintrin.h>
 
@@ -11,17 +15,24 @@ void AlignedArrayShared<T>::SetUp() {
     if (totalSize % ALIGNMENT_32 != 0) {
         totalSize += ALIGNMENT_32 - (totalSize % ALIGNMENT_32);
     }
-    array = static_cast<T*>(std::aligned_alloc(ALIGNMENT_32, totalSize));
+    array = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
 
     ASSERT_NE(array, nullptr) << "Unable to alloc array of size " << size;
 
-    memset(array, 0, totalSize);
+    std::vector<Tile> slices = grid_tiles(size, 1, numThreads, 1);
+    first_touch(slices.size(), [&](size_t i) { fill_tile(array, 1, slices[i], 0); });
+
+    loops = LOOP_COUNT_200K;
+
+    record_thread_setup(numThreads);
 }
 
 template <typename T>
 void AlignedArrayShared<T>::TearDown() {
-    free(array);
-    threads.clear();
+    record_worker_timings();
+
+    safe_free(array);
+    tasks.clear();
 }
 
 // TODO: add scalar loops to increment the remainder of arrays
@@ -30,7 +41,8 @@ void sequential_iterate<int>(size_t start, size_t end, const AlignedArrayShared<
     const __m256i one_vec = _mm256_set1_epi32(1);
     const size_t unroll_end = start + ((end - start) / (SIMD_INT_WIDTH * 4)) * (SIMD_INT_WIDTH * 4);
     
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
         for (size_t j = start; j < unroll_end; j += SIMD_INT_WIDTH * 4) {
             __m256i vec1 = _mm256_load_si256(reinterpret_cast<const __m256i*>(test->array + j));
             __m256i vec2 = _mm256_load_si256(reinterpret_cast<const __m256i*>(test->array + j + SIMD_INT_WIDTH));
@@ -55,7 +67,8 @@ void sequential_iterate<long>(size_t start, size_t end, const AlignedArrayShared
     const __m256i one_vec = _mm256_set1_epi64x(1);
     const size_t unroll_end = start + ((end - start) / (SIMD_LONG_WIDTH * 4)) * (SIMD_LONG_WIDTH * 4);
     
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
         for (size_t j = start; j < unroll_end; j += SIMD_LONG_WIDTH * 4) {
             __m256i vec1 = _mm256_load_si256(reinterpret_cast<const __m256i*>(test->array + j));
             __m256i vec2 = _mm256_load_si256(reinterpret_cast<const __m256i*>(test->array + j + SIMD_LONG_WIDTH));
@@ -80,7 +93,8 @@ void sequential_iterate<double>(size_t start, size_t end, const AlignedArrayShar
     const __m256d one_vec = _mm256_set1_pd(1.0);
     const size_t unroll_end = start + ((end - start) / (SIMD_DOUBLE_WIDTH * 4)) * (SIMD_DOUBLE_WIDTH * 4);
     
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
         for (size_t j = start; j < unroll_end; j += SIMD_DOUBLE_WIDTH * 4) {
             __m256d vec1 = _mm256_load_pd(test->array + j);
             __m256d vec2 = _mm256_load_pd(test->array + j + SIMD_DOUBLE_WIDTH);
@@ -100,26 +114,43 @@ void sequential_iterate<double>(size_t start, size_t end, const AlignedArrayShar
     }
 }
 
+template <typename T>
+void sequential_write(size_t start, size_t end, const AlignedArrayShared<T>* test) {
+    store_iterate<T, false, false>(test->array, start, end, test->loops);
+}
+
+template <typename T>
+void streaming_write(size_t start, size_t end, const AlignedArrayShared<T>* test) {
+    store_iterate<T, false, true>(test->array, start, end, test->loops);
+}
+
+template <typename T>
+void streaming_iterate(size_t start, size_t end, const AlignedArrayShared<T>* test) {
+    store_iterate<T, true, true>(test->array, start, end, test->loops);
+}
+
+// Elements a run touches, every slice leaves its own tail alone
+template <typename T>
+size_t slice_elements(size_t size, size_t numThreads) {
+    size_t elements = 0;
+    for (const Tile& slice : grid_tiles(size, 1, numThreads, 1)) {
+        elements += store_iterate_elements<T>(slice.row_begin, slice.row_end);
+    }
+    return elements;
+}
+
 template <typename T>
 void AlignedArrayShared<T>::runTest(iterate_function<T> iterate) {
     size_t totalSize, numThreads;
     std::tie(totalSize, numThreads) = this->GetParam();
 
-    size_t sliceSize = totalSize / numThreads, 
-           remainder = totalSize % numThreads,
-           start     = 0;
-    
-    for (size_t i = 0; i < numThreads; i++) {
-        size_t currentSliceSize = sliceSize + (i < remainder ? 1 : 0);
-        size_t end = start + currentSliceSize;
-        
-        threads.emplace_back(iterate, start, end, this);
-        start = end;
+    // the slices SetUp first touched
+    for (const Tile& slice : grid_tiles(totalSize, 1, numThreads, 1)) {
+        tasks.emplace_back(std::bind(iterate, slice.row_begin, slice.row_end, this));
     }
 
-    for (auto& thread : threads) {
-        thread.join();
-    }
+    thread_pool().run(tasks);
+    tasks.clear();
 }
 
 using AlignedArraySharedInt = AlignedArrayShared<int>;
@@ -127,15 +158,87 @@ using AlignedArraySharedLong = AlignedArrayShared<long>;
 using AlignedArraySharedDouble = AlignedArrayShared<double>;
 
 TEST_P(AlignedArraySharedInt, SequentialIterate) {
-    this->runTest(sequential_iterate<int>);
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { this->runTest(sequential_iterate<int>); });
+    record_bandwidth(stats, store_iterate_bytes<int>(true, loops, slice_elements<int>(size, numThreads)));
 }
 
 TEST_P(AlignedArraySharedLong, SequentialIterate) {
-    this->runTest(sequential_iterate<long>);
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { this->runTest(sequential_iterate<long>); });
+    record_bandwidth(stats, store_iterate_bytes<long>(true, loops, slice_elements<long>(size, numThreads)));
 }
 
 TEST_P(AlignedArraySharedDouble, SequentialIterate) {
-    this->runTest(sequential_iterate<double>);
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { this->runTest(sequential_iterate<double>); });
+    record_bandwidth(stats, store_iterate_bytes<double>(true, loops, slice_elements<double>(size, numThreads)));
+}
+
+TEST_P(AlignedArraySharedInt, SequentialWrite) {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { this->runTest(sequential_write<int>); });
+    record_bandwidth(stats, store_iterate_bytes<int>(false, loops, slice_elements<int>(size, numThreads)));
+}
+
+TEST_P(AlignedArraySharedInt, StreamingWrite) {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { this->runTest(streaming_write<int>); });
+    record_bandwidth(stats, store_iterate_bytes<int>(false, loops, slice_elements<int>(size, numThreads)));
+}
+
+TEST_P(AlignedArraySharedInt, StreamingIterate) {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { this->runTest(streaming_iterate<int>); });
+    record_bandwidth(stats, store_iterate_bytes<int>(true, loops, slice_elements<int>(size, numThreads)));
+}
+
+TEST_P(AlignedArraySharedLong, SequentialWrite) {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { this->runTest(sequential_write<long>); });
+    record_bandwidth(stats, store_iterate_bytes<long>(false, loops, slice_elements<long>(size, numThreads)));
+}
+
+TEST_P(AlignedArraySharedLong, StreamingWrite) {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { this->runTest(streaming_write<long>); });
+    record_bandwidth(stats, store_iterate_bytes<long>(false, loops, slice_elements<long>(size, numThreads)));
+}
+
+TEST_P(AlignedArraySharedLong, StreamingIterate) {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { this->runTest(streaming_iterate<long>); });
+    record_bandwidth(stats, store_iterate_bytes<long>(true, loops, slice_elements<long>(size, numThreads)));
+}
+
+TEST_P(AlignedArraySharedDouble, SequentialWrite) {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { this->runTest(sequential_write<double>); });
+    record_bandwidth(stats, store_iterate_bytes<double>(false, loops, slice_elements<double>(size, numThreads)));
+}
+
+TEST_P(AlignedArraySharedDouble, StreamingWrite) {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { this->runTest(streaming_write<double>); });
+    record_bandwidth(stats, store_iterate_bytes<double>(false, loops, slice_elements<double>(size, numThreads)));
+}
+
+TEST_P(AlignedArraySharedDouble, StreamingIterate) {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    SampleStats stats = measure_loops(loops, size, [&] { this->runTest(streaming_iterate<double>); });
+    record_bandwidth(stats, store_iterate_bytes<double>(true, loops, slice_elements<double>(size, numThreads)));
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -1,5 +1,11 @@
 #include "simd/multithreaded_matrix.hpp"
+#include "simd/block_kernels.hpp"
+#include "simd/gemm.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
+#include "utils/utils.hpp"
+#include "utils/blocking.hpp"
+#include "utils/first_touch.hpp"
 
 #include <immintrin.h>
 
@@ -11,22 +17,36 @@ void AlignedMatrixShared<T>::SetUp() {
     if (totalSize % ALIGNMENT_32 != 0) {
         totalSize += ALIGNMENT_32 - (totalSize % ALIGNMENT_32);
     }
-    matrix_A = static_cast<T*>(std::aligned_alloc(ALIGNMENT_32, totalSize));
-    matrix_B = static_cast<T*>(std::aligned_alloc(ALIGNMENT_32, totalSize));
-    matrix_C = static_cast<T*>(std::aligned_alloc(ALIGNMENT_32, totalSize));
+    matrix_A = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+    matrix_B = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+    matrix_C = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
 
-    memset(matrix_A, 3, totalSize);
-    memset(matrix_B, 3, totalSize);
-    memset(matrix_C, 0, totalSize);
+    // every worker touches the rows of A, B and C of its runTest band of C
+    std::vector<Tile> bands = grid_tiles(size, size, numThreads, 1);
+    first_touch(bands.size(), [&](size_t i) {
+        fill_tile(matrix_A, size, bands[i], 3);
+        fill_tile(matrix_B, size, bands[i], 3);
+        fill_tile(matrix_C, size, bands[i], 0);
+    });
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+
+    record_thread_setup(numThreads);
 }
 
 template <typename T>
 void AlignedMatrixShared<T>::TearDown() {
-    free(matrix_A);
-    free(matrix_B);
-    free(matrix_C);
+    record_worker_timings();
+    executor.record();
+
+    safe_free(matrix_A);
+    safe_free(matrix_B);
+    safe_free(matrix_C);
+    safe_free(prepared_B);
+    prepared_B = nullptr;
 
-    threads.clear();
+    tasks.clear();
 }
 
 template <>
@@ -34,6 +54,7 @@ void optimized_mul<int>(size_t startRow, size_t endRow, size_t startCol, size_t
     size_t matrixSize, numThreads;
     std::tie(matrixSize, numThreads) = test->GetParam();
     
+    RegionTimer region;
     for (size_t i = startRow; i < endRow; i++) {
         for (size_t k = 0; k < matrixSize; k++) {
             __m256i a = _mm256_set1_epi32(test->matrix_A[i * matrixSize + k]);
@@ -52,6 +73,7 @@ void optimized_mul<long>(size_t startRow, size_t endRow, size_t startCol, size_t
     size_t matrixSize, numThreads;
     std::tie(matrixSize, numThreads) = test->GetParam();
     
+    RegionTimer region;
     for (size_t i = startRow; i < endRow; i++) {
         for (size_t k = 0; k < matrixSize; k++) {
             __m256i a = _mm256_set1_epi64x(test->matrix_A[i * matrixSize + k]);
@@ -72,6 +94,7 @@ void optimized_mul<double>(size_t startRow, size_t endRow, size_t startCol, size
     size_t matrixSize, numThreads;
     std::tie(matrixSize, numThreads) = test->GetParam();
     
+    RegionTimer region;
     for (size_t i = startRow; i < endRow; i++) {
         for (size_t k = 0; k < matrixSize; k++) {
             __m256d a = _mm256_set1_pd(test->matrix_A[i * matrixSize + k]);
@@ -85,32 +108,115 @@ void optimized_mul<double>(size_t startRow, size_t endRow, size_t startCol, size
     }
 }
 
+// every thread packs its own B panels, redundant but amortized over its whole row band
+template <typename T>
+void gemm_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const AlignedMatrixShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    RegionTimer region;
+    gemm(test->matrix_A, test->matrix_B, test->matrix_C, matrixSize, startRow, endRow, startCol, endCol);
+}
+
+template <typename T>
+void transpose_b(size_t startRow, size_t endRow, const AlignedMatrixShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    transpose(test->matrix_B, test->prepared_B, matrixSize, startRow, endRow);
+}
+
+template <typename T>
+void pack_b(size_t startRow, size_t endRow, const AlignedMatrixShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    pack_columns(test->matrix_B, test->prepared_B, matrixSize, startRow, endRow);
+}
+
+template <typename T>
+void transposed_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const AlignedMatrixShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    RegionTimer region;
+    for (size_t i = startRow; i < endRow; i++) {
+        for (size_t j = startCol; j < endCol; j++) {
+            test->matrix_C[i * matrixSize + j] += simd_dot(&test->matrix_A[i * matrixSize], &test->prepared_B[j * matrixSize], matrixSize);
+        }
+    }
+}
+
+template <typename T>
+void packed_b_mul(size_t startRow, size_t endRow, size_t, size_t, const AlignedMatrixShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    RegionTimer region;
+    for (size_t i = startRow; i < endRow; i++) {
+        simd_packed_row_mul(&test->matrix_A[i * matrixSize], test->prepared_B, &test->matrix_C[i * matrixSize], matrixSize);
+    }
+}
+
+template <typename T>
+void recursive_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol, const AlignedMatrixShared<T>* test) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = test->GetParam();
+
+    RegionTimer region;
+    for_each_recursive_block(startRow, endRow, 0, matrixSize, startCol, endCol, RECURSION_BASE, ALIGNMENT_32 / sizeof(T),
+                             [test, matrixSize](size_t blockStartRow, size_t blockEndRow, size_t startK, size_t endK, size_t blockStartCol, size_t blockEndCol) {
+        simd_block_mul(test->matrix_A, test->matrix_B, test->matrix_C, matrixSize, blockStartRow, blockEndRow, startK, endK, blockStartCol, blockEndCol);
+    });
+}
+
 template <typename T>
 void AlignedMatrixShared<T>::runTest(mul_function<T> mul) {
     size_t matrixSize, numThreads;
     std::tie(matrixSize, numThreads) = this->GetParam();
     
-    size_t rowsPerThread = matrixSize / numThreads;
-    size_t remainderRows = matrixSize % numThreads;
-    
-    for (size_t threadId = 0; threadId < numThreads; ++threadId) {
-        size_t startRow = threadId * rowsPerThread;
-        size_t endRow = (threadId + 1) * rowsPerThread;
-        
-        if (threadId < remainderRows) {
-            startRow += threadId;
-            endRow += threadId + 1;
-        } else {
-            startRow += remainderRows;
-            endRow += remainderRows;
-        }
-        
-        threads.emplace_back(mul, startRow, endRow, 0, matrixSize, this);
+    // the bands SetUp first touched
+    for (const Tile& band : grid_tiles(matrixSize, matrixSize, numThreads, 1)) {
+        tasks.emplace_back(std::bind(mul, band.row_begin, band.row_end, band.col_begin, band.col_end, this));
     }
-    
-    for (auto& thread : threads) {
-        thread.join();
+
+    thread_pool().run(tasks);
+    tasks.clear();
+}
+
+template <typename T>
+void AlignedMatrixShared<T>::runRecursiveTest(mul_function<T> mul) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = this->GetParam();
+
+    // a few tiles per thread leave the executor something to steal, SIMD-aligned columns
+    std::vector<Tile> tiles = split_tiles({0, matrixSize, 0, matrixSize}, 4 * numThreads, ALIGNMENT_32 / sizeof(T));
+    executor.run(tiles, numThreads, [this, mul](const Tile& tile) {
+        mul(tile.row_begin, tile.row_end, tile.col_begin, tile.col_end, this);
+    });
+}
+
+template <typename T>
+void AlignedMatrixShared<T>::runPreparedTest(prepare_function<T> prepare, mul_function<T> mul) {
+    size_t matrixSize, numThreads;
+    std::tie(matrixSize, numThreads) = this->GetParam();
+
+    if (prepared_B == nullptr) {
+        prepared_B = alloc_prepared<T>(matrixSize);
+    }
+
+    std::vector<Tile> bands = grid_tiles(matrixSize, matrixSize, numThreads, 1);
+    for (const Tile& band : bands) {
+        tasks.emplace_back(std::bind(prepare, band.row_begin, band.row_end, this));
     }
+    prepare_ns.push_back(time_once([&] { thread_pool().run(tasks); }));
+    tasks.clear();
+
+    for (const Tile& band : bands) {
+        tasks.emplace_back(std::bind(mul, band.row_begin, band.row_end, band.col_begin, band.col_end, this));
+    }
+    thread_pool().run(tasks);
+    tasks.clear();
 }
 
 using AlignedMatrixSharedInt = AlignedMatrixShared<int>;
@@ -118,15 +224,75 @@ using AlignedMatrixSharedLong = AlignedMatrixShared<long>;
 using AlignedMatrixSharedDouble = AlignedMatrixShared<double>;
 
 TEST_P(AlignedMatrixSharedInt, OptimizedMul) {
-    runTest(::optimized_mul<int>);
+    measure([&] { runTest(::optimized_mul<int>); });
 }
 
 TEST_P(AlignedMatrixSharedLong, OptimizedMul) {
-    runTest(::optimized_mul<long>);
+    measure([&] { runTest(::optimized_mul<long>); });
 }
 
 TEST_P(AlignedMatrixSharedDouble, OptimizedMul) {
-    runTest(::optimized_mul<double>);
+    measure([&] { runTest(::optimized_mul<double>); });
+}
+
+TEST_P(AlignedMatrixSharedInt, GemmMul) {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    double n = static_cast<double>(size);
+
+    SampleStats stats = measure([&] { runTest(::gemm_mul<int>); });
+    record_flops(stats, 2 * n * n * n, peak_gflops<int>(numThreads));
+}
+
+TEST_P(AlignedMatrixSharedDouble, GemmMul) {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = GetParam();
+    double n = static_cast<double>(size);
+
+    SampleStats stats = measure([&] { runTest(::gemm_mul<double>); });
+    record_flops(stats, 2 * n * n * n, peak_gflops<double>(numThreads));
+}
+
+TEST_P(AlignedMatrixSharedInt, TransposedMul) {
+    SampleStats stats = measure([&] { runPreparedTest(::transpose_b<int>, ::transposed_mul<int>); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(AlignedMatrixSharedLong, TransposedMul) {
+    SampleStats stats = measure([&] { runPreparedTest(::transpose_b<long>, ::transposed_mul<long>); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(AlignedMatrixSharedDouble, TransposedMul) {
+    SampleStats stats = measure([&] { runPreparedTest(::transpose_b<double>, ::transposed_mul<double>); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(AlignedMatrixSharedInt, PackedBMul) {
+    SampleStats stats = measure([&] { runPreparedTest(::pack_b<int>, ::packed_b_mul<int>); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(AlignedMatrixSharedLong, PackedBMul) {
+    SampleStats stats = measure([&] { runPreparedTest(::pack_b<long>, ::packed_b_mul<long>); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(AlignedMatrixSharedDouble, PackedBMul) {
+    SampleStats stats = measure([&] { runPreparedTest(::pack_b<double>, ::packed_b_mul<double>); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(AlignedMatrixSharedInt, RecursiveMul) {
+    measure([&] { runRecursiveTest(::recursive_mul<int>); });
+}
+
+TEST_P(AlignedMatrixSharedLong, RecursiveMul) {
+    measure([&] { runRecursiveTest(::recursive_mul<long>); });
+}
+
+TEST_P(AlignedMatrixSharedDouble, RecursiveMul) {
+    measure([&] { runRecursiveTest(::recursive_mul<double>); });
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -158,3 +324,117 @@ INSTANTIATE_TEST_SUITE_P(
     ),
     AlignedMatrixSharedDouble::getTestCaseName
 );
+
+template <typename T>
+void AlignedMatrixSharedBlocked<T>::SetUp() {
+    size_t size, numThreads, l1, l2;
+    std::tie(size, numThreads, l1, l2) = this->GetParam();
+    size_t totalSize = size * size * sizeof(T);
+    if (totalSize % ALIGNMENT_32 != 0) {
+        totalSize += ALIGNMENT_32 - (totalSize % ALIGNMENT_32);
+    }
+    matrix_A = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+    matrix_B = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+    matrix_C = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+
+    // same bands as runTest, see AlignedMatrixShared::SetUp
+    std::vector<Tile> bands = grid_tiles(size, size, numThreads, 1);
+    first_touch(bands.size(), [&](size_t i) {
+        fill_tile(matrix_A, size, bands[i], 3);
+        fill_tile(matrix_B, size, bands[i], 3);
+        fill_tile(matrix_C, size, bands[i], 0);
+    });
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+
+    record_thread_setup(numThreads);
+}
+
+template <typename T>
+void AlignedMatrixSharedBlocked<T>::TearDown() {
+    record_worker_timings();
+
+    safe_free(matrix_A);
+    safe_free(matrix_B);
+    safe_free(matrix_C);
+
+    tasks.clear();
+}
+
+template <typename T>
+void AlignedMatrixSharedBlocked<T>::blocked_mul(size_t startRow, size_t endRow, size_t startCol, size_t endCol) {
+    size_t matrixSize, numThreads, l1, l2;
+    std::tie(matrixSize, numThreads, l1, l2) = this->GetParam();
+
+    RegionTimer region;
+    for_each_block(startRow, endRow, startCol, endCol, matrixSize, l1, l2,
+                   [this, matrixSize](size_t blockStartRow, size_t blockEndRow, size_t startK, size_t endK, size_t blockStartCol, size_t blockEndCol) {
+        simd_block_mul(matrix_A, matrix_B, matrix_C, matrixSize, blockStartRow, blockEndRow, startK, endK, blockStartCol, blockEndCol);
+    });
+}
+
+template <typename T>
+void AlignedMatrixSharedBlocked<T>::runTest() {
+    size_t matrixSize, numThreads, l1, l2;
+    std::tie(matrixSize, numThreads, l1, l2) = this->GetParam();
+
+    for (const Tile& band : grid_tiles(matrixSize, matrixSize, numThreads, 1)) {
+        tasks.emplace_back(std::bind(&AlignedMatrixSharedBlocked<T>::blocked_mul, this, band.row_begin, band.row_end, band.col_begin, band.col_end));
+    }
+
+    thread_pool().run(tasks);
+    tasks.clear();
+}
+
+using AlignedMatrixSharedBlockedInt = AlignedMatrixSharedBlocked<int>;
+using AlignedMatrixSharedBlockedLong = AlignedMatrixSharedBlocked<long>;
+using AlignedMatrixSharedBlockedDouble = AlignedMatrixSharedBlocked<double>;
+
+TEST_P(AlignedMatrixSharedBlockedInt, BlockedMul) {
+    measure([&] { runTest(); });
+}
+
+TEST_P(AlignedMatrixSharedBlockedLong, BlockedMul) {
+    measure([&] { runTest(); });
+}
+
+TEST_P(AlignedMatrixSharedBlockedDouble, BlockedMul) {
+    measure([&] { runTest(); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    simd_multithreaded_caching,
+    AlignedMatrixSharedBlockedInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    AlignedMatrixSharedBlockedInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    simd_multithreaded_caching,
+    AlignedMatrixSharedBlockedLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    AlignedMatrixSharedBlockedLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    simd_multithreaded_caching,
+    AlignedMatrixSharedBlockedDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    AlignedMatrixSharedBlockedDouble::getTestCaseName
+);
@@ -0,0 +1,171 @@
+#include "simd/stream.hpp"
+#include "utils/constants.hpp"
+#include "utils/harness.hpp"
+#include "utils/utils.hpp"
+#include "utils/first_touch.hpp"
+
+#include <immintrin.h>
+#include <algorithm>
+
+void simd_stream_kernel(StreamKernel kernel, double* a, double* b, double* c, double q, size_t begin, size_t end) {
+    // worker slices start anywhere, so the loads and stores are the unaligned forms;
+    // on aligned addresses they cost the same as the aligned ones
+    size_t vectorEnd = begin + (end - begin) / SIMD_DOUBLE_WIDTH * SIMD_DOUBLE_WIDTH;
+    __m256d scalar = _mm256_set1_pd(q);
+
+    RegionTimer region;
+    switch (kernel) {
+        case StreamKernel::copy:
+            for (size_t i = begin; i < vectorEnd; i += SIMD_DOUBLE_WIDTH) {
+                _mm256_storeu_pd(c + i, _mm256_loadu_pd(a + i));
+            }
+            break;
+        case StreamKernel::scale:
+            for (size_t i = begin; i < vectorEnd; i += SIMD_DOUBLE_WIDTH) {
+                _mm256_storeu_pd(b + i, _mm256_mul_pd(scalar, _mm256_loadu_pd(c + i)));
+            }
+            break;
+        case StreamKernel::add:
+            for (size_t i = begin; i < vectorEnd; i += SIMD_DOUBLE_WIDTH) {
+                _mm256_storeu_pd(c + i, _mm256_add_pd(_mm256_loadu_pd(a + i), _mm256_loadu_pd(b + i)));
+            }
+            break;
+        case StreamKernel::triad:
+            for (size_t i = begin; i < vectorEnd; i += SIMD_DOUBLE_WIDTH) {
+                _mm256_storeu_pd(a + i, _mm256_add_pd(_mm256_loadu_pd(b + i), _mm256_mul_pd(scalar, _mm256_loadu_pd(c + i))));
+            }
+            break;
+    }
+    stream_kernel(kernel, a, b, c, q, vectorEnd, end);
+}
+
+template <typename T>
+void AlignedStream<T>::SetUp() {
+    size_t size = this->GetParam();
+
+    a = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, size * sizeof(T)));
+    b = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, size * sizeof(T)));
+    c = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, size * sizeof(T)));
+
+    std::fill(a, a + size, T(1));
+    std::fill(b, b + size, T(2));
+    std::fill(c, c + size, T(0));
+
+    set_work(static_cast<double>(size));
+}
+
+template <typename T>
+void AlignedStream<T>::TearDown() {
+    safe_free(a);
+    safe_free(b);
+    safe_free(c);
+}
+
+using AlignedStreamDouble = AlignedStream<double>;
+
+TEST_P(AlignedStreamDouble, Copy) {
+    SampleStats stats = measure([&] { simd_stream_kernel(StreamKernel::copy, a, b, c, STREAM_SCALAR, 0, GetParam()); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::copy, GetParam()));
+}
+
+TEST_P(AlignedStreamDouble, Scale) {
+    SampleStats stats = measure([&] { simd_stream_kernel(StreamKernel::scale, a, b, c, STREAM_SCALAR, 0, GetParam()); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::scale, GetParam()));
+}
+
+TEST_P(AlignedStreamDouble, Add) {
+    SampleStats stats = measure([&] { simd_stream_kernel(StreamKernel::add, a, b, c, STREAM_SCALAR, 0, GetParam()); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::add, GetParam()));
+}
+
+TEST_P(AlignedStreamDouble, Triad) {
+    SampleStats stats = measure([&] { simd_stream_kernel(StreamKernel::triad, a, b, c, STREAM_SCALAR, 0, GetParam()); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::triad, GetParam()));
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    simd_singlecore_caching,
+    AlignedStreamDouble,
+    ::testing::ValuesIn(STREAM_SIZES),
+    AlignedStreamDouble::getTestCaseName
+);
+
+template <typename T>
+void AlignedStreamShared<T>::SetUp() {
+    size_t size, numThreads;
+    std::tie(size, numThreads) = this->GetParam();
+
+    a = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, size * sizeof(T)));
+    b = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, size * sizeof(T)));
+    c = static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, size * sizeof(T)));
+
+    std::vector<Tile> slices = grid_tiles(size, 1, numThreads, 1);
+    first_touch(slices.size(), [&](size_t i) {
+        std::fill(a + slices[i].row_begin, a + slices[i].row_end, T(1));
+        std::fill(b + slices[i].row_begin, b + slices[i].row_end, T(2));
+        std::fill(c + slices[i].row_begin, c + slices[i].row_end, T(0));
+    });
+
+    set_work(static_cast<double>(size));
+
+    record_thread_setup(numThreads);
+}
+
+template <typename T>
+void AlignedStreamShared<T>::TearDown() {
+    record_worker_timings();
+
+    safe_free(a);
+    safe_free(b);
+    safe_free(c);
+
+    tasks.clear();
+}
+
+template <typename T>
+void AlignedStreamShared<T>::runTest(StreamKernel kernel) {
+    size_t totalSize, numThreads;
+    std::tie(totalSize, numThreads) = this->GetParam();
+
+    // the slices SetUp first touched
+    for (const Tile& slice : grid_tiles(totalSize, 1, numThreads, 1)) {
+        tasks.emplace_back([this, kernel, slice] {
+            simd_stream_kernel(kernel, a, b, c, STREAM_SCALAR, slice.row_begin, slice.row_end);
+        });
+    }
+
+    thread_pool().run(tasks);
+    tasks.clear();
+}
+
+using AlignedStreamSharedDouble = AlignedStreamShared<double>;
+
+TEST_P(AlignedStreamSharedDouble, Copy) {
+    SampleStats stats = measure([&] { this->runTest(StreamKernel::copy); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::copy, std::get<0>(GetParam())));
+}
+
+TEST_P(AlignedStreamSharedDouble, Scale) {
+    SampleStats stats = measure([&] { this->runTest(StreamKernel::scale); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::scale, std::get<0>(GetParam())));
+}
+
+TEST_P(AlignedStreamSharedDouble, Add) {
+    SampleStats stats = measure([&] { this->runTest(StreamKernel::add); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::add, std::get<0>(GetParam())));
+}
+
+TEST_P(AlignedStreamSharedDouble, Triad) {
+    SampleStats stats = measure([&] { this->runTest(StreamKernel::triad); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::triad, std::get<0>(GetParam())));
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    simd_multithreaded_caching,
+    AlignedStreamSharedDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(STREAM_SIZES),
+        ::testing::ValuesIn(NUM_THREADS)
+    ),
+    AlignedStreamSharedDouble::getTestCaseName
+);
@@ -1,6 +1,7 @@
 #include "simd/mandelbrot.hpp"
 #include "utils/utils.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
 
 void AlignedArrayMandelbrot::SetUp() {
     std::tuple<size_t, size_t> dimensions;
@@ -16,7 +17,7 @@ void AlignedArrayMandelbrot::SetUp() {
     if (totalSize % ALIGNMENT_32 != 0) {
         totalSize += ALIGNMENT_32 - (totalSize % ALIGNMENT_32);
     }
-    array = static_cast<int*>(std::aligned_alloc(ALIGNMENT_32, totalSize));
+    array = static_cast<int*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
     ASSERT_NE(array, nullptr) << "Unable to alloc array of size " << totalSize;
 
     memset(array, 1, totalSize);
@@ -24,16 +25,19 @@ void AlignedArrayMandelbrot::SetUp() {
     this->pixel_width         = radius * 2 / ((width < height) ? static_cast<double>(width) : static_cast<double>(height));
     this->top_left_coord_real = center_coord_real - static_cast<double>(width) / 2 * this->pixel_width;
     this->top_left_coord_im   = center_coord_im + static_cast<double>(height) / 2 * this->pixel_width;
+
+    set_work(static_cast<double>(width * height));
 }
 
 void AlignedArrayMandelbrot::TearDown() {
-    free(array);
+    safe_free(array);
 }
 
 void AlignedArrayMandelbrot::mandelbrot() {
     __m256d im_part = _mm256_set1_pd(this->top_left_coord_im);
     __m256d pixel_width_vec = _mm256_set1_pd(this->pixel_width);
 
+    RegionTimer region;
     for (size_t i = 0; i < height; i++) {
         __m256d real_base = _mm256_set1_pd(this->top_left_coord_real);
         __m256d lane_offets = _mm256_set_pd(3 * this->pixel_width, 2 * this->pixel_width, this->pixel_width, 0);
@@ -53,7 +57,7 @@ void AlignedArrayMandelbrot::mandelbrot() {
 }
 
 TEST_P(AlignedArrayMandelbrot, MandelbrotQuadratic) {
-    mandelbrot();
+    measure([&] { mandelbrot(); });
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -1,12 +1,13 @@
 #include "simd/multithreaded_mandelbrot.hpp"
 #include "utils/utils.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
 
 void AlignedArraySharedMandelbrot::SetUp() {
     std::tuple<size_t, size_t> dimensions;
     std::tuple<double, double, double> mandelbrot_args;
     size_t numThreads;
-    std::tie(dimensions, mandelbrot_args, numThreads) = GetParam();
+    std::tie(dimensions, mandelbrot_args, numThreads, std::ignore) = GetParam();
 
     std::tie(width, height) = dimensions;
     double center_coord_real, center_coord_im, radius;
@@ -17,7 +18,7 @@ void AlignedArraySharedMandelbrot::SetUp() {
     if (totalSize % ALIGNMENT_32 != 0) {
         totalSize += ALIGNMENT_32 - (totalSize % ALIGNMENT_32);
     }
-    array = static_cast<int*>(std::aligned_alloc(ALIGNMENT_32, totalSize));
+    array = static_cast<int*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
     ASSERT_NE(array, nullptr) << "Unable to alloc array of size " << totalSize;
 
     memset(array, 1, totalSize);
@@ -25,19 +26,29 @@ void AlignedArraySharedMandelbrot::SetUp() {
     this->pixel_width         = radius * 2 / ((width < height) ? static_cast<double>(width) : static_cast<double>(height));
     this->top_left_coord_real = center_coord_real - static_cast<double>(width) / 2 * this->pixel_width;
     this->top_left_coord_im   = center_coord_im + static_cast<double>(height) / 2 * this->pixel_width;
+
+    set_work(static_cast<double>(width * height));
+
+    record_thread_setup(numThreads);
+    record_metric("chunk", static_cast<double>(schedule_chunk()));
 }
 
 void AlignedArraySharedMandelbrot::TearDown() {
-    free(array);
+    record_worker_timings(work);
+    executor.record();
+
+    safe_free(array);
 }
 
-void mandelbrot_simd(size_t start_row, size_t end_row, const AlignedArraySharedMandelbrot* test) {
+double mandelbrot_simd(size_t start_row, size_t end_row, size_t start_col, size_t end_col,
+                       const AlignedArraySharedMandelbrot* test) {
+    double iterations = 0;
     double start_im = test->top_left_coord_im - (static_cast<double>(start_row) * test->pixel_width);
     __m256d im_part = _mm256_set1_pd(start_im);
     __m256d pixel_width_vec = _mm256_set1_pd(test->pixel_width);
 
     for (size_t i = start_row; i < end_row; i++) {
-        __m256d real_base = _mm256_set1_pd(test->top_left_coord_real);
+        __m256d real_base = _mm256_set1_pd(test->top_left_coord_real + static_cast<double>(start_col) * test->pixel_width);
         __m256d lane_offsets = _mm256_set_pd(
             3.0 * test->pixel_width, 
             2.0 * test->pixel_width, 
@@ -46,55 +57,72 @@ void mandelbrot_simd(size_t start_row, size_t end_row, const AlignedArraySharedM
         );
         __m256d real_part = _mm256_add_pd(real_base, lane_offsets);
 
-        for (size_t j = 0; j + SIMD_DOUBLE_WIDTH <= test->width; j += SIMD_DOUBLE_WIDTH) {
+        for (size_t j = start_col; j + SIMD_DOUBLE_WIDTH <= end_col; j += SIMD_DOUBLE_WIDTH) {
             size_t array_index = test->width * i + j;
             __m128i iter_count = simd_diverge(real_part, im_part, simd_ints_1500);
 
             _mm_store_si128(reinterpret_cast<__m128i*>(test->array + array_index), iter_count);
+            // simd_diverge runs every lane until the last one stops, so each lane holds the
+            // vector iterations the whole group took
+            iterations += _mm_cvtsi128_si32(iter_count);
 
             __m256d step = _mm256_set1_pd(SIMD_DOUBLE_WIDTH * test->pixel_width);
             real_part = _mm256_add_pd(real_part, step);
         }
         
-        for (size_t j = (test->width / SIMD_DOUBLE_WIDTH) * SIMD_DOUBLE_WIDTH; j < test->width; j++) {
+        for (size_t j = start_col + (end_col - start_col) / SIMD_DOUBLE_WIDTH * SIMD_DOUBLE_WIDTH; j < end_col; j++) {
             double real_coord = test->top_left_coord_real + j * test->pixel_width;
             double im_coord = test->top_left_coord_im - i * test->pixel_width;
             int iter_count = scalar_diverge(real_coord, im_coord, ITER_1500);
             test->array[test->width * i + j] = iter_count;
+            // scalar_diverge stores 0 for the pixels that ran all the iterations
+            iterations += iter_count != 0 ? iter_count : ITER_1500 + 1;
         }
         
         im_part = _mm256_sub_pd(im_part, pixel_width_vec);
     }
+    return iterations;
+}
+
+void render(size_t worker, AlignedArraySharedMandelbrot* test) {
+    size_t start_row, end_row;
+    double iterations = 0;
+
+    RegionTimer region;
+    while (test->scheduler.next(worker, start_row, end_row)) {
+        iterations += mandelbrot_simd(start_row, end_row, 0, test->width, test);
+    }
+    test->work[worker] = iterations;
 }
 
 void runTest(AlignedArraySharedMandelbrot* test) {
-    std::tuple<size_t, size_t> dimensions;
-    std::tuple<double, double, double> mandelbrot_args;
     size_t numThreads;
-    std::tie(dimensions, mandelbrot_args, numThreads) = test->GetParam();
-
-    size_t width, height;
-    std::tie(width, height) = dimensions;
+    Schedule schedule;
+    std::tie(std::ignore, std::ignore, numThreads, schedule) = test->GetParam();
+
+    if (schedule == Schedule::stealing) {
+        // whole vectors per tile row keep the aligned stores aligned
+        size_t tileCols = (tile_size() + SIMD_DOUBLE_WIDTH - 1) / SIMD_DOUBLE_WIDTH * SIMD_DOUBLE_WIDTH;
+        std::vector<Tile> tiles = make_tiles(test->height, test->width, tile_size(), tileCols);
+        test->work.assign(numThreads, 0);
+        test->executor.run(tiles, numThreads, [test](size_t worker, const Tile& tile) {
+            test->work[worker] += mandelbrot_simd(tile.row_begin, tile.row_end, tile.col_begin, tile.col_end, test);
+        });
+        return;
+    }
 
-    size_t rowsPerThread = height / numThreads;
-    size_t remainderRows = height % numThreads;
-    size_t currentRow = 0;
-    
+    test->scheduler.reset(schedule, test->height, numThreads, schedule_chunk());
+    test->work.assign(numThreads, 0);
     for (size_t i = 0; i < numThreads; i++) {
-        size_t startRow = currentRow;
-        size_t endRow = startRow + rowsPerThread + (i < remainderRows ? 1 : 0);
-        
-        test->threads.emplace_back(mandelbrot_simd, startRow, endRow, test);
-        currentRow = endRow;
+        test->tasks.emplace_back(std::bind(render, i, test));
     }
 
-    for (auto& thread : test->threads) {
-        thread.join();
-    }
+    thread_pool().run(test->tasks);
+    test->tasks.clear();
 }
 
 TEST_P(AlignedArraySharedMandelbrot, MandelbrotQuadratic) {
-    ::runTest(this);
+    measure([&] { ::runTest(this); });
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -103,6 +131,7 @@ INSTANTIATE_TEST_SUITE_P(
     ::testing::Combine(
         ::testing::ValuesIn(picture_dimensions),
         ::testing::ValuesIn(MANDELBROT_ARGS),
-        ::testing::ValuesIn(NUM_THREADS)),
+        ::testing::ValuesIn(NUM_THREADS),
+        ::testing::ValuesIn(SCHEDULES)),
     AlignedArraySharedMandelbrot::getTestCaseName
 );
@@ -1,7 +1,11 @@
+#include "utils/results.hpp"
+
 #include <gtest/gtest.h>
 
 int main(int argc, char** argv) {
     ::testing::InitGoogleTest(&argc, argv);
 
+    register_results_listener();
+
     return RUN_ALL_TESTS();
 }
@@ -1,5 +1,7 @@
 #pragma once
 
+#include "utils/prefetch.hpp"
+
 #include <gtest/gtest.h>
 
 template <typename T>
@@ -10,8 +12,47 @@ protected:
     void TearDown() override;
 public:
     T* array;
+    // outer passes over the array, fixed unless BENCH_CALIBRATE is set
+    size_t loops;
 
     static std::string getTestCaseName(const ::testing::TestParamInfo<size_t>& info) {
         return "size_" + std::to_string(info.param);
     }
 };
+
+// CArray plus a shuffled index and a random cycle over the same elements, walked by the
+// random-access kernels instead of a stride the prefetcher can follow
+template <typename T>
+class CArrayRandom : public CArray<T> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    // every element once, in shuffled order
+    size_t* index;
+    // next[j] is the element visited after j, one cycle through the whole array
+    size_t* next;
+};
+
+// The strided and shuffled-index walks with a software prefetch `distance` iterations
+// ahead, for every locality hint
+template <typename T>
+class CArrayPrefetch : public testing::TestWithParam<std::tuple<size_t, size_t, PrefetchHint>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* array;
+    // every element once, in shuffled order
+    size_t* index;
+    size_t loops;
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t, PrefetchHint>>& info) {
+        size_t size, distance;
+        PrefetchHint hint;
+        std::tie(size, distance, hint) = info.param;
+        return "size_" + std::to_string(size) + "_distance_" + std::to_string(distance) + "_hint_" + prefetch_hint_name(hint);
+    }
+};
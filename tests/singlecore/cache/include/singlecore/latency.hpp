@@ -0,0 +1,40 @@
+#pragma once
+
+#include "utils/constants.hpp"
+
+#include <gtest/gtest.h>
+
+#include <cstdint>
+#include <vector>
+
+// One ring element per cache line, so every load of a chase touches a new line
+struct alignas(CACHE_LINE) LatencyNode {
+    LatencyNode* next;
+};
+
+// Ring sizes in bytes from LATENCY_MIN_BYTES to LATENCY_MAX_BYTES, LATENCY_STEPS_PER_OCTAVE per doubling
+std::vector<size_t> latency_ladder();
+
+// A single random cycle through every node of a buffer of the given byte size, chased
+// by 1 or more independent pointers that start evenly spaced along it. The size in the
+// test name, and so in the results, is the ring's size in bytes.
+class CLatencyLadder : public testing::TestWithParam<std::tuple<size_t, size_t>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    LatencyNode* nodes;
+    std::vector<LatencyNode*> starts;
+    // sum of where the chasers stopped, keeps the loads alive
+    uintptr_t checksum = 0;
+
+    // LATENCY_LOADS / chasers steps of every chaser
+    void runTest();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t>>& info) {
+        size_t bytes, chasers;
+        std::tie(bytes, chasers) = info.param;
+        return "size_" + std::to_string(bytes) + "_chasers_" + std::to_string(chasers);
+    }
+};
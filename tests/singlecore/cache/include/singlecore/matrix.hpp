@@ -1,5 +1,8 @@
 #pragma once
 
+#include "utils/loop_order.hpp"
+#include "utils/row_allocation.hpp"
+
 #include <gtest/gtest.h>
 
 template <typename T>
@@ -17,7 +20,88 @@ public:
 
     void optimized_mul();
 
+    // B^T or B in column panels, allocated on first use with room for the packed layout
+    T* prepared_B = nullptr;
+    std::vector<double> prepare_ns;
+
+    // row i of A dotted with row j of B^T, B is transposed at the start of every run
+    void transposed_mul();
+
+    // C rows against PACKED_B_WIDTH column panels of B, packed at the start of every run
+    void packed_b_mul();
+
     static std::string getTestCaseName(const ::testing::TestParamInfo<size_t>& info) {
         return "size_" + std::to_string(info.param) + "x" + std::to_string(info.param);
     }
 };
+
+// (size, l1 tile, l2 tile)
+template <typename T>
+class CMatrixBlocked : public testing::TestWithParam<std::tuple<size_t, size_t, size_t>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T** matrix_A;
+    T** matrix_B;
+    T** matrix_C;
+
+    // ikj inside l1 x l1 blocks of l2 x l2 panels of B, see for_each_block()
+    void blocked_mul();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t, size_t>>& info) {
+        size_t totalSize, l1, l2;
+        std::tie(totalSize, l1, l2) = info.param;
+        return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize) +
+               "_l1_" + std::to_string(l1) + "_l2_" + std::to_string(l2);
+    }
+};
+
+// (size, loop order)
+template <typename T>
+class CMatrixLoopOrder : public testing::TestWithParam<std::tuple<size_t, LoopOrder>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T** matrix_A;
+    T** matrix_B;
+    T** matrix_C;
+
+    // the plain triple loop nested in the fixture's loop order, see for_each_in_order()
+    void loop_order_mul();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, LoopOrder>>& info) {
+        size_t totalSize;
+        LoopOrder order;
+        std::tie(totalSize, order) = info.param;
+        return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize) + "_order_" + loop_order_name(order);
+    }
+};
+
+// (size, row allocation), see RowAllocation
+template <typename T>
+class CMatrixAllocation : public testing::TestWithParam<std::tuple<size_t, RowAllocation>> {
+protected:
+    // times the allocation and the first touch of the three matrices on their own
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T** matrix_A;
+    T** matrix_B;
+    T** matrix_C;
+
+    void naive_mul();
+
+    void optimized_mul();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, RowAllocation>>& info) {
+        size_t totalSize;
+        RowAllocation allocation;
+        std::tie(totalSize, allocation) = info.param;
+        return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize) + "_alloc_" + row_allocation_name(allocation);
+    }
+};
@@ -1,5 +1,7 @@
 #pragma once
 
+#include "utils/loop_order.hpp"
+
 #include <thread>
 #include <gtest/gtest.h>
 template <typename T>
@@ -19,8 +21,91 @@ public:
     
     void optimized_mul();
 
+    // B^T or B in column panels, allocated on first use with room for the packed layout
+    T* prepared_B = nullptr;
+    std::vector<double> prepare_ns;
+
+    // row i of A dotted with row j of B^T, B is transposed at the start of every run
+    void transposed_mul();
+
+    // C rows against PACKED_B_WIDTH column panels of B, packed at the start of every run
+    void packed_b_mul();
+
+    // ikj on the blocks of a cache-oblivious recursion, see for_each_recursive_block()
+    void recursive_mul();
+
     static std::string getTestCaseName(const ::testing::TestParamInfo<size_t>& info) {
         size_t totalSize = info.param;
         return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize);
     }
 };
+
+// (size, l1 tile, l2 tile)
+template <typename T>
+class CMatrixArrayBlocked : public testing::TestWithParam<std::tuple<size_t, size_t, size_t>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* matrix_A;
+    T* matrix_B;
+    T* matrix_C;
+
+    // ikj inside l1 x l1 blocks of l2 x l2 panels of B, see for_each_block()
+    void blocked_mul();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t, size_t>>& info) {
+        size_t totalSize, l1, l2;
+        std::tie(totalSize, l1, l2) = info.param;
+        return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize) +
+               "_l1_" + std::to_string(l1) + "_l2_" + std::to_string(l2);
+    }
+};
+
+// (size, loop order)
+template <typename T>
+class CMatrixArrayLoopOrder : public testing::TestWithParam<std::tuple<size_t, LoopOrder>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* matrix_A;
+    T* matrix_B;
+    T* matrix_C;
+
+    // the plain triple loop nested in the fixture's loop order, see for_each_in_order()
+    void loop_order_mul();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, LoopOrder>>& info) {
+        size_t totalSize;
+        LoopOrder order;
+        std::tie(totalSize, order) = info.param;
+        return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize) + "_order_" + loop_order_name(order);
+    }
+};
+
+// (size, row padding in bytes), rows are leading_dimension() elements apart
+template <typename T>
+class CMatrixArrayPadded : public testing::TestWithParam<std::tuple<size_t, size_t>> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* matrix_A;
+    T* matrix_B;
+    T* matrix_C;
+    size_t ld;
+
+    void naive_mul();
+
+    void optimized_mul();
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<std::tuple<size_t, size_t>>& info) {
+        size_t totalSize, pad;
+        std::tie(totalSize, pad) = info.param;
+        return "size_" + std::to_string(totalSize) + "x" + std::to_string(totalSize) + "_pad_" + std::to_string(pad);
+    }
+};
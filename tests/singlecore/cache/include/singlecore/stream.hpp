@@ -0,0 +1,20 @@
+#pragma once
+
+#include <gtest/gtest.h>
+
+// The three STREAM arrays of `size` elements each, a = 1, b = 2, c = 0 after SetUp
+template <typename T>
+class CStream : public testing::TestWithParam<size_t> {
+protected:
+    void SetUp() override;
+
+    void TearDown() override;
+public:
+    T* a;
+    T* b;
+    T* c;
+
+    static std::string getTestCaseName(const ::testing::TestParamInfo<size_t>& info) {
+        return "size_" + std::to_string(info.param);
+    }
+};
@@ -1,6 +1,8 @@
 #include "singlecore/iterate.hpp"
 #include "utils/utils.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
+#include "utils/permutation.hpp"
 
 template <typename T>
 void CArray<T>::SetUp() {
@@ -11,17 +13,20 @@ void CArray<T>::SetUp() {
     ASSERT_NE(array, nullptr) << "Unable to alloc array of size " << size;
 
     memset(array, 1, totalSize);
+
+    loops = LOOP_COUNT_200K;
 }
 
 template <typename T>
 void CArray<T>::TearDown() {
-    free(array);
+    safe_free(array);
 }
 
 template <typename T>
 void sequential_iterate(const CArray<T>* test) {
     size_t size = test->GetParam();
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
         for (size_t j = 0; j < size; j++) {
             test->array[j]++;
         }
@@ -31,7 +36,8 @@ void sequential_iterate(const CArray<T>* test) {
 template <typename T>
 void reverse_sequential_iterate(const CArray<T>* test) {
     size_t size = test->GetParam();
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
         for (size_t j = size - 1; j > 0; j--) {
             test->array[j]++;
         }
@@ -45,7 +51,8 @@ void jump_iterate(const CArray<T>* test) {
     
     size_t size = test->GetParam();
     
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
         for (size_t k = 0; k < jump_size; k++) {
             size_t j = k;
             while (j < size) {
@@ -64,7 +71,8 @@ void reverse_jump_iterate(const CArray<T>* test) {
     
     size_t size = test->GetParam();
 
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
         for (size_t k = 0; k < jump_size; k++) {
             size_t j = size - k - 1;
             while (j < size) {
@@ -76,56 +84,81 @@ void reverse_jump_iterate(const CArray<T>* test) {
     }
 }
 
+template <typename T>
+void random_iterate(const CArrayRandom<T>* test) {
+    size_t size = test->GetParam();
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
+        for (size_t j = 0; j < size; j++) {
+            test->array[test->index[j]]++;
+        }
+    }
+}
+
+// every address depends on the previous load, so the misses cannot overlap
+template <typename T>
+void pointer_chase(const CArrayRandom<T>* test) {
+    size_t size = test->GetParam();
+    size_t j = 0;
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
+        for (size_t k = 0; k < size; k++) {
+            j = test->next[j];
+            test->array[j]++;
+        }
+    }
+}
+
 using CArrayInt = CArray<int>;
 using CArrayLong = CArray<long>;
 using CArrayDouble = CArray<double>;
 
 TEST_P(CArrayInt, SequentialIterate) {
-    sequential_iterate(this);
+    measure_loops(loops, GetParam(), [&] { sequential_iterate(this); });
 }
 
 TEST_P(CArrayLong, SequentialIterate) {
-    sequential_iterate(this);
+    measure_loops(loops, GetParam(), [&] { sequential_iterate(this); });
 }
 
 TEST_P(CArrayDouble, SequentialIterate) {
-    sequential_iterate(this);
+    measure_loops(loops, GetParam(), [&] { sequential_iterate(this); });
 }
 
 TEST_P(CArrayInt, DISABLED_ReverseSequentialIterate) {
-    reverse_sequential_iterate(this);
+    measure_loops(loops, GetParam(), [&] { reverse_sequential_iterate(this); });
 }
 
 TEST_P(CArrayLong, DISABLED_ReverseSequentialIterate) {
-    reverse_sequential_iterate(this);
+    measure_loops(loops, GetParam(), [&] { reverse_sequential_iterate(this); });
 }
 
 TEST_P(CArrayDouble, DISABLED_ReverseSequentialIterate) {
-    reverse_sequential_iterate(this);
+    measure_loops(loops, GetParam(), [&] { reverse_sequential_iterate(this); });
 }
 
 TEST_P(CArrayInt, DISABLED_JumpIterate) {
-    jump_iterate(this);
+    measure_loops(loops, GetParam(), [&] { jump_iterate(this); });
 }
 
 TEST_P(CArrayLong, DISABLED_JumpIterate) {
-    jump_iterate(this);
+    measure_loops(loops, GetParam(), [&] { jump_iterate(this); });
 }
 
 TEST_P(CArrayDouble, DISABLED_JumpIterate) {
-    jump_iterate(this);
+    measure_loops(loops, GetParam(), [&] { jump_iterate(this); });
 }
 
 TEST_P(CArrayInt, DISABLED_ReverseJumpIterate) {
-    reverse_jump_iterate(this);
+    measure_loops(loops, GetParam(), [&] { reverse_jump_iterate(this); });
 }
 
 TEST_P(CArrayLong, DISABLED_ReverseJumpIterate) {
-    reverse_jump_iterate(this);
+    measure_loops(loops, GetParam(), [&] { reverse_jump_iterate(this); });
 }
 
 TEST_P(CArrayDouble, DISABLED_ReverseJumpIterate) {
-    reverse_jump_iterate(this);
+    measure_loops(loops, GetParam(), [&] { reverse_jump_iterate(this); });
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -148,3 +181,250 @@ INSTANTIATE_TEST_SUITE_P(
     ::testing::Values(10, 100, 1000, 10000, 100000, 1000000, 2000000, 3000000),
     CArrayDouble::getTestCaseName
 );
+
+template <typename T>
+void CArrayRandom<T>::SetUp() {
+    CArray<T>::SetUp();
+    size_t size = this->GetParam();
+
+    ASSERT_NO_THROW(index = (size_t*) safe_malloc(size * sizeof(size_t)));
+    ASSERT_NO_THROW(next = (size_t*) safe_malloc(size * sizeof(size_t)));
+    shuffled_indices(index, 0, size, PERMUTATION_SEED);
+    random_cycle(next, 0, size, PERMUTATION_SEED);
+
+    // a miss per element costs far more than a sequential pass, the small sizes need BENCH_CALIBRATE
+    this->loops = LOOP_COUNT_18;
+}
+
+template <typename T>
+void CArrayRandom<T>::TearDown() {
+    safe_free(index);
+    safe_free(next);
+    CArray<T>::TearDown();
+}
+
+using CArrayRandomInt = CArrayRandom<int>;
+using CArrayRandomLong = CArrayRandom<long>;
+using CArrayRandomDouble = CArrayRandom<double>;
+
+TEST_P(CArrayRandomInt, RandomIterate) {
+    measure_loops(loops, GetParam(), [&] { random_iterate(this); });
+}
+
+TEST_P(CArrayRandomLong, RandomIterate) {
+    measure_loops(loops, GetParam(), [&] { random_iterate(this); });
+}
+
+TEST_P(CArrayRandomDouble, RandomIterate) {
+    measure_loops(loops, GetParam(), [&] { random_iterate(this); });
+}
+
+TEST_P(CArrayRandomInt, PointerChase) {
+    measure_loops(loops, GetParam(), [&] { pointer_chase(this); });
+}
+
+TEST_P(CArrayRandomLong, PointerChase) {
+    measure_loops(loops, GetParam(), [&] { pointer_chase(this); });
+}
+
+TEST_P(CArrayRandomDouble, PointerChase) {
+    measure_loops(loops, GetParam(), [&] { pointer_chase(this); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CArrayRandomInt,
+    ::testing::ValuesIn(ARRAY_SIZES),
+    CArrayRandomInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CArrayRandomLong,
+    ::testing::ValuesIn(ARRAY_SIZES),
+    CArrayRandomLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CArrayRandomDouble,
+    ::testing::ValuesIn(ARRAY_SIZES),
+    CArrayRandomDouble::getTestCaseName
+);
+
+template <typename T>
+void CArrayPrefetch<T>::SetUp() {
+    size_t size = std::get<0>(this->GetParam());
+
+    ASSERT_NO_THROW(array = (T*) safe_malloc(size * sizeof(T)));
+    ASSERT_NO_THROW(index = (size_t*) safe_malloc(size * sizeof(size_t)));
+    memset(array, 1, size * sizeof(T));
+    shuffled_indices(index, 0, size, PERMUTATION_SEED);
+
+    // the walks are meant to miss, a pass costs far more than a sequential one
+    loops = LOOP_COUNT_18;
+}
+
+template <typename T>
+void CArrayPrefetch<T>::TearDown() {
+    safe_free(array);
+    safe_free(index);
+}
+
+template <typename T, typename Hint>
+void prefetch_jump_iterate(const CArrayPrefetch<T>* test, Hint) {
+    constexpr size_t element_size = sizeof(T),
+                     jump_size    = CACHE_LINE / element_size;
+
+    size_t size, distance;
+    std::tie(size, distance, std::ignore) = test->GetParam();
+    size_t ahead = distance * jump_size;
+
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
+        for (size_t k = 0; k < jump_size; k++) {
+            size_t j = k;
+            while (j < size) {
+                if (ahead != 0 && j + ahead < size) {
+                    prefetch_line<Hint::value>(&test->array[j + ahead]);
+                }
+                test->array[j]++;
+
+                j += jump_size;
+            }
+        }
+    }
+}
+
+template <typename T, typename Hint>
+void prefetch_reverse_jump_iterate(const CArrayPrefetch<T>* test, Hint) {
+    constexpr size_t element_size = sizeof(T),
+                     jump_size    = CACHE_LINE / element_size;
+
+    size_t size, distance;
+    std::tie(size, distance, std::ignore) = test->GetParam();
+    size_t ahead = distance * jump_size;
+
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
+        for (size_t k = 0; k < jump_size; k++) {
+            size_t j = size - k - 1;
+            while (j < size) {
+                if (ahead != 0 && j >= ahead) {
+                    prefetch_line<Hint::value>(&test->array[j - ahead]);
+                }
+                test->array[j]++;
+
+                j -= jump_size;
+            }
+        }
+    }
+}
+
+// the index is read sequentially, the hardware prefetcher already streams it in
+template <typename T, typename Hint>
+void prefetch_random_iterate(const CArrayPrefetch<T>* test, Hint) {
+    size_t size, distance;
+    std::tie(size, distance, std::ignore) = test->GetParam();
+
+    RegionTimer region;
+    for (size_t i = 0; i < test->loops; i++) {
+        for (size_t j = 0; j < size; j++) {
+            if (distance != 0 && j + distance < size) {
+                prefetch_line<Hint::value>(&test->array[test->index[j + distance]]);
+            }
+            test->array[test->index[j]]++;
+        }
+    }
+}
+
+using CArrayPrefetchInt = CArrayPrefetch<int>;
+using CArrayPrefetchLong = CArrayPrefetch<long>;
+using CArrayPrefetchDouble = CArrayPrefetch<double>;
+
+TEST_P(CArrayPrefetchInt, PrefetchJumpIterate) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] {
+        with_prefetch_hint(std::get<2>(GetParam()), [&](auto hint) { prefetch_jump_iterate(this, hint); });
+    });
+}
+
+TEST_P(CArrayPrefetchLong, PrefetchJumpIterate) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] {
+        with_prefetch_hint(std::get<2>(GetParam()), [&](auto hint) { prefetch_jump_iterate(this, hint); });
+    });
+}
+
+TEST_P(CArrayPrefetchDouble, PrefetchJumpIterate) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] {
+        with_prefetch_hint(std::get<2>(GetParam()), [&](auto hint) { prefetch_jump_iterate(this, hint); });
+    });
+}
+
+TEST_P(CArrayPrefetchInt, PrefetchReverseJumpIterate) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] {
+        with_prefetch_hint(std::get<2>(GetParam()), [&](auto hint) { prefetch_reverse_jump_iterate(this, hint); });
+    });
+}
+
+TEST_P(CArrayPrefetchLong, PrefetchReverseJumpIterate) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] {
+        with_prefetch_hint(std::get<2>(GetParam()), [&](auto hint) { prefetch_reverse_jump_iterate(this, hint); });
+    });
+}
+
+TEST_P(CArrayPrefetchDouble, PrefetchReverseJumpIterate) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] {
+        with_prefetch_hint(std::get<2>(GetParam()), [&](auto hint) { prefetch_reverse_jump_iterate(this, hint); });
+    });
+}
+
+TEST_P(CArrayPrefetchInt, PrefetchRandomIterate) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] {
+        with_prefetch_hint(std::get<2>(GetParam()), [&](auto hint) { prefetch_random_iterate(this, hint); });
+    });
+}
+
+TEST_P(CArrayPrefetchLong, PrefetchRandomIterate) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] {
+        with_prefetch_hint(std::get<2>(GetParam()), [&](auto hint) { prefetch_random_iterate(this, hint); });
+    });
+}
+
+TEST_P(CArrayPrefetchDouble, PrefetchRandomIterate) {
+    measure_loops(loops, std::get<0>(GetParam()), [&] {
+        with_prefetch_hint(std::get<2>(GetParam()), [&](auto hint) { prefetch_random_iterate(this, hint); });
+    });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CArrayPrefetchInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(ARRAY_SIZES),
+        ::testing::ValuesIn(PREFETCH_DISTANCES),
+        ::testing::ValuesIn(PREFETCH_HINTS)
+    ),
+    CArrayPrefetchInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CArrayPrefetchLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(ARRAY_SIZES),
+        ::testing::ValuesIn(PREFETCH_DISTANCES),
+        ::testing::ValuesIn(PREFETCH_HINTS)
+    ),
+    CArrayPrefetchLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CArrayPrefetchDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(ARRAY_SIZES),
+        ::testing::ValuesIn(PREFETCH_DISTANCES),
+        ::testing::ValuesIn(PREFETCH_HINTS)
+    ),
+    CArrayPrefetchDouble::getTestCaseName
+);
@@ -0,0 +1,101 @@
+#include "singlecore/latency.hpp"
+#include "utils/utils.hpp"
+#include "utils/harness.hpp"
+#include "utils/permutation.hpp"
+
+#include <algorithm>
+#include <array>
+#include <stdexcept>
+
+std::vector<size_t> latency_ladder() {
+    std::vector<size_t> sizes;
+    for (size_t octave = LATENCY_MIN_BYTES; octave <= LATENCY_MAX_BYTES; octave *= 2) {
+        for (size_t step = 0; step < LATENCY_STEPS_PER_OCTAVE; step++) {
+            size_t bytes = (octave + octave * step / LATENCY_STEPS_PER_OCTAVE) / CACHE_LINE * CACHE_LINE;
+            if (bytes <= LATENCY_MAX_BYTES) {
+                sizes.push_back(bytes);
+            }
+        }
+    }
+    return sizes;
+}
+
+void CLatencyLadder::SetUp() {
+    size_t bytes, chasers;
+    std::tie(bytes, chasers) = this->GetParam();
+    size_t count = bytes / sizeof(LatencyNode);
+
+    ASSERT_NO_THROW(nodes = static_cast<LatencyNode*>(safe_aligned_alloc(CACHE_LINE, count * sizeof(LatencyNode))));
+
+    // linking the nodes in shuffled order makes one cycle, and the order tells where
+    // the chasers have to start to be evenly spaced along it
+    std::vector<size_t> order(count);
+    shuffled_indices(order.data(), 0, count, PERMUTATION_SEED);
+    for (size_t i = 0; i < count; i++) {
+        nodes[order[i]].next = &nodes[order[(i + 1) % count]];
+    }
+    for (size_t c = 0; c < chasers; c++) {
+        starts.push_back(&nodes[order[c * count / chasers]]);
+    }
+
+    set_work(static_cast<double>(LATENCY_LOADS / chasers * chasers));
+}
+
+void CLatencyLadder::TearDown() {
+    safe_free(nodes);
+    starts.clear();
+}
+
+template <size_t Chasers>
+uintptr_t chase(LatencyNode* const* starts, size_t steps) {
+    std::array<LatencyNode*, Chasers> heads;
+    std::copy(starts, starts + Chasers, heads.begin());
+
+    RegionTimer region;
+    for (size_t i = 0; i < steps; i++) {
+        for (size_t c = 0; c < Chasers; c++) {
+            heads[c] = heads[c]->next;
+        }
+    }
+
+    uintptr_t sum = 0;
+    for (LatencyNode* head : heads) {
+        sum += reinterpret_cast<uintptr_t>(head);
+    }
+    return sum;
+}
+
+void CLatencyLadder::runTest() {
+    size_t chasers = std::get<1>(this->GetParam());
+    size_t steps = LATENCY_LOADS / chasers;
+
+    switch (chasers) {
+        case 1:  checksum += chase<1>(starts.data(), steps); break;
+        case 2:  checksum += chase<2>(starts.data(), steps); break;
+        case 4:  checksum += chase<4>(starts.data(), steps); break;
+        case 8:  checksum += chase<8>(starts.data(), steps); break;
+        case 16: checksum += chase<16>(starts.data(), steps); break;
+        default: throw std::invalid_argument("Unsupported chaser count " + std::to_string(chasers));
+    }
+}
+
+TEST_P(CLatencyLadder, PointerChase) {
+    size_t chasers = std::get<1>(GetParam());
+    double steps = static_cast<double>(LATENCY_LOADS / chasers);
+
+    SampleStats stats = measure([&] { this->runTest(); });
+
+    // ns_per_step is the latency one chaser sees, ns_per_load what the core sustains
+    record_metric("ns_per_step", stats.median / steps);
+    record_metric("ns_per_load", stats.median / (steps * static_cast<double>(chasers)));
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_latency,
+    CLatencyLadder,
+    ::testing::Combine(
+        ::testing::ValuesIn(latency_ladder()),
+        ::testing::ValuesIn(LATENCY_CHASERS)
+    ),
+    CLatencyLadder::getTestCaseName
+);
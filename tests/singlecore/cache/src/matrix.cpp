@@ -1,6 +1,9 @@
 #include "singlecore/matrix.hpp"
 #include "utils/constants.hpp"
 #include "utils/utils.hpp"
+#include "utils/harness.hpp"
+#include "utils/blocking.hpp"
+#include "utils/transpose.hpp"
 
 // TODO: make an implementation for matrix as array
 template <typename T>
@@ -10,6 +13,9 @@ void CMatrix<T>::SetUp() {
     ASSERT_NO_THROW(create_matrix(matrix_A, size));
     ASSERT_NO_THROW(create_matrix(matrix_B, size));
     ASSERT_NO_THROW(create_matrix(matrix_C, size));
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
 }
 
 template <typename T>
@@ -19,12 +25,15 @@ void CMatrix<T>::TearDown() {
     free_matrix(reinterpret_cast<void**&>(matrix_A), size);
     free_matrix(reinterpret_cast<void**&>(matrix_B), size);
     free_matrix(reinterpret_cast<void**&>(matrix_C), size);
+    safe_free(prepared_B);
+    prepared_B = nullptr;
 }
 
 template <typename T>
 void CMatrix<T>::naive_mul() {
     size_t size = this->GetParam();
 
+    RegionTimer region;
     for (size_t i = 0; i < size; i++) {
         for (size_t j = 0; j < size; j++) {
             for (size_t k = 0; k < size; k++) {
@@ -39,6 +48,7 @@ template <typename T>
 void CMatrix<T>::optimized_mul() {
     size_t size = this->GetParam();
 
+    RegionTimer region;
     for (size_t i = 0; i < size; i++) {
         for (size_t k = 0; k < size; k++) {
             for (size_t j = 0; j < size; j++) {
@@ -48,32 +58,92 @@ void CMatrix<T>::optimized_mul() {
     }
 }
 
+template <typename T>
+void CMatrix<T>::transposed_mul() {
+    size_t size = this->GetParam();
+    if (prepared_B == nullptr) {
+        prepared_B = alloc_prepared<T>(size);
+    }
+    prepare_ns.push_back(time_once([&] { transpose(matrix_B, prepared_B, size, 0, size); }));
+
+    RegionTimer region;
+    for (size_t i = 0; i < size; i++) {
+        for (size_t j = 0; j < size; j++) {
+            matrix_C[i][j] += dot(matrix_A[i], &prepared_B[j * size], size);
+        }
+    }
+}
+
+template <typename T>
+void CMatrix<T>::packed_b_mul() {
+    size_t size = this->GetParam();
+    if (prepared_B == nullptr) {
+        prepared_B = alloc_prepared<T>(size);
+    }
+    prepare_ns.push_back(time_once([&] { pack_columns(matrix_B, prepared_B, size, 0, size); }));
+
+    RegionTimer region;
+    for (size_t i = 0; i < size; i++) {
+        packed_row_mul(matrix_A[i], prepared_B, matrix_C[i], size);
+    }
+}
+
 using CMatrixInt = CMatrix<int>;
 using CMatrixLong = CMatrix<long>;
 using CMatrixDouble = CMatrix<double>;
 
 TEST_P(CMatrixInt, DISABLED_NaiveMul) {
-    naive_mul();
+    measure([&] { naive_mul(); });
 }
 
 TEST_P(CMatrixLong, DISABLED_NaiveMul) {
-    naive_mul();
+    measure([&] { naive_mul(); });
 }
 
 TEST_P(CMatrixDouble, DISABLED_NaiveMul) {
-    naive_mul();
+    measure([&] { naive_mul(); });
 }
 
 TEST_P(CMatrixInt, OptimizedMul) {
-    optimized_mul();
+    measure([&] { optimized_mul(); });
 }
 
 TEST_P(CMatrixLong, OptimizedMul) {
-    optimized_mul();
+    measure([&] { optimized_mul(); });
 }
 
 TEST_P(CMatrixDouble, OptimizedMul) {
-    optimized_mul();
+    measure([&] { optimized_mul(); });
+}
+
+TEST_P(CMatrixInt, TransposedMul) {
+    SampleStats stats = measure([&] { transposed_mul(); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(CMatrixLong, TransposedMul) {
+    SampleStats stats = measure([&] { transposed_mul(); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(CMatrixDouble, TransposedMul) {
+    SampleStats stats = measure([&] { transposed_mul(); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(CMatrixInt, PackedBMul) {
+    SampleStats stats = measure([&] { packed_b_mul(); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(CMatrixLong, PackedBMul) {
+    SampleStats stats = measure([&] { packed_b_mul(); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(CMatrixDouble, PackedBMul) {
+    SampleStats stats = measure([&] { packed_b_mul(); });
+    record_phase("pack", prepare_ns, stats);
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -96,3 +166,308 @@ INSTANTIATE_TEST_SUITE_P(
     ::testing::ValuesIn(MATRIX_SIZES_POW2),
     CMatrixDouble::getTestCaseName
 );
+
+template <typename T>
+void CMatrixBlocked<T>::SetUp() {
+    size_t size, l1, l2;
+    std::tie(size, l1, l2) = this->GetParam();
+
+    ASSERT_NO_THROW(create_matrix(matrix_A, size));
+    ASSERT_NO_THROW(create_matrix(matrix_B, size));
+    ASSERT_NO_THROW(create_matrix(matrix_C, size));
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+}
+
+template <typename T>
+void CMatrixBlocked<T>::TearDown() {
+    size_t size, l1, l2;
+    std::tie(size, l1, l2) = this->GetParam();
+
+    free_matrix(reinterpret_cast<void**&>(matrix_A), size);
+    free_matrix(reinterpret_cast<void**&>(matrix_B), size);
+    free_matrix(reinterpret_cast<void**&>(matrix_C), size);
+}
+
+template <typename T>
+void CMatrixBlocked<T>::blocked_mul() {
+    size_t size, l1, l2;
+    std::tie(size, l1, l2) = this->GetParam();
+
+    RegionTimer region;
+    for_each_block(0, size, 0, size, size, l1, l2,
+                   [this](size_t startRow, size_t endRow, size_t startK, size_t endK, size_t startCol, size_t endCol) {
+        for (size_t i = startRow; i < endRow; i++) {
+            for (size_t k = startK; k < endK; k++) {
+                for (size_t j = startCol; j < endCol; j++) {
+                    matrix_C[i][j] += matrix_A[i][k] * matrix_B[k][j];
+                }
+            }
+        }
+    });
+}
+
+using CMatrixBlockedInt = CMatrixBlocked<int>;
+using CMatrixBlockedLong = CMatrixBlocked<long>;
+using CMatrixBlockedDouble = CMatrixBlocked<double>;
+
+TEST_P(CMatrixBlockedInt, BlockedMul) {
+    measure([&] { blocked_mul(); });
+}
+
+TEST_P(CMatrixBlockedLong, BlockedMul) {
+    measure([&] { blocked_mul(); });
+}
+
+TEST_P(CMatrixBlockedDouble, BlockedMul) {
+    measure([&] { blocked_mul(); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixBlockedInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    CMatrixBlockedInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixBlockedLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    CMatrixBlockedLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixBlockedDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    CMatrixBlockedDouble::getTestCaseName
+);
+
+template <typename T>
+void CMatrixLoopOrder<T>::SetUp() {
+    size_t size;
+    LoopOrder order;
+    std::tie(size, order) = this->GetParam();
+
+    ASSERT_NO_THROW(create_matrix(matrix_A, size));
+    ASSERT_NO_THROW(create_matrix(matrix_B, size));
+    ASSERT_NO_THROW(create_matrix(matrix_C, size));
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+
+    record_loop_strides(order);
+}
+
+template <typename T>
+void CMatrixLoopOrder<T>::TearDown() {
+    size_t size;
+    LoopOrder order;
+    std::tie(size, order) = this->GetParam();
+
+    free_matrix(reinterpret_cast<void**&>(matrix_A), size);
+    free_matrix(reinterpret_cast<void**&>(matrix_B), size);
+    free_matrix(reinterpret_cast<void**&>(matrix_C), size);
+}
+
+template <typename T>
+void CMatrixLoopOrder<T>::loop_order_mul() {
+    size_t size;
+    LoopOrder order;
+    std::tie(size, order) = this->GetParam();
+
+    RegionTimer region;
+    for_each_in_order(order, size, [this](size_t i, size_t j, size_t k) {
+        matrix_C[i][j] += matrix_A[i][k] * matrix_B[k][j];
+    });
+}
+
+using CMatrixLoopOrderInt = CMatrixLoopOrder<int>;
+using CMatrixLoopOrderLong = CMatrixLoopOrder<long>;
+using CMatrixLoopOrderDouble = CMatrixLoopOrder<double>;
+
+TEST_P(CMatrixLoopOrderInt, DISABLED_LoopOrderMul) {
+    measure([&] { loop_order_mul(); });
+}
+
+TEST_P(CMatrixLoopOrderLong, DISABLED_LoopOrderMul) {
+    measure([&] { loop_order_mul(); });
+}
+
+TEST_P(CMatrixLoopOrderDouble, DISABLED_LoopOrderMul) {
+    measure([&] { loop_order_mul(); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixLoopOrderInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(LOOP_ORDERS)
+    ),
+    CMatrixLoopOrderInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixLoopOrderLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(LOOP_ORDERS)
+    ),
+    CMatrixLoopOrderLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixLoopOrderDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(LOOP_ORDERS)
+    ),
+    CMatrixLoopOrderDouble::getTestCaseName
+);
+
+template <typename T>
+void CMatrixAllocation<T>::SetUp() {
+    size_t size;
+    RowAllocation allocation;
+    std::tie(size, allocation) = this->GetParam();
+
+    double allocate_ns = 0;
+    ASSERT_NO_THROW(allocate_ns = time_once([&] {
+        matrix_A = allocate_matrix<T>(size, allocation);
+        matrix_B = allocate_matrix<T>(size, allocation);
+        matrix_C = allocate_matrix<T>(size, allocation);
+    }));
+
+    // the pages are mapped in by the first write, not by the allocation
+    double first_touch_ns = time_once([&] {
+        for (size_t i = 0; i < size; i++) {
+            memset(matrix_A[i], 3, size * sizeof(T));
+            memset(matrix_B[i], 3, size * sizeof(T));
+            memset(matrix_C[i], 0, size * sizeof(T));
+        }
+    });
+    record_metric("allocate_ns", allocate_ns);
+    record_metric("first_touch_ns", first_touch_ns);
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+}
+
+template <typename T>
+void CMatrixAllocation<T>::TearDown() {
+    size_t size;
+    RowAllocation allocation;
+    std::tie(size, allocation) = this->GetParam();
+
+    free_rows(reinterpret_cast<void**>(matrix_A), size, allocation);
+    free_rows(reinterpret_cast<void**>(matrix_B), size, allocation);
+    free_rows(reinterpret_cast<void**>(matrix_C), size, allocation);
+    reset_row_arena();
+}
+
+template <typename T>
+void CMatrixAllocation<T>::naive_mul() {
+    size_t size;
+    RowAllocation allocation;
+    std::tie(size, allocation) = this->GetParam();
+
+    RegionTimer region;
+    for (size_t i = 0; i < size; i++) {
+        for (size_t j = 0; j < size; j++) {
+            for (size_t k = 0; k < size; k++) {
+                matrix_C[i][j] += matrix_A[i][k] * matrix_B[k][j];
+            }
+        }
+    }
+}
+
+template <typename T>
+void CMatrixAllocation<T>::optimized_mul() {
+    size_t size;
+    RowAllocation allocation;
+    std::tie(size, allocation) = this->GetParam();
+
+    RegionTimer region;
+    for (size_t i = 0; i < size; i++) {
+        for (size_t k = 0; k < size; k++) {
+            for (size_t j = 0; j < size; j++) {
+                matrix_C[i][j] += matrix_A[i][k] * matrix_B[k][j];
+            }
+        }
+    }
+}
+
+using CMatrixAllocationInt = CMatrixAllocation<int>;
+using CMatrixAllocationLong = CMatrixAllocation<long>;
+using CMatrixAllocationDouble = CMatrixAllocation<double>;
+
+TEST_P(CMatrixAllocationInt, DISABLED_NaiveMul) {
+    measure([&] { naive_mul(); });
+}
+
+TEST_P(CMatrixAllocationLong, DISABLED_NaiveMul) {
+    measure([&] { naive_mul(); });
+}
+
+TEST_P(CMatrixAllocationDouble, DISABLED_NaiveMul) {
+    measure([&] { naive_mul(); });
+}
+
+TEST_P(CMatrixAllocationInt, OptimizedMul) {
+    measure([&] { optimized_mul(); });
+}
+
+TEST_P(CMatrixAllocationLong, OptimizedMul) {
+    measure([&] { optimized_mul(); });
+}
+
+TEST_P(CMatrixAllocationDouble, OptimizedMul) {
+    measure([&] { optimized_mul(); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixAllocationInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(ROW_ALLOCATIONS)
+    ),
+    CMatrixAllocationInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixAllocationLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(ROW_ALLOCATIONS)
+    ),
+    CMatrixAllocationLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixAllocationDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(ROW_ALLOCATIONS)
+    ),
+    CMatrixAllocationDouble::getTestCaseName
+);
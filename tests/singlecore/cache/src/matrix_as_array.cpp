@@ -1,6 +1,9 @@
 #include "singlecore/matrix_as_array.hpp"
 #include "utils/utils.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
+#include "utils/blocking.hpp"
+#include "utils/transpose.hpp"
 
 #include <cmath>
 
@@ -15,13 +18,18 @@ void CMatrixArray<T>::SetUp() {
     memset(matrix_A, 3, size);
     memset(matrix_B, 3, size);
     memset(matrix_C, 0, size);
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
 }
 
 template <typename T>
 void CMatrixArray<T>::TearDown() {
-    free(matrix_A);
-    free(matrix_B);
-    free(matrix_C);
+    safe_free(matrix_A);
+    safe_free(matrix_B);
+    safe_free(matrix_C);
+    safe_free(prepared_B);
+    prepared_B = nullptr;
 
     threads.clear();
 }
@@ -30,6 +38,7 @@ template <typename T>
 void CMatrixArray<T>::naive_mul() {
     size_t matrixSize = GetParam();
     
+    RegionTimer region;
     for (size_t i = 0; i < matrixSize; i++) {
         for (size_t j = 0; j < matrixSize; j++) {
             for (size_t k = 0; k < matrixSize; k++) {
@@ -43,6 +52,7 @@ template <typename T>
 void CMatrixArray<T>::optimized_mul() {
     size_t matrixSize = GetParam();
     
+    RegionTimer region;
     for (size_t i = 0; i < matrixSize; i++) {
         for (size_t k = 0; k < matrixSize; k++) {
             T a_ik = matrix_A[i * matrixSize + k];
@@ -53,32 +63,122 @@ void CMatrixArray<T>::optimized_mul() {
     }
 }
 
+template <typename T>
+void CMatrixArray<T>::transposed_mul() {
+    size_t matrixSize = GetParam();
+    if (prepared_B == nullptr) {
+        prepared_B = (T*) safe_malloc(packed_panels(matrixSize) * PACKED_B_WIDTH * matrixSize * sizeof(T));
+    }
+    prepare_ns.push_back(time_once([&] { transpose(matrix_B, prepared_B, matrixSize, 0, matrixSize); }));
+
+    RegionTimer region;
+    for (size_t i = 0; i < matrixSize; i++) {
+        for (size_t j = 0; j < matrixSize; j++) {
+            matrix_C[i * matrixSize + j] += dot(&matrix_A[i * matrixSize], &prepared_B[j * matrixSize], matrixSize);
+        }
+    }
+}
+
+template <typename T>
+void CMatrixArray<T>::packed_b_mul() {
+    size_t matrixSize = GetParam();
+    if (prepared_B == nullptr) {
+        prepared_B = (T*) safe_malloc(packed_panels(matrixSize) * PACKED_B_WIDTH * matrixSize * sizeof(T));
+    }
+    prepare_ns.push_back(time_once([&] { pack_columns(matrix_B, prepared_B, matrixSize, 0, matrixSize); }));
+
+    RegionTimer region;
+    for (size_t i = 0; i < matrixSize; i++) {
+        packed_row_mul(&matrix_A[i * matrixSize], prepared_B, &matrix_C[i * matrixSize], matrixSize);
+    }
+}
+
+template <typename T>
+void CMatrixArray<T>::recursive_mul() {
+    size_t matrixSize = GetParam();
+
+    RegionTimer region;
+    for_each_recursive_block(0, matrixSize, 0, matrixSize, 0, matrixSize, RECURSION_BASE, 1,
+                             [this, matrixSize](size_t startRow, size_t endRow, size_t startK, size_t endK, size_t startCol, size_t endCol) {
+        for (size_t i = startRow; i < endRow; i++) {
+            for (size_t k = startK; k < endK; k++) {
+                T a_ik = matrix_A[i * matrixSize + k];
+                for (size_t j = startCol; j < endCol; j++) {
+                    matrix_C[i * matrixSize + j] += a_ik * matrix_B[k * matrixSize + j];
+                }
+            }
+        }
+    });
+}
+
 using CMatrixArrayInt = CMatrixArray<int>;
 using CMatrixArrayLong = CMatrixArray<long>;
 using CMatrixArrayDouble = CMatrixArray<double>;
 
 TEST_P(CMatrixArrayInt, DISABLED_NaiveMul) {
-    naive_mul();
+    measure([&] { naive_mul(); });
 }
 
 TEST_P(CMatrixArrayLong, DISABLED_NaiveMul) {
-    naive_mul();
+    measure([&] { naive_mul(); });
 }
 
 TEST_P(CMatrixArrayDouble, DISABLED_NaiveMul) {
-    naive_mul();
+    measure([&] { naive_mul(); });
 }
 
 TEST_P(CMatrixArrayInt, OptimizedMul) {
-    optimized_mul();
+    measure([&] { optimized_mul(); });
 }
 
 TEST_P(CMatrixArrayLong, OptimizedMul) {
-    optimized_mul();
+    measure([&] { optimized_mul(); });
 }
 
 TEST_P(CMatrixArrayDouble, OptimizedMul) {
-    optimized_mul();
+    measure([&] { optimized_mul(); });
+}
+
+TEST_P(CMatrixArrayInt, TransposedMul) {
+    SampleStats stats = measure([&] { transposed_mul(); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(CMatrixArrayLong, TransposedMul) {
+    SampleStats stats = measure([&] { transposed_mul(); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(CMatrixArrayDouble, TransposedMul) {
+    SampleStats stats = measure([&] { transposed_mul(); });
+    record_phase("transpose", prepare_ns, stats);
+}
+
+TEST_P(CMatrixArrayInt, PackedBMul) {
+    SampleStats stats = measure([&] { packed_b_mul(); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(CMatrixArrayLong, PackedBMul) {
+    SampleStats stats = measure([&] { packed_b_mul(); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(CMatrixArrayDouble, PackedBMul) {
+    SampleStats stats = measure([&] { packed_b_mul(); });
+    record_phase("pack", prepare_ns, stats);
+}
+
+TEST_P(CMatrixArrayInt, RecursiveMul) {
+    measure([&] { recursive_mul(); });
+}
+
+TEST_P(CMatrixArrayLong, RecursiveMul) {
+    measure([&] { recursive_mul(); });
+}
+
+TEST_P(CMatrixArrayDouble, RecursiveMul) {
+    measure([&] { recursive_mul(); });
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -101,3 +201,295 @@ INSTANTIATE_TEST_SUITE_P(
     ::testing::ValuesIn(MATRIX_SIZES_POW2),
     CMatrixArrayInt::getTestCaseName
 );
+
+template <typename T>
+void CMatrixArrayBlocked<T>::SetUp() {
+    size_t size, l1, l2;
+    std::tie(size, l1, l2) = this->GetParam();
+
+    ASSERT_NO_THROW(matrix_A = (T*) safe_malloc(size * size * sizeof(T)));
+    ASSERT_NO_THROW(matrix_B = (T*) safe_malloc(size * size * sizeof(T)));
+    ASSERT_NO_THROW(matrix_C = (T*) safe_malloc(size * size * sizeof(T)));
+
+    memset(matrix_A, 3, size * size * sizeof(T));
+    memset(matrix_B, 3, size * size * sizeof(T));
+    memset(matrix_C, 0, size * size * sizeof(T));
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+}
+
+template <typename T>
+void CMatrixArrayBlocked<T>::TearDown() {
+    safe_free(matrix_A);
+    safe_free(matrix_B);
+    safe_free(matrix_C);
+}
+
+template <typename T>
+void CMatrixArrayBlocked<T>::blocked_mul() {
+    size_t matrixSize, l1, l2;
+    std::tie(matrixSize, l1, l2) = this->GetParam();
+
+    RegionTimer region;
+    for_each_block(0, matrixSize, 0, matrixSize, matrixSize, l1, l2,
+                   [this, matrixSize](size_t startRow, size_t endRow, size_t startK, size_t endK, size_t startCol, size_t endCol) {
+        for (size_t i = startRow; i < endRow; i++) {
+            for (size_t k = startK; k < endK; k++) {
+                T a_ik = matrix_A[i * matrixSize + k];
+                for (size_t j = startCol; j < endCol; j++) {
+                    matrix_C[i * matrixSize + j] += a_ik * matrix_B[k * matrixSize + j];
+                }
+            }
+        }
+    });
+}
+
+using CMatrixArrayBlockedInt = CMatrixArrayBlocked<int>;
+using CMatrixArrayBlockedLong = CMatrixArrayBlocked<long>;
+using CMatrixArrayBlockedDouble = CMatrixArrayBlocked<double>;
+
+TEST_P(CMatrixArrayBlockedInt, BlockedMul) {
+    measure([&] { blocked_mul(); });
+}
+
+TEST_P(CMatrixArrayBlockedLong, BlockedMul) {
+    measure([&] { blocked_mul(); });
+}
+
+TEST_P(CMatrixArrayBlockedDouble, BlockedMul) {
+    measure([&] { blocked_mul(); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixArrayBlockedInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    CMatrixArrayBlockedInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixArrayBlockedLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    CMatrixArrayBlockedLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixArrayBlockedDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(L1_TILES),
+        ::testing::ValuesIn(L2_TILES)
+    ),
+    CMatrixArrayBlockedDouble::getTestCaseName
+);
+
+template <typename T>
+void CMatrixArrayLoopOrder<T>::SetUp() {
+    size_t size;
+    LoopOrder order;
+    std::tie(size, order) = this->GetParam();
+
+    ASSERT_NO_THROW(matrix_A = (T*) safe_malloc(size * size * sizeof(T)));
+    ASSERT_NO_THROW(matrix_B = (T*) safe_malloc(size * size * sizeof(T)));
+    ASSERT_NO_THROW(matrix_C = (T*) safe_malloc(size * size * sizeof(T)));
+
+    memset(matrix_A, 3, size * size * sizeof(T));
+    memset(matrix_B, 3, size * size * sizeof(T));
+    memset(matrix_C, 0, size * size * sizeof(T));
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+
+    record_loop_strides(order);
+}
+
+template <typename T>
+void CMatrixArrayLoopOrder<T>::TearDown() {
+    safe_free(matrix_A);
+    safe_free(matrix_B);
+    safe_free(matrix_C);
+}
+
+template <typename T>
+void CMatrixArrayLoopOrder<T>::loop_order_mul() {
+    size_t size;
+    LoopOrder order;
+    std::tie(size, order) = this->GetParam();
+
+    RegionTimer region;
+    for_each_in_order(order, size, [this, size](size_t i, size_t j, size_t k) {
+        matrix_C[i * size + j] += matrix_A[i * size + k] * matrix_B[k * size + j];
+    });
+}
+
+using CMatrixArrayLoopOrderInt = CMatrixArrayLoopOrder<int>;
+using CMatrixArrayLoopOrderLong = CMatrixArrayLoopOrder<long>;
+using CMatrixArrayLoopOrderDouble = CMatrixArrayLoopOrder<double>;
+
+TEST_P(CMatrixArrayLoopOrderInt, DISABLED_LoopOrderMul) {
+    measure([&] { loop_order_mul(); });
+}
+
+TEST_P(CMatrixArrayLoopOrderLong, DISABLED_LoopOrderMul) {
+    measure([&] { loop_order_mul(); });
+}
+
+TEST_P(CMatrixArrayLoopOrderDouble, DISABLED_LoopOrderMul) {
+    measure([&] { loop_order_mul(); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixArrayLoopOrderInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(LOOP_ORDERS)
+    ),
+    CMatrixArrayLoopOrderInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixArrayLoopOrderLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(LOOP_ORDERS)
+    ),
+    CMatrixArrayLoopOrderLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixArrayLoopOrderDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_POW2),
+        ::testing::ValuesIn(LOOP_ORDERS)
+    ),
+    CMatrixArrayLoopOrderDouble::getTestCaseName
+);
+
+template <typename T>
+void CMatrixArrayPadded<T>::SetUp() {
+    size_t size, pad;
+    std::tie(size, pad) = this->GetParam();
+    ld = leading_dimension<T>(size, pad);
+
+    ASSERT_NO_THROW(matrix_A = (T*) safe_malloc(size * ld * sizeof(T)));
+    ASSERT_NO_THROW(matrix_B = (T*) safe_malloc(size * ld * sizeof(T)));
+    ASSERT_NO_THROW(matrix_C = (T*) safe_malloc(size * ld * sizeof(T)));
+
+    memset(matrix_A, 3, size * ld * sizeof(T));
+    memset(matrix_B, 3, size * ld * sizeof(T));
+    memset(matrix_C, 0, size * ld * sizeof(T));
+
+    double n = static_cast<double>(size);
+    set_work(n * n, 2 * n * n * n);
+    record_metric("ld", static_cast<double>(ld));
+}
+
+template <typename T>
+void CMatrixArrayPadded<T>::TearDown() {
+    safe_free(matrix_A);
+    safe_free(matrix_B);
+    safe_free(matrix_C);
+}
+
+template <typename T>
+void CMatrixArrayPadded<T>::naive_mul() {
+    size_t matrixSize, pad;
+    std::tie(matrixSize, pad) = this->GetParam();
+
+    RegionTimer region;
+    for (size_t i = 0; i < matrixSize; i++) {
+        for (size_t j = 0; j < matrixSize; j++) {
+            for (size_t k = 0; k < matrixSize; k++) {
+                matrix_C[i * ld + j] += matrix_A[i * ld + k] * matrix_B[k * ld + j];
+            }
+        }
+    }
+}
+
+template <typename T>
+void CMatrixArrayPadded<T>::optimized_mul() {
+    size_t matrixSize, pad;
+    std::tie(matrixSize, pad) = this->GetParam();
+
+    RegionTimer region;
+    for (size_t i = 0; i < matrixSize; i++) {
+        for (size_t k = 0; k < matrixSize; k++) {
+            T a_ik = matrix_A[i * ld + k];
+            for (size_t j = 0; j < matrixSize; j++) {
+                matrix_C[i * ld + j] += a_ik * matrix_B[k * ld + j];
+            }
+        }
+    }
+}
+
+using CMatrixArrayPaddedInt = CMatrixArrayPadded<int>;
+using CMatrixArrayPaddedLong = CMatrixArrayPadded<long>;
+using CMatrixArrayPaddedDouble = CMatrixArrayPadded<double>;
+
+TEST_P(CMatrixArrayPaddedInt, NaiveMul) {
+    measure([&] { naive_mul(); });
+}
+
+TEST_P(CMatrixArrayPaddedLong, NaiveMul) {
+    measure([&] { naive_mul(); });
+}
+
+TEST_P(CMatrixArrayPaddedDouble, NaiveMul) {
+    measure([&] { naive_mul(); });
+}
+
+TEST_P(CMatrixArrayPaddedInt, OptimizedMul) {
+    measure([&] { optimized_mul(); });
+}
+
+TEST_P(CMatrixArrayPaddedLong, OptimizedMul) {
+    measure([&] { optimized_mul(); });
+}
+
+TEST_P(CMatrixArrayPaddedDouble, OptimizedMul) {
+    measure([&] { optimized_mul(); });
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixArrayPaddedInt,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_AROUND_POW2),
+        ::testing::ValuesIn(ROW_PADDINGS)
+    ),
+    CMatrixArrayPaddedInt::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixArrayPaddedLong,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_AROUND_POW2),
+        ::testing::ValuesIn(ROW_PADDINGS)
+    ),
+    CMatrixArrayPaddedLong::getTestCaseName
+);
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CMatrixArrayPaddedDouble,
+    ::testing::Combine(
+        ::testing::ValuesIn(MATRIX_SIZES_AROUND_POW2),
+        ::testing::ValuesIn(ROW_PADDINGS)
+    ),
+    CMatrixArrayPaddedDouble::getTestCaseName
+);
@@ -0,0 +1,58 @@
+#include "singlecore/stream.hpp"
+#include "utils/utils.hpp"
+#include "utils/constants.hpp"
+#include "utils/harness.hpp"
+#include "utils/stream.hpp"
+
+#include <algorithm>
+
+template <typename T>
+void CStream<T>::SetUp() {
+    size_t size = this->GetParam();
+
+    ASSERT_NO_THROW(a = (T*) safe_malloc(size * sizeof(T)));
+    ASSERT_NO_THROW(b = (T*) safe_malloc(size * sizeof(T)));
+    ASSERT_NO_THROW(c = (T*) safe_malloc(size * sizeof(T)));
+
+    std::fill(a, a + size, T(1));
+    std::fill(b, b + size, T(2));
+    std::fill(c, c + size, T(0));
+
+    set_work(static_cast<double>(size));
+}
+
+template <typename T>
+void CStream<T>::TearDown() {
+    safe_free(a);
+    safe_free(b);
+    safe_free(c);
+}
+
+using CStreamDouble = CStream<double>;
+
+TEST_P(CStreamDouble, Copy) {
+    SampleStats stats = measure([&] { stream_kernel(StreamKernel::copy, a, b, c, STREAM_SCALAR, 0, GetParam()); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::copy, GetParam()));
+}
+
+TEST_P(CStreamDouble, Scale) {
+    SampleStats stats = measure([&] { stream_kernel(StreamKernel::scale, a, b, c, STREAM_SCALAR, 0, GetParam()); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::scale, GetParam()));
+}
+
+TEST_P(CStreamDouble, Add) {
+    SampleStats stats = measure([&] { stream_kernel(StreamKernel::add, a, b, c, STREAM_SCALAR, 0, GetParam()); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::add, GetParam()));
+}
+
+TEST_P(CStreamDouble, Triad) {
+    SampleStats stats = measure([&] { stream_kernel(StreamKernel::triad, a, b, c, STREAM_SCALAR, 0, GetParam()); });
+    record_bandwidth(stats, stream_bytes<double>(StreamKernel::triad, GetParam()));
+}
+
+INSTANTIATE_TEST_SUITE_P(
+    scalar_singlecore_caching,
+    CStreamDouble,
+    ::testing::ValuesIn(STREAM_SIZES),
+    CStreamDouble::getTestCaseName
+);
@@ -10,6 +10,8 @@ protected:
     void TearDown() override;
 public:
     T* array;
+    // outer passes over the array, fixed unless BENCH_CALIBRATE is set
+    size_t loops;
 
     static std::string getTestCaseName(const ::testing::TestParamInfo<size_t>& info) {
         return "size_" + std::to_string(info.param);
@@ -1,6 +1,7 @@
 #include "singlecore/batch.hpp"
 #include "utils/utils.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
 
 template <typename T>
 void CArrayComputeBatch<T>::SetUp() {
@@ -11,17 +12,20 @@ void CArrayComputeBatch<T>::SetUp() {
     ASSERT_NE(array, nullptr) << "Unable to alloc array of size " << size;
 
     memset(array, 1, totalSize);
+
+    loops = LOOP_COUNT_200K;
 }
 
 template <typename T>
 void CArrayComputeBatch<T>::TearDown() {
-    free(array);
+    safe_free(array);
 }
 
 template <typename T>
 void CArrayComputeBatch<T>::batch_add() {
     size_t size = GetParam();
-    for (size_t i = 0; i < LOOP_COUNT_400K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < loops; i++) {
         for (size_t j = 0; j < size; j++) {
             array[j] += array[j];
         }
@@ -31,7 +35,8 @@ void CArrayComputeBatch<T>::batch_add() {
 template <typename T>
 void CArrayComputeBatch<T>::batch_mul() {
     size_t size = GetParam();
-    for (size_t i = 0; i < LOOP_COUNT_200K; i++) {
+    RegionTimer region;
+    for (size_t i = 0; i < loops; i++) {
         for (size_t j = 0; j < LOOP_COUNT_18; j++) {
             for (size_t k = 0; k < size; k++) {
                 array[k] *= 3 ;
@@ -45,27 +50,30 @@ using CArrayComputeBatchLong = CArrayComputeBatch<long>;
 using CArrayComputeBatchDouble = CArrayComputeBatch<double>;
 
 TEST_P(CArrayComputeBatchInt, BatchAdd) {
-    batch_add();
+    loops = LOOP_COUNT_400K;
+    measure_loops(loops, GetParam(), [&] { batch_add(); });
 }
 
 TEST_P(CArrayComputeBatchLong, BatchAdd) {
-    batch_add();
+    loops = LOOP_COUNT_400K;
+    measure_loops(loops, GetParam(), [&] { batch_add(); });
 }
 
 TEST_P(CArrayComputeBatchDouble, BatchAdd) {
-    batch_add();
+    loops = LOOP_COUNT_400K;
+    measure_loops(loops, GetParam(), [&] { batch_add(); });
 }
 
 TEST_P(CArrayComputeBatchInt, BatchMul) {
-    batch_mul();
+    measure_loops(loops, LOOP_COUNT_18 * GetParam(), [&] { batch_mul(); });
 }
 
 TEST_P(CArrayComputeBatchLong, BatchMul) {
-    batch_mul();
+    measure_loops(loops, LOOP_COUNT_18 * GetParam(), [&] { batch_mul(); });
 }
 
 TEST_P(CArrayComputeBatchDouble, BatchMul) {
-    batch_mul();
+    measure_loops(loops, LOOP_COUNT_18 * GetParam(), [&] { batch_mul(); });
 }
 
 INSTANTIATE_TEST_SUITE_P(
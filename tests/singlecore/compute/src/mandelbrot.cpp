@@ -1,6 +1,7 @@
 #include "singlecore/mandelbrot.hpp"
 #include "utils/utils.hpp"
 #include "utils/constants.hpp"
+#include "utils/harness.hpp"
 
 void CArrayMandelbrot::SetUp() {
     std::tuple<size_t, size_t> dimensions;
@@ -21,14 +22,17 @@ void CArrayMandelbrot::SetUp() {
     this->pixel_width         = radius * 2 / ((width < height) ? static_cast<double>(width) : static_cast<double>(height));
     this->top_left_coord_real = center_coord_real + static_cast<double>(width) / 2 * this->pixel_width;
     this->top_left_coord_im   = center_coord_im + static_cast<double>(height) / 2 * this->pixel_width;
+
+    set_work(static_cast<double>(width * height));
 }
 
 void CArrayMandelbrot::TearDown() {
-    free(array);
+    safe_free(array);
 }
 
 void CArrayMandelbrot::mandelbrot() {
     double im_part = this->top_left_coord_im;
+    RegionTimer region;
     for (size_t i = 0; i < height; i++) {
         double real_part = this->top_left_coord_real;
         for (size_t j = 0; j < width; j++) {
@@ -43,7 +47,7 @@ void CArrayMandelbrot::mandelbrot() {
 }
 
 TEST_P(CArrayMandelbrot, MandelbrotQuadratic) {
-    mandelbrot();
+    measure([&] { mandelbrot(); });
 }
 
 INSTANTIATE_TEST_SUITE_P(
@@ -0,0 +1,27 @@
+#include "utils/thread_pool.hpp"
+
+#include <gtest/gtest.h>
+
+#include <atomic>
+
+// A large batch wakes every worker while the small ones that follow only wait for the
+// first few, the rest wake up after their run returned
+TEST(ThreadPool, AlternatingBatchSizes) {
+    constexpr size_t ROUNDS = 20;
+    constexpr size_t LARGE = 16;
+    constexpr size_t SMALL_RUNS = 100;
+
+    std::atomic<size_t> done{0};
+    std::vector<task_function> large(LARGE, [&done] { done.fetch_add(1); });
+    std::vector<task_function> small(1, [&done] { done.fetch_add(1); });
+
+    for (size_t i = 0; i < ROUNDS; i++) {
+        thread_pool().run(large);
+        for (size_t j = 0; j < SMALL_RUNS; j++) {
+            thread_pool().run(small);
+        }
+    }
+
+    EXPECT_EQ(done.load(), ROUNDS * (LARGE + SMALL_RUNS));
+    EXPECT_EQ(thread_pool().last_spans().size(), 1u);
+}
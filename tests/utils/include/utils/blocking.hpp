@@ -0,0 +1,56 @@
+#pragma once
+
+#include <algorithm>
+#include <cstddef>
+
+// Two-level cache blocking of C[rows, cols] += A[rows, depth] * B[depth, cols].
+// The k and j ranges are cut into l2 x l2 panels of B that stay in L2 while the whole
+// row range of A streams past them, and every panel into l1 x l1 blocks that stay in L1
+// for one l1-row band of A and C. `block(startRow, endRow, startK, endK, startCol, endCol)`
+// multiplies one L1 block, the edges are clipped to the ranges.
+template <typename Block>
+void for_each_block(size_t startRow, size_t endRow, size_t startCol, size_t endCol, size_t depth,
+                    size_t l1, size_t l2, Block&& block) {
+    for (size_t kk2 = 0; kk2 < depth; kk2 += l2) {
+        size_t endK2 = std::min(kk2 + l2, depth);
+        for (size_t jj2 = startCol; jj2 < endCol; jj2 += l2) {
+            size_t endCol2 = std::min(jj2 + l2, endCol);
+            for (size_t ii = startRow; ii < endRow; ii += l1) {
+                size_t endI = std::min(ii + l1, endRow);
+                for (size_t kk = kk2; kk < endK2; kk += l1) {
+                    size_t endK = std::min(kk + l1, endK2);
+                    for (size_t jj = jj2; jj < endCol2; jj += l1) {
+                        block(ii, endI, kk, endK, jj, std::min(jj + l1, endCol2));
+                    }
+                }
+            }
+        }
+    }
+}
+
+// Cache-oblivious order of the same multiply: halves the longest of the row, k and column
+// ranges until none is longer than `base`, so the blocks fit every cache level at some
+// depth of the recursion without knowing its size. Column cuts stay on multiples of
+// `align` from startCol, for SIMD kernels. `block` is called like in for_each_block().
+template <typename Block>
+void for_each_recursive_block(size_t startRow, size_t endRow, size_t startK, size_t endK, size_t startCol, size_t endCol,
+                              size_t base, size_t align, Block&& block) {
+    size_t rows = endRow - startRow, depth = endK - startK, cols = endCol - startCol;
+    size_t colCut = cols / 2 / align * align;
+
+    if (cols > base && colCut > 0 && cols >= rows && cols >= depth) {
+        for_each_recursive_block(startRow, endRow, startK, endK, startCol, startCol + colCut, base, align, block);
+        for_each_recursive_block(startRow, endRow, startK, endK, startCol + colCut, endCol, base, align, block);
+    } else if (rows > base && rows >= depth) {
+        size_t midRow = startRow + rows / 2;
+        for_each_recursive_block(startRow, midRow, startK, endK, startCol, endCol, base, align, block);
+        for_each_recursive_block(midRow, endRow, startK, endK, startCol, endCol, base, align, block);
+    } else if (depth > base) {
+        // both halves update the same C block, one after the other
+        size_t midK = startK + depth / 2;
+        for_each_recursive_block(startRow, endRow, startK, midK, startCol, endCol, base, align, block);
+        for_each_recursive_block(startRow, endRow, midK, endK, startCol, endCol, base, align, block);
+    } else {
+        block(startRow, endRow, startK, endK, startCol, endCol);
+    }
+}
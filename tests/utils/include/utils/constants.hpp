@@ -10,6 +10,9 @@
 
 constexpr size_t CACHE_LINE = 64;
 
+// the x86-64 huge page the large allocations are aligned to, see memory_backend()
+constexpr size_t HUGE_PAGE_BYTES = 2 << 20;
+
 constexpr size_t ALIGNMENT_32      = 32;
 constexpr size_t SIMD_INT_WIDTH    = 8;
 constexpr size_t SIMD_LONG_WIDTH   = 4;
@@ -25,8 +28,57 @@ constexpr std::array<size_t, 4> NUM_THREADS = {2, 4, 8, 12};
 
 constexpr std::array<size_t, 5> MATRIX_SIZES_POW2 = {512, 1024, 2048, 4096, 8192};
 
+// a prime, pow2 - 1, pow2 and pow2 + 1 around each power of two. The power of two rows map
+// column walks onto a few cache sets, the neighbours show what that costs.
+constexpr std::array<size_t, 12> MATRIX_SIZES_AROUND_POW2 = {251, 255, 256, 257, 509, 511, 512, 513, 1021, 1023, 1024, 1025};
+
+// bytes of padding after every row of the padded matrix layouts, multiples of ALIGNMENT_32
+constexpr std::array<size_t, 3> ROW_PADDINGS = {0, 32, 64};
+
+// edges of the L1 and L2 blocks of the blocked matrix multiplications, multiples of every SIMD width
+constexpr std::array<size_t, 3> L1_TILES = {16, 32, 64};
+constexpr std::array<size_t, 3> L2_TILES = {128, 256, 512};
+
+// edge of the square blocks B is transposed in, a source and a destination block of doubles fit in L1
+constexpr size_t TRANSPOSE_BLOCK = 32;
+
+// columns per panel of the packed B layout, a multiple of every SIMD width
+constexpr size_t PACKED_B_WIDTH = 16;
+
+// the recursive multiplications stop halving once no block edge is longer than this,
+// three such blocks of doubles fit in any L1, so nothing is tuned to one machine
+constexpr size_t RECURSION_BASE = 32;
+
+// blocks of at most this edge leave the Strassen-Winograd recursion for the classical kernel
+constexpr std::array<size_t, 3> STRASSEN_CUTOFFS = {64, 128, 256};
+
+// rows of C the Strassen-Winograd benchmarks recompute with the classical kernel to measure their error
+constexpr size_t STRASSEN_CHECK_ROWS = 8;
+
 constexpr std::array<size_t, 6> ARRAY_SIZES = {192, 960, 9984, 99'840, 1'000'128, 2'000'640};
 
+// how many iterations ahead the prefetching kernels prefetch, 0 issues no prefetch at all
+constexpr std::array<size_t, 5> PREFETCH_DISTANCES = {0, 1, 4, 16, 64};
+
+// elements of each of the three STREAM arrays, from L2 sized to far beyond any last level cache
+constexpr std::array<size_t, 4> STREAM_SIZES = {1 << 14, 1 << 17, 1 << 20, 1 << 23};
+
+// q of the STREAM scale and triad kernels
+constexpr double STREAM_SCALAR = 3.0;
+
+// the latency ladder rings grow from LATENCY_MIN_BYTES to LATENCY_MAX_BYTES in
+// LATENCY_STEPS_PER_OCTAVE evenly spaced sizes per doubling
+constexpr size_t LATENCY_MIN_BYTES        = 4 << 10;
+constexpr size_t LATENCY_MAX_BYTES        = 512 << 20;
+constexpr size_t LATENCY_STEPS_PER_OCTAVE = 4;
+
+// loads of one measured latency run, shared between the chasers
+constexpr size_t LATENCY_LOADS = 1 << 22;
+
+// independent chases through the same ring, the ns per load they reach shows how many
+// misses one core keeps in flight
+constexpr std::array<size_t, 5> LATENCY_CHASERS = {1, 2, 4, 8, 16};
+
 constexpr std::array<size_t, 3> small_pow2 = {8, 16, 32};
 
 constexpr std::array<std::tuple<size_t, size_t>, 4> picture_dimensions = {{
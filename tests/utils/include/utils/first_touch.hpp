@@ -0,0 +1,42 @@
+#pragma once
+
+#include "utils/tile_executor.hpp"
+
+#include <cstddef>
+#include <cstring>
+#include <functional>
+#include <string>
+
+// How the multithreaded fixtures first touch their operands in SetUp, read from BENCH_INIT:
+// serial    every slice on the main thread, so under the default first-touch NUMA policy
+//           all pages land on its node (default)
+// parallel  slice i on pool worker i, the worker runTest hands the same slice later, so
+//           the pages land on the node of the worker that computes on them
+enum class InitMode {
+    serial,
+    parallel
+};
+
+InitMode init_mode();
+
+std::string init_mode_name(InitMode mode);
+
+// Calls touch(i) for every i < slices following init_mode() and records the mode and the
+// wall time as first_touch_ns. Only pages nobody wrote yet are placed by it: with
+// BENCH_MEMORY=malloc glibc may hand back pages a previous fixture already touched.
+void first_touch(size_t slices, const std::function<void(size_t)>& touch);
+
+// memset of the `tile` block of a row-major matrix with `ld` elements per row, a single
+// memset when the tile spans whole rows. ld = 1 with a [0, 1) column range fills the
+// [row_begin, row_end) elements of an array.
+template <typename T>
+void fill_tile(T* matrix, size_t ld, const Tile& tile, int value) {
+    size_t width = tile.col_end - tile.col_begin;
+    if (width == ld) {
+        memset(matrix + tile.row_begin * ld, value, (tile.row_end - tile.row_begin) * ld * sizeof(T));
+        return;
+    }
+    for (size_t i = tile.row_begin; i < tile.row_end; i++) {
+        memset(matrix + i * ld + tile.col_begin, value, width * sizeof(T));
+    }
+}
@@ -0,0 +1,129 @@
+#pragma once
+
+#include "utils/memory.hpp"
+#include "utils/results.hpp"
+#include "utils/tsc.hpp"
+
+#include <algorithm>
+#include <chrono>
+#include <cstddef>
+#include <string>
+#include <vector>
+
+// Read once from the environment:
+// BENCH_WARMUP       unmeasured runs before the measured ones (default 1)
+// BENCH_REPETITIONS  measured runs per parameter point (default 5)
+// BENCH_OUTLIER_MADS samples further than this many scaled MADs from the median are rejected (default 3.5)
+// BENCH_CALIBRATE    pick the outer loop count of the looping kernels automatically (default 0)
+// BENCH_TARGET_MS    duration a calibrated measurement should reach (default 100)
+struct BenchmarkConfig {
+    size_t warmup;
+    size_t repetitions;
+    double outlier_mads;
+    bool calibrate;
+    double target_ns;
+};
+
+const BenchmarkConfig& benchmark_config();
+
+size_t env_size(const char* name, size_t fallback);
+
+double env_double(const char* name, double fallback);
+
+struct SampleStats {
+    double min;
+    double median;
+    double p95;
+    double mad;
+    std::vector<double> kept;
+    std::vector<double> outliers;
+};
+
+SampleStats summarize(const std::vector<double>& samples, double outlier_mads);
+
+// Summarizes the samples and attaches them to the current test's results record
+SampleStats record_samples(const std::vector<double>& samples_ns);
+
+// Work done by one measured run, used to normalize the RegionTimer cycles.
+// A flop count of 0 leaves cycles_per_flop out of the record.
+void set_work(double elements, double flops = 0);
+
+// Records the per-repetition kernel region cycles with cycles/element and cycles/FLOP
+void record_region(const std::vector<double>& cycles);
+
+// Records the GFLOP/s of the median run of `flops` and its fraction of `peak_gflops`
+void record_flops(const SampleStats& stats, double flops, double peak_gflops);
+
+// Records the bytes one run moves and the GB/s of the median run
+void record_bandwidth(const SampleStats& stats, double bytes);
+
+// Records the median duration of one timed phase of the measured runs as <name>_ns and
+// its share of the whole run, e.g. the transpose before a multiplication. `samples_ns`
+// holds one duration per run, warm-up runs first; those are left out.
+void record_phase(const std::string& name, const std::vector<double>& samples_ns, const SampleStats& total);
+
+template <typename Kernel>
+double time_once(Kernel&& kernel) {
+    auto start = std::chrono::steady_clock::now();
+    kernel();
+    auto end = std::chrono::steady_clock::now();
+
+    return static_cast<double>(std::chrono::duration_cast<std::chrono::nanoseconds>(end - start).count());
+}
+
+// Runs the kernel for the configured warm-up and measured repetitions and records
+// the per-repetition durations in ns
+template <typename Kernel>
+SampleStats measure(Kernel&& kernel) {
+    const BenchmarkConfig& config = benchmark_config();
+
+    for (size_t i = 0; i < config.warmup; i++) {
+        kernel();
+    }
+
+    std::vector<double> samples, cycles;
+    for (size_t i = 0; i < config.repetitions; i++) {
+        region_reset();
+        samples.push_back(time_once(kernel));
+        if (region_recorded()) {
+            cycles.push_back(static_cast<double>(region_cycles()));
+        }
+    }
+
+    record_region(cycles);
+    record_memory_backing();
+    return record_samples(samples);
+}
+
+// Grows `loops` until one run of the kernel takes at least the configured target duration
+template <typename Kernel>
+void calibrate_loops(size_t& loops, Kernel&& kernel) {
+    const double target = benchmark_config().target_ns;
+
+    loops = 1;
+    double elapsed = time_once(kernel);
+    while (elapsed < target) {
+        // jump straight to the estimate once the run is long enough to trust, grow tenfold before that
+        double scale = elapsed > target / 100 ? 1.1 * target / elapsed : 10.0;
+        loops = std::max(loops + 1, static_cast<size_t>(static_cast<double>(loops) * scale));
+        elapsed = time_once(kernel);
+    }
+}
+
+// For kernels that repeat a pass over `elements` items `loops` times: calibrates the loop
+// count when enabled, measures and reports the median time normalized per element
+template <typename Kernel>
+SampleStats measure_loops(size_t& loops, size_t elements, Kernel&& kernel) {
+    if (benchmark_config().calibrate) {
+        calibrate_loops(loops, kernel);
+    }
+    set_work(static_cast<double>(loops) * static_cast<double>(elements));
+
+    SampleStats stats = measure(kernel);
+
+    record_metric("loops", static_cast<double>(loops));
+    record_metric("elements", static_cast<double>(elements));
+    record_metric("ns_per_element", stats.median / (static_cast<double>(loops) * static_cast<double>(elements)));
+
+    return stats;
+}
@@ -0,0 +1,89 @@
+#pragma once
+
+#include <array>
+#include <cstddef>
+#include <string>
+
+// Nesting of the i (row of C), j (column of C) and k (reduction) loops of C += A * B,
+// outermost first. The innermost index decides the strides of the hot loop:
+// j  A invariant, B and C unit stride      (ikj, kij)
+// k  A unit stride, B row stride, C invariant (ijk, jik)
+// i  A and C row stride, B invariant       (jki, kji)
+enum class LoopOrder {
+    ijk,
+    ikj,
+    jik,
+    jki,
+    kij,
+    kji
+};
+
+constexpr std::array<LoopOrder, 6> LOOP_ORDERS = {
+    LoopOrder::ijk, LoopOrder::ikj, LoopOrder::jik, LoopOrder::jki, LoopOrder::kij, LoopOrder::kji
+};
+
+std::string loop_order_name(LoopOrder order);
+
+// Records the stride of A, B and C in the innermost loop as "unit", "row" or "invariant"
+void record_loop_strides(LoopOrder order);
+
+// Calls madd(i, j, k) for every i, j, k < size in the given loop nesting
+template <typename MultiplyAdd>
+void for_each_in_order(LoopOrder order, size_t size, MultiplyAdd&& madd) {
+    switch (order) {
+        case LoopOrder::ijk:
+            for (size_t i = 0; i < size; i++) {
+                for (size_t j = 0; j < size; j++) {
+                    for (size_t k = 0; k < size; k++) {
+                        madd(i, j, k);
+                    }
+                }
+            }
+            break;
+        case LoopOrder::ikj:
+            for (size_t i = 0; i < size; i++) {
+                for (size_t k = 0; k < size; k++) {
+                    for (size_t j = 0; j < size; j++) {
+                        madd(i, j, k);
+                    }
+                }
+            }
+            break;
+        case LoopOrder::jik:
+            for (size_t j = 0; j < size; j++) {
+                for (size_t i = 0; i < size; i++) {
+                    for (size_t k = 0; k < size; k++) {
+                        madd(i, j, k);
+                    }
+                }
+            }
+            break;
+        case LoopOrder::jki:
+            for (size_t j = 0; j < size; j++) {
+                for (size_t k = 0; k < size; k++) {
+                    for (size_t i = 0; i < size; i++) {
+                        madd(i, j, k);
+                    }
+                }
+            }
+            break;
+        case LoopOrder::kij:
+            for (size_t k = 0; k < size; k++) {
+                for (size_t i = 0; i < size; i++) {
+                    for (size_t j = 0; j < size; j++) {
+                        madd(i, j, k);
+                    }
+                }
+            }
+            break;
+        case LoopOrder::kji:
+            for (size_t k = 0; k < size; k++) {
+                for (size_t j = 0; j < size; j++) {
+                    for (size_t i = 0; i < size; i++) {
+                        madd(i, j, k);
+                    }
+                }
+            }
+            break;
+    }
+}
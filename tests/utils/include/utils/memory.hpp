@@ -0,0 +1,31 @@
+#pragma once
+
+#include <cstddef>
+#include <string>
+
+// Where allocations of at least HUGE_PAGE_BYTES come from, read from BENCH_MEMORY.
+// Smaller ones always come from malloc/aligned_alloc.
+// malloc   malloc, or aligned_alloc when an alignment is asked for (default)
+// aligned  aligned_alloc on a huge page boundary, rounded up to whole huge pages
+// thp      an anonymous mmap on a huge page boundary with madvise(MADV_HUGEPAGE)
+// hugetlb  an mmap with MAP_HUGETLB from the reserved huge page pool, thp when the
+//          pool is empty or the flag is not supported
+enum class MemoryBackend {
+    malloc,
+    aligned,
+    thp,
+    hugetlb
+};
+
+MemoryBackend memory_backend();
+
+std::string memory_backend_name(MemoryBackend backend);
+
+// `bytes` on an `alignment` boundary, 0 for malloc's own, from memory_backend() when large.
+// Has to be freed with safe_free(). Throws std::bad_alloc.
+void* backed_alloc(size_t bytes, size_t alignment);
+
+// Records the backend, and over the memory mappings that hold the live large allocations
+// how many kB /proc/self/smaps reports mapped and backed by huge pages (transparent or
+// hugetlbfs), and how many hugetlb allocations fell back to thp
+void record_memory_backing();
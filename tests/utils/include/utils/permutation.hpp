@@ -0,0 +1,14 @@
+#pragma once
+
+#include <cstddef>
+
+// Seed of the permutations the random-access kernels walk, fixed so runs are reproducible
+constexpr unsigned PERMUTATION_SEED = 42;
+
+// Writes begin, ..., end - 1 to index[begin, end) in Fisher-Yates shuffled order.
+// The order only depends on `seed`, not on the standard library.
+void shuffled_indices(size_t* index, size_t begin, size_t end, unsigned seed);
+
+// Writes one random cycle through [begin, end) to next[begin, end) with Sattolo's
+// algorithm: following next from any element visits all the others before it returns
+void random_cycle(size_t* next, size_t begin, size_t end, unsigned seed);
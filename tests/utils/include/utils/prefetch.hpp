@@ -0,0 +1,44 @@
+#pragma once
+
+#include <array>
+#include <string>
+#include <type_traits>
+
+// Locality hint of a software prefetch, the value is the __builtin_prefetch locality:
+// nta  non-temporal, kept out of the outer cache levels where the CPU supports it
+// t2   into L3 and outward
+// t1   into L2 and outward
+// t0   into every level
+enum class PrefetchHint {
+    nta,
+    t2,
+    t1,
+    t0
+};
+
+constexpr std::array<PrefetchHint, 4> PREFETCH_HINTS = {
+    PrefetchHint::nta, PrefetchHint::t2, PrefetchHint::t1, PrefetchHint::t0
+};
+
+std::string prefetch_hint_name(PrefetchHint hint);
+
+// Read prefetch of the line holding `address`, one of prefetchnta/t2/t1/t0. The write
+// form is left out on purpose: without PRFCHW the compiler falls back to a read prefetch
+// anyway, and with it every hint becomes the same prefetchw, so the hint would no
+// longer be what is measured.
+template <PrefetchHint Hint>
+inline void prefetch_line(const void* address) {
+    __builtin_prefetch(address, 0, static_cast<int>(Hint));
+}
+
+// __builtin_prefetch takes the hint as a constant, this calls
+// kernel(std::integral_constant<PrefetchHint, hint>()) for a hint only known at run time
+template <typename Kernel>
+void with_prefetch_hint(PrefetchHint hint, Kernel&& kernel) {
+    switch (hint) {
+        case PrefetchHint::nta: kernel(std::integral_constant<PrefetchHint, PrefetchHint::nta>()); break;
+        case PrefetchHint::t2:  kernel(std::integral_constant<PrefetchHint, PrefetchHint::t2>()); break;
+        case PrefetchHint::t1:  kernel(std::integral_constant<PrefetchHint, PrefetchHint::t1>()); break;
+        default:                kernel(std::integral_constant<PrefetchHint, PrefetchHint::t0>()); break;
+    }
+}
@@ -0,0 +1,36 @@
+#pragma once
+
+#include <gtest/gtest.h>
+
+#include <chrono>
+#include <fstream>
+#include <string>
+#include <vector>
+
+// Attach extra fields to the JSONL record of the test that is currently running.
+// Safe to call from worker threads, the record is written when the test ends.
+void record_field(const std::string& key, const std::string& value);
+
+void record_metric(const std::string& key, double value);
+
+void record_series(const std::string& key, const std::vector<double>& values);
+
+// Writes one JSON object per finished test case and flushes it right away,
+// so a crash halfway through a sweep keeps every record written before it.
+class ResultsListener : public testing::EmptyTestEventListener {
+public:
+    explicit ResultsListener(const std::string& path);
+
+    void OnTestStart(const testing::TestInfo& info) override;
+
+    void OnTestEnd(const testing::TestInfo& info) override;
+private:
+    std::ofstream out;
+    std::string host;
+    std::chrono::steady_clock::time_point start;
+};
+
+// BENCHMARK_RESULTS overrides the output file, "benchmark_results.jsonl" otherwise
+std::string results_path();
+
+void register_results_listener();
@@ -0,0 +1,41 @@
+#pragma once
+
+#include <array>
+#include <cstddef>
+#include <string>
+
+// Where the rows of a pointer-of-rows (T**) matrix live, named in test names as in
+// row_allocation_name():
+// per_row     ("malloc") one malloc per row like create_matrix(), placement up to the allocator
+// contiguous  one block with the rows back to back behind the row index
+// line        one block, every row starts on a cache line and is padded to whole lines
+// page        one block, every row starts on a page
+// arena       rows bumped out of chunks that are kept across tests, so a later matrix
+//             reuses pages that are mapped and touched already
+enum class RowAllocation {
+    per_row,
+    contiguous,
+    line,
+    page,
+    arena
+};
+
+constexpr std::array<RowAllocation, 5> ROW_ALLOCATIONS = {
+    RowAllocation::per_row, RowAllocation::contiguous, RowAllocation::line, RowAllocation::page, RowAllocation::arena
+};
+
+std::string row_allocation_name(RowAllocation allocation);
+
+// Index of `size` rows of `rowBytes` each, the rows are not touched. Throws std::bad_alloc.
+void** allocate_rows(size_t size, size_t rowBytes, RowAllocation allocation);
+
+// Frees what allocate_rows() returned. Arena rows stay taken until reset_row_arena().
+void free_rows(void** rows, size_t size, RowAllocation allocation);
+
+// Hands every arena row back, the chunks stay allocated for the next test
+void reset_row_arena();
+
+template <typename T>
+T** allocate_matrix(size_t size, RowAllocation allocation) {
+    return reinterpret_cast<T**>(allocate_rows(size, size * sizeof(T), allocation));
+}
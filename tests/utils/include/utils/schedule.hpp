@@ -0,0 +1,58 @@
+#pragma once
+
+#include "utils/constants.hpp"
+
+#include <array>
+#include <atomic>
+#include <string>
+#include <utility>
+#include <vector>
+
+// How rows are handed out to the workers of a threaded kernel:
+// static   one contiguous block per worker, the original split
+// cyclic   blocks of `chunk` rows dealt round-robin, worker w gets blocks w, w + workers, ...
+// dynamic  the next `chunk` rows from a shared atomic counter, whoever is free first
+// guided   like dynamic, but takes remaining / workers rows at a time, never less than `chunk`
+// stealing square tiles instead of rows, run by the work-stealing TileExecutor
+enum class Schedule {
+    static_block,
+    cyclic,
+    dynamic,
+    guided,
+    stealing
+};
+
+constexpr std::array<Schedule, 5> SCHEDULES = {
+    Schedule::static_block, Schedule::cyclic, Schedule::dynamic, Schedule::guided, Schedule::stealing
+};
+
+std::string schedule_name(Schedule schedule);
+
+// BENCH_SCHEDULE_CHUNK, rows per cyclic/dynamic grab and the guided minimum (default 1)
+size_t schedule_chunk();
+
+class RowScheduler {
+public:
+    void reset(Schedule kind, size_t totalRows, size_t numWorkers, size_t chunkRows);
+
+    // Next [start, end) rows for `worker`, false once it has nothing left. Thread-safe
+    // as long as every worker only asks for itself. Hands out nothing for Schedule::stealing.
+    bool next(size_t worker, size_t& start, size_t& end);
+
+    // Rows each worker took during the last run
+    const std::vector<std::pair<size_t, size_t>>& taken(size_t worker) const;
+
+    size_t workers() const;
+private:
+    // one per worker, padded so the cursors of neighbouring workers never share a line
+    struct alignas(CACHE_LINE) WorkerState {
+        size_t cursor;
+        std::vector<std::pair<size_t, size_t>> taken;
+    };
+
+    Schedule schedule = Schedule::static_block;
+    size_t rows = 0;
+    size_t chunk = 1;
+    std::vector<WorkerState> states;
+    alignas(CACHE_LINE) std::atomic<size_t> next_row{0};
+};
@@ -0,0 +1,120 @@
+#pragma once
+
+#include <cstddef>
+#include <random>
+#include <type_traits>
+
+// Square n x n blocks are passed as a pointer to their first element and a leading
+// dimension `ld` (the row stride of the matrix they live in), so quadrants are views.
+
+// C = A * B with the ikj kernel, the fastest classical loop order on row-major blocks
+template <typename T>
+void classical_mul(const T* A, size_t lda, const T* B, size_t ldb, T* C, size_t ldc, size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        T* c = C + i * ldc;
+        for (size_t j = 0; j < n; j++) {
+            c[j] = T(0);
+        }
+        for (size_t k = 0; k < n; k++) {
+            T a_ik = A[i * lda + k];
+            const T* b = B + k * ldb;
+            for (size_t j = 0; j < n; j++) {
+                c[j] += a_ik * b[j];
+            }
+        }
+    }
+}
+
+// Z = X + Y, Z may alias X or Y
+template <typename T>
+void add_blocks(const T* X, size_t ldx, const T* Y, size_t ldy, T* Z, size_t ldz, size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        for (size_t j = 0; j < n; j++) {
+            Z[i * ldz + j] = X[i * ldx + j] + Y[i * ldy + j];
+        }
+    }
+}
+
+// Z = X - Y, Z may alias X or Y
+template <typename T>
+void sub_blocks(const T* X, size_t ldx, const T* Y, size_t ldy, T* Z, size_t ldz, size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        for (size_t j = 0; j < n; j++) {
+            Z[i * ldz + j] = X[i * ldx + j] - Y[i * ldy + j];
+        }
+    }
+}
+
+// Blocks of n that strassen_mul() recurses on instead of falling back to classical_mul()
+inline bool strassen_splits(size_t n, size_t cutoff) {
+    return n > cutoff && n % 2 == 0;
+}
+
+// Elements of workspace strassen_mul() needs for an n x n product
+inline size_t strassen_workspace(size_t n, size_t cutoff) {
+    if (!strassen_splits(n, cutoff)) {
+        return 0;
+    }
+    size_t half = n / 2;
+    return 2 * half * half + strassen_workspace(half, cutoff);
+}
+
+// C = A * B by Strassen-Winograd: 7 half-size products and 15 block additions per level
+// instead of 8 products, down to blocks of at most `cutoff` (or of odd size), which go
+// to classical_mul(). The schedule keeps the partial results in the quadrants of C, so
+// a level only needs two half-size temporaries, taken from `workspace`
+// (strassen_workspace() elements). C must not alias A or B.
+template <typename T>
+void strassen_mul(const T* A, size_t lda, const T* B, size_t ldb, T* C, size_t ldc, size_t n, size_t cutoff, T* workspace) {
+    if (!strassen_splits(n, cutoff)) {
+        classical_mul(A, lda, B, ldb, C, ldc, n);
+        return;
+    }
+
+    size_t h = n / 2;
+    const T *A11 = A, *A12 = A + h, *A21 = A + h * lda, *A22 = A21 + h;
+    const T *B11 = B, *B12 = B + h, *B21 = B + h * ldb, *B22 = B21 + h;
+    T *C11 = C, *C12 = C + h, *C21 = C + h * ldc, *C22 = C21 + h;
+    T *X = workspace, *Y = workspace + h * h, *rest = workspace + 2 * h * h;
+
+    sub_blocks(A11, lda, A21, lda, X, h, h);                     // S3 = A11 - A21
+    sub_blocks(B22, ldb, B12, ldb, Y, h, h);                     // T3 = B22 - B12
+    strassen_mul(X, h, Y, h, C21, ldc, h, cutoff, rest);         // M7 = S3 * T3
+    add_blocks(A21, lda, A22, lda, X, h, h);                     // S1 = A21 + A22
+    sub_blocks(B12, ldb, B11, ldb, Y, h, h);                     // T1 = B12 - B11
+    strassen_mul(X, h, Y, h, C22, ldc, h, cutoff, rest);         // M5 = S1 * T1
+    sub_blocks(X, h, A11, lda, X, h, h);                         // S2 = S1 - A11
+    sub_blocks(B22, ldb, Y, h, Y, h, h);                         // T2 = B22 - T1
+    strassen_mul(X, h, Y, h, C12, ldc, h, cutoff, rest);         // M6 = S2 * T2
+    sub_blocks(A12, lda, X, h, X, h, h);                         // S4 = A12 - S2
+    strassen_mul(X, h, B22, ldb, C11, ldc, h, cutoff, rest);     // M3 = S4 * B22
+    strassen_mul(A11, lda, B11, ldb, X, h, h, cutoff, rest);     // M1 = A11 * B11
+    add_blocks(X, h, C12, ldc, C12, ldc, h);                     // U2 = M1 + M6
+    add_blocks(C12, ldc, C21, ldc, C21, ldc, h);                 // U3 = U2 + M7
+    add_blocks(C12, ldc, C22, ldc, C12, ldc, h);                 // U4 = U2 + M5
+    add_blocks(C21, ldc, C22, ldc, C22, ldc, h);                 // C22 = U3 + M5
+    add_blocks(C12, ldc, C11, ldc, C12, ldc, h);                 // C12 = U4 + M3
+    sub_blocks(Y, h, B21, ldb, Y, h, h);                         // T4 = T2 - B21
+    strassen_mul(A22, lda, Y, h, C11, ldc, h, cutoff, rest);     // M4 = A22 * T4
+    sub_blocks(C21, ldc, C11, ldc, C21, ldc, h);                 // C21 = U3 - M4
+    strassen_mul(A12, lda, B21, ldb, C11, ldc, h, cutoff, rest); // M2 = A12 * B21
+    add_blocks(X, h, C11, ldc, C11, ldc, h);                     // C11 = M1 + M2
+}
+
+// Operands whose products neither underflow, like the 0x03 bytes of the other matrix
+// fixtures do as doubles, nor overflow: integers in [-8, 8], doubles in [-1, 1)
+template <typename T>
+void fill_operand(T* data, size_t count, unsigned seed) {
+    std::mt19937 generator(seed);
+    if constexpr (std::is_floating_point<T>::value) {
+        std::uniform_real_distribution<T> distribution(-1, 1);
+        for (size_t i = 0; i < count; i++) {
+            data[i] = distribution(generator);
+        }
+    } else {
+        std::uniform_int_distribution<int> distribution(-8, 8);
+        for (size_t i = 0; i < count; i++) {
+            data[i] = static_cast<T>(distribution(generator));
+        }
+    }
+}
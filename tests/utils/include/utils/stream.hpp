@@ -0,0 +1,53 @@
+#pragma once
+
+#include "utils/tsc.hpp"
+
+#include <cstddef>
+
+// The four STREAM kernels, over the arrays a, b and c with scalar q:
+// copy   c = a
+// scale  b = q * c
+// add    c = a + b
+// triad  a = b + q * c
+enum class StreamKernel {
+    copy,
+    scale,
+    add,
+    triad
+};
+
+// Bytes a kernel moves over `elements` elements the way STREAM counts them: every array
+// read or written once, the write-allocate read of the destination left out
+template <typename T>
+double stream_bytes(StreamKernel kernel, size_t elements) {
+    size_t arrays = kernel == StreamKernel::copy || kernel == StreamKernel::scale ? 2 : 3;
+    return static_cast<double>(arrays * sizeof(T) * elements);
+}
+
+// Runs one kernel over the elements [begin, end)
+template <typename T>
+void stream_kernel(StreamKernel kernel, T* a, T* b, T* c, T q, size_t begin, size_t end) {
+    RegionTimer region;
+    switch (kernel) {
+        case StreamKernel::copy:
+            for (size_t i = begin; i < end; i++) {
+                c[i] = a[i];
+            }
+            break;
+        case StreamKernel::scale:
+            for (size_t i = begin; i < end; i++) {
+                b[i] = q * c[i];
+            }
+            break;
+        case StreamKernel::add:
+            for (size_t i = begin; i < end; i++) {
+                c[i] = a[i] + b[i];
+            }
+            break;
+        case StreamKernel::triad:
+            for (size_t i = begin; i < end; i++) {
+                a[i] = b[i] + q * c[i];
+            }
+            break;
+    }
+}
@@ -0,0 +1,75 @@
+#pragma once
+
+#include <atomic>
+#include <condition_variable>
+#include <cstddef>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+using task_function = std::function<void()>;
+
+// When one task of the last run started and finished, steady_clock ns
+struct WorkerSpan {
+    double start_ns;
+    double end_ns;
+};
+
+// Workers that live for the whole run and are shared by every multithreaded fixture,
+// so a measured run no longer pays for pthread_create and join. Workers are pinned
+// following BENCH_PLACEMENT when they are created.
+class ThreadPool {
+public:
+    ThreadPool() = default;
+
+    ~ThreadPool();
+
+    ThreadPool(const ThreadPool&) = delete;
+
+    ThreadPool& operator=(const ThreadPool&) = delete;
+
+    // Runs tasks[i] on worker i and returns once every task finished. The workers wait
+    // on a start barrier until all of them are awake, so they enter the kernel together.
+    void run(const std::vector<task_function>& tasks);
+
+    size_t size() const;
+
+    // Per-task spans of the last run, in task order
+    std::vector<WorkerSpan> last_spans() const;
+
+    // Forgets the spans of the last run, so a test that never reaches the pool does not
+    // report the previous test's
+    void clear_spans();
+private:
+    void grow(size_t count);
+
+    void work(size_t id, size_t generation);
+
+    std::vector<std::thread> workers;
+    mutable std::mutex mutex;
+    std::condition_variable wake;
+    std::condition_variable finished;
+
+    const std::vector<task_function>* batch = nullptr;
+    std::vector<WorkerSpan> spans;
+    size_t current_generation = 0;
+    size_t pending = 0;
+    std::atomic<size_t> arrived{0};
+    bool stopping = false;
+};
+
+ThreadPool& thread_pool();
+
+// Median cost of creating and joining `numThreads` fresh std::threads that do nothing,
+// what every measured run used to include before the pool
+double spawn_overhead_ns(size_t numThreads);
+
+// Records the spawn overhead, the placement policy and the CPUs the first `numThreads`
+// workers run on, and clears the pool's spans for the test that follows
+void record_thread_setup(size_t numThreads);
+
+// Records the spans of the pool's last run relative to the earliest start, and the load
+// imbalance (longest task / mean task duration). `work` is an optional per-task work count
+// in the same order, e.g. the Mandelbrot iterations each row block needed.
+void record_worker_timings(const std::vector<double>& work = {});
@@ -0,0 +1,79 @@
+#pragma once
+
+#include "utils/constants.hpp"
+#include "utils/thread_pool.hpp"
+
+#include <deque>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <utility>
+#include <vector>
+
+// [row_begin, row_end) x [col_begin, col_end) block of a 2D iteration space
+struct Tile {
+    size_t row_begin;
+    size_t row_end;
+    size_t col_begin;
+    size_t col_end;
+};
+
+using tile_function = std::function<void(const Tile&)>;
+
+// A tile kernel that is also told the index of the worker running the tile
+using worker_tile_function = std::function<void(size_t, const Tile&)>;
+
+// BENCH_TILE, edge of the square tiles the tiled kernels are cut into (default 64)
+size_t tile_size();
+
+// Rows x cols of the grid closest to square with exactly `cells` cells, rows >= cols.
+// 12 -> 4x3, 8 -> 4x2, 2 -> 2x1
+std::pair<size_t, size_t> grid_shape(size_t cells);
+
+// Even split of rows x cols into grid_rows x grid_cols blocks, one per cell, in row-major
+// order. Block edges differ by at most one.
+std::vector<Tile> grid_tiles(size_t rows, size_t cols, size_t grid_rows, size_t grid_cols);
+
+// Halves the longer side of `whole` the same number of times on every branch until there
+// are at least `count` tiles or nothing is left to cut. Column cuts stay on multiples of
+// `col_align`. The tiles come out in recursive order, so a contiguous run of them is a
+// compact block of the whole.
+std::vector<Tile> split_tiles(const Tile& whole, size_t count, size_t col_align);
+
+// Row-major tiles covering rows x cols, the last row and column of tiles may be smaller
+std::vector<Tile> make_tiles(size_t rows, size_t cols, size_t tile_rows, size_t tile_cols);
+
+// Runs a kernel over a grid of tiles on the thread pool. Every worker starts with a
+// contiguous run of tiles in its own deque and pops from the front; once it runs dry it
+// steals from the back of the other workers' deques, so irregular tiles even out.
+class TileExecutor {
+public:
+    void run(const std::vector<Tile>& tiles, size_t workers, const tile_function& kernel);
+
+    void run(const std::vector<Tile>& tiles, size_t workers, const worker_tile_function& kernel);
+
+    // Tiles `worker` ran during the last run, stolen ones included
+    const std::vector<Tile>& executed(size_t worker) const;
+
+    size_t workers() const;
+
+    // Records the tile count, tile edge and the number of steals of the last run
+    void record() const;
+private:
+    struct alignas(CACHE_LINE) WorkerQueue {
+        std::mutex mutex;
+        std::deque<Tile> tiles;
+        std::vector<Tile> executed;
+        size_t steals = 0;
+    };
+
+    bool pop(size_t worker, Tile& tile);
+
+    bool steal(size_t worker, Tile& tile);
+
+    void work(size_t worker, const worker_tile_function& kernel);
+
+    std::vector<std::unique_ptr<WorkerQueue>> queues;
+    std::vector<task_function> tasks;
+    size_t tile_count = 0;
+};
@@ -0,0 +1,40 @@
+#pragma once
+
+#include <string>
+#include <thread>
+#include <vector>
+
+struct CpuInfo {
+    int cpu;
+    int package;
+    int core;
+    // position among the hardware threads of its core, 0 for the first sibling
+    int smt;
+};
+
+// Online CPUs this process may run on, read from /sys/devices/system/cpu.
+// Falls back to one core per CPU when sysfs is not available.
+const std::vector<CpuInfo>& cpu_topology();
+
+// How the thread pool workers are pinned, read from BENCH_PLACEMENT:
+// none      leave placement to the scheduler (default)
+// compact   every core of a package once, then their SMT siblings, then the next package
+// scatter   round-robin over the packages, one thread per core before any sibling
+// physical  one thread per core, never two workers on SMT siblings
+// smt       SMT siblings back to back, workers 2k and 2k+1 share a core
+enum class Placement {
+    none,
+    compact,
+    scatter,
+    physical,
+    smt
+};
+
+Placement placement_policy();
+
+std::string placement_name(Placement placement);
+
+// CPUs in the order the workers are pinned to them, worker i gets cpus[i % size]
+std::vector<int> placement_cpus(Placement placement);
+
+void pin_thread(std::thread& thread, int cpu);
@@ -0,0 +1,109 @@
+#pragma once
+
+#include "utils/constants.hpp"
+#include "utils/utils.hpp"
+
+#include <algorithm>
+#include <cstddef>
+
+// dst = src^T for the rows [startRow, endRow) of a size x size source, where row(i)
+// points at source row i. Works in TRANSPOSE_BLOCK blocks so neither side walks a whole
+// column at a time. dst is contiguous, row j of it at dst + j * size.
+template <typename T, typename Row>
+void transpose_rows(Row&& row, T* dst, size_t size, size_t startRow, size_t endRow) {
+    for (size_t ii = startRow; ii < endRow; ii += TRANSPOSE_BLOCK) {
+        size_t endI = std::min(ii + TRANSPOSE_BLOCK, endRow);
+        for (size_t jj = 0; jj < size; jj += TRANSPOSE_BLOCK) {
+            size_t endJ = std::min(jj + TRANSPOSE_BLOCK, size);
+            for (size_t i = ii; i < endI; i++) {
+                const T* source = row(i);
+                for (size_t j = jj; j < endJ; j++) {
+                    dst[j * size + i] = source[j];
+                }
+            }
+        }
+    }
+}
+
+template <typename T>
+void transpose(T* const* src, T* dst, size_t size, size_t startRow, size_t endRow) {
+    transpose_rows<T>([src](size_t i) { return src[i]; }, dst, size, startRow, endRow);
+}
+
+template <typename T>
+void transpose(const T* src, T* dst, size_t size, size_t startRow, size_t endRow) {
+    transpose_rows<T>([src, size](size_t i) { return src + i * size; }, dst, size, startRow, endRow);
+}
+
+// Panels of PACKED_B_WIDTH columns needed for a size x size matrix
+inline size_t packed_panels(size_t size) {
+    return (size + PACKED_B_WIDTH - 1) / PACKED_B_WIDTH;
+}
+
+// A 32-byte aligned buffer for a prepared size x size B, large enough for the panels of
+// pack_columns and so also for a plain transpose
+template <typename T>
+T* alloc_prepared(size_t size) {
+    size_t totalSize = packed_panels(size) * PACKED_B_WIDTH * size * sizeof(T);
+    if (totalSize % ALIGNMENT_32 != 0) {
+        totalSize += ALIGNMENT_32 - (totalSize % ALIGNMENT_32);
+    }
+    return static_cast<T*>(safe_aligned_alloc(ALIGNMENT_32, totalSize));
+}
+
+// Copies the rows [startRow, endRow) of a size x size source into column panels: panel p
+// keeps B[k][p * PACKED_B_WIDTH + c] at packed[(p * size + k) * PACKED_B_WIDTH + c], so a
+// panel is read front to back while k runs. Columns past the matrix are zero.
+template <typename T, typename Row>
+void pack_rows(Row&& row, T* packed, size_t size, size_t startRow, size_t endRow) {
+    for (size_t k = startRow; k < endRow; k++) {
+        const T* source = row(k);
+        for (size_t p = 0; p < packed_panels(size); p++) {
+            T* panel = &packed[(p * size + k) * PACKED_B_WIDTH];
+            for (size_t c = 0; c < PACKED_B_WIDTH; c++) {
+                size_t col = p * PACKED_B_WIDTH + c;
+                panel[c] = col < size ? source[col] : T(0);
+            }
+        }
+    }
+}
+
+template <typename T>
+void pack_columns(T* const* src, T* packed, size_t size, size_t startRow, size_t endRow) {
+    pack_rows<T>([src](size_t k) { return src[k]; }, packed, size, startRow, endRow);
+}
+
+template <typename T>
+void pack_columns(const T* src, T* packed, size_t size, size_t startRow, size_t endRow) {
+    pack_rows<T>([src, size](size_t k) { return src + k * size; }, packed, size, startRow, endRow);
+}
+
+template <typename T>
+T dot(const T* a, const T* b, size_t size) {
+    T sum = 0;
+    for (size_t k = 0; k < size; k++) {
+        sum += a[k] * b[k];
+    }
+    return sum;
+}
+
+// c_row += a_row * B with B in packed panels: one PACKED_B_WIDTH wide strip of the
+// C row is summed up over the whole panel before it is written back
+template <typename T>
+void packed_row_mul(const T* a_row, const T* packed, T* c_row, size_t size) {
+    for (size_t p = 0; p < packed_panels(size); p++) {
+        const T* panel = &packed[p * size * PACKED_B_WIDTH];
+        T sums[PACKED_B_WIDTH] = {};
+        for (size_t k = 0; k < size; k++) {
+            T a_ik = a_row[k];
+            for (size_t c = 0; c < PACKED_B_WIDTH; c++) {
+                sums[c] += a_ik * panel[k * PACKED_B_WIDTH + c];
+            }
+        }
+
+        size_t cols = std::min(PACKED_B_WIDTH, size - p * PACKED_B_WIDTH);
+        for (size_t c = 0; c < cols; c++) {
+            c_row[p * PACKED_B_WIDTH + c] += sums[c];
+        }
+    }
+}
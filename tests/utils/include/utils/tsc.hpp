@@ -0,0 +1,64 @@
+#pragma once
+
+#include <atomic>
+#include <cstdint>
+
+// Serializing reads of the time stamp counter: the fences keep the kernel's instructions
+// from being reordered across the start and end reads. Inline assembly instead of
+// intrinsics so the scalar build, compiled without SSE, can use them too.
+inline uint64_t tsc_begin() {
+#if defined(__x86_64__)
+    uint32_t low, high;
+    asm volatile("lfence\n\trdtsc" : "=a"(low), "=d"(high) :: "memory");
+    return (static_cast<uint64_t>(high) << 32) | low;
+#else
+    return 0;
+#endif
+}
+
+inline uint64_t tsc_end() {
+#if defined(__x86_64__)
+    uint32_t low, high, aux;
+    asm volatile("rdtscp\n\tlfence" : "=a"(low), "=d"(high), "=c"(aux) :: "memory");
+    return (static_cast<uint64_t>(high) << 32) | low;
+#else
+    return 0;
+#endif
+}
+
+// TSC ticks per ns, measured once against CLOCK_MONOTONIC_RAW
+double tsc_ghz();
+
+// Cycles spent inside RegionTimer scopes since the last region_reset(). When several
+// threads time their own region, the longest one is kept, it bounds the parallel run.
+void region_reset();
+
+bool region_recorded();
+
+uint64_t region_cycles();
+
+void region_add(uint64_t cycles);
+
+// Times the scope it lives in, put it around just the kernel loop. Only the outermost
+// timer of a thread counts, so a worker loop timing itself can call kernels that time
+// their own loops without every call being reported as a region of its own.
+class RegionTimer {
+public:
+    RegionTimer() : outermost(depth++ == 0), start(tsc_begin()) {}
+
+    ~RegionTimer() {
+        uint64_t end = tsc_end();
+        if (--depth == 0 && outermost) {
+            region_add(end - start);
+        }
+    }
+
+    RegionTimer(const RegionTimer&) = delete;
+
+    RegionTimer& operator=(const RegionTimer&) = delete;
+private:
+    static thread_local int depth;
+
+    bool outermost;
+    uint64_t start;
+};
@@ -1,5 +1,7 @@
 #pragma once
 
+#include "utils/constants.hpp"
+
 #include <cstdlib>
 #include <cmath>
 #include <string>
@@ -7,8 +9,14 @@
 #include <immintrin.h>
 #endif
 
+// Allocations of at least HUGE_PAGE_BYTES follow BENCH_MEMORY, see memory_backend().
+// Free them with safe_free(), which takes any pointer from these or from malloc.
 void* safe_malloc(size_t size);
 
+void* safe_aligned_alloc(size_t alignment, size_t size);
+
+void safe_free(void* memory);
+
 template <typename T>
 void create_matrix(T**& matrix, size_t size) {
     size_t rowSize = size * sizeof(T);
@@ -24,6 +32,14 @@ void create_matrix(T**& matrix, size_t size) {
 
 void free_matrix(void**& matrix, size_t size);
 
+// Elements between the starts of two rows of a `size`-column matrix: the row rounded up
+// to `alignBytes`, so every row starts aligned, then `padBytes` of padding
+template <typename T>
+size_t leading_dimension(size_t size, size_t padBytes, size_t alignBytes = sizeof(T)) {
+    size_t width = alignBytes / sizeof(T);
+    return (size + width - 1) / width * width + padBytes / sizeof(T);
+}
+
 inline void scalar_mandelbrot_quadratic(double z_real, double z_im, double c_real, double c_im, double& rez_real, double& rez_im) {
     rez_real = pow(z_real, 2) - pow(z_im, 2) + c_real;
     rez_im = 2 * z_real * z_im + c_im;
@@ -0,0 +1,54 @@
+#include "utils/first_touch.hpp"
+#include "utils/harness.hpp"
+#include "utils/results.hpp"
+#include "utils/thread_pool.hpp"
+
+#include <cstdlib>
+#include <stdexcept>
+#include <vector>
+
+InitMode init_mode() {
+    static const InitMode mode = [] {
+        const char* value = std::getenv("BENCH_INIT");
+        std::string name = value != nullptr ? value : "";
+        for (InitMode candidate : {InitMode::serial, InitMode::parallel}) {
+            if (name == init_mode_name(candidate)) {
+                return candidate;
+            }
+        }
+        if (!name.empty()) {
+            throw std::invalid_argument("Unknown BENCH_INIT " + name);
+        }
+        return InitMode::serial;
+    }();
+    return mode;
+}
+
+std::string init_mode_name(InitMode mode) {
+    switch (mode) {
+        case InitMode::parallel: return "parallel";
+        default:                 return "serial";
+    }
+}
+
+void first_touch(size_t slices, const std::function<void(size_t)>& touch) {
+    InitMode mode = init_mode();
+
+    double first_touch_ns = time_once([&] {
+        if (mode == InitMode::serial) {
+            for (size_t i = 0; i < slices; i++) {
+                touch(i);
+            }
+            return;
+        }
+
+        std::vector<task_function> tasks;
+        for (size_t i = 0; i < slices; i++) {
+            tasks.emplace_back([&touch, i] { touch(i); });
+        }
+        thread_pool().run(tasks);
+    });
+
+    record_field("init", init_mode_name(mode));
+    record_metric("first_touch_ns", first_touch_ns);
+}
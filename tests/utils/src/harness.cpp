@@ -0,0 +1,162 @@
+#include "utils/harness.hpp"
+#include "utils/results.hpp"
+
+#include <algorithm>
+#include <cmath>
+#include <cstdlib>
+#include <string>
+
+namespace {
+
+double work_elements = 0;
+double work_flops = 0;
+
+// scales the MAD to a standard deviation estimate for normally distributed samples
+constexpr double MAD_TO_SIGMA = 1.4826;
+
+double median_of_sorted(const std::vector<double>& sorted) {
+    size_t n = sorted.size();
+    if (n == 0) {
+        return NAN;
+    }
+    return (sorted[(n - 1) / 2] + sorted[n / 2]) / 2;
+}
+
+double percentile_of_sorted(const std::vector<double>& sorted, double percentile) {
+    if (sorted.empty()) {
+        return NAN;
+    }
+    double rank = percentile / 100 * static_cast<double>(sorted.size() - 1);
+    size_t low = static_cast<size_t>(std::floor(rank));
+    size_t high = std::min(low + 1, sorted.size() - 1);
+    return sorted[low] + (sorted[high] - sorted[low]) * (rank - static_cast<double>(low));
+}
+
+}
+
+size_t env_size(const char* name, size_t fallback) {
+    const char* value = std::getenv(name);
+    if (value == nullptr || *value == '\0') {
+        return fallback;
+    }
+    return std::stoul(value);
+}
+
+double env_double(const char* name, double fallback) {
+    const char* value = std::getenv(name);
+    if (value == nullptr || *value == '\0') {
+        return fallback;
+    }
+    return std::stod(value);
+}
+
+const BenchmarkConfig& benchmark_config() {
+    static const BenchmarkConfig config = {
+        env_size("BENCH_WARMUP", 1),
+        std::max<size_t>(env_size("BENCH_REPETITIONS", 5), 1),
+        env_double("BENCH_OUTLIER_MADS", 3.5),
+        env_size("BENCH_CALIBRATE", 0) != 0,
+        env_double("BENCH_TARGET_MS", 100) * 1e6,
+    };
+    return config;
+}
+
+SampleStats summarize(const std::vector<double>& samples, double outlier_mads) {
+    std::vector<double> sorted = samples;
+    std::sort(sorted.begin(), sorted.end());
+
+    SampleStats stats;
+    double median = median_of_sorted(sorted);
+
+    std::vector<double> deviations;
+    for (double sample : sorted) {
+        deviations.push_back(std::fabs(sample - median));
+    }
+    std::sort(deviations.begin(), deviations.end());
+    stats.mad = median_of_sorted(deviations);
+
+    double limit = outlier_mads * MAD_TO_SIGMA * stats.mad;
+    for (double sample : samples) {
+        if (stats.mad > 0 && std::fabs(sample - median) > limit) {
+            stats.outliers.push_back(sample);
+        } else {
+            stats.kept.push_back(sample);
+        }
+    }
+
+    std::vector<double> kept = stats.kept;
+    std::sort(kept.begin(), kept.end());
+
+    stats.min    = kept.empty() ? NAN : kept.front();
+    stats.median = median_of_sorted(kept);
+    stats.p95    = percentile_of_sorted(kept, 95);
+
+    return stats;
+}
+
+SampleStats record_samples(const std::vector<double>& samples_ns) {
+    const BenchmarkConfig& config = benchmark_config();
+    SampleStats stats = summarize(samples_ns, config.outlier_mads);
+
+    record_metric("warmup", static_cast<double>(config.warmup));
+    record_metric("repetitions", static_cast<double>(samples_ns.size()));
+    record_series("samples_ns", stats.kept);
+    record_series("outliers_ns", stats.outliers);
+    record_metric("min_ns", stats.min);
+    record_metric("median_ns", stats.median);
+    record_metric("p95_ns", stats.p95);
+    record_metric("mad_ns", stats.mad);
+
+    return stats;
+}
+
+void set_work(double elements, double flops) {
+    work_elements = elements;
+    work_flops = flops;
+}
+
+void record_region(const std::vector<double>& cycles) {
+    if (!cycles.empty()) {
+        std::vector<double> sorted = cycles;
+        std::sort(sorted.begin(), sorted.end());
+        double median = median_of_sorted(sorted);
+
+        record_series("region_cycles", cycles);
+        record_metric("median_cycles", median);
+        record_metric("tsc_ghz", tsc_ghz());
+        record_metric("region_ns", median / tsc_ghz());
+        if (work_elements > 0) {
+            record_metric("cycles_per_element", median / work_elements);
+        }
+        if (work_flops > 0) {
+            record_metric("cycles_per_flop", median / work_flops);
+        }
+    }
+
+    set_work(0, 0);
+}
+
+void record_flops(const SampleStats& stats, double flops, double peak_gflops) {
+    double gflops = flops / stats.median;
+    record_metric("gflops", gflops);
+    record_metric("peak_gflops", peak_gflops);
+    record_metric("peak_fraction", gflops / peak_gflops);
+}
+
+void record_bandwidth(const SampleStats& stats, double bytes) {
+    record_metric("bytes", bytes);
+    record_metric("gb_per_s", bytes / stats.median);
+}
+
+void record_phase(const std::string& name, const std::vector<double>& samples_ns, const SampleStats& total) {
+    size_t warmup = std::min(benchmark_config().warmup, samples_ns.size());
+    std::vector<double> measured(samples_ns.begin() + static_cast<std::ptrdiff_t>(warmup), samples_ns.end());
+    if (measured.empty()) {
+        return;
+    }
+
+    std::sort(measured.begin(), measured.end());
+    double median = median_of_sorted(measured);
+    record_metric(name + "_ns", median);
+    record_metric(name + "_share", median / total.median);
+}
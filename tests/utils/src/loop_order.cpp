@@ -0,0 +1,22 @@
+#include "utils/loop_order.hpp"
+#include "utils/results.hpp"
+
+std::string loop_order_name(LoopOrder order) {
+    switch (order) {
+        case LoopOrder::ikj: return "ikj";
+        case LoopOrder::jik: return "jik";
+        case LoopOrder::jki: return "jki";
+        case LoopOrder::kij: return "kij";
+        case LoopOrder::kji: return "kji";
+        default:             return "ijk";
+    }
+}
+
+void record_loop_strides(LoopOrder order) {
+    std::string name = loop_order_name(order);
+    char inner = name.back();
+
+    record_field("stride_A", inner == 'k' ? "unit" : inner == 'i' ? "row" : "invariant");
+    record_field("stride_B", inner == 'j' ? "unit" : inner == 'k' ? "row" : "invariant");
+    record_field("stride_C", inner == 'j' ? "unit" : inner == 'i' ? "row" : "invariant");
+}
@@ -0,0 +1,229 @@
+#include "utils/memory.hpp"
+#include "utils/constants.hpp"
+#include "utils/results.hpp"
+#include "utils/utils.hpp"
+
+#include <cstdint>
+#include <cstdio>
+#include <cstdlib>
+#include <fstream>
+#include <iterator>
+#include <map>
+#include <mutex>
+#include <new>
+#include <stdexcept>
+#include <string>
+#include <sys/mman.h>
+#include <vector>
+
+namespace {
+
+struct LargeBlock {
+    size_t bytes;
+    // mmap'ed, so freed with munmap
+    bool mapped;
+};
+
+struct BlockRegistry {
+    std::mutex mutex;
+    std::map<char*, LargeBlock> blocks;
+    size_t hugetlb_fallbacks = 0;
+};
+
+// never destroyed, the row arena hands its chunks back from a static destructor
+BlockRegistry& block_registry() {
+    static BlockRegistry* registry = new BlockRegistry;
+    return *registry;
+}
+
+size_t round_up(size_t bytes, size_t alignment) {
+    return (bytes + alignment - 1) / alignment * alignment;
+}
+
+void* checked(void* memory) {
+    if (memory == nullptr) {
+        throw std::bad_alloc();
+    }
+    return memory;
+}
+
+// `bytes` on a huge page boundary out of an anonymous mapping one huge page larger, the
+// unaligned head and the tail are unmapped again
+char* huge_aligned_mapping(size_t bytes) {
+    size_t length = bytes + HUGE_PAGE_BYTES;
+    void* mapping = mmap(nullptr, length, PROT_READ | PROT_WRITE, MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+    if (mapping == MAP_FAILED) {
+        throw std::bad_alloc();
+    }
+
+    char* start = static_cast<char*>(mapping);
+    char* aligned = reinterpret_cast<char*>(round_up(reinterpret_cast<uintptr_t>(start), HUGE_PAGE_BYTES));
+    if (aligned > start) {
+        munmap(start, static_cast<size_t>(aligned - start));
+    }
+    munmap(aligned + bytes, static_cast<size_t>(start + length - (aligned + bytes)));
+    return aligned;
+}
+
+char* hugetlb_mapping(size_t bytes) {
+#ifdef MAP_HUGETLB
+    void* mapping = mmap(nullptr, bytes, PROT_READ | PROT_WRITE, MAP_PRIVATE | MAP_ANONYMOUS | MAP_HUGETLB, -1, 0);
+    if (mapping != MAP_FAILED) {
+        return static_cast<char*>(mapping);
+    }
+#endif
+    return nullptr;
+}
+
+// smaps fields of one mapping, in kB
+struct MappingUsage {
+    unsigned long start;
+    unsigned long end;
+    double size_kb = 0;
+    double huge_kb = 0;
+};
+
+std::vector<MappingUsage> smaps_mappings() {
+    std::vector<MappingUsage> mappings;
+    std::ifstream smaps("/proc/self/smaps");
+    std::string line;
+    while (std::getline(smaps, line)) {
+        unsigned long start, end;
+        char key[64];
+        double kb;
+        if (std::sscanf(line.c_str(), "%lx-%lx ", &start, &end) == 2 && line.find('-') < line.find(' ')) {
+            mappings.push_back({start, end});
+        } else if (!mappings.empty() && std::sscanf(line.c_str(), "%63[^:]: %lf kB", key, &kb) == 2) {
+            std::string field = key;
+            if (field == "Size") {
+                mappings.back().size_kb = kb;
+            } else if (field == "AnonHugePages" || field == "Private_Hugetlb" || field == "Shared_Hugetlb") {
+                mappings.back().huge_kb += kb;
+            }
+        }
+    }
+    return mappings;
+}
+
+}
+
+MemoryBackend memory_backend() {
+    static const MemoryBackend backend = [] {
+        const char* value = std::getenv("BENCH_MEMORY");
+        std::string name = value != nullptr ? value : "";
+        for (MemoryBackend candidate : {MemoryBackend::malloc, MemoryBackend::aligned, MemoryBackend::thp, MemoryBackend::hugetlb}) {
+            if (name == memory_backend_name(candidate)) {
+                return candidate;
+            }
+        }
+        if (!name.empty()) {
+            throw std::invalid_argument("Unknown BENCH_MEMORY " + name);
+        }
+        return MemoryBackend::malloc;
+    }();
+    return backend;
+}
+
+std::string memory_backend_name(MemoryBackend backend) {
+    switch (backend) {
+        case MemoryBackend::aligned: return "aligned";
+        case MemoryBackend::thp:     return "thp";
+        case MemoryBackend::hugetlb: return "hugetlb";
+        default:                     return "malloc";
+    }
+}
+
+void* backed_alloc(size_t bytes, size_t alignment) {
+    if (bytes < HUGE_PAGE_BYTES) {
+        return checked(alignment == 0 ? malloc(bytes) : std::aligned_alloc(alignment, round_up(bytes, alignment)));
+    }
+
+    size_t rounded = round_up(bytes, HUGE_PAGE_BYTES);
+    char* memory = nullptr;
+    bool mapped = false, fell_back = false;
+
+    switch (memory_backend()) {
+        case MemoryBackend::hugetlb:
+            memory = hugetlb_mapping(rounded);
+            if (memory != nullptr) {
+                mapped = true;
+                break;
+            }
+            fell_back = true;
+            [[fallthrough]];
+        case MemoryBackend::thp:
+            memory = huge_aligned_mapping(rounded);
+            madvise(memory, rounded, MADV_HUGEPAGE);
+            mapped = true;
+            break;
+        case MemoryBackend::aligned:
+            memory = static_cast<char*>(checked(std::aligned_alloc(HUGE_PAGE_BYTES, rounded)));
+            break;
+        default:
+            memory = static_cast<char*>(checked(alignment == 0 ? malloc(bytes) : std::aligned_alloc(alignment, round_up(bytes, alignment))));
+            rounded = bytes;
+            break;
+    }
+
+    BlockRegistry& registry = block_registry();
+    std::lock_guard<std::mutex> lock(registry.mutex);
+    registry.hugetlb_fallbacks += fell_back ? 1 : 0;
+    registry.blocks[memory] = {rounded, mapped};
+    return memory;
+}
+
+void safe_free(void* memory) {
+    {
+        BlockRegistry& registry = block_registry();
+        std::lock_guard<std::mutex> lock(registry.mutex);
+        auto block = registry.blocks.find(static_cast<char*>(memory));
+        if (block != registry.blocks.end()) {
+            LargeBlock large = block->second;
+            registry.blocks.erase(block);
+            if (large.mapped) {
+                munmap(memory, large.bytes);
+                return;
+            }
+        }
+    }
+    free(memory);
+}
+
+void record_memory_backing() {
+    record_field("memory", memory_backend_name(memory_backend()));
+
+    std::map<char*, LargeBlock> blocks;
+    size_t fallbacks;
+    {
+        BlockRegistry& registry = block_registry();
+        std::lock_guard<std::mutex> lock(registry.mutex);
+        blocks = registry.blocks;
+        fallbacks = registry.hugetlb_fallbacks;
+    }
+    if (blocks.empty()) {
+        return;
+    }
+
+    double mapped_kb = 0, huge_kb = 0;
+    for (const MappingUsage& mapping : smaps_mappings()) {
+        // the first block that ends past the mapping start decides whether they overlap
+        auto block = blocks.upper_bound(reinterpret_cast<char*>(mapping.start));
+        if (block != blocks.begin()) {
+            auto previous = std::prev(block);
+            if (reinterpret_cast<unsigned long>(previous->first + previous->second.bytes) > mapping.start) {
+                block = previous;
+            }
+        }
+        if (block != blocks.end() && reinterpret_cast<unsigned long>(block->first) < mapping.end) {
+            mapped_kb += mapping.size_kb;
+            huge_kb += mapping.huge_kb;
+        }
+    }
+
+    record_metric("mapped_kb", mapped_kb);
+    record_metric("huge_kb", huge_kb);
+    record_metric("huge_fraction", mapped_kb > 0 ? huge_kb / mapped_kb : 0);
+    if (fallbacks > 0) {
+        record_metric("hugetlb_fallbacks", static_cast<double>(fallbacks));
+    }
+}
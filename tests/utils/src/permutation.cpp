@@ -0,0 +1,37 @@
+#include "utils/permutation.hpp"
+
+#include <random>
+#include <utility>
+
+namespace {
+
+// uniform_int_distribution differs between standard libraries, a plain modulo of the
+// engine does not, and its bias is negligible next to 2^64
+size_t below(std::mt19937_64& generator, size_t bound) {
+    return static_cast<size_t>(generator() % bound);
+}
+
+}
+
+void shuffled_indices(size_t* index, size_t begin, size_t end, unsigned seed) {
+    for (size_t i = begin; i < end; i++) {
+        index[i] = i;
+    }
+
+    std::mt19937_64 generator(seed);
+    for (size_t i = end - begin; i > 1; i--) {
+        std::swap(index[begin + i - 1], index[begin + below(generator, i)]);
+    }
+}
+
+void random_cycle(size_t* next, size_t begin, size_t end, unsigned seed) {
+    for (size_t i = begin; i < end; i++) {
+        next[i] = i;
+    }
+
+    // Fisher-Yates that never lets an element swap with itself
+    std::mt19937_64 generator(seed);
+    for (size_t i = end - begin; i > 1; i--) {
+        std::swap(next[begin + i - 1], next[begin + below(generator, i - 1)]);
+    }
+}
@@ -0,0 +1,10 @@
+#include "utils/prefetch.hpp"
+
+std::string prefetch_hint_name(PrefetchHint hint) {
+    switch (hint) {
+        case PrefetchHint::nta: return "nta";
+        case PrefetchHint::t2:  return "t2";
+        case PrefetchHint::t1:  return "t1";
+        default:                return "t0";
+    }
+}
@@ -0,0 +1,228 @@
+#include "utils/results.hpp"
+
+#include <cctype>
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <ctime>
+#include <mutex>
+#include <sstream>
+#include <stdexcept>
+#include <utility>
+#include <unistd.h>
+
+namespace {
+
+// tokens of a test name that take the following token as their value,
+// e.g. "size_512x512_threads_4" -> size=512x512, threads=4
+const std::vector<std::string> PARAM_KEYS = {"size", "threads", "sliceSize", "schedule", "l1", "l2", "order", "cutoff", "pad", "alloc", "chasers", "distance", "hint"};
+
+std::mutex extras_mutex;
+std::vector<std::pair<std::string, std::string>> extras;
+
+std::string escape(const std::string& value) {
+    std::string escaped;
+    for (char c : value) {
+        if (c == '"' || c == '\\') {
+            escaped += '\\';
+        }
+        escaped += c;
+    }
+    return escaped;
+}
+
+std::string quote(const std::string& value) {
+    return "\"" + escape(value) + "\"";
+}
+
+std::string number(double value) {
+    if (!std::isfinite(value)) {
+        return "null";
+    }
+    std::ostringstream oss;
+    oss.precision(17);
+    oss << value;
+    return oss.str();
+}
+
+bool is_number(const std::string& value) {
+    if (value.empty()) {
+        return false;
+    }
+    for (char c : value) {
+        if (!std::isdigit(static_cast<unsigned char>(c))) {
+            return false;
+        }
+    }
+    return true;
+}
+
+void set_extra(const std::string& key, const std::string& json_value) {
+    std::lock_guard<std::mutex> lock(extras_mutex);
+    for (auto& extra : extras) {
+        if (extra.first == key) {
+            extra.second = json_value;
+            return;
+        }
+    }
+    extras.emplace_back(key, json_value);
+}
+
+std::vector<std::string> split(const std::string& value, char delimiter) {
+    std::vector<std::string> tokens;
+    std::stringstream ss(value);
+    std::string token;
+    while (std::getline(ss, token, delimiter)) {
+        tokens.push_back(token);
+    }
+    return tokens;
+}
+
+std::string dtype_of(const std::string& fixture) {
+    const std::pair<const char*, const char*> suffixes[] = {
+        {"Int", "int"}, {"Long", "long"}, {"Double", "double"}
+    };
+    for (const auto& suffix : suffixes) {
+        std::string name = suffix.first;
+        if (fixture.size() > name.size() && fixture.compare(fixture.size() - name.size(), name.size(), name) == 0) {
+            return suffix.second;
+        }
+    }
+    return "";
+}
+
+// Decodes the parameter part of a test name built by the getTestCaseName helpers.
+// Square "NxN" sizes collapse to N, Mandelbrot "WxH" pictures keep width and height
+// and report the pixel count as size.
+std::vector<std::pair<std::string, std::string>> decode_params(const std::string& params) {
+    std::vector<std::pair<std::string, std::string>> fields;
+    std::vector<std::string> tokens = split(params, '_');
+    std::string preset;
+    std::string dimensions;
+
+    for (size_t i = 0; i < tokens.size(); i++) {
+        const std::string& token = tokens[i];
+        bool is_key = false;
+        for (const auto& key : PARAM_KEYS) {
+            is_key = is_key || token == key;
+        }
+
+        if (is_key && i + 1 < tokens.size()) {
+            const std::string& value = tokens[++i];
+            if (token == "size" && value.find('x') != std::string::npos) {
+                dimensions = value;
+            } else {
+                fields.emplace_back(token, is_number(value) ? value : quote(value));
+            }
+        } else {
+            preset = token;
+        }
+    }
+
+    if (!dimensions.empty()) {
+        std::vector<std::string> sides = split(dimensions, 'x');
+        size_t width = std::stoul(sides[0]), height = std::stoul(sides[1]);
+        if (preset.empty()) {
+            fields.emplace_back("size", std::to_string(width));
+        } else {
+            fields.emplace_back("size", std::to_string(width * height));
+            fields.emplace_back("width", std::to_string(width));
+            fields.emplace_back("height", std::to_string(height));
+        }
+    }
+    if (!preset.empty()) {
+        fields.emplace_back("preset", quote(preset));
+    }
+
+    return fields;
+}
+
+}
+
+void record_field(const std::string& key, const std::string& value) {
+    set_extra(key, quote(value));
+}
+
+void record_metric(const std::string& key, double value) {
+    set_extra(key, number(value));
+}
+
+void record_series(const std::string& key, const std::vector<double>& values) {
+    std::string json = "[";
+    for (size_t i = 0; i < values.size(); i++) {
+        json += (i ? "," : "") + number(values[i]);
+    }
+    set_extra(key, json + "]");
+}
+
+ResultsListener::ResultsListener(const std::string& path) : out(path, std::ios::app) {
+    if (!out) {
+        throw std::runtime_error("Cannot open results file " + path);
+    }
+
+    char hostname[256] = {0};
+    gethostname(hostname, sizeof hostname - 1);
+    host = hostname;
+}
+
+void ResultsListener::OnTestStart(const testing::TestInfo&) {
+    {
+        std::lock_guard<std::mutex> lock(extras_mutex);
+        extras.clear();
+    }
+    start = std::chrono::steady_clock::now();
+}
+
+void ResultsListener::OnTestEnd(const testing::TestInfo& info) {
+    auto ns = std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now() - start).count();
+
+    // "scalar_singlecore_caching/CArrayInt" and "SequentialIterate/size_10"
+    std::vector<std::string> suite = split(info.test_suite_name(), '/');
+    std::vector<std::string> name = split(info.name(), '/');
+
+    std::string kernel = name[0];
+    if (kernel.rfind("DISABLED_", 0) == 0) {
+        kernel = kernel.substr(9);
+    }
+    std::string fixture = suite.back();
+
+    std::string status = "passed";
+    if (info.result()->Skipped()) {
+        status = "skipped";
+    } else if (info.result()->Failed()) {
+        status = "failed";
+    }
+
+    std::ostringstream record;
+    record << "{\"suite\":" << quote(suite.size() > 1 ? suite[0] : "")
+           << ",\"fixture\":" << quote(fixture)
+           << ",\"kernel\":" << quote(kernel)
+           << ",\"dtype\":" << quote(dtype_of(fixture));
+    if (name.size() > 1) {
+        for (const auto& field : decode_params(name[1])) {
+            record << ",\"" << field.first << "\":" << field.second;
+        }
+    }
+    record << ",\"status\":" << quote(status)
+           << ",\"ns\":" << ns
+           << ",\"host\":" << quote(host)
+           << ",\"unix_time\":" << std::time(nullptr);
+    {
+        std::lock_guard<std::mutex> lock(extras_mutex);
+        for (const auto& extra : extras) {
+            record << ",\"" << escape(extra.first) << "\":" << extra.second;
+        }
+    }
+    record << "}";
+
+    out << record.str() << std::endl;
+}
+
+std::string results_path() {
+    const char* path = std::getenv("BENCHMARK_RESULTS");
+    return (path != nullptr && *path != '\0') ? path : "benchmark_results.jsonl";
+}
+
+void register_results_listener() {
+    testing::UnitTest::GetInstance()->listeners().Append(new ResultsListener(results_path()));
+}
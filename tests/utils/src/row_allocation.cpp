@@ -0,0 +1,124 @@
+#include "utils/row_allocation.hpp"
+#include "utils/constants.hpp"
+#include "utils/utils.hpp"
+
+#include <cstdlib>
+#include <unistd.h>
+#include <vector>
+
+namespace {
+
+// arena chunks are at least this large, rows bigger than that get a chunk of their own
+constexpr size_t ARENA_CHUNK = 64 << 20;
+
+size_t round_up(size_t bytes, size_t alignment) {
+    return (bytes + alignment - 1) / alignment * alignment;
+}
+
+size_t page_bytes() {
+    static const size_t bytes = static_cast<size_t>(sysconf(_SC_PAGESIZE));
+    return bytes;
+}
+
+struct ArenaChunk {
+    char* base;
+    size_t capacity;
+    size_t used;
+};
+
+// chunks in allocation order, rows are taken from the first one with room left
+struct RowArena {
+    std::vector<ArenaChunk> chunks;
+
+    ~RowArena() {
+        for (ArenaChunk& chunk : chunks) {
+            safe_free(chunk.base);
+        }
+    }
+
+    void* take(size_t bytes) {
+        bytes = round_up(bytes, CACHE_LINE);
+        for (ArenaChunk& chunk : chunks) {
+            if (chunk.capacity - chunk.used >= bytes) {
+                void* row = chunk.base + chunk.used;
+                chunk.used += bytes;
+                return row;
+            }
+        }
+
+        size_t capacity = round_up(bytes > ARENA_CHUNK ? bytes : ARENA_CHUNK, CACHE_LINE);
+        chunks.push_back({static_cast<char*>(safe_aligned_alloc(CACHE_LINE, capacity)), capacity, bytes});
+        return chunks.back().base;
+    }
+
+    void reset() {
+        for (ArenaChunk& chunk : chunks) {
+            chunk.used = 0;
+        }
+    }
+};
+
+RowArena& row_arena() {
+    static RowArena arena;
+    return arena;
+}
+
+// one block of `size` rows `stride` bytes apart behind the index
+void** strided_rows(void** rows, size_t size, size_t stride, size_t alignment) {
+    char* block = static_cast<char*>(alignment == 0 ? safe_malloc(size * stride) : safe_aligned_alloc(alignment, size * stride));
+    for (size_t i = 0; i < size; i++) {
+        rows[i] = block + i * stride;
+    }
+    return rows;
+}
+
+}
+
+std::string row_allocation_name(RowAllocation allocation) {
+    switch (allocation) {
+        case RowAllocation::contiguous: return "contiguous";
+        case RowAllocation::line:       return "line";
+        case RowAllocation::page:       return "page";
+        case RowAllocation::arena:      return "arena";
+        default:                        return "malloc";
+    }
+}
+
+void** allocate_rows(size_t size, size_t rowBytes, RowAllocation allocation) {
+    void** rows = static_cast<void**>(safe_malloc(size * sizeof(void*)));
+
+    switch (allocation) {
+        case RowAllocation::per_row:
+            for (size_t i = 0; i < size; i++) {
+                rows[i] = safe_malloc(rowBytes);
+            }
+            return rows;
+        case RowAllocation::contiguous:
+            return strided_rows(rows, size, rowBytes, 0);
+        case RowAllocation::line:
+            return strided_rows(rows, size, round_up(rowBytes, CACHE_LINE), CACHE_LINE);
+        case RowAllocation::page:
+            return strided_rows(rows, size, round_up(rowBytes, page_bytes()), page_bytes());
+        case RowAllocation::arena:
+            for (size_t i = 0; i < size; i++) {
+                rows[i] = row_arena().take(rowBytes);
+            }
+            return rows;
+    }
+    return rows;
+}
+
+void free_rows(void** rows, size_t size, RowAllocation allocation) {
+    if (allocation == RowAllocation::per_row) {
+        for (size_t i = 0; i < size; i++) {
+            safe_free(rows[i]);
+        }
+    } else if (allocation != RowAllocation::arena && size > 0) {
+        safe_free(rows[0]);
+    }
+    safe_free(rows);
+}
+
+void reset_row_arena() {
+    row_arena().reset();
+}
@@ -0,0 +1,89 @@
+#include "utils/schedule.hpp"
+#include "utils/harness.hpp"
+
+#include <algorithm>
+
+std::string schedule_name(Schedule schedule) {
+    switch (schedule) {
+        case Schedule::cyclic:   return "cyclic";
+        case Schedule::dynamic:  return "dynamic";
+        case Schedule::guided:   return "guided";
+        case Schedule::stealing: return "stealing";
+        default:                 return "static";
+    }
+}
+
+size_t schedule_chunk() {
+    static const size_t chunk = std::max<size_t>(env_size("BENCH_SCHEDULE_CHUNK", 1), 1);
+    return chunk;
+}
+
+void RowScheduler::reset(Schedule kind, size_t totalRows, size_t numWorkers, size_t chunkRows) {
+    schedule = kind;
+    rows = totalRows;
+    chunk = std::max<size_t>(chunkRows, 1);
+
+    states.resize(numWorkers);
+    for (size_t w = 0; w < numWorkers; w++) {
+        states[w].cursor = schedule == Schedule::cyclic ? w * chunk : 0;
+        states[w].taken.clear();
+    }
+    next_row.store(0);
+}
+
+bool RowScheduler::next(size_t worker, size_t& start, size_t& end) {
+    WorkerState& state = states[worker];
+    size_t numWorkers = states.size();
+
+    switch (schedule) {
+        case Schedule::static_block: {
+            if (state.cursor != 0) {
+                return false;
+            }
+            state.cursor = 1;
+            size_t perWorker = rows / numWorkers, remainder = rows % numWorkers;
+            start = worker * perWorker + std::min(worker, remainder);
+            end = start + perWorker + (worker < remainder ? 1 : 0);
+            break;
+        }
+        case Schedule::cyclic: {
+            start = state.cursor;
+            end = std::min(start + chunk, rows);
+            state.cursor += numWorkers * chunk;
+            break;
+        }
+        case Schedule::dynamic: {
+            start = next_row.fetch_add(chunk);
+            end = std::min(start + chunk, rows);
+            break;
+        }
+        case Schedule::guided: {
+            start = next_row.load();
+            size_t grab;
+            do {
+                if (start >= rows) {
+                    return false;
+                }
+                grab = std::max(chunk, (rows - start + numWorkers - 1) / numWorkers);
+            } while (!next_row.compare_exchange_weak(start, start + grab));
+            end = std::min(start + grab, rows);
+            break;
+        }
+        case Schedule::stealing:
+            return false;
+    }
+
+    if (start >= end) {
+        return false;
+    }
+    state.taken.emplace_back(start, end);
+    return true;
+}
+
+const std::vector<std::pair<size_t, size_t>>& RowScheduler::taken(size_t worker) const {
+    return states[worker].taken;
+}
+
+size_t RowScheduler::workers() const {
+    return states.size();
+}
@@ -0,0 +1,179 @@
+#include "utils/thread_pool.hpp"
+#include "utils/harness.hpp"
+#include "utils/topology.hpp"
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+
+namespace {
+
+constexpr size_t SPAWN_SAMPLES = 5;
+
+double now_ns() {
+    return static_cast<double>(std::chrono::duration_cast<std::chrono::nanoseconds>(
+        std::chrono::steady_clock::now().time_since_epoch()).count());
+}
+
+}
+
+ThreadPool::~ThreadPool() {
+    {
+        std::lock_guard<std::mutex> lock(mutex);
+        stopping = true;
+    }
+    wake.notify_all();
+
+    for (auto& worker : workers) {
+        worker.join();
+    }
+}
+
+void ThreadPool::run(const std::vector<task_function>& tasks) {
+    if (tasks.empty()) {
+        return;
+    }
+    grow(tasks.size());
+
+    std::unique_lock<std::mutex> lock(mutex);
+    batch = &tasks;
+    spans.assign(tasks.size(), {0, 0});
+    pending = tasks.size();
+    arrived.store(0);
+    current_generation++;
+    wake.notify_all();
+
+    finished.wait(lock, [this] { return pending == 0; });
+    batch = nullptr;
+}
+
+size_t ThreadPool::size() const {
+    std::lock_guard<std::mutex> lock(mutex);
+    return workers.size();
+}
+
+std::vector<WorkerSpan> ThreadPool::last_spans() const {
+    std::lock_guard<std::mutex> lock(mutex);
+    return spans;
+}
+
+void ThreadPool::clear_spans() {
+    std::lock_guard<std::mutex> lock(mutex);
+    spans.clear();
+}
+
+void ThreadPool::grow(size_t count) {
+    std::lock_guard<std::mutex> lock(mutex);
+    static const std::vector<int> cpus = placement_cpus(placement_policy());
+
+    while (workers.size() < count) {
+        workers.emplace_back(&ThreadPool::work, this, workers.size(), current_generation);
+        if (!cpus.empty()) {
+            pin_thread(workers.back(), cpus[(workers.size() - 1) % cpus.size()]);
+        }
+    }
+}
+
+void ThreadPool::work(size_t id, size_t generation) {
+    while (true) {
+        const std::vector<task_function>* tasks;
+        {
+            std::unique_lock<std::mutex> lock(mutex);
+            wake.wait(lock, [&] { return stopping || current_generation != generation; });
+            if (stopping) {
+                return;
+            }
+            generation = current_generation;
+            // workers beyond the batch size sit this one out. run() only waits for the
+            // workers it has tasks for, so one of those that wakes late can find the
+            // batch already gone
+            if (batch == nullptr || id >= batch->size()) {
+                continue;
+            }
+            tasks = batch;
+        }
+
+        // start barrier, yield instead of spinning hard in case there are more workers than cores
+        arrived.fetch_add(1);
+        while (arrived.load() < tasks->size()) {
+            std::this_thread::yield();
+        }
+
+        double start = now_ns();
+        (*tasks)[id]();
+        double end = now_ns();
+
+        std::lock_guard<std::mutex> lock(mutex);
+        spans[id] = {start, end};
+        if (--pending == 0) {
+            finished.notify_one();
+        }
+    }
+}
+
+ThreadPool& thread_pool() {
+    static ThreadPool pool;
+    return pool;
+}
+
+double spawn_overhead_ns(size_t numThreads) {
+    std::vector<double> samples;
+    for (size_t i = 0; i < SPAWN_SAMPLES; i++) {
+        samples.push_back(time_once([numThreads] {
+            std::vector<std::thread> threads;
+            for (size_t j = 0; j < numThreads; j++) {
+                threads.emplace_back([] {});
+            }
+            for (auto& thread : threads) {
+                thread.join();
+            }
+        }));
+    }
+
+    std::sort(samples.begin(), samples.end());
+    return samples[samples.size() / 2];
+}
+
+void record_thread_setup(size_t numThreads) {
+    thread_pool().clear_spans();
+    record_metric("spawn_overhead_ns", spawn_overhead_ns(numThreads));
+    record_field("placement", placement_name(placement_policy()));
+
+    std::vector<int> cpus = placement_cpus(placement_policy());
+    if (!cpus.empty()) {
+        std::vector<double> worker_cpus;
+        for (size_t i = 0; i < numThreads; i++) {
+            worker_cpus.push_back(cpus[i % cpus.size()]);
+        }
+        record_series("worker_cpus", worker_cpus);
+    }
+}
+
+void record_worker_timings(const std::vector<double>& work) {
+    std::vector<WorkerSpan> spans = thread_pool().last_spans();
+    if (spans.empty()) {
+        return;
+    }
+
+    double origin = spans.front().start_ns;
+    for (const WorkerSpan& span : spans) {
+        origin = std::min(origin, span.start_ns);
+    }
+
+    std::vector<double> starts, ends;
+    double longest = 0, total = 0;
+    for (const WorkerSpan& span : spans) {
+        starts.push_back(span.start_ns - origin);
+        ends.push_back(span.end_ns - origin);
+        longest = std::max(longest, span.end_ns - span.start_ns);
+        total += span.end_ns - span.start_ns;
+    }
+    double mean = total / static_cast<double>(spans.size());
+
+    record_series("worker_start_ns", starts);
+    record_series("worker_end_ns", ends);
+    if (!work.empty()) {
+        record_series("worker_work", work);
+    }
+    record_metric("imbalance", mean > 0 ? longest / mean : NAN);
+}
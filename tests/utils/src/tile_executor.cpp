@@ -0,0 +1,163 @@
+#include "utils/tile_executor.hpp"
+#include "utils/harness.hpp"
+
+#include <algorithm>
+
+namespace {
+
+void split(const Tile& tile, size_t levels, size_t col_align, std::vector<Tile>& tiles) {
+    size_t rows = tile.row_end - tile.row_begin, cols = tile.col_end - tile.col_begin;
+    size_t colCut = cols / 2 / col_align * col_align;
+
+    if (levels == 0 || (rows < 2 && colCut == 0)) {
+        tiles.push_back(tile);
+    } else if (colCut > 0 && (cols >= rows || rows < 2)) {
+        split({tile.row_begin, tile.row_end, tile.col_begin, tile.col_begin + colCut}, levels - 1, col_align, tiles);
+        split({tile.row_begin, tile.row_end, tile.col_begin + colCut, tile.col_end}, levels - 1, col_align, tiles);
+    } else {
+        size_t midRow = tile.row_begin + rows / 2;
+        split({tile.row_begin, midRow, tile.col_begin, tile.col_end}, levels - 1, col_align, tiles);
+        split({midRow, tile.row_end, tile.col_begin, tile.col_end}, levels - 1, col_align, tiles);
+    }
+}
+
+}
+
+size_t tile_size() {
+    static const size_t size = std::max<size_t>(env_size("BENCH_TILE", 64), 1);
+    return size;
+}
+
+std::pair<size_t, size_t> grid_shape(size_t cells) {
+    size_t cols = 1;
+    for (size_t candidate = 1; candidate * candidate <= cells; candidate++) {
+        if (cells % candidate == 0) {
+            cols = candidate;
+        }
+    }
+    return {cells / cols, cols};
+}
+
+std::vector<Tile> grid_tiles(size_t rows, size_t cols, size_t grid_rows, size_t grid_cols) {
+    size_t blockRows = rows / grid_rows, rowRemainder = rows % grid_rows;
+    size_t blockCols = cols / grid_cols, colRemainder = cols % grid_cols;
+
+    std::vector<Tile> tiles;
+    for (size_t i = 0; i < grid_rows; i++) {
+        size_t startRow = i * blockRows + std::min(i, rowRemainder);
+        size_t endRow = startRow + blockRows + (i < rowRemainder ? 1 : 0);
+        for (size_t j = 0; j < grid_cols; j++) {
+            size_t startCol = j * blockCols + std::min(j, colRemainder);
+            size_t endCol = startCol + blockCols + (j < colRemainder ? 1 : 0);
+            tiles.push_back({startRow, endRow, startCol, endCol});
+        }
+    }
+    return tiles;
+}
+
+std::vector<Tile> split_tiles(const Tile& whole, size_t count, size_t col_align) {
+    size_t levels = 0;
+    while ((size_t(1) << levels) < count) {
+        levels++;
+    }
+
+    std::vector<Tile> tiles;
+    split(whole, levels, std::max<size_t>(col_align, 1), tiles);
+    return tiles;
+}
+
+std::vector<Tile> make_tiles(size_t rows, size_t cols, size_t tile_rows, size_t tile_cols) {
+    std::vector<Tile> tiles;
+    for (size_t row = 0; row < rows; row += tile_rows) {
+        for (size_t col = 0; col < cols; col += tile_cols) {
+            tiles.push_back({row, std::min(row + tile_rows, rows), col, std::min(col + tile_cols, cols)});
+        }
+    }
+    return tiles;
+}
+
+void TileExecutor::run(const std::vector<Tile>& tiles, size_t workers, const tile_function& kernel) {
+    run(tiles, workers, worker_tile_function([&kernel](size_t, const Tile& tile) { kernel(tile); }));
+}
+
+void TileExecutor::run(const std::vector<Tile>& tiles, size_t workers, const worker_tile_function& kernel) {
+    queues.clear();
+    for (size_t w = 0; w < workers; w++) {
+        queues.push_back(std::make_unique<WorkerQueue>());
+    }
+
+    // contiguous runs keep neighbouring tiles, and the data they share, on one worker
+    size_t perWorker = tiles.size() / workers, remainder = tiles.size() % workers;
+    size_t next = 0;
+    for (size_t w = 0; w < workers; w++) {
+        size_t count = perWorker + (w < remainder ? 1 : 0);
+        queues[w]->tiles.assign(tiles.begin() + static_cast<std::ptrdiff_t>(next),
+                                tiles.begin() + static_cast<std::ptrdiff_t>(next + count));
+        next += count;
+    }
+    tile_count = tiles.size();
+
+    for (size_t w = 0; w < workers; w++) {
+        tasks.emplace_back(std::bind(&TileExecutor::work, this, w, std::cref(kernel)));
+    }
+    thread_pool().run(tasks);
+    tasks.clear();
+}
+
+const std::vector<Tile>& TileExecutor::executed(size_t worker) const {
+    return queues[worker]->executed;
+}
+
+size_t TileExecutor::workers() const {
+    return queues.size();
+}
+
+void TileExecutor::record() const {
+    if (queues.empty()) {
+        return;
+    }
+
+    size_t steals = 0;
+    for (const auto& queue : queues) {
+        steals += queue->steals;
+    }
+    record_metric("tiles", static_cast<double>(tile_count));
+    record_metric("tile_size", static_cast<double>(tile_size()));
+    record_metric("steals", static_cast<double>(steals));
+}
+
+bool TileExecutor::pop(size_t worker, Tile& tile) {
+    WorkerQueue& queue = *queues[worker];
+    std::lock_guard<std::mutex> lock(queue.mutex);
+    if (queue.tiles.empty()) {
+        return false;
+    }
+    tile = queue.tiles.front();
+    queue.tiles.pop_front();
+    return true;
+}
+
+bool TileExecutor::steal(size_t worker, Tile& tile) {
+    // no tiles are added during a run, so one empty sweep means the run is done
+    for (size_t offset = 1; offset < queues.size(); offset++) {
+        WorkerQueue& victim = *queues[(worker + offset) % queues.size()];
+        std::lock_guard<std::mutex> lock(victim.mutex);
+        if (!victim.tiles.empty()) {
+            tile = victim.tiles.back();
+            victim.tiles.pop_back();
+            queues[worker]->steals++;
+            return true;
+        }
+    }
+    return false;
+}
+
+void TileExecutor::work(size_t worker, const worker_tile_function& kernel) {
+    Tile tile;
+
+    RegionTimer region;
+    while (pop(worker, tile) || steal(worker, tile)) {
+        kernel(worker, tile);
+        queues[worker]->executed.push_back(tile);
+    }
+}
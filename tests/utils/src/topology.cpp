@@ -0,0 +1,156 @@
+#include "utils/topology.hpp"
+
+#include <algorithm>
+#include <cstdlib>
+#include <fstream>
+#include <sstream>
+#include <stdexcept>
+#include <tuple>
+#include <pthread.h>
+#include <sched.h>
+
+namespace {
+
+const std::string CPU_ROOT = "/sys/devices/system/cpu/";
+
+bool read_line(const std::string& path, std::string& line) {
+    std::ifstream in(path);
+    return static_cast<bool>(std::getline(in, line));
+}
+
+int read_int(const std::string& path, int fallback) {
+    std::string line;
+    if (!read_line(path, line) || line.empty()) {
+        return fallback;
+    }
+    return std::stoi(line);
+}
+
+// "0-3,8,10-11" -> 0 1 2 3 8 10 11
+std::vector<int> parse_cpu_list(const std::string& list) {
+    std::vector<int> cpus;
+    std::stringstream ss(list);
+    std::string range;
+    while (std::getline(ss, range, ',')) {
+        if (range.empty()) {
+            continue;
+        }
+        size_t dash = range.find('-');
+        int first = std::stoi(range.substr(0, dash));
+        int last = dash == std::string::npos ? first : std::stoi(range.substr(dash + 1));
+        for (int cpu = first; cpu <= last; cpu++) {
+            cpus.push_back(cpu);
+        }
+    }
+    return cpus;
+}
+
+std::vector<CpuInfo> read_topology() {
+    cpu_set_t allowed;
+    CPU_ZERO(&allowed);
+    bool have_mask = sched_getaffinity(0, sizeof allowed, &allowed) == 0;
+
+    std::string online;
+    std::vector<int> cpus;
+    if (read_line(CPU_ROOT + "online", online)) {
+        cpus = parse_cpu_list(online);
+    } else {
+        for (unsigned cpu = 0; cpu < std::max(1u, std::thread::hardware_concurrency()); cpu++) {
+            cpus.push_back(static_cast<int>(cpu));
+        }
+    }
+
+    std::vector<CpuInfo> topology;
+    for (int cpu : cpus) {
+        if (have_mask && !CPU_ISSET(cpu, &allowed)) {
+            continue;
+        }
+
+        std::string dir = CPU_ROOT + "cpu" + std::to_string(cpu) + "/topology/";
+        CpuInfo info = {cpu, read_int(dir + "physical_package_id", 0), read_int(dir + "core_id", cpu), 0};
+
+        std::string siblings;
+        if (read_line(dir + "thread_siblings_list", siblings)) {
+            std::vector<int> list = parse_cpu_list(siblings);
+            info.smt = static_cast<int>(std::find(list.begin(), list.end(), cpu) - list.begin());
+        }
+        topology.push_back(info);
+    }
+
+    return topology;
+}
+
+}
+
+const std::vector<CpuInfo>& cpu_topology() {
+    static const std::vector<CpuInfo> topology = read_topology();
+    return topology;
+}
+
+Placement placement_policy() {
+    static const Placement placement = [] {
+        const char* value = std::getenv("BENCH_PLACEMENT");
+        std::string name = value != nullptr ? value : "";
+        for (Placement candidate : {Placement::none, Placement::compact, Placement::scatter, Placement::physical, Placement::smt}) {
+            if (name == placement_name(candidate)) {
+                return candidate;
+            }
+        }
+        if (!name.empty()) {
+            throw std::invalid_argument("Unknown BENCH_PLACEMENT " + name);
+        }
+        return Placement::none;
+    }();
+    return placement;
+}
+
+std::string placement_name(Placement placement) {
+    switch (placement) {
+        case Placement::compact:  return "compact";
+        case Placement::scatter:  return "scatter";
+        case Placement::physical: return "physical";
+        case Placement::smt:      return "smt";
+        default:                  return "none";
+    }
+}
+
+std::vector<int> placement_cpus(Placement placement) {
+    std::vector<CpuInfo> order = cpu_topology();
+
+    auto sort_by = [&order](auto key) {
+        std::sort(order.begin(), order.end(), [&key](const CpuInfo& a, const CpuInfo& b) { return key(a) < key(b); });
+    };
+    switch (placement) {
+        case Placement::compact:
+            sort_by([](const CpuInfo& c) { return std::make_tuple(c.package, c.smt, c.core, c.cpu); });
+            break;
+        case Placement::scatter:
+            sort_by([](const CpuInfo& c) { return std::make_tuple(c.smt, c.core, c.package, c.cpu); });
+            break;
+        case Placement::physical:
+            order.erase(std::remove_if(order.begin(), order.end(), [](const CpuInfo& c) { return c.smt != 0; }), order.end());
+            sort_by([](const CpuInfo& c) { return std::make_tuple(c.package, c.core, c.cpu); });
+            break;
+        case Placement::smt:
+            sort_by([](const CpuInfo& c) { return std::make_tuple(c.package, c.core, c.smt, c.cpu); });
+            break;
+        default:
+            return {};
+    }
+
+    std::vector<int> cpus;
+    for (const CpuInfo& info : order) {
+        cpus.push_back(info.cpu);
+    }
+    return cpus;
+}
+
+void pin_thread(std::thread& thread, int cpu) {
+    cpu_set_t set;
+    CPU_ZERO(&set);
+    CPU_SET(cpu, &set);
+
+    if (pthread_setaffinity_np(thread.native_handle(), sizeof set, &set) != 0) {
+        throw std::runtime_error("Cannot pin thread to cpu " + std::to_string(cpu));
+    }
+}
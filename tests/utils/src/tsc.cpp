@@ -0,0 +1,57 @@
+#include "utils/tsc.hpp"
+
+#include <ctime>
+
+namespace {
+
+std::atomic<uint64_t> longest_region{0};
+std::atomic<bool> any_region{false};
+
+uint64_t monotonic_raw_ns() {
+    timespec ts;
+    clock_gettime(CLOCK_MONOTONIC_RAW, &ts);
+    return static_cast<uint64_t>(ts.tv_sec) * 1'000'000'000ull + static_cast<uint64_t>(ts.tv_nsec);
+}
+
+double calibrate_tsc() {
+    constexpr uint64_t CALIBRATION_NS = 50'000'000;
+
+    uint64_t clock_start = monotonic_raw_ns();
+    uint64_t tsc_start = tsc_begin();
+    uint64_t clock_now;
+    do {
+        clock_now = monotonic_raw_ns();
+    } while (clock_now - clock_start < CALIBRATION_NS);
+    uint64_t tsc_stop = tsc_end();
+
+    return static_cast<double>(tsc_stop - tsc_start) / static_cast<double>(clock_now - clock_start);
+}
+
+}
+
+thread_local int RegionTimer::depth = 0;
+
+double tsc_ghz() {
+    static const double ghz = calibrate_tsc();
+    return ghz;
+}
+
+void region_reset() {
+    longest_region.store(0);
+    any_region.store(false);
+}
+
+bool region_recorded() {
+    return any_region.load();
+}
+
+uint64_t region_cycles() {
+    return longest_region.load();
+}
+
+void region_add(uint64_t cycles) {
+    uint64_t current = longest_region.load();
+    while (cycles > current && !longest_region.compare_exchange_weak(current, cycles)) {
+    }
+    any_region.store(true);
+}
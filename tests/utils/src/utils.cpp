@@ -1,5 +1,6 @@
 #include "utils/utils.hpp"
 #include "utils/constants.hpp"
+#include "utils/memory.hpp"
 
 #include <cstdint>
 #include <cstdlib>
@@ -11,18 +12,18 @@
 #endif
 
 void* safe_malloc(size_t size) {
-    void* memory = malloc(size);
-    if (memory == nullptr) {
-        throw std::bad_alloc();
-    }
-    return memory;
+    return backed_alloc(size, 0);
+}
+
+void* safe_aligned_alloc(size_t alignment, size_t size) {
+    return backed_alloc(size, alignment);
 }
 
 void free_matrix(void**& matrix, size_t size) {
     for (size_t i = 0; i < size; i++) {
-        free(matrix[i]);
+        safe_free(matrix[i]);
     }
-    free(matrix);
+    safe_free(matrix);
 }
 
 int scalar_diverge(double c_real, double c_im, int num_iters) {